@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import math
-import os
 from dataclasses import dataclass
-from pathlib import Path
 
 from PIL import Image, ImageDraw, ImageFont
 
+from mockupkit import cache, canvas, charts, cli, motion, shapes, stamp, trace, units, waveform
+from mockupkit.fonts import load_font
+from mockupkit.i18n import tr
+from mockupkit.registry import Family
+from mockupkit.units import px
+
 
 @dataclass(frozen=True)
 class Theme:
@@ -28,41 +32,12 @@ def _hex(hex_color: str) -> tuple[int, int, int]:
     return (int(hex_color[0:2], 16), int(hex_color[2:4], 16), int(hex_color[4:6], 16))
 
 
-def _load_font(path: str | None, size: int) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    if path and os.path.exists(path):
-        try:
-            return ImageFont.truetype(path, size=size)
-        except Exception:
-            pass
-    return ImageFont.load_default()
-
-
+@trace.span
 def _wrap_text(text: str, font: ImageFont.ImageFont, max_width: int, draw: ImageDraw.ImageDraw) -> list[str]:
-    words = text.split()
-    lines: list[str] = []
-    current: list[str] = []
-
-    def width_of(s: str) -> int:
-        bbox = draw.textbbox((0, 0), s, font=font)
-        return bbox[2] - bbox[0]
-
-    for w in words:
-        trial = " ".join([*current, w]).strip()
-        if not trial:
-            continue
-        if width_of(trial) <= max_width:
-            current.append(w)
-            continue
-        if current:
-            lines.append(" ".join(current))
-            current = [w]
-        else:
-            lines.append(w)
-    if current:
-        lines.append(" ".join(current))
-    return lines
+    return list(cache.wrap(font, text, max_width))
 
 
+@trace.span
 def _text(
     draw: ImageDraw.ImageDraw,
     xy: tuple[int, int],
@@ -80,12 +55,13 @@ def _text(
 
     lh = line_height
     if lh is None:
-        bbox = draw.textbbox((0, 0), "Ag", font=font)
+        bbox = cache.text_bbox(font, "Ag")
         lh = int((bbox[3] - bbox[1]) * 1.35)
 
     lines = _wrap_text(text, font=font, max_width=max_width, draw=draw)
     for i, line in enumerate(lines):
         draw.text((x, y + i * lh), line, font=font, fill=fill)
+    canvas.wrapped(draw, (x, y), lines, font, max_width, lh)
     end_y = y + len(lines) * lh
     return (x + max_width, end_y)
 
@@ -98,9 +74,10 @@ def _rounded_rect(
     outline: tuple[int, int, int] | None = None,
     width: int = 2,
 ) -> None:
-    draw.rounded_rectangle(xy, radius=radius, fill=fill, outline=outline, width=width)
+    shapes.rounded_rectangle(draw, xy, radius=radius, fill=fill, outline=outline, width=width)
 
 
+@trace.span
 def _button(
     draw: ImageDraw.ImageDraw,
     box: tuple[int, int, int, int],
@@ -110,14 +87,15 @@ def _button(
     text_color: tuple[int, int, int],
     outline: tuple[int, int, int] | None = None,
 ) -> None:
-    _rounded_rect(draw, box, radius=22, fill=fill, outline=outline, width=2)
+    _rounded_rect(draw, box, radius=px(11), fill=fill, outline=outline, width=px(1))
     x1, y1, x2, y2 = box
-    bbox = draw.textbbox((0, 0), text, font=font)
+    bbox = cache.text_bbox(font, text)
     tw = bbox[2] - bbox[0]
     th = bbox[3] - bbox[1]
-    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - 2), text, font=font, fill=text_color)
+    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - px(1)), text, font=font, fill=text_color)
 
 
+@trace.span
 def _pill(
     draw: ImageDraw.ImageDraw,
     x: int,
@@ -128,97 +106,114 @@ def _pill(
     fg: tuple[int, int, int],
     border: tuple[int, int, int],
 ) -> int:
-    bbox = draw.textbbox((0, 0), label, font=font)
+    bbox = cache.text_bbox(font, label)
     tw = bbox[2] - bbox[0]
     th = bbox[3] - bbox[1]
-    pad_x, pad_y = 18, 12
+    pad_x, pad_y = px(9), px(6)
     w = tw + pad_x * 2
     h = th + pad_y * 2
-    _rounded_rect(draw, (x, y, x + w, y + h), radius=999, fill=bg, outline=border, width=2)
-    draw.text((x + pad_x, y + pad_y - 2), label, font=font, fill=fg)
+    _rounded_rect(draw, (x, y, x + w, y + h), radius=999, fill=bg, outline=border, width=px(1))
+    draw.text((x + pad_x, y + pad_y - px(1)), label, font=font, fill=fg)
     return w
 
 
-def _sparkline(draw: ImageDraw.ImageDraw, x: int, y: int, w: int, h: int, color: tuple[int, int, int]) -> None:
+@trace.span
+def _sparkline(
+    draw: ImageDraw.ImageDraw,
+    x: int,
+    y: int,
+    w: int,
+    h: int,
+    color: tuple[int, int, int],
+    values: charts.Series | None = None,
+) -> None:
+    if values is not None:
+        # Session exports can be long; charts reduces them to the line's pixel width.
+        charts.draw(draw, (x, y, w, h), values, color, width=px(2))
+        return
     pts = []
     for i in range(10):
         t = i / 9
         yy = y + h * (0.55 + 0.25 * math.sin(t * math.pi * 2.3) + 0.08 * math.sin(t * math.pi * 7.1))
         xx = x + int(w * t)
         pts.append((xx, int(yy)))
-    draw.line(pts, fill=color, width=4, joint="curve")
+    draw.line(pts, fill=color, width=px(2), joint="curve")
 
 
+@trace.span
 def _infinity_mark(draw: ImageDraw.ImageDraw, cx: int, cy: int, size: int, color: tuple[int, int, int]) -> None:
     w = size
     h = int(size * 0.6)
     r = h // 2
     left = (cx - w // 2, cy - h // 2, cx - w // 2 + h, cy + h // 2)
     right = (cx + w // 2 - h, cy - h // 2, cx + w // 2, cy + h // 2)
-    draw.arc(left, start=40, end=320, fill=color, width=10)
-    draw.arc(right, start=220, end=140, fill=color, width=10)
-    draw.line([(cx - r, cy), (cx + r, cy)], fill=color, width=10)
+    shapes.arc(draw, left, start=40, end=320, fill=color, width=px(5))
+    shapes.arc(draw, right, start=220, end=140, fill=color, width=px(5))
+    shapes.line(draw, [(cx - r, cy), (cx + r, cy)], fill=color, width=px(5))
 
 
+@trace.span
 def _base_canvas(width: int, height: int, theme: Theme) -> tuple[Image.Image, ImageDraw.ImageDraw]:
-    im = Image.new("RGB", (width, height), theme.bg)
-    return im, ImageDraw.Draw(im)
+    im = canvas.new("RGB", (width, height), theme.bg)
+    return im, canvas.draw(im)
 
 
-def _common_fonts() -> dict[str, ImageFont.ImageFont]:
+def _common_fonts(scale: float) -> dict[str, ImageFont.ImageFont]:
     font_title = "/System/Library/Fonts/NewYork.ttf"
     font_body = "/System/Library/Fonts/SFCompact.ttf"
     font_mono = "/System/Library/Fonts/SFNSMono.ttf"
 
     return {
-        "title_64": _load_font(font_title, 64),
-        "title_48": _load_font(font_title, 48),
-        "body_36": _load_font(font_body, 36),
-        "body_32": _load_font(font_body, 32),
-        "body_28": _load_font(font_body, 28),
-        "body_24": _load_font(font_body, 24),
-        "mono_24": _load_font(font_mono, 24),
+        # Keys name the @2x pixel size; the fonts themselves follow the device scale.
+        "title_64": load_font(font_title, px(32, scale)),
+        "title_48": load_font(font_title, px(24, scale)),
+        "body_36": load_font(font_body, px(18, scale)),
+        "body_32": load_font(font_body, px(16, scale)),
+        "body_28": load_font(font_body, px(14, scale)),
+        "body_24": load_font(font_body, px(12, scale)),
+        "mono_24": load_font(font_mono, px(12, scale)),
     }
 
 
 def screen_onboarding(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 64
+    margin = px(32)
+    top = units.safe_top()
 
-    _text(draw, (margin, 130), "CONZIA", font=fonts["title_64"], fill=theme.text)
+    _text(draw, (margin, top + px(18)), "CONZIA", font=fonts["title_64"], fill=theme.text)
     _text(
         draw,
-        (margin, 240),
-        "Una sala silenciosa. Sin juicio. Sin anestesia.",
+        (margin, top + px(73)),
+        tr("Una sala silenciosa. Sin juicio. Sin anestesia."),
         font=fonts["body_32"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
     )
 
-    _infinity_mark(draw, width // 2, height // 2 - 40, size=300, color=theme.accent)
+    _infinity_mark(draw, width // 2, height // 2 - px(20), size=px(150), color=theme.accent)
 
     _text(
         draw,
-        (margin, height // 2 + 160),
-        "Lo que no se nombra, se repite.",
+        (margin, height // 2 + px(80)),
+        tr("Lo que no se nombra, se repite."),
         font=fonts["title_48"],
         fill=theme.text,
         max_width=width - margin * 2,
-        line_height=66,
+        line_height=px(33),
     )
 
     _button(
         draw,
-        (margin, height - 210, width - margin, height - 120),
-        "ENTRAR",
+        (margin, height - px(105), width - margin, height - px(60)),
+        tr("ENTRAR"),
         font=fonts["body_32"],
         fill=theme.accent,
         text_color=(255, 255, 255),
     )
     _text(
         draw,
-        (margin, height - 95),
-        "Datos en tu dispositivo. Sin espectáculo.",
+        (margin, height - px(47.5)),
+        tr("Datos en tu dispositivo. Sin espectáculo."),
         font=fonts["body_24"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
@@ -228,65 +223,66 @@ def screen_onboarding(width: int, height: int, theme: Theme, fonts: dict[str, Im
 
 def screen_contrato(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 64
+    margin = px(32)
+    top = units.safe_top()
 
-    _text(draw, (margin, 120), "Antes de empezar", font=fonts["title_48"], fill=theme.text)
+    _text(draw, (margin, top + px(13)), tr("Antes de empezar"), font=fonts["title_48"], fill=theme.text)
     _text(
         draw,
-        (margin, 200),
-        "CONZIA no es un asistente. No está para hacerte sentir cómodo. Está para ayudarte a mirar lo que evitas.",
+        (margin, top + px(53)),
+        tr("CONZIA no es un asistente. No está para hacerte sentir cómodo. Está para ayudarte a mirar lo que evitas."),
         font=fonts["body_32"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
-        line_height=48,
+        line_height=px(24),
     )
 
     _rounded_rect(
         draw,
-        (margin, 420, width - margin, 840),
-        radius=26,
+        (margin, top + px(163), width - margin, top + px(373)),
+        radius=px(13),
         fill=theme.card,
         outline=theme.border,
-        width=2,
+        width=px(1),
     )
     _text(
         draw,
-        (margin + 36, 460),
-        "Reglas:",
+        (margin + px(18), top + px(183)),
+        tr("Reglas:"),
         font=fonts["body_32"],
         fill=theme.text,
     )
     rules = [
-        "• No diagnóstico. No promesas clínicas.",
-        "• Una pregunta por vez.",
-        "• Tú decides cuándo pedir lectura.",
-        "• La Bóveda está fuera del sistema.",
+        tr("• No diagnóstico. No promesas clínicas."),
+        tr("• Una pregunta por vez."),
+        tr("• Tú decides cuándo pedir lectura."),
+        tr("• La Bóveda está fuera del sistema."),
     ]
-    y = 520
+    y = top + px(213)
     for r in rules:
         _text(
             draw,
-            (margin + 36, y),
+            (margin + px(18), y),
             r,
             font=fonts["body_28"],
             fill=theme.text_muted,
-            max_width=width - margin * 2 - 72,
-            line_height=42,
+            max_width=width - margin * 2 - px(36),
+            line_height=px(21),
         )
-        y += 64
+        y += px(32)
 
     _button(
         draw,
-        (margin, height - 260, width - margin, height - 170),
-        "ACEPTO",
+        (margin, height - px(130), width - margin, height - px(85)),
+        tr("ACEPTO"),
         font=fonts["body_32"],
         fill=theme.accent,
         text_color=(255, 255, 255),
     )
     _button(
         draw,
-        (margin, height - 150, width - margin, height - 60),
-        "NO AHORA",
+        (margin, height - px(75), width - margin, height - px(30)),
+        tr("NO AHORA"),
         font=fonts["body_32"],
         fill=theme.bg,
         text_color=theme.text,
@@ -297,37 +293,40 @@ def screen_contrato(width: int, height: int, theme: Theme, fonts: dict[str, Imag
 
 def screen_acceso(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 64
+    margin = px(32)
+    top = units.safe_top()
 
-    _text(draw, (margin, 120), "Acceso", font=fonts["title_48"], fill=theme.text)
+    _text(draw, (margin, top + px(13)), tr("Acceso"), font=fonts["title_48"], fill=theme.text)
     _text(
         draw,
-        (margin, 200),
-        "Puedes entrar sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in).",
+        (margin, top + px(53)),
+        tr("Puedes entrar sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in)."),
         font=fonts["body_28"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
-        line_height=42,
+        line_height=px(21),
     )
 
-    _rounded_rect(draw, (margin, 330, width - margin, 430), radius=18, fill=theme.card, outline=theme.border)
-    _text(draw, (margin + 24, 360), "Correo", font=fonts["body_28"], fill=theme.text_muted)
+    field_box = (margin, top + px(118), width - margin, top + px(168))
+    _rounded_rect(draw, field_box, radius=px(9), fill=theme.card, outline=theme.border, width=px(1))
+    _text(draw, (margin + px(12), top + px(133)), tr("Correo"), font=fonts["body_28"], fill=theme.text_muted)
 
-    _rounded_rect(draw, (margin, 470, width - margin, 570), radius=18, fill=theme.card, outline=theme.border)
-    _text(draw, (margin + 24, 500), "Contraseña", font=fonts["body_28"], fill=theme.text_muted)
+    field_box = (margin, top + px(188), width - margin, top + px(238))
+    _rounded_rect(draw, field_box, radius=px(9), fill=theme.card, outline=theme.border, width=px(1))
+    _text(draw, (margin + px(12), top + px(203)), tr("Contraseña"), font=fonts["body_28"], fill=theme.text_muted)
 
     _button(
         draw,
-        (margin, 640, width - margin, 730),
-        "CONTINUAR",
+        (margin, top + px(273), width - margin, top + px(318)),
+        tr("CONTINUAR"),
         font=fonts["body_32"],
         fill=theme.accent,
         text_color=(255, 255, 255),
     )
     _button(
         draw,
-        (margin, 760, width - margin, 850),
-        "ENTRAR SIN CUENTA",
+        (margin, top + px(333), width - margin, top + px(378)),
+        tr("ENTRAR SIN CUENTA"),
         font=fonts["body_32"],
         fill=theme.bg,
         text_color=theme.text,
@@ -336,8 +335,8 @@ def screen_acceso(width: int, height: int, theme: Theme, fonts: dict[str, ImageF
 
     _text(
         draw,
-        (margin, height - 130),
-        "Privacidad: CONZIA funciona local. Sync es opcional.",
+        (margin, height - px(65)),
+        tr("Privacidad: CONZIA funciona local. Sync es opcional."),
         font=fonts["body_24"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
@@ -347,13 +346,23 @@ def screen_acceso(width: int, height: int, theme: Theme, fonts: dict[str, ImageF
 
 def screen_sesion(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 56
+    margin = px(28)
+    top = units.safe_top()
 
-    _text(draw, (margin, 110), "Hola, [Nombre].", font=fonts["title_48"], fill=theme.text)
+    hello = tr("Hola, [Nombre].")
+    name_tag = tr("[Nombre]")
+    stamp.slot(
+        draw,
+        "name",
+        name_tag,
+        lambda d, name: _text(
+            d, (margin, top + px(8)), hello.replace(name_tag, name), font=fonts["title_48"], fill=theme.text
+        ),
+    )
     _text(
         draw,
-        (margin, 180),
-        "Hoy no necesitas explicarte. Solo nombra el hecho.",
+        (margin, top + px(43)),
+        tr("Hoy no necesitas explicarte. Solo nombra el hecho."),
         font=fonts["body_28"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
@@ -361,162 +370,199 @@ def screen_sesion(width: int, height: int, theme: Theme, fonts: dict[str, ImageF
 
     _rounded_rect(
         draw,
-        (margin, 270, width - margin, 690),
-        radius=30,
+        (margin, top + px(88), width - margin, top + px(298)),
+        radius=px(15),
         fill=theme.panel,
         outline=theme.border,
-        width=2,
+        width=px(1),
     )
-    _text(draw, (margin + 36, 310), "Tu próximo paso", font=fonts["body_32"], fill=theme.accent_2)
-    _text(
+    _text(draw, (margin + px(18), top + px(108)), tr("Tu próximo paso"), font=fonts["body_32"], fill=theme.accent_2)
+    intro = tr("Habla 60s sobre esto:")
+    stamp.slot(
         draw,
-        (margin + 36, 370),
-        "Habla 60s sobre esto:\n“¿Dónde cediste hoy para evitar incomodidad?”",
-        font=fonts["body_32"],
-        fill=theme.text,
-        max_width=width - margin * 2 - 72,
-        line_height=50,
+        "prompt",
+        tr("“¿Dónde cediste hoy para evitar incomodidad?”"),
+        lambda d, prompt: _text(
+            d,
+            (margin + px(18), top + px(138)),
+            f"{intro}\n{prompt}",
+            font=fonts["body_32"],
+            fill=theme.text,
+            max_width=width - margin * 2 - px(36),
+            line_height=px(25),
+        ),
     )
 
     _button(
         draw,
-        (margin + 36, 560, width - margin - 36, 650),
-        "HABLAR",
+        (margin + px(18), top + px(233), width - margin - px(18), top + px(278)),
+        tr("HABLAR"),
         font=fonts["body_32"],
         fill=theme.accent,
         text_color=(255, 255, 255),
     )
 
-    _text(draw, (margin, 745), "Mapa · Bóveda · Refugio", font=fonts["body_24"], fill=theme.text_muted)
+    _text(draw, (margin, top + px(325.5)), tr("Mapa · Bóveda · Refugio"), font=fonts["body_24"], fill=theme.text_muted)
 
     # Mini gráfica colapsada
     _rounded_rect(
         draw,
-        (margin, 820, width - margin, 980),
-        radius=26,
+        (margin, top + px(363), width - margin, top + px(443)),
+        radius=px(13),
         fill=theme.card,
         outline=theme.border,
-        width=2,
+        width=px(1),
+    )
+    _text(draw, (margin + px(14), top + px(379)), tr("Densidad (7 días)"), font=fonts["body_28"], fill=theme.text_muted)
+    spark = (margin + px(14), top + px(405.5), width - margin * 2 - px(28), px(27.5))
+    stamp.slot(
+        draw,
+        "density",
+        None,
+        lambda d, values: _sparkline(d, *spark, theme.accent_2, values),
     )
-    _text(draw, (margin + 28, 852), "Densidad (7 días)", font=fonts["body_28"], fill=theme.text_muted)
-    _sparkline(draw, margin + 28, 905, width - margin * 2 - 56, 55, theme.accent_2)
 
     return im
 
 
 def screen_menu(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     # Base: sesión de fondo
-    base = screen_sesion(width, height, theme, fonts).convert("RGBA")
-    overlay = Image.new("RGBA", (width, height), theme.overlay)
+    with stamp.baked():
+        base = screen_sesion(width, height, theme, fonts).convert("RGBA")
+    panel_w = int(width * 0.78)
+    if motion.element("drawer", (0, 0, panel_w + 1, height), scrim=theme.overlay, opaque=True):
+        return base.convert("RGB")
+    overlay = canvas.new("RGBA", (width, height), theme.overlay)
     base.alpha_composite(overlay)
 
-    draw = ImageDraw.Draw(base)
+    draw = canvas.draw(base)
 
-    panel_w = int(width * 0.78)
-    _rounded_rect(draw, (0, 0, panel_w, height), radius=0, fill=theme.panel, outline=theme.border, width=2)
+    _rounded_rect(draw, (0, 0, panel_w, height), radius=0, fill=theme.panel, outline=theme.border, width=px(1))
 
-    x = 48
-    y = 120
+    x = px(24)
+    y = units.safe_top() + px(13)
     _text(draw, (x, y), "CONZIA", font=fonts["title_48"], fill=theme.text)
-    y += 86
-    _text(draw, (x, y), "Menú", font=fonts["body_28"], fill=theme.text_muted)
-    y += 64
+    y += px(43)
+    _text(draw, (x, y), tr("Menú"), font=fonts["body_28"], fill=theme.text_muted)
+    y += px(32)
 
-    items = ["Mapa", "Caja", "Lecturas", "Integración", "Arquetipos", "Bóveda", "Tests", "Ajustes"]
+    items = [tr("Mapa"), tr("Caja"), tr("Lecturas"), tr("Integración"), tr("Arquetipos"), tr("Bóveda"), tr("Tests"), tr("Ajustes")]
     for it in items:
-        _rounded_rect(draw, (x - 14, y - 10, panel_w - 32, y + 54), radius=18, fill=theme.card, outline=theme.border)
-        _text(draw, (x + 18, y + 4), it, font=fonts["body_32"], fill=theme.text)
-        y += 84
+        item_box = (x - px(7), y - px(5), panel_w - px(16), y + px(27))
+        _rounded_rect(draw, item_box, radius=px(9), fill=theme.card, outline=theme.border, width=px(1))
+        _text(draw, (x + px(9), y + px(2)), it, font=fonts["body_32"], fill=theme.text)
+        y += px(42)
 
     return base.convert("RGB")
 
 
 def screen_espejo_negro(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 56
+    margin = px(28)
+    top = units.safe_top()
 
-    _text(draw, (margin, 110), "Espejo Negro", font=fonts["title_48"], fill=theme.text)
+    _text(draw, (margin, top + px(8)), tr("Espejo Negro"), font=fonts["title_48"], fill=theme.text)
     _text(
         draw,
-        (margin, 190),
-        "Háblame de la última vez que te traicionaste un poco.",
+        (margin, top + px(48)),
+        tr("Háblame de la última vez que te traicionaste un poco."),
         font=fonts["body_32"],
         fill=theme.text_muted,
         max_width=width - margin * 2,
-        line_height=48,
+        line_height=px(24),
     )
 
-    _rounded_rect(draw, (margin, 330, width - margin, 640), radius=30, fill=theme.card, outline=theme.border, width=2)
-    _text(draw, (margin + 28, 360), "00:45", font=fonts["mono_24"], fill=theme.text_muted)
-    _sparkline(draw, margin + 28, 430, width - margin * 2 - 56, 120, theme.accent_2)
+    card = (margin, top + px(118), width - margin, top + px(273))
+    _rounded_rect(draw, card, radius=px(15), fill=theme.card, outline=theme.border, width=px(1))
+    wave_box = (margin + px(14), top + px(168), width - margin * 2 - px(28), px(60))
+
+    def recording(d: ImageDraw.ImageDraw, path: str | None) -> None:
+        # A WAV path shows the real take; without one, the drawn placeholder.
+        if path is None:
+            _text(d, (margin + px(14), top + px(133)), "00:45", font=fonts["mono_24"], fill=theme.text_muted)
+            _sparkline(d, *wave_box, theme.accent_2)
+            return
+        peaks = waveform.draw(d, wave_box, path, theme.border, rms_color=theme.accent_2)
+        label = waveform.duration_label(peaks.duration)
+        _text(d, (margin + px(14), top + px(133)), label, font=fonts["mono_24"], fill=theme.text_muted)
+
+    stamp.slot(draw, "recording", None, recording)
     _text(
         draw,
-        (margin + 28, 575),
-        "Mantén presionado para hablar.",
+        (margin + px(14), top + px(240.5)),
+        tr("Mantén presionado para hablar."),
         font=fonts["body_24"],
         fill=theme.text_muted,
     )
 
     # Record button
-    cx, cy = width // 2, height - 210
-    r = 88
-    draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=theme.accent, outline=theme.border, width=2)
-    draw.ellipse((cx - 32, cy - 32, cx + 32, cy + 32), fill=(255, 255, 255))
-    _text(draw, (margin, height - 92), "Guardar sin lectura · Pedir espejo", font=fonts["body_24"], fill=theme.text_muted)
+    cx, cy = width // 2, height - px(105)
+    r = px(44)
+    if not motion.element("record", (cx - r, cy - r, cx + r + 1, cy + r + 1)):
+        shapes.ellipse(draw, (cx - r, cy - r, cx + r, cy + r), fill=theme.accent, outline=theme.border, width=px(1))
+        shapes.ellipse(draw, (cx - px(16), cy - px(16), cx + px(16), cy + px(16)), fill=(255, 255, 255))
+    _text(draw, (margin, height - px(46)), tr("Guardar sin lectura · Pedir espejo"), font=fonts["body_24"], fill=theme.text_muted)
     return im
 
 
 def screen_caja(width: int, height: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im, draw = _base_canvas(width, height, theme)
-    margin = 56
+    margin = px(28)
+    top = units.safe_top()
+    inner = margin + px(14)
 
-    _text(draw, (margin, 110), "Caja", font=fonts["title_48"], fill=theme.text)
-    _text(draw, (margin, 190), "Evidencia → Patrón → Historia espejo", font=fonts["body_28"], fill=theme.text_muted)
+    _text(draw, (margin, top + px(8)), tr("Caja"), font=fonts["title_48"], fill=theme.text)
+    _text(draw, (margin, top + px(48)), tr("Evidencia → Patrón → Historia espejo"), font=fonts["body_28"], fill=theme.text_muted)
 
     # Evidencia
-    _rounded_rect(draw, (margin, 270, width - margin, 520), radius=30, fill=theme.card, outline=theme.border, width=2)
-    _text(draw, (margin + 28, 300), "Lo que pasó (3 evidencias)", font=fonts["body_28"], fill=theme.text_muted)
+    card = (margin, top + px(88), width - margin, top + px(213))
+    _rounded_rect(draw, card, radius=px(15), fill=theme.card, outline=theme.border, width=px(1))
+    _text(draw, (inner, top + px(103)), tr("Lo que pasó (3 evidencias)"), font=fonts["body_28"], fill=theme.text_muted)
     evidence = [
-        "• Lun 05 · Cediste tu tiempo para evitar tensión.",
-        "• Mié 07 · Pediste perdón por poner un límite.",
-        "• Vie 09 · Callaste para que “todo esté bien”.",
+        tr("• Lun 05 · Cediste tu tiempo para evitar tensión."),
+        tr("• Mié 07 · Pediste perdón por poner un límite."),
+        tr("• Vie 09 · Callaste para que “todo esté bien”."),
     ]
-    y = 346
+    y = top + px(126)
     for e in evidence:
-        _text(draw, (margin + 28, y), e, font=fonts["body_28"], fill=theme.text, max_width=width - margin * 2 - 56)
-        y += 56
+        _text(draw, (inner, y), e, font=fonts["body_28"], fill=theme.text, max_width=width - margin * 2 - px(28))
+        y += px(28)
 
     # Patrón
-    _rounded_rect(draw, (margin, 560, width - margin, 720), radius=30, fill=theme.panel, outline=theme.border, width=2)
-    _text(draw, (margin + 28, 590), "Patrón", font=fonts["body_28"], fill=theme.text_muted)
-    _text(draw, (margin + 28, 628), "Negociación de dignidad", font=fonts["body_36"], fill=theme.text)
+    card = (margin, top + px(233), width - margin, top + px(313))
+    _rounded_rect(draw, card, radius=px(15), fill=theme.panel, outline=theme.border, width=px(1))
+    _text(draw, (inner, top + px(248)), tr("Patrón"), font=fonts["body_28"], fill=theme.text_muted)
+    _text(draw, (inner, top + px(267)), tr("Negociación de dignidad"), font=fonts["body_36"], fill=theme.text)
 
     # Historia espejo
-    _rounded_rect(draw, (margin, 760, width - margin, 1100), radius=30, fill=theme.card, outline=theme.border, width=2)
-    _text(draw, (margin + 28, 790), "Historia espejo", font=fonts["body_28"], fill=theme.text_muted)
+    card = (margin, top + px(333), width - margin, top + px(503))
+    _rounded_rect(draw, card, radius=px(15), fill=theme.card, outline=theme.border, width=px(1))
+    _text(draw, (inner, top + px(348)), tr("Historia espejo"), font=fonts["body_28"], fill=theme.text_muted)
     _text(
         draw,
-        (margin + 28, 840),
-        "Claudia siempre cede un poco para no perder a nadie. "
-        "Se vuelve flexible hasta desaparecer. Luego llama a eso “amor”.",
+        (inner, top + px(373)),
+        tr(
+            "Claudia siempre cede un poco para no perder a nadie. "
+            "Se vuelve flexible hasta desaparecer. Luego llama a eso “amor”."
+        ),
         font=fonts["body_28"],
         fill=theme.text,
-        max_width=width - margin * 2 - 56,
-        line_height=42,
+        max_width=width - margin * 2 - px(28),
+        line_height=px(21),
     )
 
     _button(
         draw,
-        (margin, height - 260, width - margin, height - 170),
-        "RUTA A · ACCIÓN MÍNIMA",
+        (margin, height - px(130), width - margin, height - px(85)),
+        tr("RUTA A · ACCIÓN MÍNIMA"),
         font=fonts["body_28"],
         fill=theme.accent,
         text_color=(255, 255, 255),
     )
     _button(
         draw,
-        (margin, height - 150, width - margin, height - 60),
-        "RUTA B · PREGUNTA PROFUNDA",
+        (margin, height - px(75), width - margin, height - px(30)),
+        tr("RUTA B · PREGUNTA PROFUNDA"),
         font=fonts["body_28"],
         fill=theme.bg,
         text_color=theme.text,
@@ -525,43 +571,39 @@ def screen_caja(width: int, height: int, theme: Theme, fonts: dict[str, ImageFon
     return im
 
 
-def main() -> None:
-    width, height = 780, 1688
-    out_dir = Path(__file__).resolve().parent
-    out_dir.mkdir(parents=True, exist_ok=True)
-
-    fonts = _common_fonts()
-
-    themes = [
-        Theme(
-            key="light",
-            name="Light (Sala silenciosa)",
-            bg=_hex("#EAE6DF"),
-            panel=_hex("#F4F1EB"),
-            card=_hex("#FEFDFC"),
-            border=_hex("#D7CEC3"),
-            text=_hex("#542919"),
-            text_muted=_hex("#7E6F62"),
-            accent=_hex("#7D5C6B"),
-            accent_2=_hex("#A39483"),
-            overlay=(0, 0, 0, 90),
-        ),
-        Theme(
-            key="dark",
-            name="Dark (Claroscuro)",
-            bg=_hex("#2C3E50"),
-            panel=_hex("#243241"),
-            card=_hex("#34495E"),
-            border=_hex("#3E566C"),
-            text=_hex("#FDF6E3"),
-            text_muted=_hex("#B8C1C7"),
-            accent=_hex("#E67E22"),
-            accent_2=_hex("#F1C40F"),
-            overlay=(0, 0, 0, 120),
-        ),
-    ]
-
-    builders = {
+THEMES = {
+    "light": Theme(
+        key="light",
+        name="Light (Sala silenciosa)",
+        bg=_hex("#EAE6DF"),
+        panel=_hex("#F4F1EB"),
+        card=_hex("#FEFDFC"),
+        border=_hex("#D7CEC3"),
+        text=_hex("#542919"),
+        text_muted=_hex("#7E6F62"),
+        accent=_hex("#7D5C6B"),
+        accent_2=_hex("#A39483"),
+        overlay=(0, 0, 0, 90),
+    ),
+    "dark": Theme(
+        key="dark",
+        name="Dark (Claroscuro)",
+        bg=_hex("#2C3E50"),
+        panel=_hex("#243241"),
+        card=_hex("#34495E"),
+        border=_hex("#3E566C"),
+        text=_hex("#FDF6E3"),
+        text_muted=_hex("#B8C1C7"),
+        accent=_hex("#E67E22"),
+        accent_2=_hex("#F1C40F"),
+        overlay=(0, 0, 0, 120),
+    ),
+}
+
+FAMILY = Family(
+    key="mirat",
+    themes=THEMES,
+    screens={
         "onboarding": screen_onboarding,
         "contrato": screen_contrato,
         "acceso": screen_acceso,
@@ -569,15 +611,16 @@ def main() -> None:
         "menu": screen_menu,
         "espejo_negro": screen_espejo_negro,
         "caja": screen_caja,
-    }
+    },
+    fonts=_common_fonts,
+    filename="mirat_{theme}_{screen}.png",
+)
+
 
-    for theme in themes:
-        for key, builder in builders.items():
-            im = builder(width, height, theme, fonts)
-            path = out_dir / f"mirat_{theme.key}_{key}.png"
-            im.save(path, format="PNG", optimize=True)
-            print("wrote", path)
+def main() -> int:
+    # Same as `python -m mockupkit render --family <key>`: the committed default-profile PNGs.
+    return cli.main(["render", "--family", FAMILY.key])
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import math
-import os
 from dataclasses import dataclass
-from pathlib import Path
 
-from PIL import Image, ImageDraw, ImageFilter, ImageFont
+from PIL import Image, ImageDraw, ImageFont
+
+from mockupkit import cache, canvas, cli, quality, shapes, stamp, trace, units
+from mockupkit.fonts import load_font
+from mockupkit.i18n import tr
+from mockupkit.registry import Family
+from mockupkit.units import px
 
 
 @dataclass(frozen=True)
@@ -28,34 +32,25 @@ def _hex(h: str) -> tuple[int, int, int]:
     return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
 
-def _font(path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    if os.path.exists(path):
-        try:
-            return ImageFont.truetype(path, size=size, index=index)
-        except Exception:
-            pass
-    return ImageFont.load_default()
-
-
-def _fonts() -> dict[str, ImageFont.ImageFont]:
+def _fonts(scale: float) -> dict[str, ImageFont.ImageFont]:
     # iOS‑ish typography: Avenir Next + SF Compact (fallbacks)
     avenir_next = "/System/Library/Fonts/Avenir Next.ttc"
     sf = "/System/Library/Fonts/SFNS.ttf"
     sf_compact = "/System/Library/Fonts/SFCompact.ttf"
 
     return {
-        "h1": _font(avenir_next, 56, index=0),
-        "h2": _font(avenir_next, 44, index=0),
-        "h3": _font(avenir_next, 34, index=0),
-        "b1": _font(sf_compact, 30, index=0),
-        "b2": _font(sf, 26, index=0),
-        "b3": _font(sf, 22, index=0),
-        "cap": _font(sf, 20, index=0),
+        "h1": load_font(avenir_next, px(28, scale), index=0),
+        "h2": load_font(avenir_next, px(22, scale), index=0),
+        "h3": load_font(avenir_next, px(17, scale), index=0),
+        "b1": load_font(sf_compact, px(15, scale), index=0),
+        "b2": load_font(sf, px(13, scale), index=0),
+        "b3": load_font(sf, px(11, scale), index=0),
+        "cap": load_font(sf, px(10, scale), index=0),
     }
 
 
 def _rounded_rect(draw: ImageDraw.ImageDraw, box: tuple[int, int, int, int], r: int, fill=None, outline=None, w: int = 2) -> None:
-    draw.rounded_rectangle(box, radius=r, fill=fill, outline=outline, width=w)
+    shapes.rounded_rectangle(draw, box, radius=r, fill=fill, outline=outline, width=w)
 
 
 def _text(draw: ImageDraw.ImageDraw, xy: tuple[int, int], s: str, font: ImageFont.ImageFont, fill) -> tuple[int, int, int, int]:
@@ -65,27 +60,10 @@ def _text(draw: ImageDraw.ImageDraw, xy: tuple[int, int], s: str, font: ImageFon
 
 
 def _wrap(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_w: int) -> list[str]:
-    words = text.split()
-    lines: list[str] = []
-    current: list[str] = []
-
-    def width(s: str) -> int:
-        b = draw.textbbox((0, 0), s, font=font)
-        return b[2] - b[0]
-
-    for w in words:
-        trial = " ".join([*current, w]).strip()
-        if width(trial) <= max_w:
-            current.append(w)
-        else:
-            if current:
-                lines.append(" ".join(current))
-            current = [w]
-    if current:
-        lines.append(" ".join(current))
-    return lines
+    return list(cache.wrap(font, text, max_w))
 
 
+@trace.span
 def _paragraph(
     draw: ImageDraw.ImageDraw,
     x: int,
@@ -96,12 +74,14 @@ def _paragraph(
     max_w: int,
     lh: int,
 ) -> int:
-    for line in _wrap(draw, text, font, max_w):
-        draw.text((x, y), line, font=font, fill=fill)
-        y += lh
-    return y
+    lines = _wrap(draw, text, font, max_w)
+    for i, line in enumerate(lines):
+        draw.text((x, y + i * lh), line, font=font, fill=fill)
+    canvas.wrapped(draw, (x, y), lines, font, max_w, lh)
+    return y + len(lines) * lh
 
 
+@trace.span
 def _linear_gradient(w: int, h: int, top: tuple[int, int, int], bottom: tuple[int, int, int]) -> Image.Image:
     im = Image.new("RGB", (w, h), top)
     px = im.load()
@@ -115,8 +95,12 @@ def _linear_gradient(w: int, h: int, top: tuple[int, int, int], bottom: tuple[in
     return im
 
 
+@cache.images("background")
+@trace.span
 def _scene(w: int, h: int, theme: Theme) -> Image.Image:
     # Simple “photo‑like” scene (sky + mountains + haze) to avoid web‑flat UI.
+    if canvas.measuring():
+        return canvas.new("RGBA", (w, h))
     base = _linear_gradient(w, h, theme.bg_top, theme.bg_bottom).convert("RGBA")
     draw = ImageDraw.Draw(base)
 
@@ -147,7 +131,7 @@ def _scene(w: int, h: int, theme: Theme) -> Image.Image:
     haze = Image.new("RGBA", (w, h), (255, 255, 255, 0))
     haze_draw = ImageDraw.Draw(haze)
     haze_draw.rectangle((0, int(h * 0.48), w, h), fill=(255, 255, 255, 28))
-    haze = haze.filter(ImageFilter.GaussianBlur(10))
+    haze = quality.blur(haze, 5 * units.scale())
     base.alpha_composite(haze)
 
     # Vignette
@@ -158,51 +142,68 @@ def _scene(w: int, h: int, theme: Theme) -> Image.Image:
     # Edge darkening via alpha mask rings
     for i in range(16):
         a = int(10 + i * 6)
-        inset = int(i * 18)
-        vdraw.rounded_rectangle((inset, inset, w - inset, h - inset), radius=80, outline=(0, 0, 0, a), width=4)
-    vignette = vignette.filter(ImageFilter.GaussianBlur(18))
+        inset = px(i * 9)
+        vdraw.rounded_rectangle((inset, inset, w - inset, h - inset), radius=px(40), outline=(0, 0, 0, a), width=px(2))
+    vignette = quality.blur(vignette, 9 * units.scale())
     base.alpha_composite(vignette)
 
     return base
 
 
-def _sheet(im: Image.Image, theme: Theme, top_y: int, radius: int = 44) -> tuple[Image.Image, ImageDraw.ImageDraw]:
-    w, h = im.size
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    _rounded_rect(draw, (24, top_y, w - 24, h - 24), r=radius, fill=theme.sheet, outline=theme.sheet_border, w=2)
+@trace.span
+def _sheet(im: Image.Image, theme: Theme, top_y: int, radius: float = 22) -> tuple[Image.Image, ImageDraw.ImageDraw]:
+    im.alpha_composite(_sheet_layer(im.size, theme, top_y, px(radius)))
+    return im, canvas.draw(im)
+
+
+@cache.images("sprite", copy=False)
+@trace.span
+def _sheet_layer(size: tuple[int, int], theme: Theme, top_y: int, radius: int) -> Image.Image:
+    w, h = size
+    overlay = canvas.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = canvas.draw(overlay)
+    _rounded_rect(draw, (px(12), top_y, w - px(12), h - px(12)), r=radius, fill=theme.sheet, outline=theme.sheet_border, w=px(1))
 
     # Handle
-    hx1 = w // 2 - 60
-    hx2 = w // 2 + 60
-    hy = top_y + 22
-    _rounded_rect(draw, (hx1, hy, hx2, hy + 10), r=999, fill=(255, 255, 255, 70), outline=None, w=0)
+    hx1 = w // 2 - px(30)
+    hx2 = w // 2 + px(30)
+    hy = top_y + px(11)
+    _rounded_rect(draw, (hx1, hy, hx2, hy + px(5)), r=999, fill=(255, 255, 255, 70), outline=None, w=0)
 
-    im.alpha_composite(overlay)
-    return im, ImageDraw.Draw(im)
+    return overlay
 
 
+@trace.span
 def _status_bar(draw: ImageDraw.ImageDraw, w: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> None:
     # Minimal, not literal
-    _text(draw, (46, 34), "9:41", font=fonts["cap"], fill=theme.text)
+    _text(draw, (px(23), px(17)), "9:41", font=fonts["cap"], fill=theme.text)
     # Right icons (fake)
-    bx = w - 180
-    by = 36
-    draw.rounded_rectangle((bx, by, bx + 54, by + 26), radius=6, outline=theme.text, width=2)
-    draw.rectangle((bx + 56, by + 7, bx + 60, by + 19), fill=theme.text)
+    bx = w - px(90)
+    by = px(18)
+    shapes.rounded_rectangle(draw, (bx, by, bx + px(27), by + px(13)), radius=px(3), outline=theme.text, width=px(1))
+    draw.rectangle((bx + px(28), by + px(3.5), bx + px(30), by + px(9.5)), fill=theme.text)
     # wifi + signal
-    draw.arc((w - 108, 34, w - 56, 82), start=200, end=340, fill=theme.text, width=3)
-    draw.arc((w - 102, 40, w - 62, 80), start=205, end=335, fill=theme.text, width=3)
-    draw.ellipse((w - 82, 62, w - 76, 68), fill=theme.text)
+    shapes.arc(draw, (w - px(54), px(17), w - px(28), px(41)), start=200, end=340, fill=theme.text, width=px(1.5))
+    shapes.arc(draw, (w - px(51), px(20), w - px(31), px(40)), start=205, end=335, fill=theme.text, width=px(1.5))
+    shapes.ellipse(draw, (w - px(41), px(31), w - px(38), px(34)), fill=theme.text)
 
 
+@trace.span
 def _nav_bar(im: Image.Image, theme: Theme, active: str) -> None:
-    w, h = im.size
-    nav_h = 130
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    im.alpha_composite(_nav_bar_layer(im.size, theme, active))
+
 
-    _rounded_rect(draw, (24, h - nav_h - 24, w - 24, h - 24), r=42, fill=theme.nav_bg, outline=theme.sheet_border, w=2)
+@cache.images("sprite", copy=False)
+@trace.span
+def _nav_bar_layer(size: tuple[int, int], theme: Theme, active: str) -> Image.Image:
+    w, h = size
+    nav_h = px(65)
+    overlay = canvas.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = canvas.draw(overlay)
+
+    _rounded_rect(
+        draw, (px(12), h - nav_h - px(12), w - px(12), h - px(12)), r=px(21), fill=theme.nav_bg, outline=theme.sheet_border, w=px(1)
+    )
 
     slots = ["sesion", "mapa", "caja", "boveda", "perfil"]
     labels = {
@@ -212,8 +213,9 @@ def _nav_bar(im: Image.Image, theme: Theme, active: str) -> None:
         "boveda": "Bóveda",
         "perfil": "Yo",
     }
-    cx = [int((w - 48) * (i + 0.5) / 5) + 24 for i in range(5)]
-    cy = h - nav_h - 24 + 54
+    cx = [int((w - px(24)) * (i + 0.5) / 5) + px(12) for i in range(5)]
+    cy = h - nav_h - px(12) + px(27)
+    lw = px(1.5)
 
     def icon_color(key: str) -> tuple[int, int, int]:
         return theme.nav_icon_active if key == active else theme.nav_icon
@@ -224,90 +226,96 @@ def _nav_bar(im: Image.Image, theme: Theme, active: str) -> None:
         y = cy
         # icons: simple line drawings
         if key == "sesion":  # home
-            draw.polygon([(x - 22, y + 10), (x, y - 16), (x + 22, y + 10)], outline=col, fill=None)
-            draw.rectangle((x - 16, y + 10, x + 16, y + 32), outline=col, width=3)
+            shapes.polygon(draw, [(x - px(11), y + px(5)), (x, y - px(8)), (x + px(11), y + px(5))], outline=col, fill=None)
+            draw.rectangle((x - px(8), y + px(5), x + px(8), y + px(16)), outline=col, width=lw)
         elif key == "mapa":  # pin
-            draw.ellipse((x - 16, y - 16, x + 16, y + 16), outline=col, width=3)
-            draw.polygon([(x, y + 38), (x - 10, y + 8), (x + 10, y + 8)], outline=col)
-            draw.ellipse((x - 4, y - 4, x + 4, y + 4), fill=col)
+            shapes.ellipse(draw, (x - px(8), y - px(8), x + px(8), y + px(8)), outline=col, width=lw)
+            shapes.polygon(draw, [(x, y + px(19)), (x - px(5), y + px(4)), (x + px(5), y + px(4))], outline=col)
+            shapes.ellipse(draw, (x - px(2), y - px(2), x + px(2), y + px(2)), fill=col)
         elif key == "caja":  # box
-            draw.rounded_rectangle((x - 18, y - 12, x + 18, y + 26), radius=8, outline=col, width=3)
-            draw.line((x - 18, y + 2, x + 18, y + 2), fill=col, width=3)
+            shapes.rounded_rectangle(draw, (x - px(9), y - px(6), x + px(9), y + px(13)), radius=px(4), outline=col, width=lw)
+            draw.line((x - px(9), y + px(1), x + px(9), y + px(1)), fill=col, width=lw)
         elif key == "boveda":  # lock
-            draw.rounded_rectangle((x - 18, y - 2, x + 18, y + 28), radius=10, outline=col, width=3)
-            draw.arc((x - 16, y - 26, x + 16, y + 6), start=200, end=-20, fill=col, width=3)
-            draw.ellipse((x - 3, y + 10, x + 3, y + 16), fill=col)
+            shapes.rounded_rectangle(draw, (x - px(9), y - px(1), x + px(9), y + px(14)), radius=px(5), outline=col, width=lw)
+            shapes.arc(draw, (x - px(8), y - px(13), x + px(8), y + px(3)), start=200, end=-20, fill=col, width=lw)
+            shapes.ellipse(draw, (x - px(1.5), y + px(5), x + px(1.5), y + px(8)), fill=col)
         elif key == "perfil":  # user
-            draw.ellipse((x - 14, y - 16, x + 14, y + 12), outline=col, width=3)
-            draw.arc((x - 22, y + 6, x + 22, y + 46), start=200, end=-20, fill=col, width=3)
+            shapes.ellipse(draw, (x - px(7), y - px(8), x + px(7), y + px(6)), outline=col, width=lw)
+            shapes.arc(draw, (x - px(11), y + px(3), x + px(11), y + px(23)), start=200, end=-20, fill=col, width=lw)
 
         # active dot
         if key == active:
-            draw.ellipse((x - 5, y + 54, x + 5, y + 64), fill=theme.accent)
+            shapes.ellipse(draw, (x - px(2.5), y + px(27), x + px(2.5), y + px(32)), fill=theme.accent)
 
-    im.alpha_composite(overlay)
+    return overlay
 
 
+@trace.span
 def _primary_button(draw: ImageDraw.ImageDraw, box: tuple[int, int, int, int], theme: Theme, text: str, font: ImageFont.ImageFont) -> None:
-    _rounded_rect(draw, box, r=26, fill=theme.accent + (255,), outline=None, w=0)
-    b = draw.textbbox((0, 0), text, font=font)
+    _rounded_rect(draw, box, r=px(13), fill=theme.accent + (255,), outline=None, w=0)
+    b = cache.text_bbox(font, text)
     tw = b[2] - b[0]
     th = b[3] - b[1]
     x1, y1, x2, y2 = box
-    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - 2), text, font=font, fill=theme.accent_text)
+    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - px(1)), text, font=font, fill=theme.accent_text)
 
 
+@trace.span
 def _field(draw: ImageDraw.ImageDraw, x: int, y: int, w: int, label: str, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> None:
-    _rounded_rect(draw, (x, y, x + w, y + 92), r=22, fill=(255, 255, 255, 35), outline=(255, 255, 255, 55), w=2)
-    draw.text((x + 22, y + 28), label, font=fonts["b2"], fill=theme.text_muted)
+    _rounded_rect(draw, (x, y, x + w, y + px(46)), r=px(11), fill=(255, 255, 255, 35), outline=(255, 255, 255, 55), w=px(1))
+    draw.text((x + px(11), y + px(14)), label, font=fonts["b2"], fill=theme.text_muted)
 
 
 def screen_onboarding(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im = _scene(w, h, theme)
-    draw = ImageDraw.Draw(im)
+    draw = canvas.draw(im)
     _status_bar(draw, w, theme, fonts)
 
     # Hero title (top-left, like reference)
-    draw.text((56, 220), "CONZIA", font=fonts["h1"], fill=theme.text)
+    top = units.safe_top()
+    draw.text((px(28), top + px(63)), "CONZIA", font=fonts["h1"], fill=theme.text)
     _paragraph(
         draw,
-        56,
-        292,
-        "Ver claro.",
+        px(28),
+        top + px(99),
+        tr("Ver claro."),
         font=fonts["b1"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=40,
+        max_w=w - px(56),
+        lh=px(20),
     )
 
     # Bottom sheet
     im, draw = _sheet(im, theme, top_y=int(h * 0.58))
-    sx = 56
-    sy = int(h * 0.58) + 60
-    draw.text((sx, sy), "INFORMACIÓN", font=fonts["cap"], fill=theme.text_muted)
-    sy += 42
-    draw.text((sx, sy), "Esto es una sala privada.", font=fonts["h3"], fill=theme.text)
-    sy += 54
+    sx = px(28)
+    sy = int(h * 0.58) + px(30)
+    draw.text((sx, sy), tr("INFORMACIÓN"), font=fonts["cap"], fill=theme.text_muted)
+    sy += px(21)
+    draw.text((sx, sy), tr("Esto es una sala privada."), font=fonts["h3"], fill=theme.text)
+    sy += px(27)
     sy = _paragraph(
         draw,
         sx,
         sy,
-        "Una pregunta por vez. Tú decides cuándo pedir lectura. "
-        "La Bóveda está fuera del sistema.",
+        tr(
+            "Una pregunta por vez. Tú decides cuándo pedir lectura. "
+            "La Bóveda está fuera del sistema."
+        ),
         font=fonts["b2"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=38,
+        max_w=w - px(56),
+        lh=px(19),
     )
 
     # Small meta row
-    meta_y = int(h * 0.58) + 60
-    meta_x = w - 56 - 160
-    draw.ellipse((meta_x, meta_y, meta_x + 44, meta_y + 44), outline=(255, 255, 255, 60), width=2)
-    draw.text((meta_x + 58, meta_y + 8), "Local", font=fonts["b3"], fill=theme.text)
+    meta_y = int(h * 0.58) + px(30)
+    meta_x = w - px(28) - px(80)
+    shapes.ellipse(draw, (meta_x, meta_y, meta_x + px(22), meta_y + px(22)), outline=(255, 255, 255, 60), width=px(1))
+    draw.text((meta_x + px(29), meta_y + px(4)), tr("Local"), font=fonts["b3"], fill=theme.text)
 
     # CTA
-    _primary_button(draw, (56, h - 210, w - 56, h - 132), theme, "ENTRAR", fonts["b1"])
+    bottom = h - units.safe_bottom()
+    _primary_button(draw, (px(28), bottom - px(71), w - px(28), bottom - px(32)), theme, tr("ENTRAR"), fonts["b1"])
 
     # Bottom nav hidden on onboarding (keep clean)
     return im.convert("RGB")
@@ -315,103 +323,109 @@ def screen_onboarding(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.I
 
 def screen_login(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
     im = _scene(w, h, theme)
-    draw = ImageDraw.Draw(im)
+    draw = canvas.draw(im)
     _status_bar(draw, w, theme, fonts)
 
-    draw.text((56, 180), "Acceso", font=fonts["h2"], fill=theme.text)
+    top = units.safe_top()
+    draw.text((px(28), top + px(43)), tr("Acceso"), font=fonts["h2"], fill=theme.text)
     _paragraph(
         draw,
-        56,
-        250,
-        "Puedes entrar sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in).",
+        px(28),
+        top + px(78),
+        tr("Puedes entrar sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in)."),
         font=fonts["b2"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=38,
+        max_w=w - px(56),
+        lh=px(19),
     )
 
     im, draw = _sheet(im, theme, top_y=int(h * 0.40))
-    x = 56
-    y = int(h * 0.40) + 70
-    _field(draw, x, y, w - 112, "Correo", theme, fonts)
-    y += 118
-    _field(draw, x, y, w - 112, "Contraseña", theme, fonts)
-    y += 138
-    _primary_button(draw, (56, y, w - 56, y + 86), theme, "CONTINUAR", fonts["b1"])
-    y += 106
-    _rounded_rect(draw, (56, y, w - 56, y + 86), r=26, fill=(0, 0, 0, 0), outline=(255, 255, 255, 60), w=2)
-    b = draw.textbbox((0, 0), "ENTRAR SIN CUENTA", font=fonts["b1"])
+    x = px(28)
+    y = int(h * 0.40) + px(35)
+    _field(draw, x, y, w - px(56), tr("Correo"), theme, fonts)
+    y += px(59)
+    _field(draw, x, y, w - px(56), tr("Contraseña"), theme, fonts)
+    y += px(69)
+    _primary_button(draw, (px(28), y, w - px(28), y + px(43)), theme, tr("CONTINUAR"), fonts["b1"])
+    y += px(53)
+    _rounded_rect(draw, (px(28), y, w - px(28), y + px(43)), r=px(13), fill=(0, 0, 0, 0), outline=(255, 255, 255, 60), w=px(1))
+    label = tr("ENTRAR SIN CUENTA")
+    b = cache.text_bbox(fonts["b1"], label)
     tw = b[2] - b[0]
     th = b[3] - b[1]
-    draw.text(((w - tw) // 2, y + (86 - th) // 2 - 2), "ENTRAR SIN CUENTA", font=fonts["b1"], fill=theme.text)
+    draw.text(((w - tw) // 2, y + (px(43) - th) // 2 - px(1)), label, font=fonts["b1"], fill=theme.text)
 
     return im.convert("RGB")
 
 
 def screen_dashboard(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
-    im = _scene(w, h, theme).filter(ImageFilter.GaussianBlur(0.6))
-    draw = ImageDraw.Draw(im)
+    im = quality.blur(_scene(w, h, theme), 0.3 * units.scale())
+    draw = canvas.draw(im)
     _status_bar(draw, w, theme, fonts)
 
     # Top content stays minimal (native, not header + tabs)
-    draw.text((56, 170), "Hola, [Nombre].", font=fonts["h2"], fill=theme.text)
+    top = units.safe_top()
+    hello = tr("Hola, [Nombre].")
+    name_tag = tr("[Nombre]")
+    stamp.slot(
+        draw,
+        "name",
+        name_tag,
+        lambda d, name: d.text((px(28), top + px(38)), hello.replace(name_tag, name), font=fonts["h2"], fill=theme.text),
+    )
     _paragraph(
         draw,
-        56,
-        240,
-        "Hoy: nombra el hecho sin adornarlo.",
+        px(28),
+        top + px(73),
+        tr("Hoy: nombra el hecho sin adornarlo."),
         font=fonts["b2"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=38,
+        max_w=w - px(56),
+        lh=px(19),
     )
 
     # Bottom sheet contains the session card
     sheet_top = int(h * 0.46)
     im, draw = _sheet(im, theme, top_y=sheet_top)
 
-    x = 56
-    y = sheet_top + 58
-    draw.text((x, y), "TU PRÓXIMO PASO", font=fonts["cap"], fill=theme.text_muted)
-    y += 44
-    draw.text((x, y), "Habla 60s.", font=fonts["h3"], fill=theme.text)
-    y += 54
-    y = _paragraph(
+    x = px(28)
+    y = sheet_top + px(29)
+    draw.text((x, y), tr("TU PRÓXIMO PASO"), font=fonts["cap"], fill=theme.text_muted)
+    y += px(22)
+    draw.text((x, y), tr("Habla 60s."), font=fonts["h3"], fill=theme.text)
+    y += px(27)
+    # The prompt's line count moves the button and pills, so it keys templates.
+    y = stamp.slot(
         draw,
-        x,
-        y,
-        "“¿Dónde cediste hoy para evitar incomodidad?”",
-        font=fonts["b1"],
-        fill=theme.text,
-        max_w=w - 112,
-        lh=42,
+        "prompt",
+        tr("“¿Dónde cediste hoy para evitar incomodidad?”"),
+        lambda d, prompt, y=y: _paragraph(
+            d, x, y, prompt, font=fonts["b1"], fill=theme.text, max_w=w - px(56), lh=px(21)
+        ),
+        layout=True,
     )
-    y += 26
-    _primary_button(draw, (56, y, w - 56, y + 92), theme, "HABLAR", fonts["b1"])
-    y += 120
+    y += px(13)
+    _primary_button(draw, (px(28), y, w - px(28), y + px(46)), theme, tr("HABLAR"), fonts["b1"])
+    y += px(60)
 
     # Secondary actions as pills (not a dashboard grid)
     pill_bg = (255, 255, 255, 28)
     pill_border = (255, 255, 255, 50)
-    _rounded_rect(draw, (56, y, 246, y + 64), r=999, fill=pill_bg, outline=pill_border, w=2)
-    draw.text((88, y + 18), "Mapa", font=fonts["b2"], fill=theme.text)
-    _rounded_rect(draw, (270, y, 492, y + 64), r=999, fill=pill_bg, outline=pill_border, w=2)
-    draw.text((302, y + 18), "Bóveda", font=fonts["b2"], fill=theme.text)
-    _rounded_rect(draw, (516, y, w - 56, y + 64), r=999, fill=pill_bg, outline=pill_border, w=2)
-    draw.text((548, y + 18), "Refugio", font=fonts["b2"], fill=theme.text)
+    pill_h = px(32)
+    _rounded_rect(draw, (px(28), y, px(123), y + pill_h), r=999, fill=pill_bg, outline=pill_border, w=px(1))
+    draw.text((px(44), y + px(9)), tr("Mapa"), font=fonts["b2"], fill=theme.text)
+    _rounded_rect(draw, (px(135), y, px(246), y + pill_h), r=999, fill=pill_bg, outline=pill_border, w=px(1))
+    draw.text((px(151), y + px(9)), tr("Bóveda"), font=fonts["b2"], fill=theme.text)
+    _rounded_rect(draw, (px(258), y, w - px(28), y + pill_h), r=999, fill=pill_bg, outline=pill_border, w=px(1))
+    draw.text((px(274), y + px(9)), tr("Refugio"), font=fonts["b2"], fill=theme.text)
 
     # Bottom nav (native)
     _nav_bar(im, theme, active="sesion")
     return im.convert("RGB")
 
 
-def main() -> None:
-    w, h = 780, 1688  # iPhone 14-ish @2x (390x844)
-    out_dir = Path(__file__).resolve().parent
-    out_dir.mkdir(parents=True, exist_ok=True)
-    fonts = _fonts()
-
-    theme = Theme(
+THEMES = {
+    "default": Theme(
         bg_top=_hex("#B7E2FF"),
         bg_bottom=_hex("#1B2C42"),
         sheet=(10, 18, 32, 215),  # deep navy, semi‑transparent
@@ -423,20 +437,26 @@ def main() -> None:
         nav_bg=(10, 18, 32, 200),
         nav_icon=_hex("#B9C6D3"),
         nav_icon_active=_hex("#F4F7FB"),
-    )
+    ),
+}
+
+FAMILY = Family(
+    key="native",
+    themes=THEMES,
+    screens={
+        "onboarding": screen_onboarding,
+        "login": screen_login,
+        "dashboard": screen_dashboard,
+    },
+    fonts=_fonts,
+    filename="mirat_{screen}_native.png",
+)
 
-    screens = {
-        "onboarding_native": screen_onboarding,
-        "login_native": screen_login,
-        "dashboard_native": screen_dashboard,
-    }
 
-    for key, builder in screens.items():
-        im = builder(w, h, theme, fonts)
-        path = out_dir / f"mirat_{key}.png"
-        im.save(path, format="PNG", optimize=True)
-        print("wrote", path)
+def main() -> int:
+    # Same as `python -m mockupkit render --family <key>`: the committed default-profile PNGs.
+    return cli.main(["render", "--family", FAMILY.key])
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
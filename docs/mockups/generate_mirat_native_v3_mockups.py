@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 import math
-import os
 import random
 from dataclasses import dataclass
-from pathlib import Path
 
-from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+import numpy as np
+from PIL import Image, ImageChops, ImageDraw, ImageFont
+
+from mockupkit import cache, canvas, cli, motion, quality, shapes, stamp, tiles, trace, units
+from mockupkit.fonts import load_font
+from mockupkit.i18n import tr
+from mockupkit.registry import Family
+from mockupkit.units import px
 
 
 @dataclass(frozen=True)
@@ -26,69 +31,42 @@ def _hex(h: str) -> tuple[int, int, int]:
     return (int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
 
 
-def _font(path: str, size: int, index: int = 0) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
-    if os.path.exists(path):
-        try:
-            return ImageFont.truetype(path, size=size, index=index)
-        except Exception:
-            pass
-    return ImageFont.load_default()
-
-
-def _fonts() -> dict[str, ImageFont.ImageFont]:
+def _fonts(scale: float) -> dict[str, ImageFont.ImageFont]:
     avenir_next = "/System/Library/Fonts/Avenir Next.ttc"
     sf = "/System/Library/Fonts/SFNS.ttf"
     sf_compact = "/System/Library/Fonts/SFCompact.ttf"
     return {
-        "title": _font(avenir_next, 62, index=0),
-        "title2": _font(avenir_next, 48, index=0),
-        "h": _font(avenir_next, 38, index=0),
-        "b": _font(sf_compact, 28, index=0),
-        "b2": _font(sf, 24, index=0),
-        "cap": _font(sf, 20, index=0),
-        "cap2": _font(sf, 18, index=0),
+        "title": load_font(avenir_next, px(31, scale), index=0),
+        "title2": load_font(avenir_next, px(24, scale), index=0),
+        "h": load_font(avenir_next, px(19, scale), index=0),
+        "b": load_font(sf_compact, px(14, scale), index=0),
+        "b2": load_font(sf, px(12, scale), index=0),
+        "cap": load_font(sf, px(10, scale), index=0),
+        "cap2": load_font(sf, px(9, scale), index=0),
     }
 
 
 def _rounded(draw: ImageDraw.ImageDraw, box: tuple[int, int, int, int], r: int, fill=None, outline=None, w: int = 2) -> None:
-    draw.rounded_rectangle(box, radius=r, fill=fill, outline=outline, width=w)
+    shapes.rounded_rectangle(draw, box, radius=r, fill=fill, outline=outline, width=w)
 
 
+@trace.span
 def _status_bar(draw: ImageDraw.ImageDraw, w: int, fonts: dict[str, ImageFont.ImageFont], color: tuple[int, int, int]) -> None:
-    draw.text((46, 34), "9:41", font=fonts["cap"], fill=color)
-    bx = w - 180
-    by = 36
-    draw.rounded_rectangle((bx, by, bx + 54, by + 26), radius=6, outline=color, width=2)
-    draw.rectangle((bx + 56, by + 7, bx + 60, by + 19), fill=color)
-    draw.arc((w - 108, 34, w - 56, 82), start=200, end=340, fill=color, width=3)
-    draw.arc((w - 102, 40, w - 62, 80), start=205, end=335, fill=color, width=3)
-    draw.ellipse((w - 82, 62, w - 76, 68), fill=color)
+    draw.text((px(23), px(17)), "9:41", font=fonts["cap"], fill=color)
+    bx = w - px(90)
+    by = px(18)
+    shapes.rounded_rectangle(draw, (bx, by, bx + px(27), by + px(13)), radius=px(3), outline=color, width=px(1))
+    draw.rectangle((bx + px(28), by + px(3.5), bx + px(30), by + px(9.5)), fill=color)
+    shapes.arc(draw, (w - px(54), px(17), w - px(28), px(41)), start=200, end=340, fill=color, width=px(1.5))
+    shapes.arc(draw, (w - px(51), px(20), w - px(31), px(40)), start=205, end=335, fill=color, width=px(1.5))
+    shapes.ellipse(draw, (w - px(41), px(31), w - px(38), px(34)), fill=color)
 
 
 def _wrap(draw: ImageDraw.ImageDraw, text: str, font: ImageFont.ImageFont, max_w: int) -> list[str]:
-    words = text.split()
-    lines: list[str] = []
-    current: list[str] = []
-
-    def width(s: str) -> int:
-        b = draw.textbbox((0, 0), s, font=font)
-        return b[2] - b[0]
-
-    for w in words:
-        trial = " ".join([*current, w]).strip()
-        if not trial:
-            continue
-        if width(trial) <= max_w:
-            current.append(w)
-            continue
-        if current:
-            lines.append(" ".join(current))
-        current = [w]
-    if current:
-        lines.append(" ".join(current))
-    return lines
+    return list(cache.wrap(font, text, max_w))
 
 
+@trace.span
 def _paragraph(
     draw: ImageDraw.ImageDraw,
     x: int,
@@ -99,77 +77,109 @@ def _paragraph(
     max_w: int,
     lh: int,
 ) -> int:
-    for line in _wrap(draw, text, font, max_w):
-        draw.text((x, y), line, font=font, fill=fill)
-        y += lh
-    return y
+    lines = _wrap(draw, text, font, max_w)
+    for i, line in enumerate(lines):
+        draw.text((x, y + i * lh), line, font=font, fill=fill)
+    canvas.wrapped(draw, (x, y), lines, font, max_w, lh)
+    return y + len(lines) * lh
 
 
-def _noise_layer(size: tuple[int, int], amount: int, blur: float) -> Image.Image:
-    w, h = size
-    noise = Image.effect_noise((w, h), amount).convert("L")
-    noise = noise.filter(ImageFilter.GaussianBlur(blur))
-    return noise
+_NOISE_BLOCK = 256
 
 
-def _radial_light(size: tuple[int, int], center: tuple[int, int], radius: int, color: tuple[int, int, int, int]) -> Image.Image:
-    w, h = size
-    layer = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+@trace.span
+def _noise(w: int, ya: int, yb: int, amount: float, key: tuple[int, ...]) -> Image.Image:
+    # Generated in fixed row blocks seeded by their index, so any band gets the
+    # same rows the full frame would, and the result doesn't depend on what ran before.
+    b0 = ya // _NOISE_BLOCK
+    b1 = (yb - 1) // _NOISE_BLOCK + 1
+    blocks = [
+        np.random.default_rng((*key, w, b)).standard_normal((_NOISE_BLOCK, w), dtype=np.float32)
+        for b in range(b0, b1)
+    ]
+    rows = np.concatenate(blocks)[ya - b0 * _NOISE_BLOCK : yb - b0 * _NOISE_BLOCK] * amount + 128
+    return Image.fromarray(np.clip(rows, 0, 255).astype(np.uint8), "L")
+
+
+@trace.span
+def _noise_layer(w: int, ya: int, yb: int, amount: int, blur: float, key: tuple[int, ...]) -> Image.Image:
+    return quality.blur(_noise(w, ya, yb, amount, key), blur)
+
+
+def _contrast(im: Image.Image, factor: float) -> Image.Image:
+    # ImageEnhance.Contrast pivots on the image mean, which differs per band;
+    # the noise is centered on 128, so pivot there.
+    return tiles.point(im, [max(0, min(255, int(128 + factor * (v - 128)))) for v in range(256)])
+
+
+def _ramp(im: Image.Image, top: int) -> Image.Image:
+    return tiles.point(im, [int((v / 255) * top) for v in range(256)])
+
+
+def _tint(alpha: Image.Image, color: tuple[int, int, int]) -> Image.Image:
+    layer = Image.new("RGBA", alpha.size, color + (0,))
+    layer.putalpha(alpha)
+    return layer
+
+
+def _reach(h: int, y0: int, y1: int, blur: float) -> tuple[int, int]:
+    # Rows a blurred layer needs around the band so its edges match the full frame.
+    pad = math.ceil(3 * blur) + 2
+    return max(0, y0 - pad), min(h, y1 + pad)
+
+
+@trace.span
+def _radial_light(
+    w: int, ya: int, yb: int, center: tuple[int, int], radius: int, color: tuple[int, int, int, int]
+) -> Image.Image:
+    layer = Image.new("RGBA", (w, yb - ya), (0, 0, 0, 0))
     draw = ImageDraw.Draw(layer)
-    cx, cy = center
+    cx, cy = center[0], center[1] - ya
     for i in range(12):
         t = i / 11
         r = int(radius * (1 - t))
         a = int(color[3] * (1 - t) ** 2)
         draw.ellipse((cx - r, cy - r, cx + r, cy + r), fill=(color[0], color[1], color[2], a))
-    return layer.filter(ImageFilter.GaussianBlur(28))
+    return quality.blur(layer, 14 * units.scale())
 
 
-def _photo_background(w: int, h: int, seed: int = 7) -> Image.Image:
-    random.seed(seed)
-    base = Image.new("RGB", (w, h), (10, 16, 26))
-    draw = ImageDraw.Draw(base)
-
-    # Sky gradient
-    top = _hex("#B9E6FF")
-    mid = _hex("#7FB7D9")
-    bot = _hex("#23374B")
-    for y in range(h):
-        t = y / max(1, h - 1)
-        if t < 0.55:
-            tt = t / 0.55
-            r = int(top[0] * (1 - tt) + mid[0] * tt)
-            g = int(top[1] * (1 - tt) + mid[1] * tt)
-            b = int(top[2] * (1 - tt) + mid[2] * tt)
-        else:
-            tt = (t - 0.55) / 0.45
-            r = int(mid[0] * (1 - tt) + bot[0] * tt)
-            g = int(mid[1] * (1 - tt) + bot[1] * tt)
-            b = int(mid[2] * (1 - tt) + bot[2] * tt)
-        draw.line((0, y, w, y), fill=(r, g, b))
-
-    im = base.convert("RGBA")
+@trace.span
+def _sky_rows(w: int, h: int, y0: int, y1: int) -> Image.Image:
+    # Three-stop vertical gradient, bending at 55% of the frame.
+    top = np.array(_hex("#B9E6FF"), dtype=np.float64)
+    mid = np.array(_hex("#7FB7D9"), dtype=np.float64)
+    bot = np.array(_hex("#23374B"), dtype=np.float64)
+    t = (np.arange(y0, y1, dtype=np.float64) / max(1, h - 1))[:, None]
+    upper = top * (1 - t / 0.55) + mid * (t / 0.55)
+    lower = mid * (1 - (t - 0.55) / 0.45) + bot * ((t - 0.55) / 0.45)
+    sky = np.where(t < 0.55, upper, lower).astype(np.uint8)
+    return Image.fromarray(np.ascontiguousarray(np.broadcast_to(sky[:, None, :], (y1 - y0, w, 3))), "RGB").convert("RGBA")
+
+
+@trace.span
+def _photo_rows(w: int, h: int, seed: int, y0: int, y1: int) -> Image.Image:
+    """Rows ``y0..y1`` of the photo background.
+
+    Each layer is built only over the band plus its blur reach and composited
+    straight away, so memory follows the band height and bands join seamlessly.
+    """
+    s = units.scale()
+    rnd = random.Random(seed)
+    im = _sky_rows(w, h, y0, y1)
+
+    def add(layer: Image.Image, ya: int) -> None:
+        im.alpha_composite(layer.crop((0, y0 - ya, w, y1 - ya)))
 
     # Clouds: soft noise masked near top
-    clouds = _noise_layer((w, h), amount=90, blur=10)
-    clouds = ImageEnhance.Contrast(clouds).enhance(1.35)
-    clouds = ImageEnhance.Brightness(clouds).enhance(1.15)
-    clouds_rgba = Image.new("RGBA", (w, h), (255, 255, 255, 0))
-    clouds_px = clouds.load()
-    cr_px = clouds_rgba.load()
-    for y in range(int(h * 0.55)):
-        fade = 1 - (y / (h * 0.55)) * 0.9
-        for x in range(w):
-            v = clouds_px[x, y]
-            a = int((v / 255) * 110 * fade)
-            cr_px[x, y] = (255, 255, 255, a)
-    clouds_rgba = clouds_rgba.filter(ImageFilter.GaussianBlur(2))
-    im.alpha_composite(clouds_rgba)
+    ya, yb = _reach(h, y0, y1, 6 * s)
+    clouds = tiles.brightness(_contrast(_noise_layer(w, ya, yb, 90, 5 * s, (seed, 0)), 1.35), 1.15)
+    ys = np.arange(ya, yb)
+    fade = np.where(ys < int(h * 0.55), 1 - (ys / (h * 0.55)) * 0.9, 0.0)
+    alpha = (np.asarray(clouds) / 255 * 110 * fade[:, None]).astype(np.uint8)
+    add(quality.blur(_tint(Image.fromarray(alpha, "L"), (255, 255, 255)), 1 * s), ya)
 
     # Mountains: two layers with texture
-    def ridge(y_base: float, amp: float, col: tuple[int, int, int, int], blur: float, grain: int) -> None:
-        ridge_im = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        rdraw = ImageDraw.Draw(ridge_im)
+    def ridge_points(y_base: float, amp: float) -> list[tuple[int, int]]:
         pts = []
         for i in range(0, 18):
             t = i / 17
@@ -178,130 +188,150 @@ def _photo_background(w: int, h: int, seed: int = 7) -> Image.Image:
                 h
                 * (
                     y_base
-                    + amp * math.sin(t * math.pi * (1.2 + random.random() * 0.4) + random.random())
+                    + amp * math.sin(t * math.pi * (1.2 + rnd.random() * 0.4) + rnd.random())
                     + 0.03 * math.sin(t * math.pi * 5.1 + 0.7)
                 )
             )
             pts.append((x, y))
-        pts += [(w, h), (0, h)]
-        rdraw.polygon(pts, fill=col)
+        return pts + [(w, h), (0, h)]
+
+    def ridge(pts: list[tuple[int, int]], col: tuple[int, int, int, int], blur: float, grain: int, stream: int) -> None:
+        ya, yb = _reach(h, y0, y1, 3 * s + blur)
+        ridge_im = Image.new("RGBA", (w, yb - ya), (0, 0, 0, 0))
+        ImageDraw.Draw(ridge_im).polygon([(x, y - ya) for x, y in pts], fill=col)
 
         # texture
-        tex = _noise_layer((w, h), amount=grain, blur=6)
-        tex = ImageEnhance.Contrast(tex).enhance(1.5)
-        tex_rgba = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-        tpx = tex.load()
-        tr = tex_rgba.load()
-        for y in range(h):
-            for x in range(w):
-                v = tpx[x, y]
-                a = int((v / 255) * 55)
-                tr[x, y] = (255, 255, 255, a)
-        ridge_im = ImageChops.overlay(ridge_im, tex_rgba)
-        ridge_im = ridge_im.filter(ImageFilter.GaussianBlur(blur))
-        im.alpha_composite(ridge_im)
-
-    ridge(0.48, 0.06, (30, 54, 78, 175), blur=1.6, grain=70)
-    ridge(0.57, 0.06, (12, 26, 38, 230), blur=0.8, grain=85)
+        if not quality.draft():
+            tex = _contrast(_noise_layer(w, ya, yb, grain, 3 * s, (seed, stream)), 1.5)
+            ridge_im = ImageChops.overlay(ridge_im, _tint(_ramp(tex, 55), (255, 255, 255)))
+        add(quality.blur(ridge_im, blur), ya)
+
+    # Both outlines come off the seeded stream in order, whatever the band.
+    near = ridge_points(0.48, 0.06)
+    far = ridge_points(0.57, 0.06)
+    ridge(near, (30, 54, 78, 175), blur=0.8 * s, grain=70, stream=1)
+    ridge(far, (12, 26, 38, 230), blur=0.4 * s, grain=85, stream=2)
 
     # Haze near horizon
-    haze = Image.new("RGBA", (w, h), (255, 255, 255, 0))
+    ya, yb = _reach(h, y0, y1, 9 * s)
+    haze = Image.new("RGBA", (w, yb - ya), (255, 255, 255, 0))
     hdraw = ImageDraw.Draw(haze)
     for i in range(10):
         a = int(28 * (1 - i / 9))
-        y1 = int(h * (0.44 + i * 0.02))
-        hdraw.rectangle((0, y1, w, y1 + int(h * 0.08)), fill=(255, 255, 255, a))
-    haze = haze.filter(ImageFilter.GaussianBlur(18))
-    im.alpha_composite(haze)
+        hy = int(h * (0.44 + i * 0.02)) - ya
+        hdraw.rectangle((0, hy, w, hy + int(h * 0.08)), fill=(255, 255, 255, a))
+    add(quality.blur(haze, 9 * s), ya)
 
     # Sun glow
-    im.alpha_composite(_radial_light((w, h), center=(int(w * 0.22), int(h * 0.22)), radius=320, color=(255, 255, 255, 120)))
+    ya, yb = _reach(h, y0, y1, 14 * s)
+    add(_radial_light(w, ya, yb, center=(int(w * 0.22), int(h * 0.22)), radius=px(160), color=(255, 255, 255, 120)), ya)
 
     # Film grain
-    grain = _noise_layer((w, h), amount=60, blur=0.6)
-    grain = ImageEnhance.Contrast(grain).enhance(1.8)
-    g = grain.convert("RGBA")
-    gp = g.load()
-    for y in range(h):
-        for x in range(w):
-            v = gp[x, y][0]
-            a = int((v / 255) * 28)
-            gp[x, y] = (255, 255, 255, a)
-    im.alpha_composite(g)
+    if not quality.draft():
+        ya, yb = _reach(h, y0, y1, 0.3 * s)
+        grain = _contrast(_noise_layer(w, ya, yb, 60, 0.3 * s, (seed, 3)), 1.8)
+        add(_tint(_ramp(grain, 28), (255, 255, 255)), ya)
 
     # Vignette
-    vignette = Image.new("L", (w, h), 0)
+    ya, yb = _reach(h, y0, y1, 12 * s)
+    vignette = Image.new("L", (w, yb - ya), 0)
     vdraw = ImageDraw.Draw(vignette)
     for i in range(18):
-        inset = int(i * 20)
+        inset = px(i * 10)
         a = int(10 + i * 7)
-        vdraw.rounded_rectangle((inset, inset, w - inset, h - inset), radius=120, outline=a, width=6)
-    vignette = vignette.filter(ImageFilter.GaussianBlur(24))
-    v_rgba = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    vp = vignette.load()
-    vr = v_rgba.load()
-    for y in range(h):
-        for x in range(w):
-            vr[x, y] = (0, 0, 0, vp[x, y])
-    im.alpha_composite(v_rgba)
+        vdraw.rounded_rectangle((inset, inset - ya, w - inset, h - inset - ya), radius=px(60), outline=a, width=px(3))
+    add(_tint(quality.blur(vignette, 12 * s), (0, 0, 0)), ya)
 
     return im
 
 
-def _glass_sheet(im: Image.Image, theme: Theme, top_y: int, radius: int = 54) -> Image.Image:
+@cache.images("background")
+@trace.span
+def _photo_background(w: int, h: int, seed: int = 7) -> Image.Image:
+    if canvas.measuring():
+        return canvas.new("RGBA", (w, h))
+    return _photo_rows(w, h, seed, 0, h)
+
+
+# Background seed per screen, shared by the builders and the banded scene renderer.
+SCENE_SEEDS = {"onboarding": 11, "login": 12, "dashboard": 13}
+
+
+def scene_rows(screen: str, w: int, h: int, y0: int, y1: int) -> Image.Image:
+    return _photo_rows(w, h, SCENE_SEEDS[screen], y0, y1)
+
+
+@trace.span
+def _glass_sheet(im: Image.Image, theme: Theme, top_y: int, radius: float = 27) -> Image.Image:
     w, h = im.size
-    sheet_box = (24, top_y, w - 24, h - 24)
+    sheet_box = (px(12), top_y, w - px(12), h - px(12))
 
     # Blur only the region under the sheet
     bg = im.copy()
-    region = bg.crop(sheet_box).filter(ImageFilter.GaussianBlur(18))
+    region = quality.blur(bg.crop(sheet_box), 9 * units.scale())
     bg.paste(region, sheet_box)
 
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    _rounded(draw, sheet_box, r=radius, fill=theme.sheet_fill, outline=theme.sheet_border, w=2)
-    # Handle
-    hx1 = w // 2 - 70
-    hx2 = w // 2 + 70
-    hy = top_y + 18
-    _rounded(draw, (hx1, hy, hx2, hy + 10), r=999, fill=(255, 255, 255, 70), outline=None, w=0)
-
-    bg.alpha_composite(overlay)
+    bg.alpha_composite(_sheet_layer(im.size, theme, top_y, px(radius)))
     return bg
 
 
+@cache.images("sprite", copy=False)
+@trace.span
+def _sheet_layer(size: tuple[int, int], theme: Theme, top_y: int, radius: int) -> Image.Image:
+    w, h = size
+    overlay = canvas.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = canvas.draw(overlay)
+    _rounded(draw, (px(12), top_y, w - px(12), h - px(12)), r=radius, fill=theme.sheet_fill, outline=theme.sheet_border, w=px(1))
+    # Handle
+    hx1 = w // 2 - px(35)
+    hx2 = w // 2 + px(35)
+    hy = top_y + px(9)
+    _rounded(draw, (hx1, hy, hx2, hy + px(5)), r=999, fill=(255, 255, 255, 70), outline=None, w=0)
+    return overlay
+
+
+@trace.span
 def _primary_button(draw: ImageDraw.ImageDraw, box: tuple[int, int, int, int], theme: Theme, text: str, font: ImageFont.ImageFont) -> None:
-    _rounded(draw, box, r=28, fill=theme.accent + (255,), outline=None, w=0)
-    b = draw.textbbox((0, 0), text, font=font)
+    _rounded(draw, box, r=px(14), fill=theme.accent + (255,), outline=None, w=0)
+    b = cache.text_bbox(font, text)
     tw = b[2] - b[0]
     th = b[3] - b[1]
     x1, y1, x2, y2 = box
-    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - 2), text, font=font, fill=theme.accent_text)
+    draw.text(((x1 + x2 - tw) // 2, (y1 + y2 - th) // 2 - px(1)), text, font=font, fill=theme.accent_text)
 
 
+@trace.span
 def _pill(draw: ImageDraw.ImageDraw, x: int, y: int, text: str, fonts: dict[str, ImageFont.ImageFont], theme: Theme) -> int:
-    b = draw.textbbox((0, 0), text, font=fonts["b2"])
+    b = cache.text_bbox(fonts["b2"], text)
     tw = b[2] - b[0]
     th = b[3] - b[1]
-    pad_x, pad_y = 18, 12
+    pad_x, pad_y = px(9), px(6)
     w = tw + pad_x * 2
     h = th + pad_y * 2
-    _rounded(draw, (x, y, x + w, y + h), r=999, fill=(255, 255, 255, 26), outline=(255, 255, 255, 46), w=2)
-    draw.text((x + pad_x, y + pad_y - 1), text, font=fonts["b2"], fill=theme.text)
+    _rounded(draw, (x, y, x + w, y + h), r=999, fill=(255, 255, 255, 26), outline=(255, 255, 255, 46), w=px(1))
+    draw.text((x + pad_x, y + pad_y - px(0.5)), text, font=fonts["b2"], fill=theme.text)
     return w
 
 
+@trace.span
 def _nav(im: Image.Image, theme: Theme, active: int = 0) -> None:
-    w, h = im.size
-    nav_h = 124
-    box = (24, h - nav_h - 24, w - 24, h - 24)
+    im.alpha_composite(_nav_layer(im.size, theme, active))
+
 
-    overlay = Image.new("RGBA", (w, h), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
-    _rounded(draw, box, r=44, fill=theme.nav_fill, outline=theme.nav_border, w=2)
+@cache.images("sprite", copy=False)
+@trace.span
+def _nav_layer(size: tuple[int, int], theme: Theme, active: int) -> Image.Image:
+    w, h = size
+    nav_h = px(62)
+    box = (px(12), h - nav_h - px(12), w - px(12), h - px(12))
+
+    overlay = canvas.new("RGBA", (w, h), (0, 0, 0, 0))
+    draw = canvas.draw(overlay)
+    _rounded(draw, box, r=px(22), fill=theme.nav_fill, outline=theme.nav_border, w=px(1))
 
-    cx = [int((w - 48) * (i + 0.5) / 5) + 24 for i in range(5)]
-    cy = h - nav_h - 24 + 52
+    cx = [int((w - px(24)) * (i + 0.5) / 5) + px(12) for i in range(5)]
+    cy = h - nav_h - px(12) + px(26)
+    lw = px(1.5)
 
     def col(i: int) -> tuple[int, int, int]:
         return theme.text if i == active else theme.text_muted
@@ -311,173 +341,184 @@ def _nav(im: Image.Image, theme: Theme, active: int = 0) -> None:
         x = cx[i]
         y = cy
         if i == 0:  # home
-            draw.polygon([(x - 22, y + 10), (x, y - 16), (x + 22, y + 10)], outline=c)
-            draw.rectangle((x - 16, y + 10, x + 16, y + 32), outline=c, width=3)
+            shapes.polygon(draw, [(x - px(11), y + px(5)), (x, y - px(8)), (x + px(11), y + px(5))], outline=c)
+            draw.rectangle((x - px(8), y + px(5), x + px(8), y + px(16)), outline=c, width=lw)
         elif i == 1:  # pin
-            draw.ellipse((x - 16, y - 16, x + 16, y + 16), outline=c, width=3)
-            draw.polygon([(x, y + 38), (x - 10, y + 8), (x + 10, y + 8)], outline=c)
-            draw.ellipse((x - 4, y - 4, x + 4, y + 4), fill=c)
+            shapes.ellipse(draw, (x - px(8), y - px(8), x + px(8), y + px(8)), outline=c, width=lw)
+            shapes.polygon(draw, [(x, y + px(19)), (x - px(5), y + px(4)), (x + px(5), y + px(4))], outline=c)
+            shapes.ellipse(draw, (x - px(2), y - px(2), x + px(2), y + px(2)), fill=c)
         elif i == 2:  # mic
-            draw.rounded_rectangle((x - 12, y - 18, x + 12, y + 18), radius=10, outline=c, width=3)
-            draw.arc((x - 22, y - 8, x + 22, y + 34), start=200, end=-20, fill=c, width=3)
-            draw.line((x, y + 34, x, y + 46), fill=c, width=3)
+            shapes.rounded_rectangle(draw, (x - px(6), y - px(9), x + px(6), y + px(9)), radius=px(5), outline=c, width=lw)
+            shapes.arc(draw, (x - px(11), y - px(4), x + px(11), y + px(17)), start=200, end=-20, fill=c, width=lw)
+            draw.line((x, y + px(17), x, y + px(23)), fill=c, width=lw)
         elif i == 3:  # lock
-            draw.rounded_rectangle((x - 18, y - 2, x + 18, y + 28), radius=10, outline=c, width=3)
-            draw.arc((x - 16, y - 26, x + 16, y + 6), start=200, end=-20, fill=c, width=3)
-            draw.ellipse((x - 3, y + 10, x + 3, y + 16), fill=c)
+            shapes.rounded_rectangle(draw, (x - px(9), y - px(1), x + px(9), y + px(14)), radius=px(5), outline=c, width=lw)
+            shapes.arc(draw, (x - px(8), y - px(13), x + px(8), y + px(3)), start=200, end=-20, fill=c, width=lw)
+            shapes.ellipse(draw, (x - px(1.5), y + px(5), x + px(1.5), y + px(8)), fill=c)
         elif i == 4:  # user
-            draw.ellipse((x - 14, y - 16, x + 14, y + 12), outline=c, width=3)
-            draw.arc((x - 22, y + 6, x + 22, y + 46), start=200, end=-20, fill=c, width=3)
+            shapes.ellipse(draw, (x - px(7), y - px(8), x + px(7), y + px(6)), outline=c, width=lw)
+            shapes.arc(draw, (x - px(11), y + px(3), x + px(11), y + px(23)), start=200, end=-20, fill=c, width=lw)
 
         if i == active:
-            draw.ellipse((x - 5, y + 54, x + 5, y + 64), fill=theme.accent)
+            shapes.ellipse(draw, (x - px(2.5), y + px(27), x + px(2.5), y + px(32)), fill=theme.accent)
 
-    im.alpha_composite(overlay)
+    return overlay
 
 
 def screen_onboarding(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
-    im = _photo_background(w, h, seed=11)
-    draw = ImageDraw.Draw(im)
+    im = _photo_background(w, h, seed=SCENE_SEEDS["onboarding"])
+    draw = canvas.draw(im)
     _status_bar(draw, w, fonts, theme.text)
 
     # Title block (like ref)
-    draw.text((56, 210), "CONZIA", font=fonts["title"], fill=theme.text)
-    y = 290
-    y = _paragraph(draw, 56, y, "Ver claro.", fonts["b"], theme.text, max_w=w - 112, lh=38)
-    y += 22
+    top = units.safe_top()
+    draw.text((px(28), top + px(58)), "CONZIA", font=fonts["title"], fill=theme.text)
+    y = top + px(98)
+    y = _paragraph(draw, px(28), y, tr("Ver claro."), fonts["b"], theme.text, max_w=w - px(56), lh=px(19))
+    y += px(11)
 
     # Small meta row (right)
-    draw.ellipse((w - 210, 300, w - 164, 346), outline=(255, 255, 255, 80), width=2)
-    draw.text((w - 154, 304), "Local", font=fonts["cap"], fill=theme.text)
+    shapes.ellipse(draw, (w - px(105), top + px(103), w - px(82), top + px(126)), outline=(255, 255, 255, 80), width=px(1))
+    draw.text((w - px(77), top + px(105)), tr("Local"), font=fonts["cap"], fill=theme.text)
 
     # Bottom sheet
     sheet_top = int(h * 0.58)
+    if motion.element("sheet", (px(12), sheet_top, w - px(12) + 1, h - px(12) + 1)):
+        return im.convert("RGB")
     im = _glass_sheet(im, theme, top_y=sheet_top)
-    draw = ImageDraw.Draw(im)
-
-    x = 56
-    y = sheet_top + 62
-    draw.text((x, y), "INFORMACIÓN", font=fonts["cap2"], fill=theme.text_muted)
-    y += 42
-    draw.text((x, y), "Qué vas a hacer aquí", font=fonts["h"], fill=theme.text)
-    y += 54
+    draw = canvas.draw(im)
+
+    x = px(28)
+    y = sheet_top + px(31)
+    draw.text((x, y), tr("INFORMACIÓN"), font=fonts["cap2"], fill=theme.text_muted)
+    y += px(21)
+    draw.text((x, y), tr("Qué vas a hacer aquí"), font=fonts["h"], fill=theme.text)
+    y += px(27)
     y = _paragraph(
         draw,
         x,
         y,
-        "Una pregunta por vez. Tú decides cuándo pedir lectura. "
-        "La Bóveda está fuera del sistema.",
+        tr(
+            "Una pregunta por vez. Tú decides cuándo pedir lectura. "
+            "La Bóveda está fuera del sistema."
+        ),
         font=fonts["b2"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=36,
+        max_w=w - px(56),
+        lh=px(18),
     )
 
     # Chips row (inviting, not form)
-    y += 26
+    y += px(13)
     cx = x
-    for label in ["Privado", "Directo", "Sin drama"]:
+    for label in [tr("Privado"), tr("Directo"), tr("Sin drama")]:
         cw = _pill(draw, cx, y, label, fonts, theme)
-        cx += cw + 14
+        cx += cw + px(7)
 
     # CTA
-    _primary_button(draw, (56, h - 220, w - 56, h - 140), theme, "ENTRAR", fonts["b"])
+    bottom = h - units.safe_bottom()
+    _primary_button(draw, (px(28), bottom - px(76), w - px(28), bottom - px(36)), theme, tr("ENTRAR"), fonts["b"])
     return im.convert("RGB")
 
 
 def screen_login(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
-    im = _photo_background(w, h, seed=12)
-    draw = ImageDraw.Draw(im)
+    im = _photo_background(w, h, seed=SCENE_SEEDS["login"])
+    draw = canvas.draw(im)
     _status_bar(draw, w, fonts, theme.text)
 
-    draw.text((56, 190), "Acceso", font=fonts["title2"], fill=theme.text)
+    top = units.safe_top()
+    draw.text((px(28), top + px(48)), tr("Acceso"), font=fonts["title2"], fill=theme.text)
     _paragraph(
         draw,
-        56,
-        260,
-        "Entra sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in).",
+        px(28),
+        top + px(83),
+        tr("Entra sin cuenta. Si creas cuenta, es solo para sincronizar (opt‑in)."),
         font=fonts["b2"],
         fill=theme.text_muted,
-        max_w=w - 112,
-        lh=36,
+        max_w=w - px(56),
+        lh=px(18),
     )
 
     sheet_top = int(h * 0.43)
+    if motion.element("sheet", (px(12), sheet_top, w - px(12) + 1, h - px(12) + 1)):
+        return im.convert("RGB")
     im = _glass_sheet(im, theme, top_y=sheet_top)
-    draw = ImageDraw.Draw(im)
+    draw = canvas.draw(im)
 
     # fields (soft, native)
     def field(y: int, label: str) -> None:
-        _rounded(draw, (56, y, w - 56, y + 96), r=26, fill=(255, 255, 255, 28), outline=(255, 255, 255, 55), w=2)
-        draw.text((84, y + 30), label, font=fonts["b2"], fill=theme.text_muted)
+        _rounded(draw, (px(28), y, w - px(28), y + px(48)), r=px(13), fill=(255, 255, 255, 28), outline=(255, 255, 255, 55), w=px(1))
+        draw.text((px(42), y + px(15)), label, font=fonts["b2"], fill=theme.text_muted)
 
-    y = sheet_top + 80
-    field(y, "Correo")
-    y += 120
-    field(y, "Contraseña")
-    y += 140
+    y = sheet_top + px(40)
+    field(y, tr("Correo"))
+    y += px(60)
+    field(y, tr("Contraseña"))
+    y += px(70)
 
-    _primary_button(draw, (56, y, w - 56, y + 92), theme, "CONTINUAR", fonts["b"])
-    y += 112
+    _primary_button(draw, (px(28), y, w - px(28), y + px(46)), theme, tr("CONTINUAR"), fonts["b"])
+    y += px(56)
 
-    _rounded(draw, (56, y, w - 56, y + 92), r=28, fill=(0, 0, 0, 0), outline=(255, 255, 255, 60), w=2)
-    b = draw.textbbox((0, 0), "ENTRAR SIN CUENTA", font=fonts["b"])
+    _rounded(draw, (px(28), y, w - px(28), y + px(46)), r=px(14), fill=(0, 0, 0, 0), outline=(255, 255, 255, 60), w=px(1))
+    label = tr("ENTRAR SIN CUENTA")
+    b = cache.text_bbox(fonts["b"], label)
     tw = b[2] - b[0]
     th = b[3] - b[1]
-    draw.text(((w - tw) // 2, y + (92 - th) // 2 - 2), "ENTRAR SIN CUENTA", font=fonts["b"], fill=theme.text)
+    draw.text(((w - tw) // 2, y + (px(46) - th) // 2 - px(1)), label, font=fonts["b"], fill=theme.text)
 
     return im.convert("RGB")
 
 
 def screen_dashboard(w: int, h: int, theme: Theme, fonts: dict[str, ImageFont.ImageFont]) -> Image.Image:
-    im = _photo_background(w, h, seed=13).filter(ImageFilter.GaussianBlur(0.4))
-    draw = ImageDraw.Draw(im)
+    im = quality.blur(_photo_background(w, h, seed=SCENE_SEEDS["dashboard"]), 0.2 * units.scale())
+    draw = canvas.draw(im)
     _status_bar(draw, w, fonts, theme.text)
 
-    draw.text((56, 170), "Hola, [Nombre].", font=fonts["title2"], fill=theme.text)
-    _paragraph(draw, 56, 240, "Hoy: nombra el hecho sin adornarlo.", fonts["b2"], theme.text_muted, max_w=w - 112, lh=36)
+    top = units.safe_top()
+    hello = tr("Hola, [Nombre].")
+    name_tag = tr("[Nombre]")
+    stamp.slot(
+        draw,
+        "name",
+        name_tag,
+        lambda d, name: d.text((px(28), top + px(38)), hello.replace(name_tag, name), font=fonts["title2"], fill=theme.text),
+    )
+    _paragraph(
+        draw, px(28), top + px(73), tr("Hoy: nombra el hecho sin adornarlo."), fonts["b2"], theme.text_muted, max_w=w - px(56), lh=px(18)
+    )
 
     sheet_top = int(h * 0.47)
     im = _glass_sheet(im, theme, top_y=sheet_top)
-    draw = ImageDraw.Draw(im)
-
-    x = 56
-    y = sheet_top + 62
-    draw.text((x, y), "TU PRÓXIMO PASO", font=fonts["cap2"], fill=theme.text_muted)
-    y += 42
-    draw.text((x, y), "Habla 60s.", font=fonts["h"], fill=theme.text)
-    y += 54
-    _paragraph(
+    draw = canvas.draw(im)
+
+    x = px(28)
+    y = sheet_top + px(31)
+    draw.text((x, y), tr("TU PRÓXIMO PASO"), font=fonts["cap2"], fill=theme.text_muted)
+    y += px(21)
+    draw.text((x, y), tr("Habla 60s."), font=fonts["h"], fill=theme.text)
+    y += px(27)
+    stamp.slot(
         draw,
-        x,
-        y,
-        "“¿Dónde cediste hoy para evitar incomodidad?”",
-        font=fonts["b"],
-        fill=theme.text,
-        max_w=w - 112,
-        lh=40,
+        "prompt",
+        tr("“¿Dónde cediste hoy para evitar incomodidad?”"),
+        lambda d, prompt, y=y: _paragraph(d, x, y, prompt, font=fonts["b"], fill=theme.text, max_w=w - px(56), lh=px(20)),
     )
 
-    _primary_button(draw, (56, sheet_top + 330, w - 56, sheet_top + 422), theme, "HABLAR", fonts["b"])
+    _primary_button(draw, (px(28), sheet_top + px(165), w - px(28), sheet_top + px(211)), theme, tr("HABLAR"), fonts["b"])
 
     # Quick actions row
-    ay = sheet_top + 452
-    ax = 56
-    for label in ["Mapa", "Caja", "Bóveda"]:
+    ay = sheet_top + px(226)
+    ax = px(28)
+    for label in [tr("Mapa"), tr("Caja"), tr("Bóveda")]:
         w_p = _pill(draw, ax, ay, label, fonts, theme)
-        ax += w_p + 14
+        ax += w_p + px(7)
 
     _nav(im, theme, active=0)
     return im.convert("RGB")
 
 
-def main() -> None:
-    w, h = 780, 1688  # 390x844 @2x
-    out_dir = Path(__file__).resolve().parent
-    out_dir.mkdir(parents=True, exist_ok=True)
-    fonts = _fonts()
-
-    theme = Theme(
+THEMES = {
+    "default": Theme(
         accent=_hex("#7D5C6B"),
         accent_text=_hex("#FFFFFF"),
         text=_hex("#F4F7FB"),
@@ -486,20 +527,27 @@ def main() -> None:
         sheet_border=(255, 255, 255, 45),
         nav_fill=(8, 12, 18, 185),
         nav_border=(255, 255, 255, 35),
-    )
+    ),
+}
+
+FAMILY = Family(
+    key="native_v3",
+    themes=THEMES,
+    screens={
+        "onboarding": screen_onboarding,
+        "login": screen_login,
+        "dashboard": screen_dashboard,
+    },
+    fonts=_fonts,
+    filename="mirat_native_v3_{screen}.png",
+    scene=scene_rows,
+)
 
-    screens = {
-        "mirat_native_v3_onboarding": screen_onboarding,
-        "mirat_native_v3_login": screen_login,
-        "mirat_native_v3_dashboard": screen_dashboard,
-    }
 
-    for name, builder in screens.items():
-        im = builder(w, h, theme, fonts)
-        path = out_dir / f"{name}.png"
-        im.save(path, format="PNG", optimize=True)
-        print("wrote", path)
+def main() -> int:
+    # Same as `python -m mockupkit render --family <key>`: the committed default-profile PNGs.
+    return cli.main(["render", "--family", FAMILY.key])
 
 
 if __name__ == "__main__":
-    main()
+    raise SystemExit(main())
@@ -0,0 +1 @@
+"""Shared tooling for the MIRAT mockup generators in ``docs/mockups``."""
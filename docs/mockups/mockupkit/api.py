@@ -0,0 +1,152 @@
+"""In-process rendering API: frames as Pillow images, numpy arrays or raw buffers.
+
+    from mockupkit import api
+
+    im = api.render("native_v3", "dashboard", overrides={"prompt": "Hoy elijo pausar"})
+    arr = api.render("mirat", "caja", "dark", size=(390, 844), output="array")
+    for frame in api.frames(["mirat"], output="buffer"):
+        ...
+
+``array`` and ``buffer`` outputs are views over one numpy-owned RGBX buffer
+that the frame is copied into once, line by line; nothing is encoded. RGB
+arrays are a strided view that skips the pad byte, ``channels=4`` gives the
+whole contiguous buffer (pad is 255, so it reads as opaque RGBA). Buffers
+default to 4 channels: a 3-channel memoryview is not contiguous, so
+``file.write`` or ``socket.send`` reject it.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, replace
+from typing import Any
+
+import numpy as np
+from PIL import Image
+
+from mockupkit import context, devices, registry
+from mockupkit import render as render_
+from mockupkit.i18n import SOURCE_LOCALE
+
+OUTPUTS = ("image", "array", "buffer")
+
+
+def _family(family: str | registry.Family) -> registry.Family:
+    if isinstance(family, registry.Family):
+        return family
+    fams = registry.families()
+    if family not in fams:
+        raise ValueError(f"unknown family {family!r}; one of {', '.join(fams)}")
+    return fams[family]
+
+
+def sized(device: devices.Device, size: tuple[int, int] | None) -> devices.Device:
+    """``device`` scaled so its frame is ``size`` pixels; the width in points is kept, the height follows."""
+    if size is None or size == device.pixels:
+        return device
+    w, h = size
+    scale = w / device.points[0]
+    return replace(device, key=f"{device.key}_{w}x{h}", points=(device.points[0], h / scale), scale=scale)
+
+
+def to_array(im: Image.Image, channels: int = 3) -> np.ndarray:
+    """``(h, w, channels)`` uint8 view over a fresh buffer holding ``im``."""
+    if channels not in (3, 4):
+        raise ValueError("channels must be 3 or 4")
+    if im.mode not in ("RGB", "RGBA", "RGBX"):
+        im = im.convert("RGB")
+    w, h = im.size
+    buf = np.empty((h, w, 4), dtype=np.uint8)
+    mode = "RGBA" if im.mode == "RGBA" else "RGBX"
+    shared = Image.frombuffer(mode, (w, h), buf, "raw", mode, 0, 1)
+    # Core paste: RGB and RGBX share the 4-byte pixel layout, so this is a
+    # straight row copy; Image.paste would convert first and, the buffer being
+    # read-only to Pillow, copy it away.
+    im.load()
+    shared.im.paste(im.im, (0, 0, w, h))
+    return buf if channels == 4 else buf[..., :3]
+
+
+def render(
+    family: str | registry.Family,
+    screen: str,
+    theme: str | None = None,
+    size: tuple[int, int] | None = None,
+    overrides: Mapping[str, Any] | None = None,
+    *,
+    output: str = "image",
+    channels: int | None = None,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+    draft: float | None = None,
+) -> Image.Image | np.ndarray | memoryview:
+    """One frame; ``overrides`` are slot values (``prompt``, ``name``, ``density``, ...).
+
+    ``channels`` defaults to 3 for arrays and 4 for buffers.
+
+    ``draft`` gives a quick preview at that fraction of the size (see ``quality``).
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"output must be one of {', '.join(OUTPUTS)}")
+    fam = _family(family)
+    if screen not in fam.screens:
+        raise ValueError(f"{fam.key} has no screen {screen!r}; one of {', '.join(fam.screens)}")
+    theme = theme or next(iter(fam.themes))
+    if theme not in fam.themes:
+        raise ValueError(f"{fam.key} has no theme {theme!r}; one of {', '.join(fam.themes)}")
+    with context.use(values=dict(overrides or {})):
+        im = render_.render(fam, theme, screen, locale, sized(device, size), draft)
+    if output == "image":
+        return im
+    arr = to_array(im, channels or (4 if output == "buffer" else 3))
+    return arr if output == "array" else memoryview(arr)
+
+
+@dataclass(frozen=True)
+class Frame:
+    family: str
+    theme: str
+    screen: str
+    data: Any
+
+    @property
+    def name(self) -> str:
+        return registry.families()[self.family].output_name(self.theme, self.screen)
+
+
+def frames(
+    families: Iterable[str | registry.Family] | None = None,
+    themes: Iterable[str] | None = None,
+    screens: Iterable[str] | None = None,
+    size: tuple[int, int] | None = None,
+    overrides: Mapping[str, Any] | None = None,
+    *,
+    output: str = "image",
+    channels: int | None = None,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+    draft: float | None = None,
+) -> Iterator[Frame]:
+    """Render the matrix lazily, one frame per ``next``."""
+    fams = [_family(f) for f in families] if families is not None else list(registry.families().values())
+    theme_filter, screen_filter = set(themes or ()), set(screens or ())
+    for fam in fams:
+        for theme_key in fam.themes:
+            if theme_filter and theme_key not in theme_filter:
+                continue
+            for screen_key in fam.screens:
+                if screen_filter and screen_key not in screen_filter:
+                    continue
+                data = render(
+                    fam,
+                    screen_key,
+                    theme_key,
+                    size,
+                    overrides,
+                    output=output,
+                    channels=channels,
+                    locale=locale,
+                    device=device,
+                    draft=draft,
+                )
+                yield Frame(fam.key, theme_key, screen_key, data)
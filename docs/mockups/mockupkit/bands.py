@@ -0,0 +1,196 @@
+"""Banded rendering for print and poster sizes.
+
+A scene (``Family.scene``) renders any horizontal strip of the frame on its
+own, so a 6000x13000 poster is produced strip by strip and every strip goes
+straight to a streaming encoder. Peak memory follows the strip height, not
+the frame: the PNG sink deflates as it goes, the TIFF sink writes strips at
+precomputed offsets, and the ``npy`` sink fills a memory-mapped array.
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import struct
+import sys
+import time
+import zlib
+from collections.abc import Callable
+from dataclasses import replace
+from pathlib import Path
+from typing import BinaryIO, Protocol
+
+import numpy as np
+from PIL import Image
+
+from mockupkit import context, devices, registry
+
+# Rows per strip unless the caller asks otherwise; ~100MB of RGBA layers at 6000px wide.
+STRIP = 512
+
+Rows = Callable[[int, int], Image.Image]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class Sink(Protocol):
+    def write(self, rows: np.ndarray) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def write_chunk(fh: BinaryIO, kind: bytes, data: bytes) -> None:
+    fh.write(struct.pack(">I", len(data)) + kind + data)
+    fh.write(struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def scanlines(rows: np.ndarray) -> bytes:
+    """``(h, w, channels)`` uint8 rows as PNG scanlines with the Sub filter."""
+    # Each byte minus the same channel of the pixel to its left.
+    sub = rows.copy()
+    sub[:, 1:] -= rows[:, :-1]
+    lines = np.empty((rows.shape[0], 1 + rows.shape[1] * rows.shape[2]), dtype=np.uint8)
+    lines[:, 0] = 1
+    lines[:, 1:] = sub.reshape(rows.shape[0], -1)
+    return lines.tobytes()
+
+
+class PngSink:
+    """RGBA PNG written row strip by row strip, one IDAT per strip."""
+
+    def __init__(self, path: Path, size: tuple[int, int], level: int = 6) -> None:
+        self.fh = path.open("wb")
+        self.z = zlib.compressobj(level)
+        w, h = size
+        self.fh.write(PNG_SIGNATURE)
+        write_chunk(self.fh, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 6, 0, 0, 0))
+
+    def write(self, rows: np.ndarray) -> None:
+        data = self.z.compress(scanlines(rows))
+        if data:
+            write_chunk(self.fh, b"IDAT", data)
+
+    def close(self) -> None:
+        write_chunk(self.fh, b"IDAT", self.z.flush())
+        write_chunk(self.fh, b"IEND", b"")
+        self.fh.close()
+
+
+class TiffSink:
+    """Uncompressed baseline RGBA TIFF; strip offsets are known up front."""
+
+    ROWS_PER_STRIP = 64
+
+    def __init__(self, path: Path, size: tuple[int, int]) -> None:
+        w, h = size
+        self.fh = path.open("wb")
+        row = w * 4
+        n = -(-h // self.ROWS_PER_STRIP)
+        counts = [row * min(self.ROWS_PER_STRIP, h - i * self.ROWS_PER_STRIP) for i in range(n)]
+        # Header, IFD, then the out-of-line values, then the pixels.
+        entries = 12
+        ifd_end = 8 + 2 + entries * 12 + 4
+        bits_at = ifd_end
+        offsets_at = bits_at + 8
+        counts_at = offsets_at + 4 * n
+        data_at = counts_at + 4 * n
+        if data_at + row * h >= 2**32:
+            raise ValueError(f"{w}x{h} is too large for a baseline TIFF; use png or npy")
+        offsets = [data_at + sum(counts[:i]) for i in range(n)]
+
+        def entry(tag: int, kind: int, count: int, value: int) -> bytes:
+            if kind == 3 and count == 1:
+                return struct.pack("<HHIHH", tag, kind, count, value, 0)
+            return struct.pack("<HHII", tag, kind, count, value)
+
+        ifd = [
+            entry(256, 4, 1, w),  # ImageWidth
+            entry(257, 4, 1, h),  # ImageLength
+            entry(258, 3, 4, bits_at),  # BitsPerSample
+            entry(259, 3, 1, 1),  # Compression: none
+            entry(262, 3, 1, 2),  # Photometric: RGB
+            entry(273, 4, n, offsets_at) if n > 1 else entry(273, 4, 1, offsets[0]),  # StripOffsets
+            entry(277, 3, 1, 4),  # SamplesPerPixel
+            entry(278, 4, 1, self.ROWS_PER_STRIP),  # RowsPerStrip
+            entry(279, 4, n, counts_at) if n > 1 else entry(279, 4, 1, counts[0]),  # StripByteCounts
+            entry(284, 3, 1, 1),  # PlanarConfiguration: chunky
+            entry(296, 3, 1, 1),  # ResolutionUnit: none
+            entry(338, 3, 1, 2),  # ExtraSamples: unassociated alpha
+        ]
+        assert len(ifd) == entries
+        self.fh.write(b"II*\x00" + struct.pack("<I", 8))
+        self.fh.write(struct.pack("<H", entries) + b"".join(ifd) + struct.pack("<I", 0))
+        self.fh.write(struct.pack("<4H", 8, 8, 8, 8))
+        self.fh.write(struct.pack(f"<{n}I", *offsets))
+        self.fh.write(struct.pack(f"<{n}I", *counts))
+
+    def write(self, rows: np.ndarray) -> None:
+        self.fh.write(rows.tobytes())
+
+    def close(self) -> None:
+        self.fh.close()
+
+
+class NpySink:
+    """A memory-mapped ``(h, w, 4)`` uint8 ``.npy`` file, filled in place."""
+
+    def __init__(self, path: Path, size: tuple[int, int]) -> None:
+        w, h = size
+        self.array = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint8, shape=(h, w, 4))
+        self.y = 0
+
+    def write(self, rows: np.ndarray) -> None:
+        self.array[self.y : self.y + rows.shape[0]] = rows
+        self.y += rows.shape[0]
+
+    def close(self) -> None:
+        self.array.flush()
+        del self.array
+
+
+SINKS: dict[str, Callable[[Path, tuple[int, int]], Sink]] = {
+    "png": PngSink,
+    "tiff": TiffSink,
+    "npy": NpySink,
+}
+
+
+def render(size: tuple[int, int], rows: Rows, sink: Sink, strip: int = STRIP) -> None:
+    """Render ``rows(y0, y1)`` strip by strip into ``sink`` and close it."""
+    _, h = size
+    try:
+        for y0 in range(0, h, strip):
+            y1 = min(h, y0 + strip)
+            sink.write(np.asarray(rows(y0, y1).convert("RGBA")))
+    finally:
+        sink.close()
+
+
+def command(args: argparse.Namespace) -> int:
+    family = registry.families()[args.family]
+    if args.screen not in family.screens:
+        print(f"{family.key} has no screen {args.screen!r}; one of {', '.join(family.screens)}", file=sys.stderr)
+        return 2
+    device = devices.DEVICES[args.device]
+    w, h = args.size
+    # Points stay the device's; the print width decides how many pixels a point is.
+    print_device = replace(device, scale=w / device.points[0])
+    out = Path(args.output or registry.MOCKUP_DIR / "build" / "poster" / f"{family.key}_{args.screen}_{w}x{h}.{args.format}")
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    t0 = time.perf_counter()
+    with context.use(device=print_device):
+        render(
+            (w, h),
+            lambda y0, y1: family.scene(args.screen, w, h, y0, y1),
+            SINKS[args.format](out, (w, h)),
+            args.strip,
+        )
+    # ru_maxrss is KiB on Linux, bytes on macOS.
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+    print(
+        f"poster: {out} {w}x{h} in {time.perf_counter() - t0:.2f}s ({args.strip}-row strips, peak RSS {peak_mb:.0f} MB)",
+        file=sys.stderr,
+    )
+    return 0
@@ -0,0 +1,268 @@
+"""Timing of the builders and of the stages inside them.
+
+Each case (family x theme x screen) is rendered ``warmup`` times untimed and
+then ``runs`` times, followed by the PNG encode. While a case runs, the PIL
+primitives the builders use and a few named generator helpers are wrapped so
+their time lands in a stage: gradients, noise, blurs, composites, text,
+shapes and encode; whatever is left of the builder is ``other``. Stage times
+are exclusive (a blur inside a gradient helper counts as blur), so a run's
+stages add up to its total. Work that ``tiles`` fans out to its pool is
+charged on the thread that ran it, so with several cores the stage times are
+summed over threads and can exceed the total.
+
+Results are medians in milliseconds, written as JSON, and can be checked
+against a saved baseline.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import functools
+import io
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import PIL
+from PIL import Image, ImageChops, ImageDraw
+
+from mockupkit import cache, devices, registry, render, tiles
+from mockupkit.i18n import SOURCE_LOCALE
+
+STAGES = ("gradient", "noise", "blur", "composite", "text", "shapes", "encode", "other")
+
+# PIL entry points per stage: (owner, attribute names).
+_PRIMITIVES: dict[str, list[tuple[Any, tuple[str, ...]]]] = {
+    "gradient": [(Image, ("linear_gradient", "radial_gradient"))],
+    "noise": [(Image, ("effect_noise",))],
+    "blur": [(Image.Image, ("filter",))],
+    "composite": [
+        (Image, ("alpha_composite", "composite", "blend")),
+        (Image.Image, ("alpha_composite", "paste")),
+        (ImageChops, ("overlay", "multiply", "screen")),
+    ],
+    "text": [(ImageDraw.ImageDraw, ("text", "multiline_text", "textbbox", "textlength"))],
+    "shapes": [
+        (ImageDraw.ImageDraw, ("rectangle", "rounded_rectangle", "ellipse", "polygon", "line", "arc", "bitmap")),
+    ],
+}
+# Generator helpers looked up by name in each family's module.
+_HELPERS = {
+    "gradient": ("_linear_gradient", "_sky_rows", "_radial_light"),
+    "noise": ("_noise",),
+}
+
+
+class _Probe:
+    """Exclusive time per stage; a call's nested stage calls are charged to their own stage."""
+
+    def __init__(self) -> None:
+        self.totals: dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        # Nesting is per thread: tiles run blurs and lookup tables on a pool.
+        self._open = threading.local()
+
+    def wrap(self, stage: str | None, fn: Callable) -> Callable:
+        """``fn`` timed into ``stage``; with None its time is only kept from its caller."""
+        @functools.wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            children = self._open.__dict__.setdefault("children", [])
+            children.append(0.0)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                dt = time.perf_counter() - t0
+                nested = children.pop()
+                if stage is not None:
+                    with self._lock:
+                        self.totals[stage] += dt - nested
+                if children:
+                    children[-1] += dt
+
+        return timed
+
+    def take(self) -> dict[str, float]:
+        with self._lock:
+            totals, self.totals = dict(self.totals), defaultdict(float)
+        return totals
+
+
+@contextlib.contextmanager
+def _probing(family: registry.Family) -> Iterator[_Probe]:
+    probe = _Probe()
+    module = sys.modules[next(iter(family.screens.values())).__module__]
+    targets = [(owner, name, stage) for stage, owners in _PRIMITIVES.items() for owner, names in owners for name in names]
+    targets += [(module, name, stage) for stage, names in _HELPERS.items() for name in names if hasattr(module, name)]
+    # Waiting on the tile pool is the tiles' own stage, not the caller's.
+    targets.append((tiles, "map_rows", None))
+    saved = []
+    try:
+        for owner, name, stage in targets:
+            original = getattr(owner, name)
+            saved.append((owner, name, original))
+            setattr(owner, name, probe.wrap(stage, original))
+        yield probe
+    finally:
+        for owner, name, original in reversed(saved):
+            setattr(owner, name, original)
+
+
+@dataclass(frozen=True)
+class Case:
+    family: str
+    theme: str
+    screen: str
+    # Median milliseconds: the builder plus encode, then each stage.
+    total: float
+    stages: dict[str, float]
+    runs: list[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return f"{self.family}/{self.theme}/{self.screen}"
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values) * 1000, 3)
+
+
+def run_case(
+    family: registry.Family,
+    theme_key: str,
+    screen_key: str,
+    runs: int = 5,
+    warmup: int = 1,
+    device: devices.Device = devices.DEFAULT,
+    cold: bool = True,
+    optimize: bool = True,
+    locale: str = SOURCE_LOCALE,
+) -> Case:
+    """Time one builder; ``cold`` clears the shared caches before every run so backgrounds are rebuilt."""
+    totals: list[float] = []
+    per_stage: dict[str, list[float]] = {s: [] for s in STAGES}
+    with _probing(family) as probe:
+        for i in range(warmup + runs):
+            if cold:
+                cache.clear()
+            probe.take()
+            t0 = time.perf_counter()
+            im = render.render(family, theme_key, screen_key, locale, device)
+            built = time.perf_counter() - t0
+            stages = probe.take()
+            t1 = time.perf_counter()
+            im.save(io.BytesIO(), format="PNG", optimize=optimize)
+            encoded = time.perf_counter() - t1
+            if i < warmup:
+                continue
+            stages["other"] = max(0.0, built - sum(stages.values()))
+            stages["encode"] = encoded
+            totals.append(built + encoded)
+            for s in STAGES:
+                per_stage[s].append(stages.get(s, 0.0))
+    return Case(
+        family.key,
+        theme_key,
+        screen_key,
+        _median(totals),
+        {s: _median(v) for s, v in per_stage.items()},
+        [round(t * 1000, 3) for t in totals],
+    )
+
+
+def environment(device: devices.Device, runs: int, warmup: int, cold: bool) -> dict[str, Any]:
+    return {
+        "python": platform.python_version(),
+        "pillow": PIL.__version__,
+        "machine": platform.machine(),
+        "device": device.key,
+        "scale": device.scale,
+        "size": list(device.pixels),
+        "runs": runs,
+        "warmup": warmup,
+        "cold": cold,
+    }
+
+
+def to_json(cases: list[Case], env: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "environment": env,
+        "cases": {c.key: {"total": c.total, "stages": c.stages, "runs": c.runs} for c in cases},
+    }
+
+
+@dataclass(frozen=True)
+class Regression:
+    case: str
+    stage: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline if self.baseline else float("inf")
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float, floor_ms: float) -> list[Regression]:
+    """Stages (and totals) slower than the baseline by more than ``threshold`` and ``floor_ms``.
+
+    The floor keeps sub-millisecond stages from failing on timer noise.
+    """
+    out = []
+    for key, case in current["cases"].items():
+        base = baseline["cases"].get(key)
+        if base is None:
+            continue
+        pairs = [("total", base["total"], case["total"])]
+        pairs += [(s, base["stages"].get(s, 0.0), v) for s, v in case["stages"].items()]
+        for stage, old, new in pairs:
+            if new - old > floor_ms and new > old * (1 + threshold):
+                out.append(Regression(key, stage, old, new))
+    return out
+
+
+def command(args: argparse.Namespace) -> int:
+    device = devices.DEVICES[args.device]
+    if args.scale:
+        device = replace(device, scale=args.scale)
+    cases = []
+    t0 = time.perf_counter()
+    for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+        case = run_case(
+            family, theme_key, screen_key, args.runs, args.warmup, device, cold=not args.warm, optimize=not args.fast
+        )
+        top = sorted(((v, s) for s, v in case.stages.items() if v), reverse=True)[:3]
+        print(f"{case.key:32s} {case.total:9.1f}ms  " + "  ".join(f"{s} {v:.1f}" for v, s in top), file=sys.stderr)
+        cases.append(case)
+    result = to_json(cases, environment(device, args.runs, args.warmup, not args.warm))
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    baseline_path = Path(args.baseline)
+    print(f"bench: {len(cases)} cases in {time.perf_counter() - t0:.2f}s; wrote {out}", file=sys.stderr)
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+        print(f"baseline saved to {baseline_path}", file=sys.stderr)
+        return 0
+    if not baseline_path.exists():
+        return 0
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    if baseline["environment"]["size"] != result["environment"]["size"]:
+        print(f"baseline was taken at {baseline['environment']['size']}, not compared", file=sys.stderr)
+        return 0
+    regressions = compare(result, baseline, args.threshold, args.floor)
+    for r in regressions:
+        print(f"slower  {r.case} {r.stage}: {r.baseline:.1f} -> {r.current:.1f}ms (x{r.ratio:.2f})", file=sys.stderr)
+    print(f"bench: {len(regressions)} regressions past +{args.threshold:.0%} vs {baseline_path}", file=sys.stderr)
+    return 1 if regressions else 0
@@ -0,0 +1,220 @@
+"""Process-wide caches shared across themes, locales and families.
+
+Backgrounds and sprites only depend on size, scale, seed and theme, so a batch
+over many locales pays for them once; text measurement is keyed by font and
+string, and fonts are shared by every device profile with the same scale.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import PIL
+from PIL import Image, ImageDraw, ImageFont
+
+from mockupkit import context, shapes
+
+# textbbox only needs font metrics, so a 1x1 surface is enough to measure on.
+MEASURE = ImageDraw.Draw(Image.new("L", (1, 1)))
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+_stats: dict[str, CacheStats] = {}
+# Per stats name, one store per function (module and qualified name).
+_stores: dict[str, dict[str, OrderedDict]] = {}
+_lock = threading.Lock()
+
+# Text boxes kept across processes (``load_boxes``), per font face; None when off.
+_boxes: dict[str, dict[str, list[int]]] | None = None
+_boxes_added = 0
+
+
+@functools.lru_cache(maxsize=64)
+def _face(font: ImageFont.ImageFont) -> str | None:
+    # A font file is identified by its content stamp so an edited or swapped
+    # file (the macOS fonts behind symlinks, say) never reuses old boxes.
+    path = getattr(font, "path", None)
+    if not isinstance(path, str) or not os.path.exists(path):
+        return None
+    st = os.stat(path)
+    real = os.path.realpath(path)
+    return f"{real}:{st.st_size}:{st.st_mtime_ns}:{font.index}:{font.size}:{int(font.layout_engine)}"
+
+
+@functools.lru_cache(maxsize=65536)
+def text_bbox(font: ImageFont.ImageFont, text: str) -> tuple[int, int, int, int]:
+    # Fonts are loaded once per process (``fonts.load_font``), so identity is a
+    # stable key; the bbox at the origin just translates with the draw position.
+    global _boxes_added
+    face = _face(font) if _boxes is not None else None
+    if face is not None:
+        known = _boxes.get(face, {}).get(text)
+        if known is not None:
+            return tuple(known)
+    b = MEASURE.textbbox((0, 0), text, font=font)
+    if face is not None:
+        with _lock:
+            _boxes.setdefault(face, {})[text] = list(b)
+            _boxes_added += 1
+    return b
+
+
+def load_boxes(path: Path) -> None:
+    """Reuse text boxes measured by earlier runs and keep new ones for ``save_boxes``.
+
+    FreeType measurement dominates a layout-only pass; with the boxes on disk a
+    repeated dry run measures only strings that changed. Boxes from another
+    Pillow version are dropped.
+    """
+    global _boxes, _boxes_added
+    data: dict[str, Any] = {}
+    if path.exists():
+        data = json.loads(path.read_text(encoding="utf-8"))
+    with _lock:
+        _boxes = data.get("faces", {}) if data.get("pillow") == PIL.__version__ else {}
+        _boxes_added = 0
+
+
+def save_boxes(path: Path) -> None:
+    if _boxes is None or not _boxes_added:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        payload = json.dumps({"pillow": PIL.__version__, "faces": _boxes}, ensure_ascii=False, sort_keys=True)
+    path.write_text(payload, encoding="utf-8")
+
+
+def _width(font: ImageFont.ImageFont, words: list[str]) -> int:
+    b = text_bbox(font, " ".join(words))
+    return b[2] - b[0]
+
+
+@functools.lru_cache(maxsize=16384)
+def wrap(font: ImageFont.ImageFont, text: str, max_w: int) -> tuple[str, ...]:
+    """Greedy word wrap of ``text`` into lines at most ``max_w`` wide.
+
+    Each line takes the longest run of words that fits (a word wider than
+    ``max_w`` gets a line of its own). Widths grow with every word added, so
+    that run is found by bisection instead of one trial per word, and a rest
+    that fits whole ends the paragraph after a single measurement. Themes share
+    fonts, so every theme after the first reuses the lines.
+    """
+    words = text.split()
+    lines: list[str] = []
+    i = 0
+    while i < len(words):
+        if _width(font, words[i:]) <= max_w:
+            lines.append(" ".join(words[i:]))
+            break
+        # words[i:lo] fits (or is the single word), words[i:hi] does not.
+        lo, hi = i + 1, len(words)
+        while hi - lo > 1:
+            mid = (lo + hi) // 2
+            if _width(font, words[i:mid]) <= max_w:
+                lo = mid
+            else:
+                hi = mid
+        lines.append(" ".join(words[i:lo]))
+        i = lo
+    return tuple(lines)
+
+
+@functools.lru_cache(maxsize=4096)
+def text_mask(font: ImageFont.ImageFont, text: str) -> tuple[Image.Image, tuple[int, int, int, int]]:
+    """Coverage mask of ``text`` and its bbox at the origin, for repeated stamping."""
+    b = text_bbox(font, text)
+    mask = Image.new("L", (max(1, b[2] - b[0]), max(1, b[3] - b[1])), 0)
+    ImageDraw.Draw(mask).text((-b[0], -b[1]), text, font=font, fill=255)
+    return mask, b
+
+
+def images(name: str, maxsize: int = 16, copy: bool = True) -> Callable:
+    """Memoize a function returning a PIL image.
+
+    With ``copy`` (backgrounds the builders draw onto) each caller gets its own
+    copy; sprites that are only composited can share the cached image. Layout
+    passes bypass the cache so their elements are still recorded; SVG passes
+    keep only raster results (embedded as images) and rebuild vector layers.
+    """
+
+    def decorator(fn: Callable[..., Image.Image]) -> Callable[..., Image.Image]:
+        # Functions sharing a name share stats but keep their own store, so
+        # equal argument tuples from different functions never collide. A
+        # redefinition (``watch`` re-running a helper) replaces its store.
+        store: OrderedDict = OrderedDict()
+        stats = _stats.setdefault(name, CacheStats())
+        qualname = f"{fn.__module__}.{fn.__qualname__}"
+        with _lock:
+            old = _stores.setdefault(name, {}).get(qualname)
+            if old is not None:
+                old.clear()
+            _stores[name][qualname] = store
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Image.Image:
+            if context.current().recorder is not None:
+                return fn(*args, **kwargs)
+            # Point sizes inside the builder depend on the scale, not just the pixel
+            # size, and drafts draw cheaper effects at the same size.
+            ctx = context.current()
+            key = (ctx.device.scale, ctx.draft, ctx.vector is not None, args, tuple(sorted(kwargs.items())))
+            with _lock:
+                im = store.get(key)
+                if im is not None:
+                    store.move_to_end(key)
+                    stats.hits += 1
+            if im is None:
+                im = fn(*args, **kwargs)
+                if not isinstance(im, Image.Image):
+                    return im
+                with _lock:
+                    stats.misses += 1
+                    store[key] = im
+                    while len(store) > maxsize:
+                        store.popitem(last=False)
+            if ctx.vector is not None:
+                return ctx.vector.raster(im)
+            return im.copy() if copy else im
+
+        def cache_clear() -> None:
+            with _lock:
+                store.clear()
+
+        wrapper.cache_clear = cache_clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+def stats() -> dict[str, dict[str, int]]:
+    out = {}
+    for name, s in _stats.items():
+        out[name] = {"hits": s.hits, "misses": s.misses, "size": sum(len(st) for st in _stores[name].values())}
+    for key, fn in (("text", text_bbox), ("wrap", wrap), ("text_mask", text_mask), ("shapes", shapes.coverage)):
+        info = fn.cache_info()
+        out[key] = {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    return out
+
+
+def clear() -> None:
+    with _lock:
+        for stores in _stores.values():
+            for store in stores.values():
+                store.clear()
+    text_bbox.cache_clear()
+    wrap.cache_clear()
+    text_mask.cache_clear()
+    shapes.coverage.cache_clear()
@@ -0,0 +1,48 @@
+"""Image and draw factories used by the builders.
+
+Builders create layers and draws through these instead of ``Image.new`` /
+``ImageDraw.Draw`` so the same code can run against the layout recorder or
+the SVG backend.
+"""
+
+from __future__ import annotations
+
+from PIL import Image, ImageDraw, ImageFont
+
+from mockupkit import context
+from mockupkit.layout import LayoutDraw, LayoutImage
+from mockupkit.svg import SvgDraw, SvgImage
+
+
+def measuring() -> bool:
+    return context.current().recorder is not None
+
+
+def new(mode: str, size: tuple[int, int], color=0) -> Image.Image:
+    ctx = context.current()
+    if ctx.recorder is not None:
+        return LayoutImage(ctx.recorder, mode, size)
+    if ctx.vector is not None:
+        return SvgImage(ctx.vector, mode, size, color)
+    return Image.new(mode, size, color)
+
+
+def draw(im: Image.Image) -> ImageDraw.ImageDraw:
+    if isinstance(im, LayoutImage):
+        return LayoutDraw(im.recorder)
+    if isinstance(im, SvgImage):
+        return SvgDraw(im)
+    return ImageDraw.Draw(im)
+
+
+def wrapped(
+    draw: ImageDraw.ImageDraw,
+    xy: tuple[int, int],
+    lines: list[str],
+    font: ImageFont.ImageFont,
+    max_w: int,
+    lh: int,
+) -> None:
+    # Lets the recorder group the lines a helper just drew into one paragraph.
+    if isinstance(draw, LayoutDraw):
+        draw.paragraph(xy, lines, font, max_w, lh)
@@ -0,0 +1,273 @@
+"""Series charts (sparklines, density) drawn from real session data.
+
+A series is reduced to the chart's pixel budget before anything is drawn,
+so drawing cost follows the chart width, not the series length. Arrays
+(including memory-mapped ``.npy`` exports) are reduced in one vectorized pass;
+other iterables and text files are streamed in chunks into a bounded set of
+min/max buckets and never held whole.
+
+``minmax`` keeps the low and high point of every pixel column (spikes
+survive); ``lttb`` (Largest-Triangle-Three-Buckets) keeps the most visually
+significant point per bucket for a smoother line.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Union
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mockupkit import render
+
+Series = Union[np.ndarray, Iterable[float], str, Path]
+
+METHODS = ("minmax", "lttb")
+# Values pulled from a stream per numpy batch.
+CHUNK = 1 << 16
+
+
+def _lines(path: Path) -> Iterator[float]:
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            field = line.split(",", 1)[0].strip()
+            try:
+                yield float(field)
+            except ValueError:
+                continue  # header or blank line
+
+
+def load(series: Series) -> np.ndarray | Iterable[float]:
+    """Arrays and iterables as given; ``.npy`` files memory-mapped, other files streamed.
+
+    Text files hold one value per line (the first column of a CSV).
+    """
+    if isinstance(series, (str, Path)):
+        path = Path(series)
+        if path.suffix == ".npy":
+            return np.load(path, mmap_mode="r")
+        return _lines(path)
+    if isinstance(series, (list, tuple)):
+        return np.asarray(series, dtype=np.float64)
+    return series
+
+
+@dataclass(frozen=True)
+class _Envelope:
+    """Per-bucket min/max/first/last and the index span each bucket covers."""
+
+    lo: np.ndarray
+    hi: np.ndarray
+    first: np.ndarray
+    last: np.ndarray
+    start: np.ndarray
+    count: np.ndarray
+
+    def points(self, n: int) -> tuple[np.ndarray, np.ndarray]:
+        # Two points per bucket, ordered so a rising bucket goes low -> high.
+        rising = self.last >= self.first
+        a = np.where(rising, self.lo, self.hi)
+        b = np.where(rising, self.hi, self.lo)
+        denom = max(1, n - 1)
+        xa = self.start / denom
+        xb = (self.start + self.count - 1) / denom
+        return np.column_stack([xa, xb]).ravel(), np.column_stack([a, b]).ravel()
+
+
+def _array_envelope(values: np.ndarray, buckets: int) -> _Envelope:
+    n = len(values)
+    start = (np.arange(buckets) * n) // buckets
+    end = np.append(start[1:], n)
+    return _Envelope(
+        np.fmin.reduceat(values, start),
+        np.fmax.reduceat(values, start),
+        values[start].astype(np.float64),
+        values[end - 1].astype(np.float64),
+        start,
+        end - start,
+    )
+
+
+def _stream_envelope(values: Iterable[float], buckets: int) -> tuple[_Envelope, int]:
+    """Envelope of an iterable of unknown length in bounded memory.
+
+    Buckets start one value wide; whenever there are more than ``2 * buckets``
+    of them, neighbours are merged pairwise and the bucket width doubles.
+    """
+    size = 1
+    lo = hi = first = last = np.empty(0)
+    start = count = np.empty(0, dtype=np.int64)
+    pending = np.empty(0)
+    n = 0
+    it = iter(values)
+    while True:
+        chunk = np.fromiter(itertools.islice(it, CHUNK), dtype=np.float64)
+        done = chunk.size < CHUNK
+        data = np.concatenate([pending, chunk])
+        full = data.size // size
+        block = data[: full * size].reshape(full, size)
+        lo = np.concatenate([lo, np.fmin.reduce(block, axis=1)])
+        hi = np.concatenate([hi, np.fmax.reduce(block, axis=1)])
+        first = np.concatenate([first, block[:, 0]])
+        last = np.concatenate([last, block[:, -1]])
+        start = np.concatenate([start, n + np.arange(full, dtype=np.int64) * size])
+        count = np.concatenate([count, np.full(full, size, dtype=np.int64)])
+        n += full * size
+        pending = data[full * size :]
+        if done and pending.size:
+            lo, hi = np.append(lo, np.nanmin(pending)), np.append(hi, np.nanmax(pending))
+            first, last = np.append(first, pending[0]), np.append(last, pending[-1])
+            start, count = np.append(start, n), np.append(count, pending.size)
+            n += pending.size
+        while start.size > 2 * buckets:
+            m = start.size // 2 * 2
+            lo = np.append(np.fmin(lo[:m:2], lo[1:m:2]), lo[m:])
+            hi = np.append(np.fmax(hi[:m:2], hi[1:m:2]), hi[m:])
+            first = np.append(first[:m:2], first[m:])
+            last = np.append(last[1:m:2], last[m:])
+            start = np.append(start[:m:2], start[m:])
+            count = np.append(count[:m:2] + count[1:m:2], count[m:])
+            size *= 2
+        if done:
+            return _Envelope(lo, hi, first, last, start, count), n
+
+
+class _Positions:
+    """``np.arange(n) / (n - 1)`` computed per slice."""
+
+    def __init__(self, n: int) -> None:
+        self.n = n
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return np.arange(*index.indices(self.n)) / max(1, self.n - 1)
+        return np.asarray(index) / max(1, self.n - 1)
+
+
+def lttb(y: np.ndarray, threshold: int, x: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray]:
+    """Largest-Triangle-Three-Buckets: ``threshold`` points keeping the line's shape.
+
+    Without ``x`` the points are evenly spaced and ``x`` is never materialized,
+    so a memory-mapped ``y`` is only read bucket by bucket.
+    """
+    n = len(y)
+    if x is None:
+        x = _Positions(n)
+    if threshold >= n or threshold < 3:
+        return np.asarray(x[0:n], dtype=np.float64), np.asarray(y, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], max(edges[i + 2], edges[i + 1] + 1)
+            cx, cy = float(np.mean(x[nlo:nhi])), float(np.mean(y[nlo:nhi]))
+        else:
+            cx, cy = float(x[n - 1]), float(y[n - 1])
+        ax, ay = float(x[a]), float(y[a])
+        bx = np.asarray(x[lo:hi], dtype=np.float64)
+        by = np.asarray(y[lo:hi], dtype=np.float64)
+        area = np.abs((ax - cx) * (by - ay) - (ax - bx) * (cy - ay))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+    return np.asarray(x[keep], dtype=np.float64), np.asarray(y[keep], dtype=np.float64)
+
+
+def reduce(series: Series, columns: int, method: str = "minmax") -> tuple[np.ndarray, np.ndarray]:
+    """``(x, y)`` for a chart ``columns`` pixels wide; ``x`` runs from 0 to 1.
+
+    Series that already fit (two points per column or fewer) are returned as is.
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown downsampling method {method!r} (expected one of {', '.join(METHODS)})")
+    columns = max(1, columns)
+    values = load(series)
+    if isinstance(values, np.ndarray):
+        n = len(values)
+        if n <= 2 * columns:
+            return np.arange(n) / max(1, n - 1), np.asarray(values, dtype=np.float64)
+        if method == "lttb":
+            return lttb(values, 2 * columns)
+        return _array_envelope(values, columns).points(n)
+
+    # Streams: bounded envelope first; LTTB then picks from its points.
+    env, n = _stream_envelope(values, columns if method == "minmax" else 4 * columns)
+    if n <= 2 * columns and np.all(env.count == 1):
+        return env.start / max(1, n - 1), env.lo
+    x, y = env.points(n)
+    return lttb(y, 2 * columns, x) if method == "lttb" else (x, y)
+
+
+def draw(
+    draw_: ImageDraw.ImageDraw,
+    box: tuple[int, int, int, int],
+    series: Series,
+    color: tuple[int, ...],
+    width: int = 1,
+    fill: tuple[int, ...] | None = None,
+    baseline: float | None = None,
+    baseline_color: tuple[int, ...] | None = None,
+    method: str = "minmax",
+    pad: float = 0.1,
+) -> list[tuple[int, int]]:
+    """Plot ``series`` inside ``box`` (x, y, w, h) and return the line's pixel points.
+
+    ``fill`` paints the area between the line and the baseline (or the bottom
+    of the box); ``baseline`` is a value kept inside the range and drawn as a
+    guide in ``baseline_color`` when one is given. The value range maps onto
+    the box minus ``pad`` of its height at either edge.
+    """
+    x, y, w, h = box
+    xs, ys = reduce(series, w, method)
+    finite = np.isfinite(ys)
+    xs, ys = xs[finite], ys[finite]
+    if not len(ys):
+        return []
+    lo, hi = float(ys.min()), float(ys.max())
+    if baseline is not None:
+        lo, hi = min(lo, baseline), max(hi, baseline)
+    span = (hi - lo) or 1
+
+    def to_y(v: np.ndarray | float) -> np.ndarray:
+        return (y + h * ((1 - pad) - (1 - 2 * pad) * (np.asarray(v) - lo) / span)).astype(np.int64)
+
+    px_x = (x + (w * xs).astype(np.int64)).tolist()
+    pts = list(zip(px_x, to_y(ys).tolist()))
+    floor = int(to_y(baseline)) if baseline is not None else y + h
+    if fill is not None and len(pts) > 1:
+        draw_.polygon(pts + [(pts[-1][0], floor), (pts[0][0], floor)], fill=fill)
+    if baseline is not None and baseline_color is not None:
+        draw_.line([(x, floor), (x + w, floor)], fill=baseline_color, width=1)
+    draw_.line(pts, fill=color, width=width, joint="curve")
+    return pts
+
+
+def command(args: argparse.Namespace) -> int:
+    w, h = args.size
+    im = Image.new("RGBA", (w, h), (0, 0, 0, 0))
+    t0 = time.perf_counter()
+    pts = draw(
+        ImageDraw.Draw(im),
+        (0, 0, w, h),
+        args.series,
+        (126, 164, 214, 255),
+        width=args.width,
+        fill=(126, 164, 214, 70) if args.fill else None,
+        baseline=args.baseline,
+        baseline_color=(255, 255, 255, 90),
+        method=args.method,
+    )
+    elapsed = time.perf_counter() - t0
+    out = Path(args.output or Path(args.series).with_suffix(".chart.png"))
+    render.save(im, out, optimize=False)
+    print(f"chart: {out} {w}x{h}, {len(pts)} points ({args.method}) in {elapsed:.3f}s", file=sys.stderr)
+    return 0
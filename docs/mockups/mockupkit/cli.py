@@ -0,0 +1,312 @@
+"""Command line entry point: ``python -m mockupkit <command>`` from ``docs/mockups``.
+
+Only the parsers live here. Each subcommand runs a ``command`` function next to
+the code it drives (``localize`` and ``devices`` are layout reports and run from
+``layout``); arguments are validated and worker counts resolved in ``main`` first.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from mockupkit import bands, bench, charts, contrast, devices, export, gallery, i18n, icons, layout, memory, motion, pyramid, quality, registry, regress, render, server, stamp, svg, trace, watch
+
+
+def _add_matrix_args(p: argparse.ArgumentParser, locale: str | None = "all") -> None:
+    """The --family/--theme/--screen filters, and --locale: every catalog by default ("all"),
+    repeatable over the source locale ("many"), a single one ("one") or none (None).
+
+    ``main`` rejects unknown values for every parser built here, before the command runs.
+    """
+    p.set_defaults(matrix=p)
+    if locale == "all":
+        p.add_argument("--locale", action="append", help="locale (repeatable; default: every catalog)")
+    elif locale == "many":
+        p.add_argument("--locale", action="append", help=f"locale (repeatable; default: {i18n.SOURCE_LOCALE})")
+    elif locale == "one":
+        p.add_argument("--locale", default=i18n.SOURCE_LOCALE, help=f"locale (default: {i18n.SOURCE_LOCALE})")
+    p.add_argument("--family", action="append", help="family key (repeatable)")
+    p.add_argument("--theme", action="append", help="theme key (repeatable)")
+    p.add_argument("--screen", action="append", help="screen key (repeatable)")
+
+
+def _add_device_args(p: argparse.ArgumentParser, default: str) -> None:
+    p.add_argument(
+        "--device", action="append", choices=list(devices.DEVICES), help=f"device profile (repeatable; default: {default})"
+    )
+
+
+def _add_worker_args(p: argparse.ArgumentParser) -> None:
+    p.add_argument("--workers", type=int, default=4, help="parallel resample/encode threads")
+    p.add_argument(
+        "--memory-budget",
+        metavar="MB",
+        help="memory each worker may need; fewer workers run when they would not fit ('auto': last `memory` report)",
+    )
+
+
+def _add_draft_arg(p: argparse.ArgumentParser) -> None:
+    p.add_argument(
+        "--draft",
+        nargs="?",
+        type=float,
+        const=quality.DRAFT_SCALE,
+        metavar="FRACTION",
+        help=f"quick preview at this fraction of the scale, without grain or textures (default: {quality.DRAFT_SCALE})",
+    )
+
+
+def _workers(args: argparse.Namespace) -> int:
+    n = memory.workers(args.workers, memory.budget(args.memory_budget))
+    if n < args.workers:
+        print(f"memory budget allows {n} of {args.workers} workers", file=sys.stderr)
+    return n
+
+
+def _unknown_filters(args: argparse.Namespace) -> list[str]:
+    fams = registry.families()
+    known = {
+        "locale": set(i18n.locales()),
+        "family": set(fams),
+        "theme": {t for f in fams.values() for t in f.themes},
+        "screen": {s for f in fams.values() for s in f.screens},
+    }
+
+    def given(kind: str) -> list[str]:
+        # --locale is a single value for some commands and absent for others.
+        value = getattr(args, kind, None)
+        return [value] if isinstance(value, str) else list(value or ())
+
+    return [
+        f"unknown {kind} {value!r}; one of {', '.join(sorted(known[kind]))}"
+        for kind in known
+        for value in given(kind)
+        if value not in known[kind]
+    ]
+
+
+def _size(value: str) -> tuple[int, int]:
+    w, _, h = value.lower().partition("x")
+    return int(w), int(h)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="mockupkit")
+    parser.add_argument("--trace", metavar="JSON", help="record a Chrome trace of the command here")
+    parser.add_argument("--trace-top", type=int, default=20, help="spans listed in the trace summary")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("render", help="render any slice of the family x theme x screen x device matrix")
+    _add_matrix_args(p, locale="one")
+    _add_device_args(p, default=devices.DEFAULT.key)
+    p.add_argument("--out", help="output directory, one subdirectory per device when several (default: the committed mockups)")
+    p.add_argument("--fast", action="store_true", help="skip PNG optimize (much faster encode)")
+    _add_draft_arg(p)
+    p.add_argument("--list", action="store_true", help="list the matching family/theme/screen combinations and exit")
+    p.add_argument("--dry-run", action="store_true", help="print what would be written without rendering")
+    p.set_defaults(func=render.command)
+
+    p = sub.add_parser("export", help="stream rendered frames into a zip/tar archive (or stdout) with a hash manifest")
+    _add_matrix_args(p, locale="many")
+    _add_device_args(p, default=devices.DEFAULT.key)
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "mockups.zip"), help="archive path, or - for stdout")
+    p.add_argument("--format", choices=export.FORMATS, help="archive format (default: from the --out suffix, tar for stdout)")
+    p.add_argument("--fast", action="store_true", help="skip PNG optimize (much faster encode)")
+    _add_draft_arg(p)
+    _add_worker_args(p)
+    p.add_argument("-v", "--verbose", action="store_true", help="print each member as it is appended")
+    p.set_defaults(func=export.command)
+
+    p = sub.add_parser("svg", help="resolution-independent SVG of each screen from the same builders")
+    _add_matrix_args(p, locale="one")
+    _add_device_args(p, default=devices.DEFAULT.key)
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "svg"), help="output directory, one subdirectory per device when several")
+    p.set_defaults(func=svg.command)
+
+    p = sub.add_parser("contrast", help="WCAG contrast of every text run against the pixels under it, across the matrix")
+    _add_matrix_args(p)
+    _add_device_args(p, default="every profile")
+    p.add_argument("-o", "--output", default=str(registry.MOCKUP_DIR / "build" / "contrast_report.json"), help="JSON report")
+    p.add_argument("--top", type=int, default=20, help="failures listed on stderr")
+    p.add_argument("--check", action="store_true", help="exit 1 when any run fails AA")
+    _add_worker_args(p)
+    p.set_defaults(func=contrast.command)
+
+    p = sub.add_parser("layout", help="layout-only pass: boxes, wrapped lines and overflows as JSON")
+    _add_matrix_args(p)
+    _add_device_args(p, default=devices.DEFAULT.key)
+    p.add_argument("-o", "--output", help="write JSON here instead of stdout")
+    p.add_argument("--indent", action="store_true", help="pretty-print the JSON")
+    p.add_argument("--check", action="store_true", help="exit 1 when any overflow is found (pre-commit)")
+    p.set_defaults(func=layout.command)
+
+    p = sub.add_parser("localize", help="render every locale x theme x screen into per-locale directories")
+    _add_matrix_args(p)
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "i18n"), help="output root")
+    p.add_argument("--fast", action="store_true", help="skip PNG optimize (much faster encode)")
+    p.add_argument("--check", action="store_true", help="exit 1 when any overflow is found")
+    p.set_defaults(func=layout.localize_command)
+
+    p = sub.add_parser("devices", help="render screens for every device profile into per-device directories")
+    _add_matrix_args(p, locale="one")
+    _add_device_args(p, default="every profile")
+    p.add_argument("--list", action="store_true", help="print the profile table and exit")
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "devices"), help="output root")
+    p.add_argument("--fast", action="store_true", help="skip PNG optimize (much faster encode)")
+    p.add_argument("--check", action="store_true", help="exit 1 when any overflow is found")
+    p.set_defaults(func=layout.devices_command)
+
+    p = sub.add_parser("pyramid", help="render one supersampled master per screen and derive @1x/@2x/@3x + thumbnails")
+    _add_matrix_args(p, locale="one")
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key, help="points and insets")
+    p.add_argument("--density", action="append", type=float, help="output scale (repeatable; default: 1, 2, 3)")
+    p.add_argument("--thumb", action="append", type=int, help="thumbnail width in px (repeatable; default: 240)")
+    p.add_argument("--master-scale", type=float, help="master render scale (default: highest density)")
+    _add_worker_args(p)
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "pyramid"), help="output root")
+    p.add_argument("--fast", action="store_true", help="skip PNG optimize (much faster encode)")
+    p.set_defaults(func=pyramid.command)
+
+    p = sub.add_parser("icons", help="Android launcher icons (square + round) and splash for every density")
+    p.add_argument("--source", default=str(icons.SOURCE), help="brand logo")
+    p.add_argument("--res", default=str(icons.RES_DIR), help="Android res directory")
+    p.add_argument("--force", action="store_true", help="regenerate even if the source is unchanged")
+    p.add_argument("--check", action="store_true", help="render in memory and report outputs that differ from the files on disk (informational)")
+    _add_worker_args(p)
+    p.set_defaults(func=icons.command)
+
+    p = sub.add_parser("stamp", help="personalized variants: static template once, slots stamped per record")
+    p.add_argument(
+        "records",
+        help="CSV or JSONL records (name, prompt, density, recording, id); '-' for JSONL on stdin. "
+        "density is a list of values or a path to a .npy/.csv session export; recording is a WAV path",
+    )
+    p.add_argument("--family", required=True, choices=list(registry.families()))
+    p.add_argument("--screen", required=True)
+    p.add_argument("--theme", help="theme key (default: the family's first)")
+    p.add_argument("--locale", default=i18n.SOURCE_LOCALE)
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key)
+    p.add_argument("--format", choices=sorted(stamp.FORMATS), default="jpeg")
+    p.add_argument("--limit", type=int, help="stop after N records")
+    p.add_argument("--out", help="output directory (default: build/stamp/<family>_<screen>)")
+    p.set_defaults(func=stamp.command)
+
+    p = sub.add_parser("poster", help="print-size scene art rendered in strips straight to a streaming encoder")
+    scenes = [key for key, f in registry.families().items() if f.scene is not None]
+    p.add_argument("--family", choices=scenes, default="native_v3", help="family with a banded scene")
+    p.add_argument("--screen", required=True)
+    p.add_argument("--size", type=_size, default=(6000, 13000), help="WxH in px (default: 6000x13000)")
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key, help="points the scene is laid out in")
+    p.add_argument("--strip", type=int, default=bands.STRIP, help="rows per strip; peak memory follows this")
+    p.add_argument("--format", choices=sorted(bands.SINKS), default="png")
+    p.add_argument("-o", "--output", help="output file (default: build/poster/<family>_<screen>_<W>x<H>.<format>)")
+    p.set_defaults(func=bands.command)
+
+    p = sub.add_parser("chart", help="plot a session export (.npy memory-mapped, .csv/.txt streamed) at a fixed pixel budget")
+    p.add_argument("series", help="one value per row; .npy, or the first column of a CSV/text file")
+    p.add_argument("--size", type=_size, default=(600, 120), help="WxH in px (default: 600x120)")
+    p.add_argument("--method", choices=charts.METHODS, default="minmax", help="downsampling (default: minmax)")
+    p.add_argument("--width", type=int, default=2, help="line width in px")
+    p.add_argument("--fill", action="store_true", help="fill the area under the line")
+    p.add_argument("--baseline", type=float, help="value drawn as a guide and used as the fill floor")
+    p.add_argument("-o", "--output", help="output PNG (default: next to the series)")
+    p.set_defaults(func=charts.command)
+
+    p = sub.add_parser("animate", help="transition frames (sheet, drawer, pulse) as APNG or a PNG sequence, dirty boxes only")
+    p.add_argument("transition", choices=sorted(motion.TRANSITIONS))
+    p.add_argument("--screen", help="screen key (default: the transition's first)")
+    p.add_argument("--theme", help="theme key (default: the family's first)")
+    p.add_argument("--locale", default=i18n.SOURCE_LOCALE)
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key)
+    p.add_argument("--frames", type=int, default=60)
+    p.add_argument("--fps", type=int, default=60)
+    p.add_argument("--format", choices=("apng", "frames"), default="apng")
+    p.add_argument("-o", "--output", help="APNG file or frame directory (default: build/motion/<transition>_<screen>)")
+    p.set_defaults(func=motion.command)
+
+    p = sub.add_parser("gallery", help="labeled contact sheets per group plus an HTML index with lazy thumbnails")
+    _add_matrix_args(p, locale="one")
+    _add_device_args(p, default=devices.DEFAULT.key)
+    p.add_argument("--by", choices=gallery.GROUPS, default="family", help="one sheet per group (default: family)")
+    p.add_argument("--cols", type=int, default=6)
+    p.add_argument("--rows", type=int, default=2, help="rows per page; larger groups are paginated")
+    p.add_argument("--thumb", type=int, default=240, help="thumbnail width in px")
+    p.add_argument(
+        "--from",
+        dest="from_dir",
+        help="read PNGs from this directory (<dir>/<file> or <dir>/<device>/<file>) instead of rendering",
+    )
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "gallery"), help="output directory")
+    p.set_defaults(func=gallery.command)
+
+    p = sub.add_parser("regress", help="diff fresh renders against the committed PNGs; exit 1 on a visible change")
+    _add_matrix_args(p, locale="one")
+    p.add_argument(
+        "--delta", type=float, default=regress.DELTA, help=f"CIE76 difference a pixel may show (default: {regress.DELTA})"
+    )
+    p.add_argument("--tolerance", type=float, default=0.0, help="fraction of pixels allowed past --delta")
+    p.add_argument("--update", action="store_true", help="rewrite the committed PNGs from fresh renders")
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "regress"), help="heatmaps and summary.json")
+    p.set_defaults(func=regress.command)
+
+    p = sub.add_parser("bench", help="time each builder and its stages; exit 1 on a regression against the baseline")
+    _add_matrix_args(p, locale=None)
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key)
+    p.add_argument("--scale", type=float, help="override the device scale (e.g. 1 for a quick CI canvas)")
+    p.add_argument("--runs", type=int, default=5, help="timed runs per case (median reported)")
+    p.add_argument("--warmup", type=int, default=1, help="untimed runs first")
+    p.add_argument("--warm", action="store_true", help="keep the background caches between runs")
+    p.add_argument("--fast", action="store_true", help="time the encode without PNG optimize")
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "bench" / "latest.json"))
+    p.add_argument("--baseline", default=str(registry.MOCKUP_DIR / "build" / "bench" / "baseline.json"))
+    p.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    p.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown per stage (default: 0.25 = 25%%)")
+    p.add_argument("--floor", type=float, default=2.0, help="ignore slowdowns under this many ms")
+    p.set_defaults(func=bench.command)
+
+    p = sub.add_parser("memory", help="peak RSS, live image buffers per helper and Python allocations per screen")
+    _add_matrix_args(p, locale="one")
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key)
+    p.add_argument("--cold", action="store_true", help="clear the background caches before every screen")
+    p.add_argument("--no-python", dest="python", action="store_false", help="skip tracemalloc (faster)")
+    p.add_argument("--top", type=int, default=10, help="largest allocations kept per screen")
+    p.add_argument("--out", default=str(memory.REPORT), help="report JSON; its budget hint feeds --memory-budget auto")
+    p.set_defaults(func=memory.command)
+
+    p = sub.add_parser("serve", help="long-lived render service over localhost HTTP or a Unix socket")
+    p.add_argument("--host", default=server.HOST)
+    p.add_argument("--port", type=int, default=server.PORT)
+    p.add_argument("--socket", help="listen on this Unix socket instead of TCP")
+    _add_worker_args(p)
+    p.add_argument("--keep", type=int, default=64, help="recent results kept for repeated requests")
+    p.add_argument("--warm", action="store_true", help="render every screen once before accepting requests")
+    p.set_defaults(func=server.command)
+
+    p = sub.add_parser("watch", help="re-render the screens affected by each edit to sources, fonts or catalogs")
+    _add_matrix_args(p, locale="one")
+    p.add_argument("--device", choices=list(devices.DEVICES), default=devices.DEFAULT.key)
+    p.add_argument("--out", default=str(registry.MOCKUP_DIR / "build" / "watch"), help="output directory")
+    p.add_argument("--optimize", action="store_true", help="optimize PNGs (slower encode)")
+    _add_draft_arg(p)
+    p.add_argument("--interval", type=float, default=0.3, help="seconds between polls")
+    p.set_defaults(func=watch.command)
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    if getattr(args, "matrix", None) is not None and (errors := _unknown_filters(args)):
+        args.matrix.error("; ".join(errors))
+    if hasattr(args, "memory_budget"):
+        args.workers = _workers(args)
+    if not args.trace:
+        return args.func(args)
+    with trace.enabled() as tracer:
+        code = args.func(args)
+    tracer.write(Path(args.trace))
+    print(tracer.summary(args.trace_top), file=sys.stderr)
+    print(f"trace: {len(tracer.events)} spans -> {args.trace}", file=sys.stderr)
+    return code
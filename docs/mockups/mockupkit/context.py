@@ -0,0 +1,47 @@
+"""Per-render state shared by the builders without threading it through every helper."""
+
+from __future__ import annotations
+
+import contextlib
+import contextvars
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+from mockupkit import devices
+
+
+@dataclass(frozen=True)
+class RenderContext:
+    # Set while a layout-only pass runs; builders then record boxes instead of pixels.
+    recorder: Any = None
+    locale: str = "es"
+    # Per-render slot values ("name", "prompt", "density", ...) overriding builder defaults.
+    values: Mapping[str, Any] = field(default_factory=dict)
+    # Set while a stamping template is built; slots then register instead of painting.
+    template: Any = None
+    # Device profile the builders convert points and safe-area insets for.
+    device: devices.Device = devices.DEFAULT
+    # Set while a transition captures its frames; see ``motion.element``.
+    motion: Any = None
+    # Draft preview: builders skip grain and textures and cheapen blurs (see ``quality``).
+    draft: bool = False
+    # Set while an SVG pass runs (an ``svg.Document``); layers then collect markup.
+    vector: Any = None
+
+
+_CURRENT: contextvars.ContextVar[RenderContext] = contextvars.ContextVar("mockupkit_render", default=RenderContext())
+
+
+def current() -> RenderContext:
+    return _CURRENT.get()
+
+
+@contextlib.contextmanager
+def use(**changes: Any) -> Iterator[RenderContext]:
+    ctx = replace(_CURRENT.get(), **changes)
+    token = _CURRENT.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _CURRENT.reset(token)
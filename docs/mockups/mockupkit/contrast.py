@@ -0,0 +1,306 @@
+"""WCAG contrast audit of every text run against the pixels actually under it.
+
+The layout pass gives each run's box, font and string; the glyph mask from
+``cache.text_mask`` splits the box into glyph cores (the text color as
+rendered) and the background between and around the glyphs. Runs only
+record luminance samples; the ratios for the whole matrix are computed in
+one numpy pass at the end.
+
+Frames come from what earlier commands wrote (the committed PNGs,
+``build/i18n`` and ``build/devices``) when they are newer than the sources;
+others are rendered once into ``build/contrast`` and reused from there. The
+samples of each frame are kept next to them, keyed by the frame's mtime, so
+an audit over unchanged frames decodes nothing and only redoes the ratios.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mockupkit import cache, devices, i18n, layout, pyramid, registry, render
+
+FRAME_DIR = registry.MOCKUP_DIR / "build" / "contrast"
+SAMPLES = FRAME_DIR / "samples.json"
+# WCAG 2.x AA minimums; large text is 18pt, or 14pt bold (24 and 18.66 CSS px).
+AA_NORMAL = 4.5
+AA_LARGE = 3.0
+LARGE_PT = 24.0
+LARGE_BOLD_PT = 18.66
+# Background percentile on the side closest to the text color, so a few
+# stray pixels don't decide but a bright cloud behind light text does.
+WORST = 10
+# Mask values counted as glyph core and the pixels of background around the box.
+CORE = 224
+PAD = 2
+# Core pixels this far (max channel) from the declared color: the run is under
+# a scrim, not visible text to audit. Runs inside a shape filled later are too.
+COVERED = 40
+_FILLED_KINDS = ("rectangle", "rounded_rectangle", "ellipse")
+
+_BOLD = ("bold", "heavy", "black")
+_WEIGHTS = np.array([0.2126, 0.7152, 0.0722], dtype=np.float32)
+
+
+@dataclass(frozen=True)
+class Run:
+    family: str
+    theme: str
+    screen: str
+    locale: str
+    device: str
+    text: str
+    box: tuple[int, int, int, int]
+    size_pt: float
+    bold: bool
+    fg: tuple[int, int, int]
+    bg: tuple[int, int, int]
+    fg_lum: float
+    bg_lum: float
+    covered: bool
+
+
+def _module_file(family: registry.Family) -> Path:
+    fn = next(iter(family.screens.values()))
+    return Path(sys.modules[fn.__module__].__file__)
+
+
+def _sources_mtime(family: registry.Family, locale: str) -> float:
+    paths = [_module_file(family), *Path(__file__).parent.glob("*.py")]
+    if locale != i18n.SOURCE_LOCALE:
+        paths.append(i18n.LOCALE_DIR / f"{locale}.json")
+    return max(p.stat().st_mtime for p in paths)
+
+
+def _candidates(family: registry.Family, theme: str, screen: str, locale: str, device: devices.Device) -> list[Path]:
+    name = family.output_name(theme, screen)
+    build = registry.MOCKUP_DIR / "build"
+    paths = [FRAME_DIR / locale / device.key / name]
+    if locale == i18n.SOURCE_LOCALE and device == devices.DEFAULT:
+        paths.append(registry.MOCKUP_DIR / name)
+    if device == devices.DEFAULT:
+        paths.append(build / "i18n" / locale / name)
+    if locale == i18n.SOURCE_LOCALE:
+        paths.append(build / "devices" / device.key / name)
+    return paths
+
+
+def frame(
+    family: registry.Family, theme: str, screen: str, locale: str, device: devices.Device
+) -> tuple[Path, np.ndarray | None]:
+    """Path of an up-to-date frame, and its pixels when it had to be rendered."""
+    newest = _sources_mtime(family, locale)
+    for path in _candidates(family, theme, screen, locale, device):
+        if path.exists() and path.stat().st_mtime >= newest:
+            # Only the header is read here.
+            with Image.open(path) as im:
+                if im.size == device.pixels:
+                    return path, None
+    im = render.render(family, theme, screen, locale, device).convert("RGB")
+    path = FRAME_DIR / locale / device.key / family.output_name(theme, screen)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    im.save(path, format="PNG", compress_level=1)
+    return path, np.asarray(im)
+
+
+def _bold(font) -> bool:
+    try:
+        style = font.getname()[1] or ""
+    except Exception:
+        return False
+    return any(word in style.lower() for word in _BOLD)
+
+
+def _luminance(rgb: np.ndarray) -> np.ndarray:
+    return pyramid.TO_LINEAR[rgb] @ _WEIGHTS
+
+
+def runs(
+    arr: np.ndarray,
+    recorder: layout.Recorder,
+    scale: float,
+    **where: str,
+) -> list[Run]:
+    """Sample the glyph cores and the background of every text run in ``arr``."""
+    h, w = arr.shape[:2]
+    out = []
+    # Fills replace what is under them, so a later filled shape hides a run.
+    fills = [(i, el.box) for i, el in enumerate(recorder.elements) if el.kind in _FILLED_KINDS and el.fill is not None]
+    for i, el in enumerate(recorder.elements):
+        if el.kind != "text" or not el.text or not el.text.strip() or el.font is None:
+            continue
+        hidden = any(j > i and layout._contains(box, *el.box[:2]) and layout._contains(box, *el.box[2:]) for j, box in fills)
+        mask, b = cache.text_mask(el.font, el.text)
+        m = np.asarray(mask)
+        mx, my = el.box[0], el.box[1]
+        x0, y0 = max(0, mx - PAD), max(0, my - PAD)
+        x1, y1 = min(w, mx + m.shape[1] + PAD), min(h, my + m.shape[0] + PAD)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        # The mask zero-extended over the padded window.
+        window = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        sx0, sy0 = max(0, -(mx - x0)), max(0, -(my - y0))
+        dx0, dy0 = mx - x0 + sx0, my - y0 + sy0
+        sub = m[sy0 : sy0 + (y1 - y0 - dy0), sx0 : sx0 + (x1 - x0 - dx0)]
+        window[dy0 : dy0 + sub.shape[0], dx0 : dx0 + sub.shape[1]] = sub
+        pixels = arr[y0:y1, x0:x1]
+        core = pixels[window >= CORE]
+        back = pixels[window == 0]
+        if not len(core) or not len(back):
+            continue
+        fg = np.median(core, axis=0).astype(np.uint8)
+        fg_lum = float(_luminance(fg))
+        back_lum = _luminance(back)
+        # The background side closest to the text color is the worst case.
+        q = 100 - WORST if fg_lum > float(np.median(back_lum)) else WORST
+        bg_lum = float(np.percentile(back_lum, q))
+        bg = back[np.argmin(np.abs(back_lum - bg_lum))]
+        declared = np.array(el.fill[:3] if isinstance(el.fill, tuple) else (el.fill or 0,) * 3, dtype=np.int16)
+        out.append(
+            Run(
+                **where,
+                text=el.text,
+                box=tuple(int(v) for v in el.box),
+                size_pt=round(getattr(el.font, "size", 0) / scale, 2),
+                bold=_bold(el.font),
+                fg=tuple(int(v) for v in fg),
+                bg=tuple(int(v) for v in bg),
+                fg_lum=fg_lum,
+                bg_lum=bg_lum,
+                covered=hidden or bool(np.abs(fg.astype(np.int16) - declared).max() > COVERED),
+            )
+        )
+    return out
+
+
+def ratios(all_runs: list[Run]) -> tuple[np.ndarray, np.ndarray]:
+    """Contrast ratio and the AA minimum of every run, in one pass."""
+    fg = np.array([r.fg_lum for r in all_runs], dtype=np.float64)
+    bg = np.array([r.bg_lum for r in all_runs], dtype=np.float64)
+    size = np.array([r.size_pt for r in all_runs], dtype=np.float64)
+    bold = np.array([r.bold for r in all_runs], dtype=bool)
+    ratio = (np.maximum(fg, bg) + 0.05) / (np.minimum(fg, bg) + 0.05)
+    large = (size >= LARGE_PT) | (bold & (size >= LARGE_BOLD_PT))
+    return ratio, np.where(large, AA_LARGE, AA_NORMAL)
+
+
+def audit(
+    matrix: Iterable[tuple[registry.Family, str, str]],
+    locales: Iterable[str],
+    profiles: Iterable[devices.Device],
+    workers: int = 4,
+) -> tuple[list[Run], int]:
+    """Runs of every frame in locales x profiles x ``matrix`` and how many frames had to be rendered."""
+
+    store = _load_samples()
+    fresh: dict[str, dict] = {}
+
+    def one(job: tuple[registry.Family, str, str, str, devices.Device]) -> tuple[list[Run], bool]:
+        family, theme, screen, locale, device = job
+        where = {"family": family.key, "theme": theme, "screen": screen, "locale": locale, "device": device.key}
+        path, arr = frame(family, theme, screen, locale, device)
+        stamp = path.stat().st_mtime_ns
+        kept = store.get(str(path))
+        if arr is None and kept is not None and kept["mtime_ns"] == stamp and kept["where"] == where:
+            return [_run(r) for r in kept["runs"]], False
+        if arr is None:
+            with Image.open(path) as im:
+                arr = np.asarray(im.convert("RGB"))
+            rendered = False
+        else:
+            rendered = True
+        recorder, _ = layout.measure(family, theme, screen, locale, device)
+        found = runs(arr, recorder, device.scale, **where)
+        fresh[str(path)] = {"mtime_ns": stamp, "where": where, "runs": [asdict(r) for r in found]}
+        return found, rendered
+
+    matrix = list(matrix)
+    jobs = [(f, t, s, locale, device) for locale in locales for device in profiles for f, t, s in matrix]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="contrast") as pool:
+        results = list(pool.map(one, jobs))
+    if fresh:
+        SAMPLES.parent.mkdir(parents=True, exist_ok=True)
+        SAMPLES.write_text(json.dumps({**store, **fresh}, ensure_ascii=False), encoding="utf-8")
+    return [r for rs, _ in results for r in rs], sum(rendered for _, rendered in results)
+
+
+def _load_samples() -> dict[str, dict]:
+    try:
+        return json.loads(SAMPLES.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _run(d: dict) -> Run:
+    return Run(**{**d, "box": tuple(d["box"]), "fg": tuple(d["fg"]), "bg": tuple(d["bg"])})
+
+
+def _hex(c: tuple[int, int, int]) -> str:
+    return "#{:02X}{:02X}{:02X}".format(*c)
+
+
+def report(all_runs: list[Run]) -> dict:
+    ratio, required = ratios(all_runs) if all_runs else (np.zeros(0), np.zeros(0))
+    failures = []
+    covered = 0
+    for run, r, req in zip(all_runs, ratio.tolist(), required.tolist()):
+        if run.covered:
+            covered += 1
+            continue
+        if r < req:
+            failures.append(
+                {
+                    "family": run.family,
+                    "theme": run.theme,
+                    "screen": run.screen,
+                    "locale": run.locale,
+                    "device": run.device,
+                    "text": run.text,
+                    "box": list(run.box),
+                    "ratio": round(r, 2),
+                    "required": req,
+                    "size_pt": run.size_pt,
+                    "fg": _hex(run.fg),
+                    "bg": _hex(run.bg),
+                }
+            )
+    failures.sort(key=lambda f: f["ratio"])
+    return {
+        "runs": len(all_runs),
+        "covered": covered,
+        "failures": failures,
+        "worst": failures[0]["ratio"] if failures else None,
+    }
+
+
+def command(args: argparse.Namespace) -> int:
+    matrix = list(registry.select(args.family, args.theme, args.screen))
+    profiles = devices.select(args.device)
+    locales = args.locale or i18n.locales()
+    t0 = time.perf_counter()
+    runs, rendered = audit(matrix, locales, profiles, args.workers)
+    payload = report(runs)
+    elapsed = time.perf_counter() - t0
+    out = Path(args.output)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    for f in payload["failures"][: args.top]:
+        where = f"{f['locale']}/{f['device']}/{f['family']}/{f['theme']}/{f['screen']}"
+        print(f"contrast {where}: {f['ratio']:.2f} < {f['required']:g} {f['fg']} on {f['bg']} {f['text']!r}", file=sys.stderr)
+    n_frames = len(matrix) * len(profiles) * len(locales)
+    print(
+        f"contrast: {payload['runs']} runs in {n_frames} frames ({rendered} rendered), "
+        f"{len(payload['failures'])} failures in {elapsed:.2f}s -> {out}",
+        file=sys.stderr,
+    )
+    return 1 if args.check and payload["failures"] else 0
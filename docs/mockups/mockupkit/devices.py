@@ -0,0 +1,70 @@
+"""Device profiles: logical size in points, scale factor and safe-area insets.
+
+Builders lay out in points (see ``units``); a profile decides how many pixels
+a point is and how much of the top and bottom edges belong to the system UI.
+Android densities are expressed as scale factors over dp (mdpi = 1x).
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Insets:
+    top: float = 0
+    bottom: float = 0
+    left: float = 0
+    right: float = 0
+
+
+@dataclass(frozen=True)
+class Device:
+    key: str
+    label: str
+    points: tuple[int, int]
+    scale: float
+    safe: Insets
+    platform: str
+
+    @property
+    def pixels(self) -> tuple[int, int]:
+        w, h = self.points
+        return (round(w * self.scale), round(h * self.scale))
+
+
+def _android(key: str, label: str, points: tuple[int, int], scale: float) -> Device:
+    # Status bar 24dp, gesture navigation handle 24dp.
+    return Device(key, label, points, scale, Insets(top=24, bottom=24), "android")
+
+
+DEVICES: dict[str, Device] = {
+    d.key: d
+    for d in (
+        Device("iphone_se", "iPhone SE", (375, 667), 2, Insets(top=20), "ios"),
+        Device("iphone_14", "iPhone 14", (390, 844), 2, Insets(top=47, bottom=34), "ios"),
+        Device("iphone_15_pro_max", "iPhone 15 Pro Max", (430, 932), 3, Insets(top=59, bottom=34), "ios"),
+        Device("ipad_mini", "iPad mini", (744, 1133), 2, Insets(top=24, bottom=20), "ios"),
+        Device("ipad_pro_11", "iPad Pro 11", (834, 1194), 2, Insets(top=24, bottom=20), "ios"),
+        _android("android_360_mdpi", "Android 360dp mdpi", (360, 800), 1),
+        _android("android_360_hdpi", "Android 360dp hdpi", (360, 800), 1.5),
+        _android("android_360_xhdpi", "Android 360dp xhdpi", (360, 800), 2),
+        _android("android_360_xxhdpi", "Android 360dp xxhdpi", (360, 800), 3),
+        _android("android_360_xxxhdpi", "Android 360dp xxxhdpi", (360, 800), 4),
+        _android("pixel_7", "Pixel 7", (412, 915), 2.625),
+        _android("android_tablet", "Android tablet 800dp", (800, 1280), 2),
+    )
+}
+
+# The profile every committed mockup was designed for (390x844 @2x).
+DEFAULT = DEVICES["iphone_14"]
+
+
+def select(keys: Iterable[str] | None = None) -> list[Device]:
+    """Profiles for ``keys`` (in table order); every profile when empty."""
+    wanted = set(keys or ())
+    unknown = wanted - DEVICES.keys()
+    if unknown:
+        raise ValueError(f"unknown device profile(s): {', '.join(sorted(unknown))}")
+    return [d for d in DEVICES.values() if not wanted or d.key in wanted]
@@ -0,0 +1,176 @@
+"""Stream rendered frames straight into a zip or tar archive.
+
+Frames are rendered and encoded on a small pool and each one is appended to
+the archive (a file or stdout) as soon as it is ready, then flushed, so a
+consumer reading the other end of a pipe can unpack while rendering goes on.
+Nothing is written to disk and read back. ``manifest.json`` closes the
+archive with every member's size and SHA-256.
+
+    python -m mockupkit export --family native_v3 --out - | tar -x -C assets/
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import sys
+import tarfile
+import time
+import zipfile
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from mockupkit import devices, i18n, registry, render
+
+FORMATS = ("zip", "tar", "tgz")
+MANIFEST = "manifest.json"
+
+
+def guess_format(path: str) -> str:
+    name = path.lower()
+    if name.endswith((".tar.gz", ".tgz")):
+        return "tgz"
+    # A zip's central directory comes last, so only tar unpacks as it arrives (stdout).
+    if name.endswith(".zip"):
+        return "zip"
+    return "tar"
+
+
+@dataclass(frozen=True)
+class Entry:
+    name: str
+    bytes: int
+    sha256: str
+
+
+class _Zip:
+    def __init__(self, out: BinaryIO) -> None:
+        # Without seeking (pipes) zipfile writes data descriptors after each member.
+        self.archive = zipfile.ZipFile(out, "w")
+
+    def add(self, name: str, data: bytes, mtime: float) -> None:
+        info = zipfile.ZipInfo(name, date_time=time.localtime(mtime)[:6])
+        # PNG is already deflated; only text members are worth compressing.
+        info.compress_type = zipfile.ZIP_STORED if name.endswith(".png") else zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self.archive.writestr(info, data)
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+class _Tar:
+    def __init__(self, out: BinaryIO, compressed: bool) -> None:
+        # Stream modes never seek, so stdout works.
+        self.archive = tarfile.open(fileobj=out, mode="w|gz" if compressed else "w|")
+
+    def add(self, name: str, data: bytes, mtime: float) -> None:
+        info = tarfile.TarInfo(name)
+        info.size = len(data)
+        info.mtime = int(mtime)
+        info.mode = 0o644
+        self.archive.addfile(info, io.BytesIO(data))
+
+    def close(self) -> None:
+        self.archive.close()
+
+
+def write(
+    out: BinaryIO,
+    fmt: str,
+    items: Iterable[tuple[str, Callable[[], bytes]]],
+    workers: int = 4,
+    meta: dict | None = None,
+    progress: Callable[[Entry], None] | None = None,
+) -> list[Entry]:
+    """Produce every ``(member name, encode)`` item on ``workers`` threads and append it to the archive.
+
+    Members are appended in completion order; at most ``2 * workers`` encoded
+    frames wait in memory at once.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"format must be one of {', '.join(FORMATS)}")
+    archive = _Zip(out) if fmt == "zip" else _Tar(out, fmt == "tgz")
+    entries: list[Entry] = []
+
+    def append(name: str, data: bytes) -> None:
+        archive.add(name, data, time.time())
+        out.flush()
+        entry = Entry(name, len(data), hashlib.sha256(data).hexdigest())
+        entries.append(entry)
+        if progress is not None:
+            progress(entry)
+
+    pending: deque[tuple[str, Future[bytes]]] = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="export") as pool:
+
+        def drain(limit: int) -> None:
+            while len(pending) > limit:
+                # Take whichever frame is ready first; block on the oldest otherwise.
+                ready = next((p for p in pending if p[1].done()), pending[0])
+                pending.remove(ready)
+                append(ready[0], ready[1].result())
+
+        for name, encode in items:
+            pending.append((name, pool.submit(encode)))
+            drain(2 * workers - 1)
+        drain(0)
+
+    manifest = {**(meta or {}), "files": [asdict(e) for e in entries]}
+    archive.add(MANIFEST, json.dumps(manifest, indent=2).encode(), time.time())
+    archive.close()
+    out.flush()
+    return entries
+
+
+def command(args: argparse.Namespace) -> int:
+    matrix = list(registry.select(args.family, args.theme, args.screen))
+    profiles = devices.select(args.device) if args.device else [devices.DEFAULT]
+    locales = args.locale or [i18n.SOURCE_LOCALE]
+    if not matrix:
+        print("export: nothing matches the filters", file=sys.stderr)
+        return 1
+    fmt = args.format or guess_format(args.out)
+
+    def items() -> Iterator[tuple[str, Callable[[], bytes]]]:
+        for locale in locales:
+            for device in profiles:
+                # Directory levels only for the axes that actually vary.
+                prefix = "".join(
+                    f"{part}/" for part, many in ((locale, len(locales) > 1), (device.key, len(profiles) > 1)) if many
+                )
+                for family, theme_key, screen_key in matrix:
+
+                    def encode(family=family, theme_key=theme_key, screen_key=screen_key, locale=locale, device=device) -> bytes:
+                        im = render.render(family, theme_key, screen_key, locale, device, args.draft)
+                        return render.encode(im, optimize=not args.fast)
+
+                    yield prefix + family.output_name(theme_key, screen_key), encode
+
+    def progress(entry: Entry) -> None:
+        if args.verbose:
+            print(f"{entry.name} {entry.bytes:,d}B", file=sys.stderr)
+
+    meta = {
+        "locales": locales,
+        "devices": [d.key for d in profiles],
+        "draft": args.draft,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    t0 = time.perf_counter()
+    if args.out == "-":
+        entries = write(sys.stdout.buffer, fmt, items(), args.workers, meta, progress)
+    else:
+        out = Path(args.out)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        with out.open("wb") as f:
+            entries = write(f, fmt, items(), args.workers, meta, progress)
+    total = sum(e.bytes for e in entries)
+    print(f"export: {len(entries)} frames, {total / 1e6:.1f}MB in {time.perf_counter() - t0:.2f}s -> {args.out}", file=sys.stderr)
+    return 0
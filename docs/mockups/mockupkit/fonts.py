@@ -0,0 +1,28 @@
+"""Font loading shared by every family.
+
+A face at a given size is opened once per process whichever family asks for
+it, so families using the same system fonts also share text metrics and
+glyph masks in ``cache``. Missing files fall back to Pillow's default font.
+"""
+
+from __future__ import annotations
+
+import functools
+import os
+
+from PIL import ImageFont
+
+
+@functools.cache
+def _default() -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    return ImageFont.load_default()
+
+
+@functools.cache
+def load_font(path: str | None, size: int, index: int = 0) -> ImageFont.FreeTypeFont | ImageFont.ImageFont:
+    if path and os.path.exists(path):
+        try:
+            return ImageFont.truetype(path, size=size, index=index)
+        except (OSError, ValueError):
+            pass
+    return _default()
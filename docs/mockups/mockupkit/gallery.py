@@ -0,0 +1,228 @@
+"""Contact sheets and an HTML index of the mockup matrix.
+
+Entries (family x theme x screen x device) are listed up front, which is
+cheap, then turned into thumbnails one at a time: rendered and reduced
+straight away, or decoded from disk at reduced size. Each page of a sheet is
+filled and written before the next starts, so only one full-size frame and
+one page are ever in memory.
+"""
+
+from __future__ import annotations
+
+import argparse
+import html
+import itertools
+import os
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from PIL import Image, ImageDraw, ImageFont
+
+from mockupkit import devices, registry, render
+from mockupkit.i18n import SOURCE_LOCALE
+
+GROUPS = ("family", "device", "theme", "screen", "none")
+
+BG = (22, 23, 27)
+LABEL = (214, 216, 222)
+MUTED = (132, 136, 146)
+GAP = 16
+LABEL_H = 34
+HEADER_H = 48
+
+
+@dataclass(frozen=True)
+class Entry:
+    family: registry.Family
+    theme: str
+    screen: str
+    device: devices.Device
+
+    @property
+    def slug(self) -> str:
+        return f"{self.family.key}_{self.theme}_{self.screen}_{self.device.key}"
+
+    def group(self, by: str) -> str:
+        return {
+            "family": self.family.key,
+            "device": self.device.key,
+            "theme": self.theme,
+            "screen": self.screen,
+            "none": "all",
+        }[by]
+
+    def label(self, by: str) -> str:
+        parts = {"family": self.family.key, "theme": self.theme, "screen": self.screen, "device": self.device.key}
+        return " · ".join(v for k, v in parts.items() if k != by)
+
+    def disk_path(self, root: Path) -> Path | None:
+        # ``devices`` writes <root>/<device>/<file>; committed mockups sit in <root>.
+        name = self.family.output_name(self.theme, self.screen)
+        for path in (root / self.device.key / name, root / name):
+            if path.exists():
+                return path
+        return None
+
+
+def entries(
+    families_: Iterable[str] | None = None,
+    themes: Iterable[str] | None = None,
+    screens: Iterable[str] | None = None,
+    devices_: Iterable[devices.Device] = (devices.DEFAULT,),
+    by: str = "family",
+) -> list[Entry]:
+    """Every entry passing the filters, ordered by group."""
+    out = [
+        Entry(family, theme_key, screen_key, device)
+        for device in devices_
+        for family, theme_key, screen_key in registry.select(families_, themes, screens)
+    ]
+    # Stable: inside a group the registry order is kept.
+    order = {g: i for i, g in enumerate(dict.fromkeys(e.group(by) for e in out))}
+    return sorted(out, key=lambda e: order[e.group(by)])
+
+
+def thumbnail(entry: Entry, width: int, root: Path | None = None, locale: str = SOURCE_LOCALE) -> Image.Image | None:
+    """``width``-wide RGB thumbnail; from ``root`` when given (None if the file is missing)."""
+    if root is not None:
+        path = entry.disk_path(root)
+        if path is None:
+            return None
+        with Image.open(path) as im:
+            # JPEG decodes at reduced size; PNG at least reduces by integer factors first.
+            im.draft("RGB", (width, width * 4))
+            im = im.convert("RGB")
+            im.thumbnail((width, round(width * im.height / im.width)), Image.Resampling.LANCZOS, reducing_gap=2.0)
+            return im
+    im = render.render(entry.family, entry.theme, entry.screen, locale, entry.device).convert("RGB")
+    im.thumbnail((width, round(width * im.height / im.width)), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return im
+
+
+@dataclass(frozen=True)
+class Page:
+    group: str
+    number: int
+    pages: int
+    path: Path
+    entries: list[tuple[Entry, Path | None]]
+
+
+def _font(size: int) -> ImageFont.ImageFont:
+    return ImageFont.load_default(size=size)
+
+
+def _cell_height(entries_: list[Entry], width: int) -> int:
+    # Profiles differ in aspect; every cell fits the tallest.
+    return max(round(width * e.device.points[1] / e.device.points[0]) for e in entries_)
+
+
+def build(
+    entries_: list[Entry],
+    out_dir: Path,
+    by: str = "family",
+    cols: int = 6,
+    rows: int = 2,
+    width: int = 240,
+    root: Path | None = None,
+    locale: str = SOURCE_LOCALE,
+) -> Iterator[Page]:
+    """Write the contact sheet pages, yielding each one as it is written.
+
+    Every thumbnail is also saved as a small JPEG under ``thumbs/`` for the
+    HTML index.
+    """
+    thumbs_dir = out_dir / "thumbs"
+    thumbs_dir.mkdir(parents=True, exist_ok=True)
+    label_font, header_font = _font(13), _font(20)
+    per_page = cols * rows
+    for group, members in itertools.groupby(entries_, key=lambda e: e.group(by)):
+        members = list(members)
+        cell_h = _cell_height(members, width)
+        pages = -(-len(members) // per_page)
+        for number in range(pages):
+            chunk = members[number * per_page : (number + 1) * per_page]
+            used_rows = -(-len(chunk) // cols)
+            sheet = Image.new(
+                "RGB",
+                (GAP + cols * (width + GAP), HEADER_H + used_rows * (cell_h + LABEL_H + GAP) + GAP),
+                BG,
+            )
+            draw = ImageDraw.Draw(sheet)
+            title = group if pages == 1 else f"{group}  ({number + 1}/{pages})"
+            draw.text((GAP, GAP), title, font=header_font, fill=LABEL)
+            written: list[tuple[Entry, Path | None]] = []
+            for i, entry in enumerate(chunk):
+                x = GAP + (i % cols) * (width + GAP)
+                y = HEADER_H + (i // cols) * (cell_h + LABEL_H + GAP)
+                thumb = thumbnail(entry, width, root, locale)
+                if thumb is None:
+                    draw.rectangle((x, y, x + width - 1, y + cell_h - 1), outline=MUTED)
+                    draw.text((x + 8, y + 8), "missing", font=label_font, fill=MUTED)
+                    written.append((entry, None))
+                else:
+                    sheet.paste(thumb, (x, y))
+                    thumb_path = thumbs_dir / f"{entry.slug}.jpg"
+                    thumb.save(thumb_path, format="JPEG", quality=85)
+                    written.append((entry, thumb_path))
+                draw.text((x, y + cell_h + 8), entry.label(by), font=label_font, fill=LABEL)
+            suffix = "" if pages == 1 else f"_p{number + 1:02d}"
+            path = out_dir / f"sheet_{group}{suffix}.png"
+            sheet.save(path, format="PNG")
+            yield Page(group, number + 1, pages, path, written)
+
+
+def write_index(pages: list[Page], out_dir: Path, by: str, root: Path | None = None) -> Path:
+    """Static ``index.html``: one section per group, lazy-loaded thumbnails linking to the full frames."""
+    parts = [
+        "<!doctype html>",
+        '<html lang="es"><head><meta charset="utf-8"><title>Mockups</title>',
+        "<style>body{background:#16171b;color:#d6d8de;font:14px system-ui,sans-serif;margin:24px}"
+        "h2{font-weight:500;margin:32px 0 12px}.grid{display:flex;flex-wrap:wrap;gap:16px}"
+        "figure{margin:0;width:240px}img{width:100%;height:auto;display:block;border-radius:6px}"
+        "figcaption{color:#848892;margin-top:6px;font-size:12px}</style></head><body>",
+        "<h1>Mockups</h1>",
+    ]
+    for group, group_pages in itertools.groupby(pages, key=lambda p: p.group):
+        group_pages = list(group_pages)
+        links = " · ".join(
+            f'<a href="{html.escape(p.path.relative_to(out_dir).as_posix())}">hoja {p.number}</a>' for p in group_pages
+        )
+        parts.append(f"<h2>{html.escape(group)}</h2><p>{links}</p><div class=\"grid\">")
+        for page in group_pages:
+            for entry, thumb in page.entries:
+                caption = html.escape(entry.label(by))
+                if thumb is None:
+                    parts.append(f"<figure><figcaption>{caption} (missing)</figcaption></figure>")
+                    continue
+                src = html.escape(thumb.relative_to(out_dir).as_posix())
+                img = f'<img loading="lazy" src="{src}" alt="{caption}">'
+                full = entry.disk_path(root) if root is not None else None
+                if full is not None:
+                    href = html.escape(Path(os.path.relpath(full.resolve(), out_dir.resolve())).as_posix())
+                    img = f'<a href="{href}">{img}</a>'
+                parts.append(f"<figure>{img}<figcaption>{caption}</figcaption></figure>")
+        parts.append("</div>")
+    parts.append("</body></html>")
+    path = out_dir / "index.html"
+    path.write_text("\n".join(parts), encoding="utf-8")
+    return path
+
+
+def command(args: argparse.Namespace) -> int:
+    out_dir = Path(args.out)
+    root = Path(args.from_dir) if args.from_dir else None
+    todo = entries(args.family, args.theme, args.screen, devices.select(args.device or [devices.DEFAULT.key]), args.by)
+    t0 = time.perf_counter()
+    pages = []
+    for page in build(todo, out_dir, args.by, args.cols, args.rows, args.thumb, root, args.locale):
+        missing = sum(1 for _, thumb in page.entries if thumb is None)
+        note = f", {missing} missing" if missing else ""
+        print(f"{page.path.name}: {len(page.entries)} frames{note}", file=sys.stderr)
+        pages.append(page)
+    index = write_index(pages, out_dir, args.by, root)
+    print(f"gallery: {len(todo)} frames, {len(pages)} sheets, {index} ({time.perf_counter() - t0:.2f}s)", file=sys.stderr)
+    return 0
@@ -0,0 +1,50 @@
+"""Per-locale string catalogs for the builders' copy.
+
+Builders keep their Spanish copy inline and wrap it in ``tr``; every other
+locale is a ``locales/<locale>.json`` mapping those source strings to
+translations. Strings missing from a catalog fall back to Spanish and are
+remembered so the batch report can list them.
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+from collections import defaultdict
+from pathlib import Path
+
+from mockupkit import context
+
+SOURCE_LOCALE = "es"
+LOCALE_DIR = Path(__file__).resolve().parent / "locales"
+
+_missing: dict[str, set[str]] = defaultdict(set)
+
+
+def locales() -> list[str]:
+    return [SOURCE_LOCALE, *sorted(p.stem for p in LOCALE_DIR.glob("*.json"))]
+
+
+@functools.cache
+def catalog(locale: str) -> dict[str, str]:
+    if locale == SOURCE_LOCALE:
+        return {}
+    path = LOCALE_DIR / f"{locale}.json"
+    if not path.exists():
+        raise ValueError(f"unknown locale {locale!r}; available: {', '.join(locales())}")
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def tr(source: str) -> str:
+    locale = context.current().locale
+    if locale == SOURCE_LOCALE:
+        return source
+    translated = catalog(locale).get(source)
+    if translated is None:
+        _missing[locale].add(source)
+        return source
+    return translated
+
+
+def missing(locale: str) -> list[str]:
+    return sorted(_missing.get(locale, ()))
@@ -0,0 +1,232 @@
+"""Android launcher icons and splash bitmaps generated from the brand logo.
+
+The logo is read once. Its face mark (the first band of opaque rows, above the
+wordmark) becomes the square and round launcher icons, and the whole logo,
+tinted, becomes the splash bitmap referenced by ``drawable/splash_background``.
+Each asset is composed once as a supersampled master and every density is
+resampled from it in linear light (``pyramid.Master``).
+
+Outputs are keyed by the source digest and the asset spec in a manifest under
+``build/``, so unchanged icons are not regenerated. That manifest is a local
+cache; ``drifted`` renders every output in memory and compares its pixels
+with the file on disk. That is a report, not a gate: the committed launcher
+icons are the shipped design and are left as they are.
+"""
+
+from __future__ import annotations
+
+import argparse
+import functools
+import hashlib
+import json
+import sys
+import time
+from collections.abc import Iterator
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mockupkit import pyramid, registry, render
+
+REPO_DIR = registry.MOCKUP_DIR.parent.parent
+SOURCE = REPO_DIR / "public" / "brand" / "conzia-logo.png"
+RES_DIR = REPO_DIR / "android" / "app" / "src" / "main" / "res"
+MANIFEST = registry.MOCKUP_DIR / "build" / "icons" / "manifest.json"
+
+# Android density buckets as scale over dp.
+DENSITIES = {"mdpi": 1.0, "hdpi": 1.5, "xhdpi": 2.0, "xxhdpi": 3.0, "xxxhdpi": 4.0}
+
+SAND = (163, 148, 131)
+SUPERSAMPLE = 4
+# Bump when the composition changes so every output is considered stale.
+VERSION = 1
+
+
+@dataclass(frozen=True)
+class Asset:
+    name: str
+    folder: str
+    shape: str | None  # "square", "round" or None for the unmasked splash
+    width_dp: int
+    # Mark height relative to the icon; the splash uses the whole logo instead.
+    mark: float = 0.62
+
+
+ASSETS = (
+    Asset("ic_launcher", "mipmap", "square", 48),
+    Asset("ic_launcher_round", "mipmap", "round", 48),
+    Asset("splash_screen", "drawable", None, 200),
+)
+
+
+@functools.lru_cache(maxsize=4)
+def _source(path: Path) -> tuple[Image.Image, bytes]:
+    data = path.read_bytes()
+    im = Image.open(path)
+    im.load()
+    return im.convert("RGBA"), data
+
+
+def _digest(path: Path) -> str:
+    return hashlib.sha256(_source(path)[1]).hexdigest()
+
+
+@functools.lru_cache(maxsize=4)
+def _logo(path: Path) -> Image.Image:
+    im, _ = _source(path)
+    return im.crop(im.getchannel("A").getbbox())
+
+
+@functools.lru_cache(maxsize=4)
+def _mark(path: Path) -> Image.Image:
+    logo = _logo(path)
+    rows = (np.asarray(logo.getchannel("A")) > 0).any(axis=1)
+    # The first transparent row after the mark separates it from the wordmark.
+    gap = np.flatnonzero(~rows)
+    mark = logo.crop((0, 0, logo.width, int(gap[0]) if gap.size else logo.height))
+    return mark.crop(mark.getchannel("A").getbbox())
+
+
+@functools.lru_cache(maxsize=8)
+def _mask(shape: str, size: int) -> Image.Image:
+    mask = Image.new("L", (size, size), 0)
+    draw = ImageDraw.Draw(mask)
+    if shape == "round":
+        inset = round(size * 3 / 192)
+        draw.ellipse((inset, inset, size - inset - 1, size - inset - 1), fill=255)
+    else:
+        inset = round(size * 12 / 192)
+        draw.rounded_rectangle((inset, inset, size - inset - 1, size - inset - 1), radius=round(size * 0.19), fill=255)
+    return mask
+
+
+def _fit(im: Image.Image, size: tuple[int, int]) -> Image.Image:
+    return pyramid.Master(im).resize(size)
+
+
+def _size(asset: Asset, path: Path, scale: float) -> tuple[int, int]:
+    w = round(asset.width_dp * scale)
+    if asset.shape is not None:
+        return (w, w)
+    logo = _logo(path)
+    return (w, round(w * logo.height / logo.width))
+
+
+def compose(asset: Asset, path: Path = SOURCE) -> Image.Image:
+    """The asset at ``SUPERSAMPLE`` times its largest density (splash: at that density)."""
+    top = max(DENSITIES.values())
+    if asset.shape is None:
+        logo = _logo(path)
+        tinted = Image.new("RGBA", logo.size, SAND + (255,))
+        tinted.putalpha(logo.getchannel("A"))
+        return _fit(tinted, _size(asset, path, top))
+
+    size = round(asset.width_dp * top * SUPERSAMPLE)
+    im = Image.new("RGBA", (size, size), SAND + (0,))
+    im.putalpha(_mask(asset.shape, size))
+    mark = _mark(path)
+    mh = round(size * asset.mark)
+    mw = round(mark.width * mh / mark.height)
+    im.alpha_composite(_fit(mark, (mw, mh)), ((size - mw) // 2, (size - mh) // 2))
+    return im
+
+
+@dataclass(frozen=True)
+class Output:
+    asset: Asset
+    density: str
+    path: Path
+    key: str
+
+
+def plan(path: Path = SOURCE, res_dir: Path = RES_DIR) -> Iterator[Output]:
+    digest = _digest(path)
+    for asset in ASSETS:
+        spec = json.dumps({"version": VERSION, "sand": SAND, **asdict(asset)}, sort_keys=True)
+        key = hashlib.sha256(f"{digest}:{spec}".encode()).hexdigest()
+        for density in DENSITIES:
+            yield Output(asset, density, res_dir / f"{asset.folder}-{density}" / f"{asset.name}.png", key)
+
+
+def load_manifest(path: Path = MANIFEST) -> dict[str, str]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(manifest: dict[str, str], path: Path = MANIFEST) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def stale(outputs: list[Output], manifest: dict[str, str]) -> list[Output]:
+    return [o for o in outputs if manifest.get(str(o.path)) != o.key or not o.path.exists()]
+
+
+def _resized(outputs: list[Output], path: Path) -> Iterator[tuple[Output, pyramid.Master, tuple[int, int]]]:
+    # One master per asset, shared by its densities.
+    masters: dict[Asset, pyramid.Master] = {}
+    for out in outputs:
+        master = masters.get(out.asset)
+        if master is None:
+            master = masters[out.asset] = pyramid.Master(compose(out.asset, path))
+        yield out, master, _size(out.asset, path, DENSITIES[out.density])
+
+
+def submit(outputs: list[Output], executor: Executor, path: Path = SOURCE) -> list[Future[Output]]:
+    """Compose one master per stale asset and resample/write its densities on ``executor``."""
+    futures: list[Future[Output]] = []
+    for out, master, size in _resized(outputs, path):
+
+        def job(out: Output = out, master: pyramid.Master = master, size: tuple[int, int] = size) -> Output:
+            render.save(master.resize(size), out.path)
+            return out
+
+        futures.append(executor.submit(job))
+    return futures
+
+
+def _differs(im: Image.Image, path: Path) -> bool:
+    if not path.exists():
+        return True
+    with Image.open(path) as old:
+        return old.size != im.size or not np.array_equal(np.asarray(old.convert("RGBA")), np.asarray(im.convert("RGBA")))
+
+
+def drifted(outputs: list[Output], executor: Executor, path: Path = SOURCE) -> list[Output]:
+    """Outputs whose file is missing or differs from a fresh render; nothing is written."""
+    futures = [
+        executor.submit(lambda out=out, master=master, size=size: _differs(master.resize(size), out.path))
+        for out, master, size in _resized(outputs, path)
+    ]
+    return [out for out, f in zip(outputs, futures) if f.result()]
+
+
+def command(args: argparse.Namespace) -> int:
+    source = Path(args.source)
+    outputs = list(plan(source, Path(args.res)))
+    if args.check:
+        # The manifest only lives in build/; compare against what is committed.
+        with ThreadPoolExecutor(max_workers=args.workers) as executor:
+            todo = drifted(outputs, executor, source)
+        for out in todo:
+            print(f"stale {out.path}", file=sys.stderr)
+        print(f"icons: {len(todo)} of {len(outputs)} outputs differ from a fresh render", file=sys.stderr)
+        return 0
+    manifest = {} if args.force else load_manifest()
+    todo = stale(outputs, manifest)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for f in submit(todo, executor, source):
+            out = f.result()
+            manifest[str(out.path)] = out.key
+    save_manifest(manifest)
+    print(
+        f"icons: wrote {len(todo)}, {len(outputs) - len(todo)} up to date ({time.perf_counter() - t0:.2f}s)",
+        file=sys.stderr,
+    )
+    return 0
@@ -0,0 +1,441 @@
+"""Layout-only pass: run builders against a recorder instead of pixels.
+
+Text is measured with the same fonts and the same ``_wrap``/``_wrap_text``
+helpers, but nothing is rasterized, composited or encoded. Each drawn element
+is kept with its box so overflows can be checked in a fraction of a render.
+The ``layout``, ``localize`` and ``devices`` commands report those overflows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from PIL import ImageFont
+
+from mockupkit import cache, context, devices, i18n, registry, render
+from mockupkit.i18n import SOURCE_LOCALE
+
+Box = tuple[int, int, int, int]
+
+_CONTAINER_KINDS = ("rectangle", "rounded_rectangle", "ellipse")
+
+# Text boxes measured by earlier dry runs; see ``cache.load_boxes``.
+BOXES = registry.MOCKUP_DIR / "build" / "layout" / "text_bbox.json"
+
+
+@dataclass
+class Element:
+    kind: str
+    box: Box
+    text: str | None = None
+    lines: list[str] | None = None
+    font: ImageFont.ImageFont | None = None
+    fill: Any = None
+    outline: Any = None
+    width: int = 0
+    radius: int = 0
+    max_w: int | None = None
+    line_height: int | None = None
+    points: list[tuple[int, int]] | None = None
+    angles: tuple[float, float] | None = None
+    in_paragraph: bool = False
+    # Where text was drawn; a paragraph's lines take ``line_height`` rows each from here.
+    origin: tuple[int, int] | None = None
+    container: Box | None = None
+    overflow: dict[str, int] = field(default_factory=dict)
+
+
+class Recorder:
+    def __init__(self, size: tuple[int, int]) -> None:
+        self.size = size
+        self.elements: list[Element] = []
+
+    def add(self, element: Element) -> Element:
+        self.elements.append(element)
+        return element
+
+
+def _box(xy) -> Box:
+    if len(xy) == 2:
+        (x1, y1), (x2, y2) = xy
+    else:
+        x1, y1, x2, y2 = xy
+    return (int(x1), int(y1), int(x2), int(y2))
+
+
+def _points_box(points: list[tuple[int, int]]) -> Box:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (int(min(xs)), int(min(ys)), int(max(xs)), int(max(ys)))
+
+
+class LayoutImage:
+    """Stand-in for a PIL image; every operation is free and keeps the recorder."""
+
+    def __init__(self, recorder: Recorder, mode: str, size: tuple[int, int]) -> None:
+        self.recorder = recorder
+        self.mode = mode
+        self.size = size
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    def convert(self, mode: str | None = None, *args, **kwargs) -> LayoutImage:
+        return LayoutImage(self.recorder, mode or self.mode, self.size)
+
+    def copy(self) -> LayoutImage:
+        return LayoutImage(self.recorder, self.mode, self.size)
+
+    def crop(self, box) -> LayoutImage:
+        x1, y1, x2, y2 = _box(box)
+        return LayoutImage(self.recorder, self.mode, (x2 - x1, y2 - y1))
+
+    def filter(self, *args, **kwargs) -> LayoutImage:
+        return self
+
+    def alpha_composite(self, *args, **kwargs) -> None:
+        return None
+
+    def paste(self, *args, **kwargs) -> None:
+        return None
+
+
+class LayoutDraw:
+    """Duck-typed ``ImageDraw`` that records what would have been drawn."""
+
+    def __init__(self, recorder: Recorder) -> None:
+        self.recorder = recorder
+
+    def textbbox(self, xy, text: str, font=None, **kwargs) -> Box:
+        if kwargs:
+            return cache.MEASURE.textbbox(xy, text, font=font, **kwargs)
+        x, y = xy
+        b = cache.text_bbox(font, text)
+        return (b[0] + x, b[1] + y, b[2] + x, b[3] + y)
+
+    def textlength(self, text: str, font=None, **kwargs) -> float:
+        return cache.MEASURE.textlength(text, font=font, **kwargs)
+
+    def text(self, xy, text: str, fill=None, font=None, **kwargs) -> None:
+        box = self.textbbox(xy, text, font=font)
+        origin = (int(xy[0]), int(xy[1]))
+        self.recorder.add(Element("text", box, text=text, font=font, fill=fill, origin=origin))
+
+    def paragraph(self, xy, lines: list[str], font, max_w: int, lh: int) -> None:
+        elements = self.recorder.elements
+        children = elements[len(elements) - len(lines) :] if lines else []
+        for child in children:
+            child.in_paragraph = True
+        x, y = xy
+        if children:
+            box = (
+                min(c.box[0] for c in children),
+                min(c.box[1] for c in children),
+                max(c.box[2] for c in children),
+                max(c.box[3] for c in children),
+            )
+        else:
+            box = (x, y, x, y)
+        para = Element(
+            "paragraph",
+            box,
+            text=" ".join(lines),
+            lines=list(lines),
+            font=font,
+            fill=children[0].fill if children else None,
+            max_w=max_w,
+            line_height=lh,
+            origin=(int(x), int(y)),
+        )
+        elements.insert(len(elements) - len(children), para)
+
+    def rounded_rectangle(self, xy, radius: int = 0, fill=None, outline=None, width: int = 1, **kwargs) -> None:
+        self.recorder.add(
+            Element("rounded_rectangle", _box(xy), fill=fill, outline=outline, width=width, radius=radius)
+        )
+
+    def rectangle(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        self.recorder.add(Element("rectangle", _box(xy), fill=fill, outline=outline, width=width))
+
+    def ellipse(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        self.recorder.add(Element("ellipse", _box(xy), fill=fill, outline=outline, width=width))
+
+    def arc(self, xy, start: float, end: float, fill=None, width: int = 1) -> None:
+        self.recorder.add(Element("arc", _box(xy), outline=fill, width=width, angles=(start, end)))
+
+    def line(self, xy, fill=None, width: int = 0, joint=None) -> None:
+        points = _pairs(xy)
+        self.recorder.add(Element("line", _points_box(points), outline=fill, width=width, points=points))
+
+    def polygon(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        points = _pairs(xy)
+        self.recorder.add(Element("polygon", _points_box(points), fill=fill, outline=outline, width=width, points=points))
+
+    def bitmap(self, xy, bitmap, fill=None) -> None:
+        x, y = (int(v) for v in xy)
+        w, h = bitmap.size
+        self.recorder.add(Element("bitmap", (x, y, x + w, y + h), fill=fill))
+
+
+def _pairs(xy) -> list[tuple[int, int]]:
+    flat = list(xy)
+    if flat and not isinstance(flat[0], (tuple, list)):
+        return [(int(flat[i]), int(flat[i + 1])) for i in range(0, len(flat), 2)]
+    return [(int(p[0]), int(p[1])) for p in flat]
+
+
+def _contains(outer: Box, x: float, y: float) -> bool:
+    return outer[0] <= x <= outer[2] and outer[1] <= y <= outer[3]
+
+
+def _area(box: Box) -> int:
+    return max(0, box[2] - box[0]) * max(0, box[3] - box[1])
+
+
+def _rows(el: Element) -> tuple[int, int]:
+    """Rows a text block takes: from where it was drawn to its ink or, for a paragraph, its last line slot."""
+    top = el.origin[1] if el.origin is not None else el.box[1]
+    bottom = el.box[3]
+    if el.kind == "paragraph" and el.line_height and el.lines:
+        bottom = max(bottom, top + len(el.lines) * el.line_height)
+    return top, bottom
+
+
+def _overlap(above: Element, below: Element) -> int:
+    """Rows ``below`` starts inside ``above`` when both share columns, else 0."""
+    if above.box[2] <= below.box[0] or below.box[2] <= above.box[0]:
+        return 0
+    (a_top, a_bottom), (b_top, _) = _rows(above), _rows(below)
+    if b_top < a_top:
+        return 0
+    return max(0, a_bottom - b_top)
+
+
+def analyze(recorder: Recorder) -> list[dict[str, Any]]:
+    """Assign each text block its container and return the overflows found."""
+    w, h = recorder.size
+    canvas_box: Box = (0, 0, w, h)
+    containers: list[Element] = []
+    issues: list[dict[str, Any]] = []
+    # Last text block per container, for blocks stacked on one another.
+    previous: dict[Box, Element] = {}
+
+    for el in recorder.elements:
+        if el.kind in _CONTAINER_KINDS and (el.fill is not None or el.outline is not None):
+            containers.append(el)
+            continue
+        if el.kind not in ("text", "paragraph") or el.in_paragraph:
+            continue
+
+        cx = (el.box[0] + el.box[2]) / 2
+        cy = (el.box[1] + el.box[3]) / 2
+        owners = [c.box for c in containers if _contains(c.box, cx, cy)]
+        el.container = min(owners, key=_area) if owners else canvas_box
+
+        c = el.container
+        overflow = {
+            "left": c[0] - el.box[0],
+            "top": c[1] - el.box[1],
+            "right": el.box[2] - c[2],
+            "bottom": el.box[3] - c[3],
+        }
+        el.overflow = {k: v for k, v in overflow.items() if v > 0}
+        if el.overflow:
+            issues.append({"kind": "container", "text": el.text, "box": list(el.box), "container": list(c), **el.overflow})
+
+        above = previous.get(c)
+        previous[c] = el
+        if above is not None and (rows := _overlap(above, el)):
+            issues.append({"kind": "overlap", "text": el.text, "box": list(el.box), "above": above.text, "rows": rows})
+
+        if el.kind == "paragraph" and el.max_w is not None:
+            for line in el.lines or []:
+                lw = _line_width(line, el.font)
+                if lw > el.max_w:
+                    issues.append({"kind": "wrap", "text": line, "width": lw, "max_width": el.max_w})
+    return issues
+
+
+def _line_width(line: str, font) -> int:
+    b = cache.text_bbox(font, line)
+    return b[2] - b[0]
+
+
+def _font_label(font) -> str | None:
+    if font is None:
+        return None
+    try:
+        name, style = font.getname()
+    except Exception:
+        return None
+    size = getattr(font, "size", None)
+    return f"{name} {style} {size}".strip()
+
+
+def _color(c) -> Any:
+    return list(c) if isinstance(c, tuple) else c
+
+
+def element_json(el: Element) -> dict[str, Any]:
+    out: dict[str, Any] = {"kind": el.kind, "box": list(el.box)}
+    if el.text is not None:
+        out["text"] = el.text
+        out["font"] = _font_label(el.font)
+    if el.lines is not None:
+        out["lines"] = el.lines
+        out["max_width"] = el.max_w
+        out["line_height"] = el.line_height
+    if el.container is not None:
+        out["container"] = list(el.container)
+    if el.overflow:
+        out["overflow"] = el.overflow
+    if el.fill is not None:
+        out["fill"] = _color(el.fill)
+    if el.outline is not None:
+        out["outline"] = _color(el.outline)
+    return out
+
+
+def frame_json(recorder: Recorder, issues: list[dict[str, Any]], **meta: Any) -> dict[str, Any]:
+    return {
+        **meta,
+        "size": list(recorder.size),
+        "elements": [element_json(el) for el in recorder.elements if not el.in_paragraph],
+        "overflows": issues,
+    }
+
+
+def measure(
+    family: registry.Family,
+    theme_key: str,
+    screen_key: str,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+) -> tuple[Recorder, list[dict[str, Any]]]:
+    """Run one builder in layout mode and return its recorder and overflows."""
+    w, h = device.pixels
+    recorder = Recorder((w, h))
+    with context.use(recorder=recorder, locale=locale, device=device):
+        fonts = registry.fonts_for(family.key, device.scale)
+        family.screens[screen_key](w, h, family.themes[theme_key], fonts)
+    return recorder, analyze(recorder)
+
+
+def command(args: argparse.Namespace) -> int:
+    t0 = time.perf_counter()
+    frames = []
+    n_issues = 0
+    profiles = devices.select(args.device) if args.device else [devices.DEFAULT]
+    cache.load_boxes(BOXES)
+    for locale in args.locale or i18n.locales():
+        for device in profiles:
+            for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+                recorder, issues = measure(family, theme_key, screen_key, locale, device)
+                n_issues += len(issues)
+                frames.append(
+                    frame_json(
+                        recorder,
+                        issues,
+                        family=family.key,
+                        theme=theme_key,
+                        screen=screen_key,
+                        locale=locale,
+                        device=device.key,
+                    )
+                )
+    cache.save_boxes(BOXES)
+    elapsed = time.perf_counter() - t0
+
+    payload = json.dumps({"frames": frames}, ensure_ascii=False, indent=2 if args.indent else None)
+    if args.output:
+        Path(args.output).write_text(payload, encoding="utf-8")
+    else:
+        print(payload)
+
+    for frame in frames:
+        for issue in frame["overflows"]:
+            where = f"{frame['locale']}/{frame['device']}/{frame['family']}/{frame['theme']}/{frame['screen']}"
+            print(f"overflow {where}: {issue}", file=sys.stderr)
+    print(f"layout: {len(frames)} frames, {n_issues} overflows in {elapsed * 1000:.0f} ms", file=sys.stderr)
+    return 1 if args.check and n_issues else 0
+
+
+def localize_command(args: argparse.Namespace) -> int:
+    out_dir = Path(args.out)
+    report: dict[str, dict] = {}
+    n_issues = 0
+    for locale in args.locale or i18n.locales():
+        t0 = time.perf_counter()
+        overflows = []
+        n_frames = 0
+        for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+            im = render.render(family, theme_key, screen_key, locale)
+            render.save(im, out_dir / locale / family.output_name(theme_key, screen_key), optimize=not args.fast)
+            _, issues = measure(family, theme_key, screen_key, locale)
+            overflows += [{"family": family.key, "theme": theme_key, "screen": screen_key, **i} for i in issues]
+            n_frames += 1
+        elapsed = time.perf_counter() - t0
+        n_issues += len(overflows)
+        report[locale] = {
+            "frames": n_frames,
+            "seconds": round(elapsed, 3),
+            "overflows": overflows,
+            "missing": i18n.missing(locale),
+        }
+        print(f"{locale}: {n_frames} frames, {len(overflows)} overflows in {elapsed:.2f}s", file=sys.stderr)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    payload = {"locales": report, "caches": cache.stats()}
+    (out_dir / "overflow_report.json").write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"wrote {out_dir / 'overflow_report.json'}", file=sys.stderr)
+    return 1 if args.check and n_issues else 0
+
+
+def devices_command(args: argparse.Namespace) -> int:
+    if args.list:
+        for d in devices.select(args.device):
+            w, h = d.pixels
+            print(f"{d.key:22s} {d.label:24s} {d.points[0]}x{d.points[1]} @{d.scale:g}x -> {w}x{h}  safe {d.safe.top:g}/{d.safe.bottom:g}")
+        return 0
+
+    out_dir = Path(args.out)
+    locale = args.locale
+    report: dict[str, dict] = {}
+    n_issues = 0
+    for device in devices.select(args.device):
+        t0 = time.perf_counter()
+        overflows = []
+        n_frames = 0
+        for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+            im = render.render(family, theme_key, screen_key, locale, device)
+            render.save(im, out_dir / device.key / family.output_name(theme_key, screen_key), optimize=not args.fast)
+            _, issues = measure(family, theme_key, screen_key, locale, device)
+            overflows += [{"family": family.key, "theme": theme_key, "screen": screen_key, **i} for i in issues]
+            n_frames += 1
+        elapsed = time.perf_counter() - t0
+        n_issues += len(overflows)
+        report[device.key] = {
+            "size": list(device.pixels),
+            "scale": device.scale,
+            "frames": n_frames,
+            "seconds": round(elapsed, 3),
+            "overflows": overflows,
+        }
+        print(f"{device.key}: {n_frames} frames, {len(overflows)} overflows in {elapsed:.2f}s", file=sys.stderr)
+
+    out_dir.mkdir(parents=True, exist_ok=True)
+    payload = {"locale": locale, "devices": report, "caches": cache.stats()}
+    (out_dir / "device_report.json").write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"wrote {out_dir / 'device_report.json'}", file=sys.stderr)
+    return 1 if args.check and n_issues else 0
@@ -0,0 +1,278 @@
+"""Memory accounting for render runs and memory-aware worker counts.
+
+Three views of a render: the process peak RSS (reset per screen through
+``/proc/self/clear_refs`` on Linux), the Pillow image buffers alive at any
+moment, attributed to the innermost traced helper that allocated them (see
+``trace``), and Python/numpy allocations through ``tracemalloc``.
+
+The worst per-screen RSS growth of a run is saved as the per-worker budget
+hint; pools size themselves with ``workers`` so that many renders fit in the
+memory actually available (cgroup limit included).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gc
+import heapq
+import io
+import json
+import os
+import re
+import resource
+import sys
+import threading
+import tracemalloc
+import weakref
+from collections import defaultdict
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image
+
+from mockupkit import cache, devices, registry, render, trace
+
+REPORT = registry.MOCKUP_DIR / "build" / "memory" / "report.json"
+MB = 1 << 20
+
+_STATUS = Path("/proc/self/status")
+_CLEAR_REFS = Path("/proc/self/clear_refs")
+
+
+def _status_kb(field: str) -> int | None:
+    try:
+        m = re.search(rf"^{field}:\s+(\d+) kB", _STATUS.read_text(), re.M)
+    except OSError:
+        return None
+    return int(m.group(1)) * 1024 if m else None
+
+
+def rss() -> int | None:
+    return _status_kb("VmRSS")
+
+
+def rss_peak() -> int:
+    """Peak RSS in bytes since the last ``reset_peak`` (process lifetime where it can't be reset)."""
+    peak = _status_kb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+
+def reset_peak() -> bool:
+    try:
+        _CLEAR_REFS.write_text("5")
+    except OSError:
+        return False
+    return True
+
+
+def _read_int(path: Path) -> int | None:
+    try:
+        text = path.read_text().strip()
+    except OSError:
+        return None
+    return int(text) if text.isdigit() else None
+
+
+def available() -> int | None:
+    """Bytes a new worker can still use: free system memory, capped by the cgroup limit."""
+    options = []
+    meminfo = Path("/proc/meminfo")
+    if meminfo.exists():
+        m = re.search(r"^MemAvailable:\s+(\d+) kB", meminfo.read_text(), re.M)
+        if m:
+            options.append(int(m.group(1)) * 1024)
+    for limit, usage in (
+        ("/sys/fs/cgroup/memory.max", "/sys/fs/cgroup/memory.current"),
+        ("/sys/fs/cgroup/memory/memory.limit_in_bytes", "/sys/fs/cgroup/memory/memory.usage_in_bytes"),
+    ):
+        cap, used = _read_int(Path(limit)), _read_int(Path(usage))
+        if cap is not None and used is not None:
+            options.append(max(0, cap - used))
+            break
+    if not options and hasattr(os, "sysconf"):
+        with contextlib.suppress(ValueError, OSError):
+            options.append(os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE"))
+    return min(options) if options else None
+
+
+def budget(value: str | None) -> int | None:
+    """Per-worker budget in bytes from ``--memory-budget``: megabytes, or ``auto`` for the last report's hint."""
+    if not value:
+        return None
+    if value == "auto":
+        if not REPORT.exists():
+            raise ValueError(f"--memory-budget auto needs a report; run `memory` first ({REPORT})")
+        return int(json.loads(REPORT.read_text(encoding="utf-8"))["budget_hint_mb"] * MB)
+    return int(float(value) * MB)
+
+
+def workers(requested: int, budget_: int | None) -> int:
+    """``requested`` workers, fewer if ``budget_`` bytes each would not fit in available memory."""
+    if not budget_:
+        return requested
+    free = available()
+    if free is None:
+        return requested
+    return max(1, min(requested, free // budget_))
+
+
+@dataclass(frozen=True)
+class Allocation:
+    bytes: int
+    size: tuple[int, int]
+    mode: str
+    stage: str
+
+
+@dataclass(frozen=True)
+class ScreenMemory:
+    screen: str
+    rss_peak: int
+    # Peak RSS growth over the RSS the screen started from.
+    rss_growth: int
+    image_peak: int
+    # Peak live image bytes allocated by each helper.
+    stages: dict[str, int]
+    largest: list[Allocation]
+    python_peak: int | None
+
+
+class Accountant:
+    """Live Pillow image buffers, per allocating helper, tracked until each image is collected."""
+
+    def __init__(self, tracer: trace.Tracer, top: int = 10) -> None:
+        self.tracer = tracer
+        self.top = top
+        self.live = 0
+        self.live_by_stage: dict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+        self.begin("")
+
+    def begin(self, screen: str) -> None:
+        with self._lock:
+            self.screen = screen
+            self.peak = self.live
+            self.peak_by_stage: dict[str, int] = dict(self.live_by_stage)
+            self.largest: list[tuple[int, int, Allocation]] = []
+            self._seq = 0
+
+    def allocated(self, im: Image.Image) -> None:
+        w, h = im.size
+        n = w * h * Image.getmodebands(im.mode)
+        stage = self.tracer.current() or "-"
+        with self._lock:
+            self.live += n
+            self.live_by_stage[stage] += n
+            self.peak = max(self.peak, self.live)
+            self.peak_by_stage[stage] = max(self.peak_by_stage.get(stage, 0), self.live_by_stage[stage])
+            self._seq += 1
+            item = (n, self._seq, Allocation(n, (w, h), im.mode, stage))
+            if len(self.largest) < self.top:
+                heapq.heappush(self.largest, item)
+            elif n > self.largest[0][0]:
+                heapq.heapreplace(self.largest, item)
+        weakref.finalize(im, self._freed, stage, n)
+
+    def _freed(self, stage: str, n: int) -> None:
+        with self._lock:
+            self.live -= n
+            self.live_by_stage[stage] -= n
+
+    def end(self, rss_start: int | None, python_peak: int | None) -> ScreenMemory:
+        peak = rss_peak()
+        with self._lock:
+            stages = dict(sorted(((s, v) for s, v in self.peak_by_stage.items() if v), key=lambda kv: -kv[1]))
+            largest = [a for _, _, a in sorted(self.largest, reverse=True)]
+            return ScreenMemory(
+                self.screen, peak, peak - (rss_start or 0), self.peak, stages, largest, python_peak
+            )
+
+
+@contextlib.contextmanager
+def accounting(top: int = 10) -> Iterator[Accountant]:
+    """Track image buffers for the block; tracing is enabled too so helpers can be named."""
+    with contextlib.ExitStack() as stack:
+        tracer = trace.active() or stack.enter_context(trace.enabled())
+        accountant = Accountant(tracer, top)
+        new = Image.Image._new
+
+        def counted_new(self: Image.Image, im: Any) -> Image.Image:
+            out = new(self, im)
+            accountant.allocated(out)
+            return out
+
+        Image.Image._new = counted_new
+        try:
+            yield accountant
+        finally:
+            Image.Image._new = new
+
+
+def to_json(screens: list[ScreenMemory], python_top: list[dict[str, Any]]) -> dict[str, Any]:
+    growth = max((s.rss_growth for s in screens), default=0)
+    return {
+        "budget_hint_mb": round(growth / MB, 1),
+        "screens": [
+            {
+                **{k: v for k, v in asdict(s).items() if k not in ("stages", "largest")},
+                "stages": s.stages,
+                "largest": [asdict(a) for a in s.largest],
+            }
+            for s in screens
+        ],
+        "python_retained": python_top,
+    }
+
+
+def command(args: argparse.Namespace) -> int:
+    device = devices.DEVICES[args.device]
+    if args.python:
+        tracemalloc.start()
+    screens = []
+    with accounting(args.top) as accountant:
+        for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+            if args.cold:
+                cache.clear()
+            gc.collect()
+            reset_peak()
+            start = rss()
+            if args.python:
+                tracemalloc.reset_peak()
+            accountant.begin(f"{family.key}/{theme_key}/{screen_key}")
+            im = render.render(family, theme_key, screen_key, args.locale, device)
+            im.save(io.BytesIO(), format="PNG")
+            del im
+            python_peak = tracemalloc.get_traced_memory()[1] if args.python else None
+            s = accountant.end(start, python_peak)
+            screens.append(s)
+            py = f"  python {s.python_peak / MB:7.1f}MB" if s.python_peak is not None else ""
+            print(
+                f"{s.screen:32s} rss {s.rss_peak / MB:7.1f}MB (+{s.rss_growth / MB:.1f})"
+                f"  images {s.image_peak / MB:7.1f}MB{py}",
+                file=sys.stderr,
+            )
+            for stage, n in list(s.stages.items())[:3]:
+                print(f"    {stage:28s} {n / MB:7.1f}MB live", file=sys.stderr)
+
+    python_top = []
+    if args.python:
+        snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, "<frozen *>")])
+        for stat in snapshot.statistics("lineno")[: args.top]:
+            frame = stat.traceback[0]
+            python_top.append({"where": f"{frame.filename}:{frame.lineno}", "bytes": stat.size, "count": stat.count})
+        tracemalloc.stop()
+    report = to_json(screens, python_top)
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    free = available()
+    fit = f", {free // max(1, int(report['budget_hint_mb'] * MB))} fit in available memory" if free else ""
+    print(f"memory: per-worker budget hint {report['budget_hint_mb']}MB{fit}; wrote {out}", file=sys.stderr)
+    return 0
@@ -0,0 +1,345 @@
+"""Animated transitions rendered with dirty rectangles.
+
+A transition renders its screen twice: once as usual (the last frame) and
+once as the static base, with the moving element left out (builders mark it
+with ``element``). The element's sprite is what the two renders differ by
+inside its box. Every frame then starts from the previous one, restores from
+the base only the rectangle the element covered before and covers now, and
+paints the element there, so backgrounds, blurs and text are rendered once.
+
+Frames go to an APNG whose frames after the first are just those rectangles,
+written as they are produced, or to a numbered PNG sequence.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import struct
+import sys
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from PIL import Image, ImageChops
+
+from mockupkit import bands, context, devices, registry, render
+from mockupkit.i18n import SOURCE_LOCALE
+
+Box = tuple[int, int, int, int]
+
+
+@dataclass
+class Capture:
+    hidden: frozenset[str]
+    boxes: dict[str, Box] = field(default_factory=dict)
+    extra: dict[str, dict[str, Any]] = field(default_factory=dict)
+
+
+def element(name: str, box: Box, **extra: Any) -> bool:
+    """Mark a moving element; True when it (and whatever follows it) must be left out.
+
+    ``box`` is where the element sits in the finished frame. Its sprite is
+    what the two renders differ by inside the box, or the whole box when
+    ``opaque`` is passed. Other ``extra`` values carry what the transition
+    needs beyond pixels (e.g. the drawer's scrim color).
+    """
+    capture = context.current().motion
+    if capture is None:
+        return False
+    capture.boxes[name] = tuple(int(v) for v in box)
+    capture.extra[name] = extra
+    return name in capture.hidden
+
+
+@dataclass(frozen=True)
+class Scene:
+    base: Image.Image
+    final: Image.Image
+    box: Box
+    # The element cut out of ``final``: RGBA, opaque where the renders differ.
+    sprite: Image.Image
+    extra: dict[str, Any]
+
+
+def _scene(family: registry.Family, theme_key: str, screen_key: str, name: str, locale: str, device: devices.Device) -> Scene:
+    capture = Capture(frozenset())
+    with context.use(motion=capture):
+        final = render.render(family, theme_key, screen_key, locale, device).convert("RGB")
+    if name not in capture.boxes:
+        raise ValueError(f"{family.key}/{screen_key} has no {name!r} element")
+    with context.use(motion=Capture(frozenset({name}))):
+        base = render.render(family, theme_key, screen_key, locale, device).convert("RGB")
+    box = capture.boxes[name]
+    extra = capture.extra[name]
+    sprite = final.crop(box).convert("RGBA")
+    if not extra.get("opaque"):
+        r, g, b = ImageChops.difference(final.crop(box), base.crop(box)).split()
+        sprite.putalpha(ImageChops.lighter(ImageChops.lighter(r, g), b).point(lambda v: 255 if v else 0))
+    return Scene(base, final, box, sprite, extra)
+
+
+def _dim(scene: Scene) -> dict[str, Any]:
+    dimmed = scene.base.convert("RGBA")
+    dimmed.alpha_composite(Image.new("RGBA", dimmed.size, scene.extra["scrim"]))
+    return {"dimmed": dimmed.convert("RGB")}
+
+
+def ease_out(t: float) -> float:
+    return 1 - (1 - t) ** 3
+
+
+def _union(a: Box, b: Box) -> Box:
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def _clip(box: Box, size: tuple[int, int]) -> Box:
+    return (max(0, box[0]), max(0, box[1]), min(size[0], box[2]), min(size[1], box[3]))
+
+
+# Where the element is at progress ``t``.
+Region = Callable[[Scene, float], Box]
+# Paints progress ``t`` over ``crop``, the base cut at ``origin``; returns the painted crop.
+Paint = Callable[[Image.Image, Box, Scene, float], Image.Image]
+
+
+def _slide_up_offset(scene: Scene, t: float) -> int:
+    return round((1 - ease_out(t)) * (scene.final.height - scene.box[1]))
+
+
+def _slide_up_region(scene: Scene, t: float) -> Box:
+    x0, y0, x1, y1 = scene.box
+    dy = _slide_up_offset(scene, t)
+    return (x0, y0 + dy, x1, y1 + dy)
+
+
+def _slide_up_paint(crop: Image.Image, origin: Box, scene: Scene, t: float) -> Image.Image:
+    x0, y0 = scene.box[:2]
+    crop.paste(scene.sprite, (x0 - origin[0], y0 + _slide_up_offset(scene, t) - origin[1]), scene.sprite)
+    return crop
+
+
+def _drawer_offset(scene: Scene, t: float) -> int:
+    return -round((1 - ease_out(t)) * scene.box[2])
+
+
+def _drawer_region(scene: Scene, t: float) -> Box:
+    # The scrim fades over the whole frame.
+    return (0, 0, *scene.final.size)
+
+
+def _drawer_paint(crop: Image.Image, origin: Box, scene: Scene, t: float) -> Image.Image:
+    crop = Image.blend(crop, scene.extra["dimmed"].crop(origin), ease_out(t))
+    x0, y0 = scene.box[:2]
+    crop.paste(scene.sprite, (x0 + _drawer_offset(scene, t) - origin[0], y0 - origin[1]), scene.sprite)
+    return crop
+
+
+_PULSE_HALO = 0.6
+
+
+def _pulse_region(scene: Scene, t: float) -> Box:
+    x0, y0, x1, y1 = scene.box
+    grow = math.ceil((x1 - x0) * _PULSE_HALO / 2) + 1
+    return (x0 - grow, y0 - grow, x1 + grow, y1 + grow)
+
+
+def _pulse_paint(crop: Image.Image, origin: Box, scene: Scene, t: float) -> Image.Image:
+    # A fading, growing echo of the button behind the button itself breathing.
+    x0, y0, x1, y1 = scene.box
+    cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+    frame = crop.convert("RGBA")
+    for scale, alpha in ((1 + _PULSE_HALO * t, 0.35 * (1 - t)), (1 + 0.04 * math.sin(2 * math.pi * t), 1.0)):
+        size = (max(1, round(scene.sprite.width * scale)), max(1, round(scene.sprite.height * scale)))
+        layer = scene.sprite.resize(size, Image.Resampling.BILINEAR)
+        if alpha < 1:
+            layer.putalpha(layer.getchannel("A").point(lambda v, a=alpha: round(v * a)))
+        # Round in frame coordinates so every crop places the layer on the same pixel.
+        frame.alpha_composite(layer, (round(cx - size[0] / 2) - origin[0], round(cy - size[1] / 2) - origin[1]))
+    return frame.convert("RGB")
+
+
+@dataclass(frozen=True)
+class Transition:
+    key: str
+    family: str
+    screens: tuple[str, ...]
+    element: str
+    region: Region
+    paint: Paint
+    # Loops run t over [0, 1) and repeat forever; one-shots end on the finished frame.
+    loop: bool = False
+    # Extra per-scene layers, computed once (e.g. the fully dimmed base).
+    prepare: Callable[[Scene], dict[str, Any]] | None = None
+
+
+TRANSITIONS = {
+    t.key: t
+    for t in (
+        Transition("sheet", "native_v3", ("onboarding", "login"), "sheet", _slide_up_region, _slide_up_paint),
+        Transition("drawer", "mirat", ("menu",), "drawer", _drawer_region, _drawer_paint, prepare=_dim),
+        Transition("pulse", "mirat", ("espejo_negro",), "record", _pulse_region, _pulse_paint, loop=True),
+    )
+}
+
+
+@dataclass(frozen=True)
+class FrameStat:
+    index: int
+    box: Box
+    paint_ms: float
+    write_ms: float
+
+    @property
+    def pixels(self) -> int:
+        return (self.box[2] - self.box[0]) * (self.box[3] - self.box[1])
+
+
+def frames(transition: Transition, scene: Scene, n: int) -> Iterator[tuple[Image.Image, Box, float]]:
+    """Yield ``(frame, dirty box, paint seconds)``; the frame is reused between yields."""
+    size = scene.final.size
+    frame = scene.base.copy()
+    prev: Box | None = None
+    for i in range(n):
+        t = i / n if transition.loop else i / max(1, n - 1)
+        t0 = time.perf_counter()
+        now = transition.region(scene, t)
+        dirty = _clip((0, 0, *size) if prev is None else _union(prev, now), size)
+        if dirty[0] < dirty[2] and dirty[1] < dirty[3]:
+            crop = transition.paint(scene.base.crop(dirty), dirty, scene, t)
+            frame.paste(crop, dirty[:2])
+        else:
+            # Nothing on screen moved; APNG frames still need a region.
+            dirty = (0, 0, 1, 1)
+        prev = now
+        yield frame, dirty, time.perf_counter() - t0
+
+
+class ApngWriter:
+    """APNG written frame by frame; later frames carry only their dirty box."""
+
+    def __init__(self, path: Path, size: tuple[int, int], n: int, delay_ms: int, loop: bool, level: int = 6) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.fh = path.open("wb")
+        self.delay = (delay_ms, 1000)
+        self.level = level
+        self.seq = 0
+        self.index = 0
+        w, h = size
+        self.fh.write(bands.PNG_SIGNATURE)
+        bands.write_chunk(self.fh, b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0))
+        bands.write_chunk(self.fh, b"acTL", struct.pack(">II", n, 0 if loop else 1))
+
+    def write(self, frame: Image.Image, box: Box) -> None:
+        x0, y0, x1, y1 = box
+        # dispose_op none, blend_op source: the box replaces what was there.
+        fctl = struct.pack(">IIIIIHHBB", self.seq, x1 - x0, y1 - y0, x0, y0, *self.delay, 0, 0)
+        bands.write_chunk(self.fh, b"fcTL", fctl)
+        self.seq += 1
+        data = zlib.compress(bands.scanlines(np.asarray(frame.crop(box))), self.level)
+        if self.index == 0:
+            bands.write_chunk(self.fh, b"IDAT", data)
+        else:
+            bands.write_chunk(self.fh, b"fdAT", struct.pack(">I", self.seq) + data)
+            self.seq += 1
+        self.index += 1
+
+    def close(self) -> None:
+        bands.write_chunk(self.fh, b"IEND", b"")
+        self.fh.close()
+
+
+class SequenceWriter:
+    """Numbered full-frame PNGs (``frame_0000.png`` ...) in a directory."""
+
+    def __init__(self, path: Path) -> None:
+        path.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.index = 0
+
+    def write(self, frame: Image.Image, box: Box) -> None:
+        frame.save(self.path / f"frame_{self.index:04d}.png", format="PNG", compress_level=1)
+        self.index += 1
+
+    def close(self) -> None:
+        pass
+
+
+def export(
+    transition: Transition,
+    screen_key: str,
+    out: Path,
+    n: int = 60,
+    fps: int = 60,
+    fmt: str = "apng",
+    theme_key: str | None = None,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+) -> tuple[list[FrameStat], float]:
+    """Render and write ``n`` frames; returns per-frame stats and the scene setup time."""
+    if screen_key not in transition.screens:
+        raise ValueError(f"{transition.key} runs on {', '.join(transition.screens)}, not {screen_key}")
+    family = registry.families()[transition.family]
+    t0 = time.perf_counter()
+    scene = _scene(family, theme_key or next(iter(family.themes)), screen_key, transition.element, locale, device)
+    if transition.prepare is not None:
+        scene = replace(scene, extra={**scene.extra, **transition.prepare(scene)})
+    setup = time.perf_counter() - t0
+
+    if fmt == "apng":
+        writer: ApngWriter | SequenceWriter = ApngWriter(out, scene.final.size, n, round(1000 / fps), transition.loop)
+    else:
+        writer = SequenceWriter(out)
+    stats = []
+    try:
+        for i, (frame, box, paint_s) in enumerate(frames(transition, scene, n)):
+            t1 = time.perf_counter()
+            writer.write(frame, box)
+            stats.append(FrameStat(i, box, round(paint_s * 1000, 3), round((time.perf_counter() - t1) * 1000, 3)))
+    finally:
+        writer.close()
+    return stats, setup
+
+
+def command(args: argparse.Namespace) -> int:
+    transition = TRANSITIONS[args.transition]
+    screen_key = args.screen or transition.screens[0]
+    ext = ".png" if args.format == "apng" else ""
+    out = Path(args.output or registry.MOCKUP_DIR / "build" / "motion" / f"{transition.key}_{screen_key}{ext}")
+    stats, setup = export(
+        transition,
+        screen_key,
+        out,
+        n=args.frames,
+        fps=args.fps,
+        fmt=args.format,
+        theme_key=args.theme,
+        locale=args.locale,
+        device=devices.DEVICES[args.device],
+    )
+    area = sum(s.pixels for s in stats)
+    out_area = len(stats) * stats[0].pixels if stats else 0
+    paint = [s.paint_ms for s in stats]
+    timing = {
+        "transition": transition.key,
+        "screen": screen_key,
+        "frames": len(stats),
+        "fps": args.fps,
+        "setup_ms": round(setup * 1000, 3),
+        "dirty_fraction": round(area / out_area, 4) if out_area else 0.0,
+        "per_frame": [{"index": s.index, "box": list(s.box), "paint_ms": s.paint_ms, "write_ms": s.write_ms} for s in stats],
+    }
+    timing_path = out.with_name(out.stem + ".timing.json") if ext else out / "timing.json"
+    timing_path.write_text(json.dumps(timing, indent=2), encoding="utf-8")
+    print(
+        f"animate: {out} {len(stats)} frames, setup {setup * 1000:.0f} ms, "
+        f"paint {sum(paint) / max(1, len(paint)):.2f} ms/frame (max {max(paint, default=0):.2f}), "
+        f"{timing['dirty_fraction']:.1%} of pixels repainted",
+        file=sys.stderr,
+    )
+    return 0
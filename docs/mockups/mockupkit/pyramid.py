@@ -0,0 +1,149 @@
+"""Density pyramid: one supersampled master per screen, every density derived from it.
+
+The builders run once, at the highest requested scale. The master is taken to
+linear light once and each density or thumbnail is a Lanczos resample of that
+array, converted back to sRGB, so no variant re-renders or re-decodes it.
+Averaging in linear light keeps thin light strokes on dark backgrounds (and
+the other way round) from getting darker or bolder than at native density.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Iterable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from mockupkit import devices, registry, render
+from mockupkit.i18n import SOURCE_LOCALE
+
+DENSITIES = (1.0, 2.0, 3.0)
+THUMB_WIDTHS = (240,)
+
+
+@dataclass(frozen=True)
+class Variant:
+    suffix: str
+    size: tuple[int, int]
+
+
+def variants(device: devices.Device, densities: Iterable[float], thumbs: Iterable[int]) -> list[Variant]:
+    w, h = device.points
+    out = [Variant(f"@{d:g}x", (round(w * d), round(h * d))) for d in densities]
+    out += [Variant(f"_thumb{tw}", (tw, round(h * tw / w))) for tw in thumbs]
+    return out
+
+
+def _srgb_to_linear_lut() -> np.ndarray:
+    c = np.arange(256, dtype=np.float64) / 255
+    return np.where(c <= 0.04045, c / 12.92, ((c + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+
+TO_LINEAR = _srgb_to_linear_lut()
+
+
+def _to_srgb(linear: np.ndarray) -> np.ndarray:
+    c = np.clip(linear, 0.0, 1.0)
+    srgb = np.where(c <= 0.0031308, c * 12.92, 1.055 * np.power(c, 1 / 2.4) - 0.055)
+    return np.rint(srgb * 255).astype(np.uint8)
+
+
+class Master:
+    """A rendered frame held in linear light, ready to be resampled to any size."""
+
+    def __init__(self, im: Image.Image) -> None:
+        self.image = im
+        self.mode = im.mode
+        arr = np.asarray(im.convert("RGBA" if "A" in im.getbands() else "RGB"))
+        linear = TO_LINEAR[arr[..., :3]]
+        if arr.shape[2] == 4:
+            # Premultiply so transparent pixels don't bleed their color into edges.
+            alpha = arr[..., 3].astype(np.float32) / 255
+            linear *= alpha[..., None]
+            self.channels = [linear[..., i] for i in range(3)] + [alpha]
+        else:
+            self.channels = [linear[..., i] for i in range(3)]
+
+    def resize(self, size: tuple[int, int]) -> Image.Image:
+        if size == self.image.size:
+            return self.image
+        planes = [
+            np.asarray(Image.fromarray(np.ascontiguousarray(c), "F").resize(size, Image.Resampling.LANCZOS))
+            for c in self.channels
+        ]
+        rgb = np.stack(planes[:3], axis=-1)
+        if len(planes) == 4:
+            alpha = np.clip(planes[3], 0.0, 1.0)
+            rgb = np.divide(rgb, alpha[..., None], out=np.zeros_like(rgb), where=alpha[..., None] > 1e-6)
+            out = np.dstack([_to_srgb(rgb), np.rint(alpha * 255).astype(np.uint8)])
+            return Image.fromarray(out, "RGBA")
+        return Image.fromarray(_to_srgb(rgb), "RGB")
+
+
+def render_master(
+    family: registry.Family,
+    theme_key: str,
+    screen_key: str,
+    scale: float,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+) -> Master:
+    return Master(render.render(family, theme_key, screen_key, locale, replace(device, scale=scale)))
+
+
+def submit(
+    master: Master,
+    variants_: Iterable[Variant],
+    out_dir: Path,
+    stem: str,
+    executor: Executor,
+    optimize: bool = True,
+) -> list[Future[Path]]:
+    """Resample and encode every variant on ``executor``; futures resolve to the written paths."""
+
+    def job(v: Variant) -> Path:
+        path = out_dir / f"{stem}{v.suffix}.png"
+        render.save(master.resize(v.size), path, optimize=optimize)
+        return path
+
+    return [executor.submit(job, v) for v in variants_]
+
+
+def command(args: argparse.Namespace) -> int:
+    device = devices.DEVICES[args.device]
+    densities = args.density or list(DENSITIES)
+    thumbs = list(THUMB_WIDTHS) if args.thumb is None else args.thumb
+    master_scale = args.master_scale or max(densities)
+    todo = variants(device, densities, thumbs)
+    out_dir = Path(args.out)
+
+    t0 = time.perf_counter()
+    t_render = 0.0
+    n = 0
+    pending: list = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+            t1 = time.perf_counter()
+            master = render_master(family, theme_key, screen_key, master_scale, args.locale, device)
+            t_render += time.perf_counter() - t1
+            # One screen's writes overlap the next render; older ones are drained first.
+            for f in pending:
+                f.result()
+            stem = Path(family.output_name(theme_key, screen_key)).stem
+            pending = submit(master, todo, out_dir / family.key, stem, executor, optimize=not args.fast)
+            n += 1
+        for f in pending:
+            f.result()
+    elapsed = time.perf_counter() - t0
+    print(
+        f"pyramid: {n} masters @{master_scale:g}x -> {n * len(todo)} files in {out_dir} "
+        f"({elapsed:.2f}s, {t_render:.2f}s rendering)",
+        file=sys.stderr,
+    )
+    return 0
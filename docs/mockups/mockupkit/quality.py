@@ -0,0 +1,49 @@
+"""Draft-quality previews for layout work.
+
+Layout is written in points, so a draft is simply the same device profile at
+a fraction of its scale: every element lands where the final frame puts it,
+on a quarter of the pixels at the default 0.5. While a draft renders the
+builders also cheapen their effects through here: ``blur`` approximates
+large radii on a downsampled copy and drops sub-pixel softening, and
+``draft()`` lets them skip film grain and texture overlays outright.
+
+Final renders are untouched: ``blur`` is a plain Gaussian blur outside drafts,
+split over row tiles (see ``tiles``) with the same result.
+"""
+
+from __future__ import annotations
+
+from dataclasses import replace
+
+from PIL import Image, ImageFilter
+
+from mockupkit import context, devices, tiles
+
+DRAFT_SCALE = 0.5
+# Radii (pixels) blurred directly in drafts; larger ones run on a downsampled copy.
+SMALL_BLUR = 3.0
+MAX_DOWNSAMPLE = 8
+
+
+def draft() -> bool:
+    return context.current().draft
+
+
+def draft_device(device: devices.Device, fraction: float = DRAFT_SCALE) -> devices.Device:
+    if not 0 < fraction <= 1:
+        raise ValueError("draft scale must be in (0, 1]")
+    return replace(device, key=f"{device.key}_draft", scale=device.scale * fraction)
+
+
+def blur(im: Image.Image, radius: float) -> Image.Image:
+    """Gaussian blur; in drafts large radii are blurred at low resolution and scaled back."""
+    if not draft():
+        return tiles.gaussian_blur(im, radius)
+    if radius < 1:
+        return im.copy()
+    factor = min(MAX_DOWNSAMPLE, int(radius // SMALL_BLUR))
+    if factor < 2:
+        return im.filter(ImageFilter.GaussianBlur(radius))
+    w, h = im.size
+    small = im.resize((max(1, w // factor), max(1, h // factor)), Image.Resampling.BOX)
+    return small.filter(ImageFilter.GaussianBlur(radius / factor)).resize((w, h), Image.Resampling.BILINEAR)
@@ -0,0 +1,79 @@
+"""Registry of the mockup families (one per ``generate_*`` script)."""
+
+from __future__ import annotations
+
+import functools
+import importlib
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageFont
+
+MOCKUP_DIR = Path(__file__).resolve().parent.parent
+
+FAMILY_MODULES = (
+    "generate_mirat_mockups",
+    "generate_mirat_native_mockups",
+    "generate_mirat_native_v3_mockups",
+)
+
+Fonts = dict[str, ImageFont.ImageFont]
+# Builders take the frame size in pixels; coordinates inside are in points (``units.px``).
+Builder = Callable[[int, int, Any, Fonts], Image.Image]
+# Full-bleed scene art rendered by rows: (screen, width, height, y0, y1) -> rows y0..y1.
+Scene = Callable[[str, int, int, int, int], Image.Image]
+
+
+@dataclass(frozen=True, eq=False)
+class Family:
+    key: str
+    themes: Mapping[str, Any]
+    screens: Mapping[str, Builder]
+    # Called with the device scale; font sizes are given in points.
+    fonts: Callable[[float], Fonts]
+    filename: str
+    scene: Scene | None = None
+
+    def output_name(self, theme: str, screen: str) -> str:
+        return self.filename.format(theme=theme, screen=screen)
+
+
+@functools.cache
+def families() -> dict[str, Family]:
+    if str(MOCKUP_DIR) not in sys.path:
+        sys.path.insert(0, str(MOCKUP_DIR))
+    out: dict[str, Family] = {}
+    for name in FAMILY_MODULES:
+        family = importlib.import_module(name).FAMILY
+        out[family.key] = family
+    return out
+
+
+@functools.cache
+def fonts_for(family_key: str, scale: float) -> Fonts:
+    # Keyed by scale, not device: profiles sharing a density share fonts and text metrics.
+    return families()[family_key].fonts(scale)
+
+
+def select(
+    families_: Iterable[str] | None = None,
+    themes: Iterable[str] | None = None,
+    screens: Iterable[str] | None = None,
+) -> Iterator[tuple[Family, str, str]]:
+    """Yield ``(family, theme, screen)`` for every combination passing the filters."""
+    fam_filter = set(families_ or ())
+    theme_filter = set(themes or ())
+    screen_filter = set(screens or ())
+    for family in families().values():
+        if fam_filter and family.key not in fam_filter:
+            continue
+        for theme_key in family.themes:
+            if theme_filter and theme_key not in theme_filter:
+                continue
+            for screen_key in family.screens:
+                if screen_filter and screen_key not in screen_filter:
+                    continue
+                yield family, theme_key, screen_key
@@ -0,0 +1,210 @@
+"""Visual regression against the committed mockups.
+
+Frames are compared tile by tile. Tile hashes of each golden PNG are kept in
+a manifest under ``build/regress``, so a frame whose tiles all hash the same
+is settled without decoding the golden at all. Only differing tiles get the
+perceptual metric: per-pixel CIE76 color difference (Delta E in Lab). A
+frame fails when more than ``tolerance`` of its pixels differ by more than
+``delta``, and failing frames get a heatmap over the golden.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mockupkit import pyramid, registry, render
+
+TILE = 64
+MANIFEST = registry.MOCKUP_DIR / "build" / "regress" / "golden.json"
+# Just-noticeable difference in CIE76.
+DELTA = 2.3
+
+# Linear sRGB -> XYZ (D65).
+_XYZ = np.array(
+    [[0.4124564, 0.3575761, 0.1804375], [0.2126729, 0.7151522, 0.0721750], [0.0193339, 0.1191920, 0.9503041]],
+    dtype=np.float32,
+)
+_WHITE = np.array([0.95047, 1.0, 1.08883], dtype=np.float32)
+
+
+def tile_hashes(arr: np.ndarray) -> list[str]:
+    h, w = arr.shape[:2]
+    return [
+        hashlib.blake2b(arr[y : y + TILE, x : x + TILE].tobytes(), digest_size=8).hexdigest()
+        for y in range(0, h, TILE)
+        for x in range(0, w, TILE)
+    ]
+
+
+def _tiles(size: tuple[int, int]) -> list[tuple[int, int, int, int]]:
+    w, h = size
+    return [(x, y, min(w, x + TILE), min(h, y + TILE)) for y in range(0, h, TILE) for x in range(0, w, TILE)]
+
+
+def _lab(rgb: np.ndarray) -> np.ndarray:
+    xyz = pyramid.TO_LINEAR[rgb] @ _XYZ.T / _WHITE
+    f = np.where(xyz > 216 / 24389, np.cbrt(xyz), (24389 / 27 * xyz + 16) / 116)
+    return np.stack([116 * f[..., 1] - 16, 500 * (f[..., 0] - f[..., 1]), 200 * (f[..., 1] - f[..., 2])], axis=-1)
+
+
+def delta_e(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Per-pixel CIE76 difference of two uint8 RGB arrays."""
+    return np.linalg.norm(_lab(a) - _lab(b), axis=-1)
+
+
+class Manifest:
+    """Golden tile hashes keyed by file, reused while size and mtime match."""
+
+    def __init__(self, path: Path = MANIFEST) -> None:
+        self.path = path
+        self.data: dict[str, dict] = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        self.dirty = False
+
+    def hashes(self, golden: Path) -> tuple[tuple[int, int], list[str]]:
+        st = golden.stat()
+        stamp = [st.st_size, st.st_mtime_ns, TILE]
+        entry = self.data.get(golden.name)
+        if entry is None or entry["stamp"] != stamp:
+            arr = _load(golden)
+            entry = self.data[golden.name] = {
+                "stamp": stamp,
+                "size": [arr.shape[1], arr.shape[0]],
+                "tiles": tile_hashes(arr),
+            }
+            self.dirty = True
+        return tuple(entry["size"]), entry["tiles"]
+
+    def save(self) -> None:
+        if self.dirty:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self.data, separators=(",", ":")), encoding="utf-8")
+            self.dirty = False
+
+
+def _load(path: Path) -> np.ndarray:
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"))
+
+
+@dataclass(frozen=True)
+class Result:
+    name: str
+    # "same", "pass" (differs within tolerance), "fail", "missing" or "size"
+    status: str
+    tiles: int = 0
+    changed_tiles: int = 0
+    changed_pixels: int = 0
+    max_delta: float = 0.0
+    heatmap: Path | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ("same", "pass")
+
+
+def heatmap(golden: np.ndarray, de: np.ndarray, boxes: list[tuple[int, int, int, int]], delta: float) -> Image.Image:
+    """The golden dimmed to gray, differences in red by strength, changed tiles outlined."""
+    gray = golden.mean(axis=-1, keepdims=True) * 0.35
+    a = np.clip(de / (4 * delta), 0, 1)[..., None]
+    red = np.array([255, 40, 40], dtype=np.float32)
+    out = Image.fromarray((gray * (1 - a) + red * a).astype(np.uint8), "RGB")
+    draw = ImageDraw.Draw(out)
+    for x0, y0, x1, y1 in boxes:
+        draw.rectangle((x0, y0, x1 - 1, y1 - 1), outline=(250, 200, 60))
+    return out
+
+
+def compare(
+    frame: Image.Image,
+    golden: Path,
+    manifest: Manifest,
+    delta: float = DELTA,
+    tolerance: float = 0.0,
+    out_dir: Path | None = None,
+) -> Result:
+    name = golden.name
+    if not golden.exists():
+        return Result(name, "missing")
+    arr = np.asarray(frame.convert("RGB"))
+    size, old = manifest.hashes(golden)
+    if size != (arr.shape[1], arr.shape[0]):
+        return Result(name, "size")
+    new = tile_hashes(arr)
+    boxes = _tiles(size)
+    changed = [boxes[i] for i, (a, b) in enumerate(zip(new, old)) if a != b]
+    if not changed:
+        return Result(name, "same", len(boxes))
+
+    ref = _load(golden)
+    # Lab only for the pixels that differ, and only inside the changed tiles.
+    differs = np.zeros(arr.shape[:2], dtype=bool)
+    for x0, y0, x1, y1 in changed:
+        differs[y0:y1, x0:x1] = (arr[y0:y1, x0:x1] != ref[y0:y1, x0:x1]).any(axis=-1)
+    de = np.zeros(arr.shape[:2], dtype=np.float32)
+    de[differs] = delta_e(arr[differs], ref[differs])
+    over = int(np.count_nonzero(de > delta))
+    status = "pass" if over <= tolerance * de.size else "fail"
+    path = None
+    if status == "fail" and out_dir is not None:
+        path = out_dir / f"{golden.stem}.diff.png"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        heatmap(ref, de, changed, delta).save(path, format="PNG", compress_level=1)
+    return Result(name, status, len(boxes), len(changed), over, round(float(de.max()), 2), path)
+
+
+def command(args: argparse.Namespace) -> int:
+    out_dir = Path(args.out)
+    manifest = Manifest()
+    t0 = time.perf_counter()
+    results = []
+    for family, theme_key, screen_key in registry.select(args.family, args.theme, args.screen):
+        im = render.render(family, theme_key, screen_key, args.locale)
+        golden = registry.MOCKUP_DIR / family.output_name(theme_key, screen_key)
+        if args.update:
+            render.save(im, golden)
+            manifest.hashes(golden)
+            results.append(Result(golden.name, "same"))
+            continue
+        r = compare(im, golden, manifest, args.delta, args.tolerance, out_dir)
+        results.append(r)
+        if r.status != "same":
+            detail = f" {r.changed_tiles}/{r.tiles} tiles, {r.changed_pixels} px > {args.delta:g}, max {r.max_delta:g}"
+            print(f"{r.status:7s} {r.name}{detail if r.tiles else ''}", file=sys.stderr)
+    manifest.save()
+    elapsed = time.perf_counter() - t0
+
+    counts = {s: sum(1 for r in results if r.status == s) for s in ("same", "pass", "fail", "missing", "size")}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "delta": args.delta,
+        "tolerance": args.tolerance,
+        "tile": TILE,
+        "seconds": round(elapsed, 3),
+        "counts": counts,
+        "frames": [
+            {
+                "name": r.name,
+                "status": r.status,
+                "tiles": r.tiles,
+                "changed_tiles": r.changed_tiles,
+                "changed_pixels": r.changed_pixels,
+                "max_delta": r.max_delta,
+                "heatmap": str(r.heatmap) if r.heatmap else None,
+            }
+            for r in results
+        ],
+    }
+    (out_dir / "summary.json").write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    summary = ", ".join(f"{n} {s}" for s, n in counts.items() if n)
+    verb = "updated" if args.update else "checked"
+    print(f"regress: {verb} {len(results)} frames ({summary}) in {elapsed:.2f}s; {out_dir / 'summary.json'}", file=sys.stderr)
+    return 0 if all(r.ok for r in results) else 1
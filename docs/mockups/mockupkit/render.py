@@ -0,0 +1,86 @@
+"""Rendering of single frames and whole matrices with the shared caches."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import sys
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from mockupkit import context, devices, quality, registry, trace
+from mockupkit.i18n import SOURCE_LOCALE
+
+
+def render(
+    family: registry.Family,
+    theme_key: str,
+    screen_key: str,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+    draft: float | None = None,
+) -> Image.Image:
+    """One frame; ``draft`` renders a preview at that fraction of the device scale (see ``quality``)."""
+    if draft:
+        device = quality.draft_device(device, draft)
+    w, h = device.pixels
+    with context.use(locale=locale, device=device, draft=bool(draft)), trace.region(f"{family.key}/{theme_key}/{screen_key}", "render"):
+        fonts = registry.fonts_for(family.key, device.scale)
+        return family.screens[screen_key](w, h, family.themes[theme_key], fonts)
+
+
+def save(im: Image.Image, path: Path, optimize: bool = True) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with trace.region("save", "encode"):
+        im.save(path, format="PNG", optimize=optimize)
+
+
+def encode(im: Image.Image, optimize: bool = True) -> bytes:
+    """The PNG ``save`` would write, in memory."""
+    buf = io.BytesIO()
+    with trace.region("save", "encode"):
+        im.save(buf, format="PNG", optimize=optimize)
+    return buf.getvalue()
+
+
+def command(args: argparse.Namespace) -> int:
+    matrix = list(registry.select(args.family, args.theme, args.screen))
+    profiles = devices.select(args.device) if args.device else [devices.DEFAULT]
+
+    def path_for(device: devices.Device, family: registry.Family, theme_key: str, screen_key: str) -> Path:
+        # Without --out the default profile overwrites the committed PNGs and
+        # other profiles go where `devices` puts them; drafts never land there.
+        if args.out:
+            out_dir = Path(args.out) / device.key if len(profiles) > 1 else Path(args.out)
+        elif args.draft:
+            out_dir = registry.MOCKUP_DIR / "build" / "draft" / device.key
+        elif device == devices.DEFAULT:
+            out_dir = registry.MOCKUP_DIR
+        else:
+            out_dir = registry.MOCKUP_DIR / "build" / "devices" / device.key
+        return out_dir / family.output_name(theme_key, screen_key)
+
+    if args.list:
+        for family, theme_key, screen_key in matrix:
+            print(f"{family.key:12s} {theme_key:8s} {screen_key:14s} {family.output_name(theme_key, screen_key)}")
+        return 0
+    jobs = [(d, f, t, s) for d in profiles for f, t, s in matrix]
+    if not jobs:
+        print("render: nothing matches the filters", file=sys.stderr)
+        return 1
+    if args.dry_run:
+        for job in jobs:
+            print(f"{job[0].key}: {job[1].key}/{job[2]}/{job[3]} -> {path_for(*job)}")
+        print(f"render: {len(jobs)} frames (dry run)", file=sys.stderr)
+        return 0
+
+    t0 = time.perf_counter()
+    for device, family, theme_key, screen_key in jobs:
+        path = path_for(device, family, theme_key, screen_key)
+        im = render(family, theme_key, screen_key, args.locale, device, args.draft)
+        save(im, path, optimize=not args.fast and not args.draft)
+        print("wrote", path)
+    print(f"render: {len(jobs)} frames in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+    return 0
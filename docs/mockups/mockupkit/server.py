@@ -0,0 +1,313 @@
+"""Long-lived render service for on-demand mockups.
+
+One process keeps fonts, backgrounds, sprites and stamping templates warm and
+answers small HTTP/1.1 requests on localhost or a Unix socket::
+
+    curl -s localhost:8765/render -o out.png \\
+        -d '{"family": "native_v3", "screen": "dashboard", "values": {"prompt": "Hoy elijo pausar"}}'
+
+``POST /render`` takes ``family``, ``screen``, ``theme``, ``locale``,
+``device``, ``values`` (slot overrides, see ``stamp``) and ``format`` (png or
+jpeg) and returns the image. Rendering runs on a thread pool; identical jobs
+in flight share one render and recent results are kept. ``GET /metrics``
+reports latency percentiles and throughput, ``GET /screens`` the matrix.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import threading
+import time
+import wave
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from typing import Any
+
+from mockupkit import cache, context, devices, i18n, registry, render, stamp
+
+HOST = "127.0.0.1"
+PORT = 8765
+CONTENT_TYPES = {"png": "image/png", "jpeg": "image/jpeg"}
+# Requests kept for latency percentiles and the throughput window.
+WINDOW = 1024
+MAX_BODY = 1 << 20
+
+
+@dataclass(frozen=True)
+class Job:
+    family: str
+    theme: str
+    screen: str
+    locale: str
+    device: str
+    # Canonical JSON of the slot overrides, so equal requests compare equal.
+    values: str
+    format: str
+
+    @classmethod
+    def parse(cls, payload: dict[str, Any]) -> Job:
+        fams = registry.families()
+        family = fams.get(payload.get("family", "native_v3"))
+        if family is None:
+            raise ValueError(f"unknown family; one of {', '.join(fams)}")
+        screen = payload.get("screen")
+        if screen not in family.screens:
+            raise ValueError(f"unknown screen for {family.key}; one of {', '.join(family.screens)}")
+        theme = payload.get("theme") or next(iter(family.themes))
+        if theme not in family.themes:
+            raise ValueError(f"unknown theme for {family.key}; one of {', '.join(family.themes)}")
+        locale = payload.get("locale", i18n.SOURCE_LOCALE)
+        if locale not in i18n.locales():
+            raise ValueError(f"unknown locale; one of {', '.join(i18n.locales())}")
+        device = payload.get("device", devices.DEFAULT.key)
+        if device not in devices.DEVICES:
+            raise ValueError(f"unknown device {device!r}")
+        fmt = payload.get("format", "png")
+        if fmt not in CONTENT_TYPES:
+            raise ValueError(f"format must be one of {', '.join(CONTENT_TYPES)}")
+        values = payload.get("values") or {}
+        if not isinstance(values, dict):
+            raise ValueError("values must be an object")
+        canonical = json.dumps(values, sort_keys=True, ensure_ascii=False)
+        return cls(family.key, theme, screen, locale, device, canonical, fmt)
+
+
+class _Stamping:
+    """A screen's stamper, built on first use; None when the screen has no slots."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stamper: stamp.Stamper | None = None
+        self.built = False
+
+
+class Renderer:
+    """Renders jobs; overrides on screens with slots are stamped onto cached templates."""
+
+    def __init__(self) -> None:
+        self._stamping: dict[tuple, _Stamping] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, job: Job) -> bytes:
+        family = registry.families()[job.family]
+        device = devices.DEVICES[job.device]
+        values = json.loads(job.values)
+        if values:
+            with self._lock:
+                entry = self._stamping.setdefault((job.family, job.theme, job.screen, job.locale, job.device), _Stamping())
+            # Stamped frames are reused by the next record, so encode while holding the lock.
+            with entry.lock:
+                if not entry.built:
+                    entry.built = True
+                    try:
+                        entry.stamper = stamp.Stamper(family, job.theme, job.screen, job.locale, device)
+                    except ValueError:
+                        pass
+                if entry.stamper is not None:
+                    return stamp.encode(entry.stamper.stamp(values), job.format)
+        with context.use(values=values):
+            im = render.render(family, job.theme, job.screen, job.locale, device)
+        return stamp.encode(im, job.format)
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.renders = 0
+        self.coalesced = 0
+        self.cached = 0
+        self.errors = 0
+        self.in_flight = 0
+        # (finished at, seconds) per answered render request.
+        self.latency: deque[tuple[float, float]] = deque(maxlen=WINDOW)
+        self.render_time: deque[float] = deque(maxlen=WINDOW)
+
+    def snapshot(self) -> dict[str, Any]:
+        now = time.monotonic()
+        lat = sorted(s for _, s in self.latency)
+
+        def pct(p: float) -> float | None:
+            return round(lat[min(len(lat) - 1, int(p * len(lat)))] * 1000, 2) if lat else None
+
+        recent = [t for t, _ in self.latency if now - t <= 60]
+        return {
+            "uptime_s": round(now - self.started, 1),
+            "requests": self.requests,
+            "renders": self.renders,
+            "coalesced": self.coalesced,
+            "result_cache_hits": self.cached,
+            "errors": self.errors,
+            "in_flight": self.in_flight,
+            "latency_ms": {"p50": pct(0.5), "p90": pct(0.9), "p99": pct(0.99), "max": pct(1.0)},
+            "render_ms_mean": round(statistics.fmean(self.render_time) * 1000, 2) if self.render_time else None,
+            "throughput_rps_60s": round(len(recent) / min(60.0, max(1e-9, now - self.started)), 2),
+            "caches": cache.stats(),
+        }
+
+
+class Service:
+    def __init__(self, workers: int = 4, keep: int = 64) -> None:
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="render")
+        self.render = Renderer()
+        self.metrics = Metrics()
+        self.keep = keep
+        self._results: OrderedDict[Job, bytes] = OrderedDict()
+        self._pending: dict[Job, asyncio.Future[bytes]] = {}
+
+    async def submit(self, job: Job) -> tuple[bytes, str]:
+        """Encoded image and how it was served: render, coalesced or cache."""
+        data = self._results.get(job)
+        if data is not None:
+            self._results.move_to_end(job)
+            self.metrics.cached += 1
+            return data, "cache"
+        pending = self._pending.get(job)
+        if pending is not None:
+            self.metrics.coalesced += 1
+            return await asyncio.shield(pending), "coalesced"
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.create_future()
+        self._pending[job] = future
+        t0 = time.perf_counter()
+        try:
+            data = await loop.run_in_executor(self.pool, self.render, job)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters see the error; nobody else needs to retrieve it.
+            future.exception()
+            raise
+        finally:
+            del self._pending[job]
+        self.metrics.renders += 1
+        self.metrics.render_time.append(time.perf_counter() - t0)
+        future.set_result(data)
+        if self.keep:
+            self._results[job] = data
+            while len(self._results) > self.keep:
+                self._results.popitem(last=False)
+        return data, "render"
+
+    async def warm(self) -> None:
+        """Render every screen once so fonts, backgrounds and sprites are cached."""
+        loop = asyncio.get_running_loop()
+        jobs = [
+            loop.run_in_executor(self.pool, render.render, family, theme_key, screen_key)
+            for family, theme_key, screen_key in registry.select()
+        ]
+        await asyncio.gather(*jobs)
+
+    async def route(self, method: str, path: str, body: bytes) -> tuple[int, str, bytes, dict[str, str]]:
+        if method == "GET" and path == "/metrics":
+            return 200, "application/json", json.dumps(self.metrics.snapshot()).encode(), {}
+        if method == "GET" and path == "/health":
+            return 200, "application/json", b'{"ok": true}', {}
+        if method == "GET" and path == "/screens":
+            matrix = [
+                {"family": f.key, "theme": t, "screen": s, "file": f.output_name(t, s)} for f, t, s in registry.select()
+            ]
+            return 200, "application/json", json.dumps(matrix).encode(), {}
+        if path != "/render":
+            return 404, "application/json", b'{"error": "not found"}', {}
+        if method != "POST":
+            return 405, "application/json", b'{"error": "use POST"}', {}
+        try:
+            payload = json.loads(body or b"{}")
+            if not isinstance(payload, dict):
+                raise ValueError("expected a JSON object")
+            job = Job.parse(payload)
+        except ValueError as e:
+            return 400, "application/json", json.dumps({"error": str(e)}).encode(), {}
+        t0 = time.perf_counter()
+        self.metrics.in_flight += 1
+        try:
+            data, how = await self.submit(job)
+        except (ValueError, wave.Error) as e:
+            # Overrides are only checked by the builders (a recording that is not a WAV, say).
+            return 400, "application/json", json.dumps({"error": str(e)}).encode(), {}
+        finally:
+            self.metrics.in_flight -= 1
+        elapsed = time.perf_counter() - t0
+        self.metrics.latency.append((time.monotonic(), elapsed))
+        return 200, CONTENT_TYPES[job.format], data, {"X-Served": how, "X-Render-Ms": f"{elapsed * 1000:.1f}"}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                method, path, version = line.decode("latin-1").split()
+                headers: dict[str, str] = {}
+                while (header := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = header.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, ctype, data, extra = 413, "application/json", b'{"error": "body too large"}', {}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    self.metrics.requests += 1
+                    try:
+                        status, ctype, data, extra = await self.route(method, path.split("?", 1)[0], body)
+                    except Exception as e:  # a failed render must not take the service down
+                        self.metrics.errors += 1
+                        status, ctype, data, extra = 500, "application/json", json.dumps({"error": repr(e)}).encode(), {}
+                    keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                head = [
+                    f"HTTP/1.1 {status} {HTTPStatus(status).phrase}",
+                    f"Content-Type: {ctype}",
+                    f"Content-Length: {len(data)}",
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}",
+                    *(f"{k}: {v}" for k, v in extra.items()),
+                ]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+    host: str = HOST,
+    port: int = PORT,
+    socket_path: str | None = None,
+    workers: int = 4,
+    keep: int = 64,
+    warm: bool = False,
+) -> None:
+    service = Service(workers, keep)
+    if warm:
+        t0 = time.perf_counter()
+        await service.warm()
+        print(f"serve: warmed {sum(1 for _ in registry.select())} screens in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+    if socket_path:
+        server = await asyncio.start_unix_server(service.handle, path=socket_path)
+        where = socket_path
+    else:
+        server = await asyncio.start_server(service.handle, host, port)
+        where = f"http://{host}:{port}"
+    print(f"serve: listening on {where} with {workers} workers", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+def command(args: argparse.Namespace) -> int:
+    try:
+        asyncio.run(serve(args.host, args.port, args.socket, args.workers, args.keep, args.warm))
+    except KeyboardInterrupt:
+        pass
+    return 0
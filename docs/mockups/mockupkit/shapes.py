@@ -0,0 +1,232 @@
+"""Antialiased vector shapes, supersampled only where edges need it.
+
+Pillow rasterizes ellipses, arcs, polygons and rounded corners without
+antialiasing. These drop-in versions of the ``ImageDraw`` calls draw the
+shape's coverage at ``FACTOR`` times the resolution over its bounding box
+alone, average it back down (box filter: exact area coverage) and paint the
+ink through that mask. Rounded rectangles only supersample their four
+corners; their straight edges are already exact on integer coordinates.
+
+Coverage masks are cached by the shape's geometry relative to its box, so a
+repeated icon or pill costs one paste. Ink replaces what is under it, as
+``ImageDraw`` does: on a transparent overlay an edge pixel gets the ink at
+reduced alpha, not a dark fringe. Layout passes and drafts (see ``quality``)
+fall back to the plain Pillow calls.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+from collections.abc import Sequence
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from mockupkit import quality
+
+FACTOR = 4
+
+Box = tuple[int, int, int, int]
+_EDGE = [255 if 0 < v < 255 else 0 for v in range(256)]
+_FULL = [255 if v == 255 else 0 for v in range(256)]
+
+
+@functools.lru_cache(maxsize=2048)
+def coverage(kind: str, geometry: tuple, options: tuple, size: tuple[int, int], factor: int) -> Image.Image:
+    """``L`` mask of one shape drawn at ``factor``x over a ``size`` window and reduced back."""
+    w, h = size
+    big = Image.new("L", (w * factor, h * factor), 0)
+    getattr(ImageDraw.Draw(big), kind)(geometry, **dict(options))
+    return big.reduce(factor)
+
+
+def _image(draw: Any, factor: int) -> Image.Image | None:
+    if factor <= 1:
+        return None
+    # Layout recorders and other stand-ins have no pixels to blend into.
+    return getattr(draw, "_image", None) if isinstance(draw, ImageDraw.ImageDraw) else None
+
+
+def _factor(factor: int | None) -> int:
+    if factor is not None:
+        return factor
+    return 1 if quality.draft() else FACTOR
+
+
+def _local_box(xy: Sequence[float], origin: tuple[int, int], s: int) -> tuple[float, ...]:
+    # Pillow boxes include their last pixel: [x0, x1] covers x1 - x0 + 1 pixels.
+    x0, y0, x1, y1 = xy
+    ox, oy = origin
+    return ((x0 - ox) * s, (y0 - oy) * s, (x1 - ox + 1) * s - 1, (y1 - oy + 1) * s - 1)
+
+
+def _local_points(points: Sequence[tuple[float, float]], origin: tuple[int, int], s: int) -> tuple:
+    # Vertices sit on pixel centers.
+    ox, oy = origin
+    return tuple(((x - ox + 0.5) * s - 0.5, (y - oy + 0.5) * s - 0.5) for x, y in points)
+
+
+def _points(xy: Sequence) -> list[tuple[float, float]]:
+    if xy and not isinstance(xy[0], (tuple, list)):
+        return [(xy[i], xy[i + 1]) for i in range(0, len(xy), 2)]
+    return [tuple(p) for p in xy]
+
+
+def _paint(im: Image.Image, window: Box, mask: Image.Image, ink: Any) -> None:
+    x0, y0, x1, y1 = window
+    W, H = im.size
+    cx0, cy0, cx1, cy1 = max(0, x0), max(0, y0), min(W, x1), min(H, y1)
+    if cx0 >= cx1 or cy0 >= cy1:
+        return
+    if (cx0, cy0, cx1, cy1) != window:
+        mask = mask.crop((cx0 - x0, cy0 - y0, cx1 - x0, cy1 - y0))
+    at = (cx0, cy0)
+    if im.mode != "RGBA":
+        ink = ink[: len(im.getbands())] if isinstance(ink, tuple) else ink
+        im.paste(ink, at, mask)
+        return
+    ink = ink if len(ink) == 4 else (*ink, 255)
+    # Edge pixels blend premultiplied, so ink over transparency keeps its color;
+    # only they go through the lossy round trip. The ink is pasted as an image:
+    # a color fill weighs RGB by the alpha underneath, premultiplying twice.
+    a = ink[3]
+    region = im.crop((cx0, cy0, cx1, cy1)).convert("RGBa")
+    region.paste(Image.new("RGBa", region.size, (*(round(c * a / 255) for c in ink[:3]), a)), (0, 0), mask)
+    im.paste(region.convert("RGBA"), at, mask.point(_EDGE))
+    im.paste(ink, at, mask.point(_FULL))
+
+
+def _shape(im: Image.Image, kind: str, window: Box, s: int, geometry: tuple, fill: Any, outline: Any, extra: tuple) -> None:
+    size = (window[2] - window[0], window[3] - window[1])
+    if fill is not None:
+        _paint(im, window, coverage(kind, geometry, (("fill", 255), *extra), size, s), fill)
+    if outline is not None:
+        _paint(im, window, coverage(kind, geometry, (("outline", 255), *extra), size, s), outline)
+
+
+def _bounds(points: Sequence[tuple[float, float]], pad: float) -> Box:
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return (
+        math.floor(min(xs) - pad),
+        math.floor(min(ys) - pad),
+        math.ceil(max(xs) + pad) + 1,
+        math.ceil(max(ys) + pad) + 1,
+    )
+
+
+def rounded_rectangle(
+    draw: ImageDraw.ImageDraw,
+    xy: Sequence[int],
+    radius: float = 0,
+    fill: Any = None,
+    outline: Any = None,
+    width: int = 1,
+    factor: int | None = None,
+) -> None:
+    s = _factor(factor)
+    im = _image(draw, s)
+    x0, y0, x1, y1 = (int(v) for v in xy)
+    r = min(radius, (x1 - x0 + 1) / 2, (y1 - y0 + 1) / 2)
+    if im is None or r <= 0:
+        draw.rounded_rectangle(xy, radius=radius, fill=fill, outline=outline, width=width)
+        return
+    c = math.ceil(r) + 1
+    if 2 * c >= x1 - x0 or 2 * c >= y1 - y0:
+        windows = [(x0, y0, x1 + 1, y1 + 1)]
+    else:
+        windows = [
+            (x0, y0, x0 + c, y0 + c),
+            (x1 + 1 - c, y0, x1 + 1, y0 + c),
+            (x0, y1 + 1 - c, x0 + c, y1 + 1),
+            (x1 + 1 - c, y1 + 1 - c, x1 + 1, y1 + 1),
+        ]
+        # Straight runs straight from Pillow; corners are put back and redone.
+        saved = [im.crop(win) for win in windows]
+        draw.rounded_rectangle(xy, radius=radius, fill=fill, outline=outline, width=width)
+        for win, patch in zip(windows, saved):
+            im.paste(patch, win[:2])
+    for win in windows:
+        geometry = _local_box((x0, y0, x1, y1), win[:2], s)
+        _shape(im, "rounded_rectangle", win, s, geometry, fill, outline, (("radius", r * s), ("width", width * s)))
+
+
+def ellipse(
+    draw: ImageDraw.ImageDraw,
+    xy: Sequence[float],
+    fill: Any = None,
+    outline: Any = None,
+    width: int = 1,
+    factor: int | None = None,
+) -> None:
+    s = _factor(factor)
+    im = _image(draw, s)
+    if im is None:
+        draw.ellipse(xy, fill=fill, outline=outline, width=width)
+        return
+    x0, y0, x1, y1 = xy
+    window = (math.floor(x0), math.floor(y0), math.ceil(x1) + 1, math.ceil(y1) + 1)
+    _shape(im, "ellipse", window, s, _local_box(xy, window[:2], s), fill, outline, (("width", width * s),))
+
+
+def arc(
+    draw: ImageDraw.ImageDraw,
+    xy: Sequence[float],
+    start: float,
+    end: float,
+    fill: Any = None,
+    width: int = 1,
+    factor: int | None = None,
+) -> None:
+    s = _factor(factor)
+    im = _image(draw, s)
+    if im is None:
+        draw.arc(xy, start=start, end=end, fill=fill, width=width)
+        return
+    x0, y0, x1, y1 = xy
+    window = (math.floor(x0), math.floor(y0), math.ceil(x1) + 1, math.ceil(y1) + 1)
+    geometry = _local_box(xy, window[:2], s)
+    options = (("start", start), ("end", end), ("fill", 255), ("width", width * s))
+    size = (window[2] - window[0], window[3] - window[1])
+    _paint(im, window, coverage("arc", geometry, options, size, s), fill)
+
+
+def polygon(
+    draw: ImageDraw.ImageDraw,
+    xy: Sequence,
+    fill: Any = None,
+    outline: Any = None,
+    width: int = 1,
+    factor: int | None = None,
+) -> None:
+    s = _factor(factor)
+    im = _image(draw, s)
+    if im is None:
+        draw.polygon(xy, fill=fill, outline=outline, width=width)
+        return
+    points = _points(xy)
+    window = _bounds(points, width)
+    geometry = _local_points(points, window[:2], s)
+    _shape(im, "polygon", window, s, geometry, fill, outline, (("width", width * s),))
+
+
+def line(
+    draw: ImageDraw.ImageDraw,
+    xy: Sequence,
+    fill: Any = None,
+    width: int = 1,
+    joint: str | None = None,
+    factor: int | None = None,
+) -> None:
+    s = _factor(factor)
+    im = _image(draw, s)
+    if im is None:
+        draw.line(xy, fill=fill, width=width, joint=joint)
+        return
+    points = _points(xy)
+    window = _bounds(points, width / 2 + 1)
+    geometry = _local_points(points, window[:2], s)
+    options = (("fill", 255), ("width", width * s), ("joint", joint))
+    size = (window[2] - window[0], window[3] - window[1])
+    _paint(im, window, coverage("line", geometry, options, size, s), fill)
@@ -0,0 +1,279 @@
+"""Template stamping for high-volume personalized renders.
+
+Builders draw personalizable content (greeting name, daily prompt, density
+chart, recording waveform) through ``slot``. In a normal render a slot paints straight away, using
+the value from ``context.values`` when one is given. While a template is being
+built the slot only measures itself and keeps its paint callback, so the
+static frame is rendered once; each record restores the regions the previous
+one touched and repaints the slots, drawing text from cached glyph masks.
+
+Slots must be the last thing drawn over their region. Screens that reuse
+another screen underneath other layers (``screen_menu``) render that base
+inside ``baked()`` so its slots become part of the static frame.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import re
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+from mockupkit import cache, context, devices, registry, render
+from mockupkit.i18n import SOURCE_LOCALE
+from mockupkit.layout import LayoutDraw, Recorder
+
+Paint = Callable[[ImageDraw.ImageDraw, Any], Any]
+
+_SERIES = re.compile(r"^\s*-?\d+(?:\.\d+)?(?:[;\s]+-?\d+(?:\.\d+)?)+\s*$")
+
+
+@dataclass
+class Slot:
+    name: str
+    default: Any
+    paint: Paint
+    layout: bool = False
+
+
+@dataclass
+class TemplateSession:
+    slots: dict[str, Slot] = field(default_factory=dict)
+
+
+def _scratch() -> LayoutDraw:
+    return LayoutDraw(Recorder((0, 0)))
+
+
+def slot(draw: ImageDraw.ImageDraw, name: str, default: Any, paint: Paint, layout: bool = False) -> Any:
+    """Paint a variable region and return whatever ``paint`` returns.
+
+    Set ``layout`` when the builder positions later content from the return
+    value (e.g. the end ``y`` of a wrapped paragraph); templates are then
+    keyed by that value. ``paint`` runs later for every record, so bind any
+    loop or reassigned variables as default arguments.
+    """
+    ctx = context.current()
+    value = ctx.values.get(name, default)
+    session = ctx.template
+    if session is None or isinstance(draw, LayoutDraw):
+        return paint(draw, value)
+    session.slots[name] = Slot(name, default, paint, layout)
+    return paint(_scratch(), value)
+
+
+@contextlib.contextmanager
+def baked() -> Iterator[None]:
+    """Paint slots immediately, even while a template is being built."""
+    with context.use(template=None):
+        yield
+
+
+@dataclass
+class Template:
+    image: Image.Image
+    slots: dict[str, Slot]
+    # Working copy reused across records; only the dirty boxes are restored.
+    frame: Image.Image | None = None
+    dirty: list[tuple[int, int, int, int]] = field(default_factory=list)
+
+
+class StampDraw:
+    """``ImageDraw`` proxy for stamping: cached glyph masks and dirty-box tracking."""
+
+    def __init__(self, im: Image.Image) -> None:
+        self.im = im
+        self.draw = ImageDraw.Draw(im)
+        self.dirty: list[tuple[int, int, int, int]] = []
+
+    def textbbox(self, xy, text: str, font=None, **kwargs):
+        if kwargs:
+            return self.draw.textbbox(xy, text, font=font, **kwargs)
+        x, y = xy
+        b = cache.text_bbox(font, text)
+        return (b[0] + x, b[1] + y, b[2] + x, b[3] + y)
+
+    def text(self, xy, text: str, fill=None, font=None, **kwargs) -> None:
+        x, y = (int(v) for v in xy)
+        if kwargs or "\n" in text or not isinstance(fill, tuple) or len(fill) != len(self.im.getbands()):
+            self.dirty.append(self.draw.textbbox((x, y), text, font=font, **kwargs))
+            self.draw.text((x, y), text, fill=fill, font=font, **kwargs)
+            return
+        mask, b = cache.text_mask(font, text)
+        box = (x + b[0], y + b[1], x + b[0] + mask.width, y + b[1] + mask.height)
+        self.im.paste(fill, box, mask)
+        self.dirty.append(box)
+
+    def line(self, xy, fill=None, width: int = 0, joint=None) -> None:
+        pts = [tuple(p) for p in xy]
+        pad = width + 2
+        self.dirty.append(
+            (
+                min(p[0] for p in pts) - pad,
+                min(p[1] for p in pts) - pad,
+                max(p[0] for p in pts) + pad,
+                max(p[1] for p in pts) + pad,
+            )
+        )
+        self.draw.line(pts, fill=fill, width=width, joint=joint)
+
+    def bitmap(self, xy, bitmap: Image.Image, fill=None) -> None:
+        x, y = (int(v) for v in xy)
+        self.dirty.append((x, y, x + bitmap.width, y + bitmap.height))
+        self.draw.bitmap((x, y), bitmap, fill=fill)
+
+    def __getattr__(self, name: str) -> Any:
+        # Anything else may touch the whole frame.
+        self.dirty.append((0, 0, *self.im.size))
+        return getattr(self.draw, name)
+
+
+class Stamper:
+    """Stamps records onto cached templates of one family/theme/screen/locale."""
+
+    def __init__(
+        self,
+        family: registry.Family,
+        theme_key: str,
+        screen_key: str,
+        locale: str = SOURCE_LOCALE,
+        device: devices.Device = devices.DEFAULT,
+    ) -> None:
+        self.family = family
+        self.theme_key = theme_key
+        self.screen_key = screen_key
+        self.locale = locale
+        self.device = device
+        self.templates: dict[tuple, Template] = {}
+        base = self._build({})
+        if not base.slots:
+            raise ValueError(f"{family.key}/{screen_key} has no stampable slots")
+        self.slots = base.slots
+        with context.use(device=device):
+            self.templates[self._signature(base.slots, {})] = base
+
+    def _build(self, values: Mapping[str, Any]) -> Template:
+        session = TemplateSession()
+        with context.use(template=session, values=dict(values)):
+            im = render.render(self.family, self.theme_key, self.screen_key, self.locale, self.device)
+        return Template(im, session.slots)
+
+    @staticmethod
+    def _signature(slots: Mapping[str, Slot], values: Mapping[str, Any]) -> tuple:
+        return tuple(
+            s.paint(_scratch(), values.get(s.name, s.default)) for s in slots.values() if s.layout
+        )
+
+    def stamp(self, record: Mapping[str, Any]) -> Image.Image:
+        """Stamp one record; the returned image is reused by the next call."""
+        values = {k: record[k] for k in self.slots if record.get(k) not in (None, "")}
+        with context.use(device=self.device):
+            return self._stamp(values)
+
+    def _stamp(self, values: Mapping[str, Any]) -> Image.Image:
+        sig = self._signature(self.slots, values)
+        template = self.templates.get(sig)
+        if template is None:
+            template = self.templates[sig] = self._build(values)
+
+        if template.frame is None:
+            template.frame = template.image.copy()
+        frame = template.frame
+        w, h = frame.size
+        for x1, y1, x2, y2 in template.dirty:
+            box = (max(0, x1), max(0, y1), min(w, x2), min(h, y2))
+            if box[0] < box[2] and box[1] < box[3]:
+                frame.paste(template.image.crop(box), box)
+
+        draw = StampDraw(frame)
+        for s in template.slots.values():
+            s.paint(draw, values.get(s.name, s.default))
+        template.dirty = draw.dirty
+        return frame
+
+
+def _coerce(value: str) -> Any:
+    if _SERIES.match(value):
+        return [float(v) for v in re.split(r"[;\s]+", value.strip())]
+    return value
+
+
+def read_records(path: str) -> Iterator[dict[str, Any]]:
+    """Stream records from a CSV or JSONL file (``-`` reads JSONL from stdin)."""
+    if path == "-":
+        stream: Iterable[str] = sys.stdin
+        for line in stream:
+            if line.strip():
+                yield json.loads(line)
+        return
+    p = Path(path)
+    with p.open(encoding="utf-8", newline="") as fh:
+        if p.suffix.lower() == ".csv":
+            for row in csv.DictReader(fh):
+                yield {k: _coerce(v) for k, v in row.items() if k}
+        else:
+            for line in fh:
+                if line.strip():
+                    yield json.loads(line)
+
+
+FORMATS = {
+    "jpeg": ("jpg", {"format": "JPEG", "quality": 90}),
+    "png": ("png", {"format": "PNG", "compress_level": 1}),
+}
+
+
+def encode(im: Image.Image, fmt: str) -> bytes:
+    _, options = FORMATS[fmt]
+    buf = io.BytesIO()
+    im.save(buf, **options)
+    return buf.getvalue()
+
+
+def record_name(record: Mapping[str, Any], index: int) -> str:
+    rid = record.get("id")
+    if rid in (None, ""):
+        return f"{index:06d}"
+    return re.sub(r"[^A-Za-z0-9._-]+", "_", str(rid))
+
+
+def command(args: argparse.Namespace) -> int:
+    family = registry.families()[args.family]
+    theme_key = args.theme or next(iter(family.themes))
+    for kind, value, known in (("theme", theme_key, family.themes), ("screen", args.screen, family.screens)):
+        if value not in known:
+            print(f"{family.key} has no {kind} {value!r}; one of {', '.join(known)}", file=sys.stderr)
+            return 2
+    t0 = time.perf_counter()
+    stamper = Stamper(family, theme_key, args.screen, args.locale, devices.DEVICES[args.device])
+    t_template = time.perf_counter() - t0
+    print(f"template {family.key}/{theme_key}/{args.screen}: slots {', '.join(stamper.slots)} ({t_template:.2f}s)", file=sys.stderr)
+
+    out_dir = Path(args.out or registry.MOCKUP_DIR / "build" / "stamp" / f"{family.key}_{args.screen}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ext, _ = FORMATS[args.format]
+    t1 = time.perf_counter()
+    n = 0
+    for i, record in enumerate(read_records(args.records)):
+        if args.limit is not None and i >= args.limit:
+            break
+        data = encode(stamper.stamp(record), args.format)
+        (out_dir / f"{record_name(record, i)}.{ext}").write_bytes(data)
+        n += 1
+    elapsed = time.perf_counter() - t1
+    fps = n / elapsed if elapsed else 0.0
+    print(
+        f"stamped {n} frames into {out_dir} in {elapsed:.2f}s ({fps:.0f} fps, {len(stamper.templates)} templates)",
+        file=sys.stderr,
+    )
+    return 0
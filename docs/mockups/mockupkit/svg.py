@@ -0,0 +1,391 @@
+"""Vector pass: run builders against SVG layers instead of pixels.
+
+Like the layout recorder, ``canvas`` hands out stand-ins while a pass runs:
+every draw call becomes markup (rounded rects, text, arcs, polygons, lines)
+and layer operations map onto SVG: ``alpha_composite``/``paste`` place a
+layer clipped to its bounds, ``crop`` translates, and a Gaussian ``filter``
+becomes a shared ``feGaussianBlur``. Procedural raster layers (noise, the
+photo scenes, gradients baked into them) still come from the cached
+backgrounds; each one is embedded once per document and referenced with
+``<use>`` wherever the builder reuses it, e.g. under a blurred sheet.
+
+The viewBox is in device pixels and the size in points, so the file scales
+to any density without another render. Ink follows Pillow: on an opaque
+frame (one not created transparent) its alpha is dropped as the final RGB
+conversion would, on a transparent layer it keeps its alpha.
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import functools
+import io
+import math
+import sys
+import time
+import weakref
+from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
+from xml.sax.saxutils import escape
+
+from PIL import Image, ImageFont
+
+from mockupkit import cache, context, devices, registry, trace
+from mockupkit.i18n import SOURCE_LOCALE
+
+Box = tuple[float, float, float, float]
+
+_WEIGHTS = (
+    ("thin", 100),
+    ("ultralight", 200),
+    ("light", 300),
+    ("medium", 500),
+    ("demi", 600),
+    ("semibold", 600),
+    ("heavy", 800),
+    ("black", 900),
+    ("bold", 700),
+)
+
+# Encoded rasters by image identity: cached backgrounds are the same object
+# across passes, so each is encoded once per process.
+_uris: dict[int, str] = {}
+
+
+def _n(v: float) -> str:
+    return f"{v:.2f}".rstrip("0").rstrip(".") if v != int(v) else str(int(v))
+
+
+def _uri(im: Image.Image) -> str:
+    key = id(im)
+    uri = _uris.get(key)
+    if uri is None:
+        buf = io.BytesIO()
+        with trace.region("embed", "encode"):
+            im.save(buf, format="PNG", compress_level=1)
+        uri = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode("ascii")
+        _uris[key] = uri
+        weakref.finalize(im, _uris.pop, key, None)
+    return uri
+
+
+class Document:
+    """Shared definitions (rasters, blurs, clips) of one SVG file."""
+
+    def __init__(self) -> None:
+        self.defs: dict[Any, str] = {}
+
+    def _define(self, key: Any, make) -> str:
+        if key not in self.defs:
+            self.defs[key] = make(f"d{len(self.defs)}")
+        return self.defs[key].split('"', 2)[1]
+
+    def raster(self, im: Image.Image) -> SvgImage:
+        """A layer showing ``im``; the pixels are embedded once however often it is used."""
+        w, h = im.size
+        ref = self._define(
+            ("image", id(im)),
+            lambda i: f'<image id="{i}" width="{w}" height="{h}" xlink:href="{_uri(im)}"/>',
+        )
+        # Rasters are backgrounds and sprites: frames, not overlays to draw into.
+        layer = SvgImage(self, "RGBA", im.size, opaque=True)
+        layer.nodes.append(f'<use xlink:href="#{ref}"/>')
+        return layer
+
+    def blur(self, radius: float) -> str:
+        return self._define(
+            ("blur", radius),
+            lambda i: f'<filter id="{i}" x="-50%" y="-50%" width="200%" height="200%">'
+            f'<feGaussianBlur stdDeviation="{_n(radius)}"/></filter>',
+        )
+
+    def clip(self, size: tuple[int, int]) -> str:
+        return self._define(
+            ("clip", size),
+            lambda i: f'<clipPath id="{i}"><rect width="{size[0]}" height="{size[1]}"/></clipPath>',
+        )
+
+    def markup(self, im: SvgImage, device: devices.Device) -> str:
+        w, h = im.size
+        pw, ph = w / device.scale, h / device.scale
+        defs = "".join(self.defs.values())
+        return (
+            '<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink" '
+            f'width="{_n(pw)}" height="{_n(ph)}" viewBox="0 0 {w} {h}">\n'
+            f"<defs>{defs}</defs>\n" + "\n".join(im.nodes) + "\n</svg>\n"
+        )
+
+
+class SvgImage:
+    """Stand-in for a PIL image holding markup in paint order.
+
+    Content is kept unclipped and clipped to the layer's bounds only where the
+    layer is placed, so a blurred crop still sees the pixels around it.
+    """
+
+    def __init__(self, doc: Document, mode: str, size: tuple[int, int], color: Any = 0, opaque: bool | None = None) -> None:
+        self.doc = doc
+        self.mode = mode
+        self.size = (int(size[0]), int(size[1]))
+        self.nodes: list[str] = []
+        if opaque is None:
+            opaque = mode != "RGBA" or (isinstance(color, tuple) and len(color) == 4 and color[3] == 255)
+        self.opaque = opaque
+        if color and (not isinstance(color, tuple) or len(color) < 4 or color[3]):
+            self.nodes.append(f'<rect width="{self.size[0]}" height="{self.size[1]}" {_paint("fill", color, opaque)}/>')
+
+    @property
+    def width(self) -> int:
+        return self.size[0]
+
+    @property
+    def height(self) -> int:
+        return self.size[1]
+
+    def _derive(self, size: tuple[int, int], nodes: list[str], mode: str | None = None) -> SvgImage:
+        out = SvgImage(self.doc, mode or self.mode, size, opaque=self.opaque or (mode is not None and mode != "RGBA"))
+        out.nodes = nodes
+        return out
+
+    def convert(self, mode: str | None = None, *args, **kwargs) -> SvgImage:
+        return self._derive(self.size, list(self.nodes), mode)
+
+    def copy(self) -> SvgImage:
+        return self._derive(self.size, list(self.nodes))
+
+    def crop(self, box) -> SvgImage:
+        x0, y0, x1, y1 = (int(v) for v in box)
+        return self._derive((x1 - x0, y1 - y0), [f'<g transform="translate({-x0} {-y0})">', *self.nodes, "</g>"])
+
+    def filter(self, f) -> SvgImage:
+        radius = getattr(f, "radius", None)
+        if type(f).__name__ != "GaussianBlur" or radius is None:
+            raise NotImplementedError(f"no SVG equivalent for {type(f).__name__}")
+        if not radius:
+            return self.copy()
+        return self._derive(self.size, [f'<g filter="url(#{self.doc.blur(radius)})">', *self.nodes, "</g>"])
+
+    def _place(self, layer: SvgImage | Image.Image, at: tuple[int, int]) -> None:
+        if isinstance(layer, Image.Image):
+            layer = self.doc.raster(layer)
+        x, y = (int(v) for v in at)
+        inner = layer.nodes
+        if layer.size != self.size or (x, y) != (0, 0):
+            inner = [f'<g clip-path="url(#{self.doc.clip(layer.size)})">', *inner, "</g>"]
+        if (x, y) != (0, 0):
+            inner = [f'<g transform="translate({x} {y})">', *inner, "</g>"]
+        self.nodes.extend(inner)
+
+    def alpha_composite(self, im: SvgImage | Image.Image, dest: tuple[int, int] = (0, 0), source: tuple[int, int] = (0, 0)) -> None:
+        if tuple(source) != (0, 0):
+            sx, sy = source
+            im = im.crop((sx, sy, im.size[0], im.size[1]))
+        self._place(im, dest)
+
+    def paste(self, im, box=None, mask=None) -> None:
+        if mask is not None:
+            raise NotImplementedError("masked paste has no SVG equivalent here")
+        at = (0, 0) if box is None else tuple(box[:2])
+        if isinstance(im, (SvgImage, Image.Image)):
+            self._place(im, at)
+            return
+        # A color fills the box (or the whole layer).
+        x0, y0, x1, y1 = box if box is not None and len(box) == 4 else (0, 0, *self.size)
+        self.nodes.append(
+            f'<rect x="{_n(x0)}" y="{_n(y0)}" width="{_n(x1 - x0)}" height="{_n(y1 - y0)}" {_paint("fill", im, True)}/>'
+        )
+
+
+def _color(c: Any) -> tuple[int, ...]:
+    if isinstance(c, int):
+        return (c, c, c)
+    return tuple(c)
+
+
+def _paint(attr: str, c: Any, opaque: bool) -> str:
+    """``fill``/``stroke`` attributes for Pillow ink ``c``."""
+    if c is None:
+        return f'{attr}="none"'
+    rgb = _color(c)
+    out = f'{attr}="#{rgb[0]:02x}{rgb[1]:02x}{rgb[2]:02x}"'
+    if len(rgb) == 4 and not opaque and rgb[3] < 255:
+        out += f' {attr}-opacity="{_n(rgb[3] / 255)}"'
+    return out
+
+
+def _box(xy) -> Box:
+    if len(xy) == 2:
+        (x0, y0), (x1, y1) = xy
+    else:
+        x0, y0, x1, y1 = xy
+    return (float(x0), float(y0), float(x1), float(y1))
+
+
+def _pairs(xy) -> list[tuple[float, float]]:
+    flat = list(xy)
+    if flat and not isinstance(flat[0], (tuple, list)):
+        return [(flat[i], flat[i + 1]) for i in range(0, len(flat), 2)]
+    return [(p[0], p[1]) for p in flat]
+
+
+def _points(points: Sequence[tuple[float, float]]) -> str:
+    # Pillow puts vertices on pixel centers.
+    return " ".join(f"{_n(x + 0.5)},{_n(y + 0.5)}" for x, y in points)
+
+
+@functools.cache
+def _font_attrs(font: ImageFont.ImageFont) -> tuple[str, float]:
+    """Font attributes and the ascent (Pillow draws text from its top, SVG from the baseline)."""
+    try:
+        name, style = font.getname()
+    except Exception:
+        name, style = None, ""
+    size = getattr(font, "size", 10)
+    ascent = font.getmetrics()[0] if hasattr(font, "getmetrics") else size
+    lowered = (style or "").lower()
+    weight = next((w for word, w in _WEIGHTS if word in lowered), 400)
+    family = f"{escape(name, {chr(34): '&quot;'})}, sans-serif" if name else "sans-serif"
+    attrs = f'font-family="{family}" font-size="{size}"'
+    if weight != 400:
+        attrs += f' font-weight="{weight}"'
+    if "italic" in lowered or "oblique" in lowered:
+        attrs += ' font-style="italic"'
+    return attrs, ascent
+
+
+class SvgDraw:
+    """Duck-typed ``ImageDraw`` writing SVG elements into a layer."""
+
+    def __init__(self, im: SvgImage) -> None:
+        self.im = im
+
+    def _add(self, markup: str) -> None:
+        self.im.nodes.append(markup)
+
+    def _shape(self, fill: Any, outline: Any, width: float) -> str:
+        opaque = self.im.opaque
+        attrs = _paint("fill", fill, opaque)
+        if outline is not None and width:
+            attrs += f' {_paint("stroke", outline, opaque)} stroke-width="{_n(width)}"'
+        return attrs
+
+    def textbbox(self, xy, text: str, font=None, **kwargs) -> tuple[int, int, int, int]:
+        if kwargs:
+            return cache.MEASURE.textbbox(xy, text, font=font, **kwargs)
+        x, y = xy
+        b = cache.text_bbox(font, text)
+        return (b[0] + x, b[1] + y, b[2] + x, b[3] + y)
+
+    def textlength(self, text: str, font=None, **kwargs) -> float:
+        return cache.MEASURE.textlength(text, font=font, **kwargs)
+
+    def text(self, xy, text: str, fill=None, font=None, **kwargs) -> None:
+        attrs, ascent = _font_attrs(font)
+        x, y = xy
+        self._add(
+            f'<text x="{_n(x)}" y="{_n(y + ascent)}" {attrs} {_paint("fill", fill, self.im.opaque)} '
+            f'xml:space="preserve">{escape(text)}</text>'
+        )
+
+    def rectangle(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        x0, y0, x1, y1 = _box(xy)
+        # Pillow boxes include their last pixel and draw outlines inside the box.
+        inset = width / 2 if outline is not None and width else 0
+        self._add(
+            f'<rect x="{_n(x0 + inset)}" y="{_n(y0 + inset)}" width="{_n(x1 - x0 + 1 - 2 * inset)}" '
+            f'height="{_n(y1 - y0 + 1 - 2 * inset)}" {self._shape(fill, outline, width)}/>'
+        )
+
+    def rounded_rectangle(self, xy, radius: float = 0, fill=None, outline=None, width: int = 1, **kwargs) -> None:
+        x0, y0, x1, y1 = _box(xy)
+        w, h = x1 - x0 + 1, y1 - y0 + 1
+        # SVG clamps rx and ry separately; Pillow keeps the corners circular.
+        r = min(radius, w / 2, h / 2)
+        inset = width / 2 if outline is not None and width else 0
+        rr = max(0.0, r - inset)
+        self._add(
+            f'<rect x="{_n(x0 + inset)}" y="{_n(y0 + inset)}" width="{_n(w - 2 * inset)}" height="{_n(h - 2 * inset)}" '
+            f'rx="{_n(rr)}" ry="{_n(rr)}" {self._shape(fill, outline, width)}/>'
+        )
+
+    def ellipse(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        x0, y0, x1, y1 = _box(xy)
+        inset = width / 2 if outline is not None and width else 0
+        rx, ry = (x1 - x0 + 1) / 2 - inset, (y1 - y0 + 1) / 2 - inset
+        self._add(
+            f'<ellipse cx="{_n((x0 + x1 + 1) / 2)}" cy="{_n((y0 + y1 + 1) / 2)}" rx="{_n(max(0.0, rx))}" '
+            f'ry="{_n(max(0.0, ry))}" {self._shape(fill, outline, width)}/>'
+        )
+
+    def arc(self, xy, start: float, end: float, fill=None, width: int = 1) -> None:
+        x0, y0, x1, y1 = _box(xy)
+        cx, cy = (x0 + x1 + 1) / 2, (y0 + y1 + 1) / 2
+        rx, ry = (x1 - x0 + 1 - width) / 2, (y1 - y0 + 1 - width) / 2
+        sweep = (end - start) % 360 or (360 if end != start else 0)
+        stroke = f'fill="none" {_paint("stroke", fill, self.im.opaque)} stroke-width="{_n(width)}"'
+        if sweep >= 360:
+            self._add(f'<ellipse cx="{_n(cx)}" cy="{_n(cy)}" rx="{_n(rx)}" ry="{_n(ry)}" {stroke}/>')
+            return
+        a, b = math.radians(start), math.radians(start + sweep)
+        sx, sy = cx + rx * math.cos(a), cy + ry * math.sin(a)
+        ex, ey = cx + rx * math.cos(b), cy + ry * math.sin(b)
+        large = 1 if sweep > 180 else 0
+        self._add(
+            f'<path d="M{_n(sx)} {_n(sy)}A{_n(rx)} {_n(ry)} 0 {large} 1 {_n(ex)} {_n(ey)}" {stroke}/>'
+        )
+
+    def line(self, xy, fill=None, width: int = 0, joint=None) -> None:
+        join = ' stroke-linejoin="round"' if joint == "curve" else ""
+        self._add(
+            f'<polyline points="{_points(_pairs(xy))}" fill="none" {_paint("stroke", fill, self.im.opaque)} '
+            f'stroke-width="{_n(width or 1)}"{join}/>'
+        )
+
+    def polygon(self, xy, fill=None, outline=None, width: int = 1) -> None:
+        self._add(f'<polygon points="{_points(_pairs(xy))}" {self._shape(fill, outline, width)}/>')
+
+    def bitmap(self, xy, bitmap: Image.Image, fill=None) -> None:
+        rgb = _color(fill)
+        layer = Image.new("RGBA", bitmap.size, rgb[:3] + (0,))
+        alpha = bitmap if len(rgb) < 4 or self.im.opaque else bitmap.point(lambda v: v * rgb[3] // 255)
+        layer.putalpha(alpha)
+        self.im._place(layer, xy)
+
+
+def render(
+    family: registry.Family,
+    theme_key: str,
+    screen_key: str,
+    locale: str = SOURCE_LOCALE,
+    device: devices.Device = devices.DEFAULT,
+) -> str:
+    """One screen as an SVG document."""
+    w, h = device.pixels
+    doc = Document()
+    with context.use(vector=doc, locale=locale, device=device), trace.region(f"{family.key}/{theme_key}/{screen_key}", "svg"):
+        fonts = registry.fonts_for(family.key, device.scale)
+        im = family.screens[screen_key](w, h, family.themes[theme_key], fonts)
+        return doc.markup(im, device)
+
+
+def command(args: argparse.Namespace) -> int:
+    matrix = list(registry.select(args.family, args.theme, args.screen))
+    profiles = devices.select(args.device) if args.device else [devices.DEFAULT]
+    if not matrix:
+        print("svg: nothing matches the filters", file=sys.stderr)
+        return 1
+    t0 = time.perf_counter()
+    for device in profiles:
+        out_dir = Path(args.out) / device.key if len(profiles) > 1 else Path(args.out)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        for family, theme_key, screen_key in matrix:
+            t1 = time.perf_counter()
+            markup = render(family, theme_key, screen_key, args.locale, device)
+            path = out_dir / Path(family.output_name(theme_key, screen_key)).with_suffix(".svg").name
+            path.write_text(markup, encoding="utf-8")
+            print(f"wrote {path} ({(time.perf_counter() - t1) * 1000:.0f} ms)")
+    print(f"svg: {len(matrix) * len(profiles)} files in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+    return 0
@@ -0,0 +1,110 @@
+"""Full-frame filters split into row tiles on a shared thread pool.
+
+A tile is a full-width band of rows, so horizontal passes see exactly the
+pixels they would on the whole frame and only a vertical halo is needed:
+each tile is filtered with ``halo`` extra rows above and below (cut at the
+frame edges, where the filter clamps anyway) and cropped back, which makes
+the stitched frame identical to the untiled call.
+
+Tiling only pays for Pillow operations that release the GIL while they run:
+Gaussian blur (three box passes per axis) and lookup tables (``point``).
+``alpha_composite``, ``ImageChops`` and ``Image.blend`` hold it, so they stay
+whole; ``brightness``, a blend with black, is recast as an exact table.
+Layout recorders and SVG layers get the plain call.
+"""
+
+from __future__ import annotations
+
+import functools
+import math
+import os
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+
+def _cpus() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+WORKERS = _cpus()
+# Bands thinner than this cost more in crops and pastes than they save.
+MIN_ROWS = 128
+
+_pools: dict[int, ThreadPoolExecutor] = {}
+_lock = threading.Lock()
+
+
+def _pool(n: int) -> ThreadPoolExecutor:
+    with _lock:
+        if n not in _pools:
+            _pools[n] = ThreadPoolExecutor(max_workers=n, thread_name_prefix="tiles")
+        return _pools[n]
+
+
+def spans(h: int, halo: int = 0) -> list[tuple[int, int]]:
+    """Row ranges splitting ``h`` rows over the workers; a single one when tiling would not pay."""
+    n = max(1, min(WORKERS, h // max(MIN_ROWS, 2 * halo)))
+    return [(h * i // n, h * (i + 1) // n) for i in range(n)]
+
+
+def map_rows(fn: Callable[[Image.Image], Image.Image], im: Any, halo: int = 0) -> Any:
+    """``fn(im)`` computed tile by tile; ``fn`` must look no further than ``halo`` rows up or down."""
+    if not isinstance(im, Image.Image):
+        return fn(im)
+    w, h = im.size
+    parts = spans(h, halo)
+    if len(parts) == 1:
+        return fn(im)
+
+    def one(span: tuple[int, int]) -> Image.Image:
+        y0, y1 = span
+        a, b = max(0, y0 - halo), min(h, y1 + halo)
+        return fn(im.crop((0, a, w, b))).crop((0, y0 - a, w, y1 - a))
+
+    done = list(_pool(len(parts)).map(one, parts))
+    out = Image.new(done[0].mode, im.size)
+    for (y0, _), tile in zip(parts, done):
+        out.paste(tile, (0, y0))
+    return out
+
+
+def blur_halo(radius: float) -> int:
+    """Rows a Gaussian blur of ``radius`` reaches: three box passes, each at most ``box + 2`` rows."""
+    # Integer part of the box radius (box + a, 0 <= a < 1) Pillow's BoxBlur.c derives for three passes.
+    box = math.floor((math.sqrt(4 * radius * radius + 1) - 1) / 2)
+    return 3 * (box + 2)
+
+
+def gaussian_blur(im: Any, radius: float) -> Any:
+    f = ImageFilter.GaussianBlur(radius)
+    return map_rows(lambda tile: tile.filter(f), im, blur_halo(radius))
+
+
+def point(im: Any, table: Sequence[int]) -> Any:
+    return map_rows(lambda tile: tile.point(table), im)
+
+
+@functools.lru_cache(maxsize=64)
+def _scaled(factor: float) -> tuple[int, ...]:
+    # Blend.c in single precision: 0 + factor * v, clipped, truncated toward zero.
+    v = np.float32(factor) * np.arange(256, dtype=np.float32)
+    return tuple(np.clip(v, 0, 255).astype(np.uint8).tolist())
+
+
+def brightness(im: Any, factor: float) -> Any:
+    """``ImageEnhance.Brightness(im).enhance(factor)``, bit for bit, as a tiled table."""
+    if not isinstance(im, Image.Image) or im.mode not in ("L", "RGB", "RGBA"):
+        return ImageEnhance.Brightness(im).enhance(factor)
+    table = _scaled(factor)
+    # Brightness keeps alpha: the black it blends with carries the image's own.
+    if im.mode == "RGBA":
+        return point(im, table * 3 + tuple(range(256)))
+    return point(im, table * len(im.getbands()))
@@ -0,0 +1,209 @@
+"""Opt-in tracing of renders, builder helpers and Pillow hot spots.
+
+Helpers carry ``@trace.span``; while no tracer is active the wrapper only
+checks a module global and calls straight through, so it stays in the code.
+``enabled()`` installs a tracer and, for its duration, wraps Pillow's
+``filter`` and ``alpha_composite`` in spans and counts ``textbbox`` calls,
+pixels composited and bytes of image buffers allocated.
+
+The result is Chrome trace JSON (``chrome://tracing`` or Perfetto) and a
+top-N table of helpers by self time.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from PIL import Image, ImageDraw
+
+COUNTERS = ("textbbox", "pixels_composited", "image_bytes")
+
+
+@dataclass(frozen=True)
+class Event:
+    name: str
+    cat: str
+    start: int  # ns
+    end: int
+    tid: int
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.events: list[Event] = []
+        self.counters: Counter[str] = Counter()
+        # Counter values over time, sampled as each render ends.
+        self.samples: list[tuple[int, dict[str, int]]] = []
+        self.origin = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self._open = threading.local()
+
+    def current(self) -> str | None:
+        """Innermost open span on this thread."""
+        stack = getattr(self._open, "stack", None)
+        return stack[-1] if stack else None
+
+    @contextlib.contextmanager
+    def span(self, name: str, cat: str) -> Iterator[None]:
+        stack = self._open.__dict__.setdefault("stack", [])
+        stack.append(name)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            stack.pop()
+            with self._lock:
+                self.events.append(Event(name, cat, start, end, threading.get_ident()))
+                if cat == "render":
+                    self.samples.append((end, dict(self.counters)))
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def chrome(self) -> dict[str, Any]:
+        tids = {tid: i for i, tid in enumerate(dict.fromkeys(e.tid for e in self.events))}
+        events: list[dict[str, Any]] = [
+            {
+                "name": e.name,
+                "cat": e.cat,
+                "ph": "X",
+                "ts": (e.start - self.origin) / 1000,
+                "dur": (e.end - e.start) / 1000,
+                "pid": 1,
+                "tid": tids[e.tid],
+            }
+            for e in self.events
+        ]
+        events += [
+            {"name": "counters", "ph": "C", "ts": (t - self.origin) / 1000, "pid": 1, "args": values}
+            for t, values in self.samples
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"counters": dict(self.counters)}}
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.chrome()), encoding="utf-8")
+
+    def summary(self, top: int = 20) -> str:
+        """Spans by self time (time not spent in nested spans), then the counters."""
+        calls: Counter[str] = Counter()
+        total: dict[str, int] = defaultdict(int)
+        own: dict[str, int] = defaultdict(int)
+        by_thread: dict[int, list[Event]] = defaultdict(list)
+        for e in self.events:
+            by_thread[e.tid].append(e)
+        for events in by_thread.values():
+            # Parents start first and, on ties, end last.
+            events.sort(key=lambda e: (e.start, -e.end))
+            stack: list[list[Any]] = []
+            for e in events:
+                while stack and stack[-1][0].end <= e.start:
+                    done, child = stack.pop()
+                    own[done.name] += done.end - done.start - child
+                stack.append([e, 0])
+                if len(stack) > 1:
+                    stack[-2][1] += e.end - e.start
+                calls[e.name] += 1
+                total[e.name] += e.end - e.start
+            for done, child in stack:
+                own[done.name] += done.end - done.start - child
+        lines = [f"{'span':40s} {'calls':>7s} {'self ms':>10s} {'total ms':>10s}"]
+        for name in sorted(own, key=own.get, reverse=True)[:top]:
+            lines.append(f"{name:40s} {calls[name]:7d} {own[name] / 1e6:10.2f} {total[name] / 1e6:10.2f}")
+        lines.append("")
+        lines += [f"{name:40s} {self.counters[name]:>20,d}" for name in COUNTERS]
+        return "\n".join(lines)
+
+
+_tracer: Tracer | None = None
+
+
+def active() -> Tracer | None:
+    return _tracer
+
+
+def span(fn: Callable) -> Callable:
+    """Record every call of ``fn`` as a span while tracing is enabled."""
+    name = fn.__name__
+    cat = fn.__module__.rsplit(".", 1)[-1]
+
+    @functools.wraps(fn)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        tracer = _tracer
+        if tracer is None:
+            return fn(*args, **kwargs)
+        with tracer.span(name, cat):
+            return fn(*args, **kwargs)
+
+    return wrapper
+
+
+def region(name: str, cat: str = "mockupkit") -> contextlib.AbstractContextManager:
+    """A span around a block; a no-op context while tracing is off."""
+    tracer = _tracer
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, cat)
+
+
+def _patches(tracer: Tracer) -> list[tuple[Any, str, Callable]]:
+    filter_ = Image.Image.filter
+    # Image.alpha_composite also serves the in-place method, after it crops the source.
+    composite, textbbox, new = Image.alpha_composite, ImageDraw.ImageDraw.textbbox, Image.Image._new
+
+    def traced_filter(self: Image.Image, f: Any) -> Image.Image:
+        with tracer.span(f"filter {getattr(f, 'name', type(f).__name__)}", "pillow"):
+            return filter_(self, f)
+
+    def traced_composite(im1: Image.Image, im2: Image.Image) -> Image.Image:
+        tracer.count("pixels_composited", im2.width * im2.height)
+        with tracer.span("alpha_composite", "pillow"):
+            return composite(im1, im2)
+
+    def counted_textbbox(self: ImageDraw.ImageDraw, *args: Any, **kwargs: Any) -> tuple:
+        tracer.count("textbbox")
+        return textbbox(self, *args, **kwargs)
+
+    def counted_new(self: Image.Image, im: Any) -> Image.Image:
+        # Every Pillow operation returning a fresh image goes through here.
+        w, h = im.size
+        tracer.count("image_bytes", w * h * Image.getmodebands(im.mode))
+        return new(self, im)
+
+    return [
+        (Image.Image, "filter", traced_filter),
+        (Image, "alpha_composite", traced_composite),
+        (ImageDraw.ImageDraw, "textbbox", counted_textbbox),
+        (Image.Image, "_new", counted_new),
+    ]
+
+
+@contextlib.contextmanager
+def enabled() -> Iterator[Tracer]:
+    """Trace everything rendered inside the block."""
+    global _tracer
+    if _tracer is not None:
+        raise RuntimeError("tracing is already enabled")
+    tracer = Tracer()
+    saved = []
+    for owner, name, fn in _patches(tracer):
+        saved.append((owner, name, getattr(owner, name)))
+        setattr(owner, name, fn)
+    _tracer = tracer
+    try:
+        yield tracer
+    finally:
+        _tracer = None
+        for owner, name, original in reversed(saved):
+            setattr(owner, name, original)
@@ -0,0 +1,27 @@
+"""Logical layout units for the builders.
+
+Coordinates are written in points and converted with ``px`` for the device
+of the current render. Content anchored to the top or bottom edge is offset
+by the safe-area insets so it clears the notch, status bar and home indicator.
+"""
+
+from __future__ import annotations
+
+from mockupkit import context
+
+
+def scale() -> float:
+    return context.current().device.scale
+
+
+def px(points: float, scale_: float | None = None) -> int:
+    """Points to whole pixels (``scale_`` overrides the current device's)."""
+    return round(points * (scale() if scale_ is None else scale_))
+
+
+def safe_top() -> int:
+    return px(context.current().device.safe.top)
+
+
+def safe_bottom() -> int:
+    return px(context.current().device.safe.bottom)
@@ -0,0 +1,271 @@
+"""Watch mode: re-render only the screens an edit can affect.
+
+The generator sources, the font files they name and the locale catalogs are
+polled. An edited generator is not reloaded; its top-level statements are
+compared with the previous version and only the changed ones are executed
+again in the live module, followed by any assignment built from them (the
+``FAMILY`` table, for one). Unchanged helpers keep their identity and their
+cached backgrounds and sprites; cached helpers that depend on a changed name
+are cleared.
+
+A screen is affected when its builder reaches a changed name through the
+helpers it calls (read statically from the source), when something its
+family table depends on changes (themes, fonts) or, for catalogs, when it
+reaches a ``tr`` string whose translation changed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import json
+import sys
+import time
+import traceback
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+
+from mockupkit import cache, devices, fonts, i18n, registry, render
+
+FONT_SUFFIXES = (".ttf", ".ttc", ".otf")
+
+
+@dataclass
+class Source:
+    """Top-level statements of a module and what each one refers to."""
+
+    statements: dict[str, ast.stmt] = field(default_factory=dict)
+    # ``ast.dump`` per statement: position-free, so moving code is not a change.
+    dumps: dict[str, str] = field(default_factory=dict)
+    deps: dict[str, set[str]] = field(default_factory=dict)
+    strings: dict[str, set[str]] = field(default_factory=dict)
+    fonts: set[str] = field(default_factory=set)
+
+    def reach(self, name: str) -> set[str]:
+        """``name`` and every top-level name it refers to, transitively."""
+        seen, todo = set(), [name]
+        while todo:
+            n = todo.pop()
+            if n not in seen:
+                seen.add(n)
+                todo += self.deps.get(n, ())
+        return seen
+
+    def tr_strings(self, name: str) -> set[str]:
+        return set().union(*(self.strings.get(n, set()) for n in self.reach(name)))
+
+
+def _defined(node: ast.stmt) -> list[str]:
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return [node.name]
+    if isinstance(node, (ast.Assign, ast.AnnAssign)):
+        targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+        return [n.id for t in targets for n in ast.walk(t) if isinstance(n, ast.Name)]
+    if isinstance(node, (ast.Import, ast.ImportFrom)):
+        return [(a.asname or a.name).split(".")[0] for a in node.names]
+    return []
+
+
+def parse(text: str) -> Source:
+    src = Source()
+    tree = ast.parse(text)
+    for node in tree.body:
+        names = _defined(node)
+        if not names:
+            continue
+        # Multi-name statements are keyed by their first name; the rest point at it.
+        key = names[0]
+        src.statements[key] = node
+        src.dumps[key] = ast.dump(node)
+        for alias in names[1:]:
+            src.deps.setdefault(alias, set()).add(key)
+    top = set(src.statements) | set(src.deps)
+    for key, node in src.statements.items():
+        refs, strings = set(), set()
+        for n in ast.walk(node):
+            if isinstance(n, ast.Name) and n.id in top and n.id != key:
+                refs.add(n.id)
+            elif isinstance(n, ast.Call) and isinstance(n.func, ast.Name) and n.func.id == "tr" and n.args:
+                if isinstance(n.args[0], ast.Constant) and isinstance(n.args[0].value, str):
+                    strings.add(n.args[0].value)
+            elif isinstance(n, ast.Constant) and isinstance(n.value, str) and n.value.lower().endswith(FONT_SUFFIXES):
+                src.fonts.add(n.value)
+        src.deps.setdefault(key, set()).update(refs)
+        src.strings[key] = strings
+    return src
+
+
+def _patch(module: ModuleType, path: Path, old: Source, new: Source) -> set[str]:
+    """Run the changed statements of ``new`` in ``module``; returns every name that changed."""
+    changed = {k for k, d in new.dumps.items() if old.dumps.get(k) != d}
+    # Assignments capture values when they run, so those built from a changed
+    # name run again too (functions look names up at call time).
+    for key, node in new.statements.items():
+        if key not in changed and not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if new.reach(key) & changed:
+                changed.add(key)
+    for key, node in new.statements.items():
+        if key in changed:
+            code = compile(ast.Module(body=[node], type_ignores=[]), str(path), "exec")
+            exec(code, module.__dict__)
+    # Cached helpers still holding output built by a changed name.
+    for key in new.statements:
+        fn = module.__dict__.get(key)
+        if key not in changed and hasattr(fn, "cache_clear") and new.reach(key) & changed:
+            fn.cache_clear()
+    return changed
+
+
+@dataclass(frozen=True)
+class Target:
+    family: str
+    theme: str
+    screen: str
+
+
+class Watcher:
+    """Polls the inputs of the selected families and reports the screens to re-render."""
+
+    def __init__(self, targets: Iterable[Target], locale: str = i18n.SOURCE_LOCALE) -> None:
+        self.targets = list(targets)
+        self.locale = locale
+        self.modules: dict[str, ModuleType] = {}
+        self.sources: dict[str, Source] = {}
+        for key in {t.family for t in self.targets}:
+            screens = registry.families()[key].screens
+            module = sys.modules[next(iter(screens.values())).__module__]
+            self.modules[key] = module
+            self.sources[key] = parse(Path(module.__file__).read_text(encoding="utf-8"))
+        self.catalog = i18n.LOCALE_DIR / f"{locale}.json"
+        self.strings = dict(i18n.catalog(locale))
+        self.stamps = {p: self._stamp(p) for p in self.paths()}
+
+    def paths(self) -> list[Path]:
+        paths = [Path(m.__file__) for m in self.modules.values()]
+        paths += sorted({Path(f) for s in self.sources.values() for f in s.fonts})
+        if self.locale != i18n.SOURCE_LOCALE:
+            paths.append(self.catalog)
+        return paths
+
+    @staticmethod
+    def _stamp(path: Path) -> tuple[int, int] | None:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def poll(self) -> Iterator[tuple[str, list[Target]]]:
+        """Yield ``(what changed, affected targets)`` for each input edited since the last poll."""
+        for path in self.paths():
+            stamp = self._stamp(path)
+            if self.stamps.get(path) == stamp:
+                continue
+            self.stamps[path] = stamp
+            if path == self.catalog:
+                yield path.name, self._catalog_changed()
+            elif path.suffix == ".py":
+                family = next(k for k, m in self.modules.items() if Path(m.__file__) == path)
+                yield path.name, self._source_changed(family, path)
+            else:
+                yield path.name, self._font_changed(str(path))
+
+    def _source_changed(self, family: str, path: Path) -> list[Target]:
+        try:
+            new = parse(path.read_text(encoding="utf-8"))
+        except SyntaxError as e:
+            print(f"watch: {path.name}:{e.lineno}: {e.msg}; keeping the previous version", file=sys.stderr)
+            return []
+        old = self.sources[family]
+        changed = _patch(self.modules[family], path, old, new)
+        self.sources[family] = new
+        if not changed:
+            return []
+        registry.families.cache_clear()
+        fam = registry.families()[family]
+        if fam.fonts.__name__ in changed:
+            registry.fonts_for.cache_clear()
+        builders = {key: new.reach(fn.__name__) for key, fn in fam.screens.items()}
+        # What the table holds besides the builders (themes, fonts, scene art) touches every screen.
+        shared = new.reach("FAMILY") - {"FAMILY"} - set().union(*builders.values())
+        everything = bool(shared & changed)
+        return [t for t in self.targets if t.family == family and (everything or builders[t.screen] & changed)]
+
+    def _font_changed(self, path: str) -> list[Target]:
+        fonts.load_font.cache_clear()
+        registry.fonts_for.cache_clear()
+        cache.text_bbox.cache_clear()
+        cache.text_mask.cache_clear()
+        return [t for t in self.targets if path in self.sources[t.family].fonts]
+
+    def _catalog_changed(self) -> list[Target]:
+        i18n.catalog.cache_clear()
+        try:
+            new = i18n.catalog(self.locale)
+        except (ValueError, json.JSONDecodeError) as e:
+            print(f"watch: {self.catalog.name}: {e}", file=sys.stderr)
+            return []
+        old, self.strings = self.strings, dict(new)
+        edited = {k for k in old.keys() | new.keys() if old.get(k) != new.get(k)}
+        out = []
+        for t in self.targets:
+            src = self.sources[t.family]
+            builder = registry.families()[t.family].screens[t.screen].__name__
+            if src.tr_strings(builder) & edited:
+                out.append(t)
+        return out
+
+
+def targets(
+    families_: Iterable[str] | None = None, themes: Iterable[str] | None = None, screens: Iterable[str] | None = None
+) -> list[Target]:
+    return [Target(f.key, t, s) for f, t, s in registry.select(families_, themes, screens)]
+
+
+def loop(watcher: Watcher, render_one: Callable[[Target], None], interval: float = 0.3) -> None:
+    """Poll forever, calling ``render_one`` for every affected target and timing each."""
+    while True:
+        try:
+            for what, affected in watcher.poll():
+                if not affected:
+                    print(f"{what}: no screen affected", file=sys.stderr)
+                    continue
+                t0 = time.perf_counter()
+                for target in affected:
+                    t1 = time.perf_counter()
+                    render_one(target)
+                    ms = (time.perf_counter() - t1) * 1000
+                    print(f"  {target.family}/{target.theme}/{target.screen} {ms:.0f}ms", file=sys.stderr)
+                print(f"{what}: {len(affected)} screens in {time.perf_counter() - t0:.2f}s", file=sys.stderr)
+        except Exception:  # a broken edit must not end the session; the next save retries
+            traceback.print_exc()
+        time.sleep(interval)
+
+
+def command(args: argparse.Namespace) -> int:
+    device = devices.DEVICES[args.device]
+    out_dir = Path(args.out)
+    selected = targets(args.family, args.theme, args.screen)
+    if not selected:
+        print("watch: nothing selected", file=sys.stderr)
+        return 1
+
+    def render_one(t: Target) -> None:
+        family = registry.families()[t.family]
+        im = render.render(family, t.theme, t.screen, args.locale, device, args.draft)
+        render.save(im, out_dir / family.output_name(t.theme, t.screen), optimize=args.optimize)
+
+    # First pass fills the caches and the output directory.
+    t0 = time.perf_counter()
+    for t in selected:
+        render_one(t)
+    print(f"watch: {len(selected)} screens in {time.perf_counter() - t0:.2f}s -> {out_dir}", file=sys.stderr)
+    watcher = Watcher(selected, args.locale)
+    print(f"watch: watching {len(watcher.paths())} files (mockupkit itself needs a restart)", file=sys.stderr)
+    try:
+        loop(watcher, render_one, args.interval)
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,252 @@
+"""Audio waveforms from WAV recordings.
+
+Samples are read through a memory map when the PCM layout allows it (8, 16,
+24 or 32-bit integer, 32-bit float) and in chunks through ``wave`` otherwise.
+One pass reduces the audio to fixed ``BLOCK``-frame bins (min, max and sum of
+squares of the mono mix). The bins are cached in memory and under
+``build/waveform``, and peaks for any width are folded from them, so rendering
+the same recording at another width never rescans the audio.
+"""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import struct
+import wave
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from mockupkit import registry
+
+BLOCK = 256
+CACHE_DIR = registry.MOCKUP_DIR / "build" / "waveform"
+# Frames decoded per numpy batch; bounds memory for hour-long recordings.
+CHUNK_FRAMES = BLOCK * 4096
+
+
+@dataclass(frozen=True)
+class Summary:
+    """``BLOCK``-frame bins of a recording; the last bin may be partial."""
+
+    lo: np.ndarray
+    hi: np.ndarray
+    sumsq: np.ndarray
+    frames: int
+    rate: int
+
+    @property
+    def duration(self) -> float:
+        return self.frames / self.rate if self.rate else 0.0
+
+
+@dataclass(frozen=True)
+class Peaks:
+    """Per-column min/max in [-1, 1] and RMS in [0, 1]."""
+
+    lo: np.ndarray
+    hi: np.ndarray
+    rms: np.ndarray
+    duration: float
+
+
+@dataclass(frozen=True)
+class _Layout:
+    offset: int
+    frames: int
+    channels: int
+    rate: int
+    width: int  # bytes per sample
+    floating: bool
+
+
+def _layout(path: Path) -> _Layout:
+    """Locate the PCM data of a RIFF/WAVE file without reading it."""
+    with path.open("rb") as fh:
+        riff, _, kind = struct.unpack("<4sI4s", fh.read(12))
+        if riff != b"RIFF" or kind != b"WAVE":
+            raise ValueError(f"{path} is not a RIFF/WAVE file")
+        fmt = None
+        while True:
+            head = fh.read(8)
+            if len(head) < 8:
+                raise ValueError(f"{path} has no data chunk")
+            cid, size = struct.unpack("<4sI", head)
+            if cid == b"fmt ":
+                body = fh.read(size)
+                tag, channels, rate, _, align, bits = struct.unpack("<HHIIHH", body[:16])
+                if tag == 0xFFFE and len(body) >= 26:
+                    # WAVE_FORMAT_EXTENSIBLE: the real format leads the subformat GUID.
+                    tag = struct.unpack("<H", body[24:26])[0]
+                fmt = (tag, channels, rate, align, bits)
+                fh.seek(size & 1, 1)
+            elif cid == b"data":
+                if fmt is None:
+                    raise ValueError(f"{path}: data chunk before fmt")
+                tag, channels, rate, align, bits = fmt
+                width = bits // 8
+                if tag not in (1, 3) or width * channels != align or (tag == 3 and width != 4):
+                    raise ValueError(f"{path}: unsupported sample format {tag}/{bits}-bit")
+                return _Layout(fh.tell(), size // align, channels, rate, width, tag == 3)
+            else:
+                fh.seek(size + (size & 1), 1)
+
+
+def _decode(raw: np.ndarray, width: int, floating: bool) -> np.ndarray:
+    """Interleaved little-endian sample bytes (frames, channels, width) -> float32 in [-1, 1]."""
+    if floating:
+        return raw.view("<f4")[..., 0].astype(np.float32)
+    if width == 1:
+        return (raw[..., 0].astype(np.float32) - 128) / 128
+    if width == 3:
+        # Sign-extend by placing the 3 bytes in the top of an int32.
+        wide = np.zeros(raw.shape[:-1] + (4,), dtype=np.uint8)
+        wide[..., 1:] = raw
+        return wide.view("<i4")[..., 0].astype(np.float32) / 2**31
+    dtype = {2: "<i2", 4: "<i4"}[width]
+    return raw.view(dtype)[..., 0].astype(np.float32) / 2 ** (8 * width - 1)
+
+
+def _mono_chunks(path: Path) -> tuple[Iterator[np.ndarray], int, int]:
+    """``(chunks, frames, rate)``; each chunk is a mono float32 run of frames."""
+    try:
+        lay = _layout(path)
+    except (ValueError, struct.error):
+        return _wave_chunks(path)
+    data = np.memmap(path, dtype=np.uint8, mode="r", offset=lay.offset, shape=(lay.frames, lay.channels, lay.width))
+
+    def chunks() -> Iterator[np.ndarray]:
+        for a in range(0, lay.frames, CHUNK_FRAMES):
+            yield _decode(np.asarray(data[a : a + CHUNK_FRAMES]), lay.width, lay.floating).mean(axis=1)
+
+    return chunks(), lay.frames, lay.rate
+
+
+def _wave_chunks(path: Path) -> tuple[Iterator[np.ndarray], int, int]:
+    with wave.open(str(path), "rb") as w:
+        frames, rate = w.getnframes(), w.getframerate()
+        channels, width = w.getnchannels(), w.getsampwidth()
+
+    def chunks() -> Iterator[np.ndarray]:
+        with wave.open(str(path), "rb") as w:
+            while True:
+                buf = w.readframes(CHUNK_FRAMES)
+                if not buf:
+                    return
+                raw = np.frombuffer(buf, dtype=np.uint8).reshape(-1, channels, width)
+                yield _decode(raw, width, False).mean(axis=1)
+
+    return chunks(), frames, rate
+
+
+def scan(path: Path) -> Summary:
+    """Reduce a recording to ``BLOCK``-frame bins in one streaming pass."""
+    chunks, _, rate = _mono_chunks(path)
+    lo, hi, sumsq = [], [], []
+    frames = 0
+    for mono in chunks:
+        frames += mono.size
+        full = mono.size // BLOCK * BLOCK
+        bins = [mono[:full].reshape(-1, BLOCK)]
+        if full < mono.size:
+            # Only the last chunk can end mid-bin (CHUNK_FRAMES is a multiple of BLOCK).
+            bins.append(mono[full:][None, :])
+        for b in bins:
+            if b.size:
+                lo.append(b.min(axis=1))
+                hi.append(b.max(axis=1))
+                sumsq.append(np.einsum("ij,ij->i", b, b, dtype=np.float64))
+    if not frames:
+        empty = np.zeros(0, dtype=np.float32)
+        return Summary(empty, empty, empty.astype(np.float64), 0, rate)
+    return Summary(np.concatenate(lo), np.concatenate(hi), np.concatenate(sumsq), frames, rate)
+
+
+def _key(path: Path) -> tuple[str, int, int]:
+    st = path.stat()
+    return (str(path.resolve()), st.st_size, st.st_mtime_ns)
+
+
+@functools.lru_cache(maxsize=32)
+def _summary(key: tuple[str, int, int]) -> Summary:
+    name = hashlib.sha1(f"{key}:{BLOCK}".encode()).hexdigest()
+    cached = CACHE_DIR / f"{name}.npz"
+    if cached.exists():
+        with np.load(cached) as z:
+            return Summary(z["lo"], z["hi"], z["sumsq"], int(z["frames"]), int(z["rate"]))
+    summary = scan(Path(key[0]))
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    tmp = cached.with_suffix(".tmp.npz")
+    np.savez(tmp, lo=summary.lo, hi=summary.hi, sumsq=summary.sumsq, frames=summary.frames, rate=summary.rate)
+    tmp.replace(cached)
+    return summary
+
+
+def summary(path: str | Path) -> Summary:
+    return _summary(_key(Path(path)))
+
+
+@functools.lru_cache(maxsize=128)
+def _peaks(key: tuple[str, int, int], columns: int) -> Peaks:
+    s = _summary(key)
+    nb = s.lo.size
+    if not nb:
+        zeros = np.zeros(columns, dtype=np.float32)
+        return Peaks(zeros, zeros, zeros, 0.0)
+    counts = np.full(nb, BLOCK, dtype=np.float64)
+    counts[-1] = s.frames - (nb - 1) * BLOCK
+    if columns >= nb:
+        # Short clip: every column shows the bin under it.
+        idx = (np.arange(columns) * nb) // columns
+        return Peaks(s.lo[idx], s.hi[idx], np.sqrt(s.sumsq[idx] / counts[idx]), s.duration)
+    start = (np.arange(columns) * nb) // columns
+    rms = np.sqrt(np.add.reduceat(s.sumsq, start) / np.add.reduceat(counts, start))
+    return Peaks(np.minimum.reduceat(s.lo, start), np.maximum.reduceat(s.hi, start), rms, s.duration)
+
+
+def peaks(path: str | Path, columns: int) -> Peaks:
+    """Min/max/RMS for ``columns`` pixel columns, cached per file and width."""
+    return _peaks(_key(Path(path)), max(1, columns))
+
+
+def duration_label(seconds: float) -> str:
+    m, s = divmod(int(round(seconds)), 60)
+    return f"{m:02d}:{s:02d}"
+
+
+def _band(top: np.ndarray, bottom: np.ndarray, h: int) -> Image.Image:
+    rows = np.arange(h)[:, None]
+    return Image.fromarray(((rows >= top) & (rows <= bottom)).astype(np.uint8) * 255, "L")
+
+
+def draw(
+    draw_: ImageDraw.ImageDraw,
+    box: tuple[int, int, int, int],
+    path: str | Path,
+    color: tuple[int, ...],
+    rms_color: tuple[int, ...] | None = None,
+    normalize: bool = True,
+) -> Peaks:
+    """Mirrored waveform of ``path`` in ``box`` (x, y, w, h): peaks in ``color``, RMS over them.
+
+    With ``normalize`` the loudest peak reaches the box edges, so quiet
+    recordings still fill the card.
+    """
+    x, y, w, h = box
+    p = peaks(path, w)
+    gain = 1.0
+    if normalize:
+        loudest = float(max(np.abs(p.lo).max(initial=0), np.abs(p.hi).max(initial=0)))
+        gain = 1 / loudest if loudest > 0 else 1.0
+    mid = (h - 1) / 2
+    top = np.floor(mid - np.clip(p.hi * gain, -1, 1) * mid).astype(np.int64)
+    bottom = np.ceil(mid - np.clip(p.lo * gain, -1, 1) * mid).astype(np.int64)
+    draw_.bitmap((x, y), _band(top, bottom, h), fill=color)
+    if rms_color is not None:
+        r = np.clip(p.rms * gain, 0, 1) * mid
+        draw_.bitmap((x, y), _band(np.floor(mid - r), np.ceil(mid + r), h), fill=rms_color)
+    return p
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# The generators and mockupkit are imported from docs/mockups, as the CLI runs them.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
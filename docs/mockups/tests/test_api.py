@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from mockupkit import api, devices
+
+SIZE = (195, 422)
+
+
+@pytest.mark.parametrize("mode", ["RGB", "RGBA", "L"])
+def test_to_array_matches_the_image(mode):
+    rng = np.random.default_rng(3)
+    im = Image.fromarray(rng.integers(0, 256, (13, 17, 4), dtype=np.uint8), "RGBA").convert(mode)
+    rgb = api.to_array(im)
+    # A strided view over the padded buffer, not a copy.
+    assert rgb.shape == (13, 17, 3) and rgb.base.shape == (13, 17, 4)
+    assert np.array_equal(rgb, np.asarray(im.convert("RGB")))
+    rgba = api.to_array(im, 4)
+    assert rgba.flags.c_contiguous and not np.shares_memory(rgb, rgba)
+    expected = np.asarray(im.convert("RGBA")) if mode == "RGBA" else np.asarray(im.convert("RGB"))
+    assert np.array_equal(rgba[..., :3], expected[..., :3])
+    if mode != "RGBA":
+        # The pad byte reads as opaque.
+        assert np.all(rgba[..., 3] == 255)
+    with pytest.raises(ValueError, match="channels"):
+        api.to_array(im, 2)
+
+
+def test_sized_devices_keep_the_width_in_points():
+    device = api.sized(devices.DEFAULT, SIZE)
+    assert device.pixels == SIZE and device.points[0] == devices.DEFAULT.points[0]
+    assert api.sized(devices.DEFAULT, devices.DEFAULT.pixels) is devices.DEFAULT
+
+
+def test_outputs_share_one_frame():
+    im = api.render("native", "login", size=SIZE)
+    assert im.size == SIZE
+    arr = api.render("native", "login", size=SIZE, output="array")
+    assert arr.shape == (SIZE[1], SIZE[0], 3)
+    assert np.array_equal(arr, np.asarray(im.convert("RGB")))
+    buf = api.render("native", "login", size=SIZE, output="buffer")
+    assert buf.contiguous and buf.nbytes == SIZE[0] * SIZE[1] * 4
+    assert np.array_equal(np.asarray(buf)[..., :3], arr)
+
+
+@pytest.mark.parametrize(
+    ("kwargs", "message"),
+    [
+        ({"family": "nope", "screen": "login"}, "unknown family"),
+        ({"family": "native", "screen": "caja"}, "has no screen"),
+        ({"family": "native", "screen": "login", "theme": "dark"}, "has no theme"),
+        ({"family": "native", "screen": "login", "output": "png"}, "output must be"),
+    ],
+)
+def test_bad_arguments_are_value_errors(kwargs, message):
+    with pytest.raises(ValueError, match=message):
+        api.render(**kwargs)
+
+
+def test_frames_walk_the_filtered_matrix_lazily():
+    it = api.frames(["native"], screens=["login", "dashboard"], size=SIZE, output="array")
+    first = next(it)
+    assert (first.family, first.theme, first.screen) == ("native", "default", "login")
+    assert first.name == "mirat_login_native.png" and first.data.shape == (SIZE[1], SIZE[0], 3)
+    assert [f.screen for f in it] == ["dashboard"]
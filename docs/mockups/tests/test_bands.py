@@ -0,0 +1,41 @@
+from dataclasses import replace
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mockupkit import bands, context, devices, registry
+
+W, H = 37, 150
+
+
+def _gradient(y0, y1):
+    y, x = np.mgrid[y0:y1, 0:W]
+    arr = np.dstack([(x * 7) % 256, (y * 3) % 256, (x + y) % 256, 255 - y % 256]).astype(np.uint8)
+    return Image.fromarray(arr, "RGBA")
+
+
+@pytest.mark.parametrize("fmt", sorted(bands.SINKS))
+def test_sinks_round_trip_strips(tmp_path, fmt):
+    path = tmp_path / f"out.{fmt}"
+    bands.render((W, H), _gradient, bands.SINKS[fmt](path, (W, H)), strip=16)
+    if fmt == "npy":
+        out = np.load(path)
+    else:
+        with Image.open(path) as im:
+            out = np.asarray(im.convert("RGBA"))
+    assert np.array_equal(out, np.asarray(_gradient(0, H)))
+
+
+def test_scene_strips_stitch_into_the_whole_frame(tmp_path):
+    scene = registry.families()["native_v3"].scene
+    w, h = 390, 844
+    device = replace(devices.DEFAULT, scale=w / devices.DEFAULT.points[0])
+
+    def frame(strip):
+        path = tmp_path / f"{strip}.npy"
+        with context.use(device=device):
+            bands.render((w, h), lambda y0, y1: scene("login", w, h, y0, y1), bands.NpySink(path, (w, h)), strip)
+        return np.load(path)
+
+    assert np.array_equal(frame(97), frame(h))
@@ -0,0 +1,66 @@
+import time
+
+import pytest
+from PIL import Image
+
+from mockupkit import bench, devices, registry
+
+
+def test_probe_charges_nested_time_to_the_inner_stage():
+    probe = bench._Probe()
+    inner = probe.wrap("blur", lambda: time.sleep(0.02))
+
+    def work():
+        inner()
+        time.sleep(0.01)
+
+    probe.wrap("composite", work)()
+    totals = probe.take()
+    assert totals["blur"] >= 0.02
+    assert 0.01 <= totals["composite"] < 0.02
+    assert probe.take() == {}
+
+
+def test_probing_restores_the_primitives():
+    family = registry.families()["native"]
+    original = Image.Image.filter
+    with bench._probing(family):
+        assert Image.Image.filter is not original
+    assert Image.Image.filter is original
+
+
+def test_run_case_splits_the_total_into_stages():
+    family = registry.families()["native"]
+    device = devices.DEVICES["android_360_mdpi"]
+    case = bench.run_case(family, "default", "login", runs=2, warmup=0, device=device, optimize=False)
+    assert case.key == "native/default/login"
+    assert set(case.stages) == set(bench.STAGES) and len(case.runs) == 2
+    assert case.stages["text"] > 0 and case.stages["encode"] > 0
+    env = bench.environment(device, 2, 0, True)
+    assert bench.to_json([case], env)["cases"]["native/default/login"]["total"] == case.total
+
+
+def _results(total, blur):
+    return {"cases": {"a/b/c": {"total": total, "stages": {"blur": blur, "text": 1.0}}}}
+
+
+@pytest.mark.parametrize(
+    ("total", "blur", "flagged"),
+    [
+        (100.0, 10.0, []),
+        (100.0, 14.0, ["blur"]),
+        # Over the ratio but inside the floor.
+        (100.0, 10.9, []),
+        (130.0, 10.0, ["total"]),
+    ],
+)
+def test_compare_needs_both_threshold_and_floor(total, blur, flagged):
+    regressions = bench.compare(_results(total, blur), _results(100.0, 10.0), threshold=0.05, floor_ms=1.0)
+    assert [r.stage for r in regressions] == flagged
+    for r in regressions:
+        assert r.ratio > 1.05
+
+
+def test_cases_missing_from_the_baseline_are_skipped():
+    assert bench.compare(_results(500.0, 50.0), {"cases": {}}, 0.05, 1.0) == []
+    assert bench.Regression("x", "blur", 0.0, 1.0).ratio == float("inf")
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from mockupkit import charts
+
+
+@pytest.fixture
+def spiky():
+    values = np.sin(np.arange(100_003) / 500)
+    values[12_345] = 50
+    values[77_777] = -30
+    return values
+
+
+@pytest.mark.parametrize("method", charts.METHODS)
+def test_spikes_survive_downsampling(spiky, method):
+    x, y = charts.reduce(spiky, 100, method)
+    assert len(x) == len(y) <= 200
+    assert y.max() == 50 and y.min() == -30
+    assert x[0] == 0 and x[-1] == pytest.approx(1)
+    assert np.all(np.diff(x) >= 0)
+
+
+@pytest.mark.parametrize("method", charts.METHODS)
+def test_streams_match_arrays_in_bounded_points(spiky, method):
+    x, y = charts.reduce(iter(spiky.tolist()), 100, method)
+    assert len(y) <= 400
+    assert y.max() == 50 and y.min() == -30
+
+
+def test_short_series_are_returned_as_is():
+    x, y = charts.reduce([3, 1, 2], 10)
+    assert x.tolist() == [0, 0.5, 1]
+    assert y.tolist() == [3, 1, 2]
+
+
+def test_files_are_mapped_or_streamed(tmp_path, spiky):
+    npy = tmp_path / "series.npy"
+    np.save(npy, spiky)
+    assert isinstance(charts.load(npy), np.memmap)
+    csv = tmp_path / "series.csv"
+    csv.write_text("value,label\n1.5,a\n\n-2,b\n", encoding="utf-8")
+    assert list(charts.load(csv)) == [1.5, -2.0]
+
+
+def test_unknown_method_is_an_error():
+    with pytest.raises(ValueError, match="unknown downsampling method"):
+        charts.reduce([1, 2, 3], 10, "mean")
+
+
+def test_draw_stays_inside_the_box(spiky):
+    im = Image.new("RGBA", (120, 40))
+    pts = charts.draw(ImageDraw.Draw(im), (10, 5, 100, 30), spiky, (255, 255, 255, 255), fill=(255, 0, 0, 80))
+    xs, ys = zip(*pts)
+    assert 10 <= min(xs) and max(xs) <= 110
+    assert 5 <= min(ys) and max(ys) <= 35
@@ -0,0 +1,76 @@
+import argparse
+
+import pytest
+
+from mockupkit import cli, memory
+
+
+def _subparsers():
+    parser = cli.build_parser()
+    action = next(a for a in parser._actions if isinstance(a, argparse._SubParsersAction))
+    return action.choices
+
+
+MATRIX = sorted(name for name, p in _subparsers().items() if p.get_default("matrix") is p)
+
+
+@pytest.mark.parametrize("command", MATRIX)
+@pytest.mark.parametrize(("flag", "value"), [("--family", "nope"), ("--theme", "sepia"), ("--screen", "inicio")])
+def test_unknown_filters_exit_before_the_command_runs(command, flag, value, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main([command, flag, value])
+    assert exc.value.code == 2
+    assert f"unknown {flag[2:]} {value!r}" in capsys.readouterr().err
+
+
+def test_unknown_locales_are_rejected_where_given():
+    with pytest.raises(SystemExit) as exc:
+        cli.main(["render", "--locale", "fr", "--list"])
+    assert exc.value.code == 2
+
+
+def test_known_filters_reach_the_command(capsys):
+    assert cli.main(["render", "--family", "native", "--screen", "login", "--list"]) == 0
+    assert capsys.readouterr().out.split() == ["native", "default", "login", "mirat_login_native.png"]
+
+
+def test_render_has_no_watch_loop():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args(["render", "--watch"])
+    assert "watch" in _subparsers()
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["stamp", "records.csv", "--family", "mirat", "--screen", "nope"],
+        ["stamp", "records.csv", "--family", "mirat", "--screen", "caja", "--theme", "default"],
+        ["poster", "--screen", "nope", "--family", "native_v3"],
+    ],
+)
+def test_stamp_and_poster_validate_theme_and_screen(argv, capsys):
+    assert cli.main(argv) == 2
+    assert "has no" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["stamp", "records.csv", "--family", "nope", "--screen", "x"],
+        # Only families with scene art can print posters.
+        ["poster", "--screen", "x", "--family", "mirat"],
+    ],
+)
+def test_stamp_and_poster_families_are_choices(argv, capsys):
+    with pytest.raises(SystemExit) as exc:
+        cli.main(argv)
+    assert exc.value.code == 2
+    assert "invalid choice" in capsys.readouterr().err
+
+
+def test_memory_budget_lowers_the_worker_count(monkeypatch, capsys):
+    monkeypatch.setattr(memory, "available", lambda: 3 * memory.MB)
+    args = argparse.Namespace(workers=8, memory_budget="1")
+    assert cli._workers(args) == 3
+    assert "allows 3 of 8 workers" in capsys.readouterr().err
+    assert cli._workers(argparse.Namespace(workers=8, memory_budget=None)) == 8
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from mockupkit import contrast, devices, layout, registry
+
+
+def _wcag(c):
+    # The WCAG formula, independent of the lookup table.
+    s = np.array(c) / 255
+    lin = np.where(s <= 0.04045, s / 12.92, ((s + 0.055) / 1.055) ** 2.4)
+    return float(lin @ [0.2126, 0.7152, 0.0722])
+
+
+def _run(fg, bg, size_pt=12.0, bold=False, covered=False, text="x"):
+    return contrast.Run(
+        "native", "default", "login", "es", "iphone_14", text, (0, 0, 1, 1), size_pt, bold,
+        fg, bg, _wcag(fg), _wcag(bg), covered,
+    )
+
+
+def test_ratios_follow_wcag():
+    runs = [
+        _run((255, 255, 255), (0, 0, 0)),
+        # The dark theme's muted text on cards.
+        _run((0xB8, 0xC1, 0xC7), (0x34, 0x49, 0x5E)),
+        _run((119, 119, 119), (255, 255, 255), size_pt=24),
+        _run((119, 119, 119), (255, 255, 255), size_pt=19, bold=True),
+        _run((119, 119, 119), (255, 255, 255), size_pt=19),
+    ]
+    ratio, required = contrast.ratios(runs)
+    assert ratio[0] == pytest.approx(21)
+    assert ratio[1] == pytest.approx(5.08, abs=0.01)
+    assert required.tolist() == [4.5, 4.5, 3.0, 3.0, 4.5]
+    assert contrast._luminance(np.array([0xB8, 0xC1, 0xC7], np.uint8)) == pytest.approx(runs[1].fg_lum, abs=1e-4)
+
+
+def test_report_lists_failures_worst_first():
+    runs = [
+        _run((150, 150, 150), (255, 255, 255), text="light"),
+        _run((200, 200, 200), (255, 255, 255), text="lighter"),
+        _run((250, 250, 250), (255, 255, 255), text="hidden", covered=True),
+        _run((0, 0, 0), (255, 255, 255), text="fine"),
+    ]
+    payload = contrast.report(runs)
+    assert [f["text"] for f in payload["failures"]] == ["lighter", "light"]
+    assert payload["covered"] == 1 and payload["worst"] == payload["failures"][0]["ratio"]
+    assert payload["failures"][0]["fg"] == "#C8C8C8"
+    assert contrast.report([])["worst"] is None
+
+
+def _drawn(fill, bg, cover=False):
+    font = registry.fonts_for("native", 2.0)["b1"]
+    im = Image.new("RGB", (300, 80), bg)
+    ImageDraw.Draw(im).text((10, 10), "Hola mundo", fill=fill, font=font)
+    recorder = layout.Recorder(im.size)
+    draw = layout.LayoutDraw(recorder)
+    draw.text((10, 10), "Hola mundo", fill=fill, font=font)
+    if cover:
+        draw.rectangle((0, 0, 299, 79), fill=(0, 0, 0))
+    return contrast.runs(np.asarray(im), recorder, 2.0, family="f", theme="t", screen="s", locale="es", device="d")
+
+
+def test_runs_sample_glyph_cores_and_background():
+    (run,) = _drawn((20, 30, 40), (240, 235, 230))
+    assert run.fg == (20, 30, 40) and run.bg == (240, 235, 230)
+    assert not run.covered and run.box[0] >= 10
+    (hidden,) = _drawn((20, 30, 40), (240, 235, 230), cover=True)
+    assert hidden.covered
+
+
+def test_audit_reuses_frames_and_samples(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry, "MOCKUP_DIR", tmp_path)
+    monkeypatch.setattr(contrast, "FRAME_DIR", tmp_path / "contrast")
+    monkeypatch.setattr(contrast, "SAMPLES", tmp_path / "contrast" / "samples.json")
+    matrix = list(registry.select(["native"], screens=["login"]))
+    device = devices.DEVICES["android_360_mdpi"]
+    first, rendered = contrast.audit(matrix, ["es"], [device])
+    assert rendered == 1 and first
+    assert (tmp_path / "contrast" / "es" / device.key / "mirat_login_native.png").exists()
+    again, rendered = contrast.audit(matrix, ["es"], [device])
+    assert rendered == 0 and again == first
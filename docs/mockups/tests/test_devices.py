@@ -0,0 +1,34 @@
+import pytest
+
+from mockupkit import context, devices, registry, render, units
+
+
+def test_pixels_follow_points_and_scale():
+    assert devices.DEFAULT.pixels == (780, 1688)
+    assert devices.DEVICES["pixel_7"].pixels == (1082, 2402)
+    assert devices.DEVICES["android_360_mdpi"].pixels == (360, 800)
+
+
+def test_select_keeps_table_order_and_rejects_unknown_keys():
+    assert [d.key for d in devices.select(["pixel_7", "iphone_se"])] == ["iphone_se", "pixel_7"]
+    assert len(devices.select()) == len(devices.DEVICES)
+    with pytest.raises(ValueError, match="nope"):
+        devices.select(["nope"])
+
+
+def test_units_use_the_current_device():
+    with context.use(device=devices.DEVICES["android_360_xxhdpi"]):
+        assert units.scale() == 3
+        assert units.px(14) == 42
+        assert units.px(14, 1.5) == 21
+        assert units.safe_top() == units.safe_bottom() == 72
+    with context.use(device=devices.DEVICES["iphone_se"]):
+        assert units.safe_bottom() == 0
+
+
+@pytest.mark.parametrize("key", ["android_360_mdpi", "ipad_mini"])
+def test_render_fills_the_device(key):
+    device = devices.DEVICES[key]
+    family = registry.families()["native"]
+    im = render.render(family, "default", "login", device=device)
+    assert im.size == device.pixels
@@ -0,0 +1,109 @@
+import hashlib
+import io
+import json
+import tarfile
+import threading
+import time
+import zipfile
+
+import pytest
+
+from mockupkit import cli, export
+
+
+class _Pipe(io.RawIOBase):
+    """A write-only stream that cannot seek, like stdout into a pipe."""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.buffer += b
+        return len(b)
+
+
+def _members(data, fmt):
+    if fmt == "zip":
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            return [(name, z.read(name)) for name in z.namelist()]
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r:*") as t:
+        return [(m.name, t.extractfile(m).read()) for m in t.getmembers()]
+
+
+def _items(n):
+    # Later items finish first, so completion order differs from submission order.
+    for i in range(n):
+        yield f"frame_{i}.png", lambda i=i: (time.sleep(0.002 * (n - i)), bytes([i]) * (100 + i))[1]
+
+
+@pytest.mark.parametrize("fmt", export.FORMATS)
+def test_manifest_hashes_match_the_members(fmt):
+    out = _Pipe()
+    entries = export.write(out, fmt, _items(9), workers=3, meta={"locales": ["es"]})
+    members = _members(bytes(out.buffer), fmt)
+    names = [name for name, _ in members]
+    assert names[-1] == export.MANIFEST
+    assert sorted(names[:-1]) == sorted(f"frame_{i}.png" for i in range(9))
+
+    manifest = json.loads(members[-1][1])
+    assert manifest["locales"] == ["es"]
+    assert manifest["files"] == [{"name": e.name, "bytes": e.bytes, "sha256": e.sha256} for e in entries]
+    data = dict(members)
+    for f in manifest["files"]:
+        assert len(data[f["name"]]) == f["bytes"]
+        assert hashlib.sha256(data[f["name"]]).hexdigest() == f["sha256"]
+
+
+def test_members_are_flushed_as_they_finish():
+    out = _Pipe()
+    written = []
+    lock = threading.Lock()
+    encoded = 0
+
+    def items():
+        for i in range(12):
+
+            def encode():
+                nonlocal encoded
+                with lock:
+                    encoded += 1
+                return b"x" * 30_000
+
+            yield f"{i}.png", encode
+
+    def progress(entry):
+        # At most 2 * workers encoded frames wait to be appended.
+        written.append(len(out.buffer))
+        with lock:
+            assert encoded - len(written) < 2 * 2
+
+    export.write(out, "tar", items(), workers=2, progress=progress)
+    # Stream-mode tar holds back at most one record; everything before it is out.
+    assert [w >= 30_000 * (i + 1) - tarfile.RECORDSIZE for i, w in enumerate(written)] == [True] * 12
+
+
+def test_unknown_formats_are_rejected():
+    with pytest.raises(ValueError, match="format must be"):
+        export.write(io.BytesIO(), "rar", [])
+
+
+@pytest.mark.parametrize(
+    ("path", "fmt"),
+    [("out.zip", "zip"), ("OUT.TAR.GZ", "tgz"), ("a.tgz", "tgz"), ("a.tar", "tar"), ("-", "tar"), ("frames", "tar")],
+)
+def test_guess_format(path, fmt):
+    assert export.guess_format(path) == fmt
+
+
+def test_command_archives_rendered_frames(tmp_path):
+    path = tmp_path / "out.tgz"
+    argv = ["export", "--family", "native", "--screen", "login", "--locale", "en", "--locale", "es"]
+    assert cli.main([*argv, "--draft", "0.25", "--fast", "--out", str(path)]) == 0
+    members = dict(_members(path.read_bytes(), "tgz"))
+    assert sorted(members) == ["en/mirat_login_native.png", "es/mirat_login_native.png", export.MANIFEST]
+    assert members["en/mirat_login_native.png"][:8] == b"\x89PNG\r\n\x1a\n"
+    manifest = json.loads(members[export.MANIFEST])
+    assert manifest["locales"] == ["en", "es"] and manifest["draft"] == 0.25
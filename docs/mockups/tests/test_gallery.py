@@ -0,0 +1,52 @@
+import itertools
+
+from PIL import Image
+
+from mockupkit import devices, gallery, registry
+
+
+def _frames(root, entries):
+    # Flat files for the default device, like the committed mockups.
+    for entry in entries:
+        path = root / entry.family.output_name(entry.theme, entry.screen)
+        Image.new("RGB", entry.device.pixels, (200, 40, 40)).save(path)
+
+
+def test_entries_are_contiguous_by_group():
+    todo = gallery.entries(by="screen")
+    assert len(todo) == len(list(registry.select()))
+    groups = [e.group("screen") for e in todo]
+    # Each group is one contiguous run.
+    runs = [g for g, _ in itertools.groupby(groups)]
+    assert len(runs) == len(set(groups))
+
+
+def test_sheets_paginate_and_mark_missing_frames(tmp_path):
+    root = tmp_path / "frames"
+    root.mkdir()
+    todo = gallery.entries(["mirat"], ["light"], by="family")
+    _frames(root, todo[1:])
+    pages = list(gallery.build(todo, tmp_path / "out", "family", cols=2, rows=2, width=60, root=root))
+
+    assert [(p.number, p.pages) for p in pages] == [(i + 1, len(pages)) for i in range(len(pages))]
+    assert len(pages) == -(-len(todo) // 4)
+    assert pages[0].path.name == "sheet_mirat_p01.png"
+    assert [e for p in pages for e, _ in p.entries] == todo
+    assert pages[0].entries[0][1] is None
+    thumb = pages[0].entries[1][1]
+    assert thumb.parent.name == "thumbs"
+    assert Image.open(thumb).width == 60
+
+    index = gallery.write_index(pages, tmp_path / "out", "family", root).read_text(encoding="utf-8")
+    assert index.count('loading="lazy"') == len(todo) - 1
+    assert "(missing)" in index
+    assert f'href="../frames/{todo[1].family.output_name("light", todo[1].screen)}"' in index
+
+
+def test_disk_thumbnails_keep_the_aspect(tmp_path):
+    entry = gallery.entries(["native"], by="none")[0]
+    _frames(tmp_path, [entry])
+    w, h = devices.DEFAULT.pixels
+    assert gallery.thumbnail(entry, 100, tmp_path).size == (100, round(100 * h / w))
+    other = gallery.Entry(entry.family, entry.theme, entry.screen, devices.DEVICES["pixel_7"])
+    assert gallery.thumbnail(other, 100, tmp_path / "empty") is None
@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+import pytest
+
+from mockupkit import context, i18n, layout, registry
+
+
+@pytest.fixture(autouse=True)
+def fresh_missing(monkeypatch):
+    monkeypatch.setattr(i18n, "_missing", defaultdict(set))
+
+
+def test_locales_start_with_the_source():
+    locales = i18n.locales()
+    assert locales[0] == i18n.SOURCE_LOCALE
+    assert {"en", "pt"} <= set(locales)
+
+
+def test_tr_translates_and_falls_back():
+    with context.use(locale="en"):
+        assert i18n.tr("Caja") != "Caja"
+        assert i18n.tr("sin traducción de prueba") == "sin traducción de prueba"
+    assert "sin traducción de prueba" in i18n.missing("en")
+    with context.use(locale=i18n.SOURCE_LOCALE):
+        assert i18n.tr("Caja") == "Caja"
+
+
+def test_unknown_locale_is_an_error():
+    with pytest.raises(ValueError, match="unknown locale"):
+        i18n.catalog("xx")
+
+
+@pytest.mark.parametrize("locale", [loc for loc in i18n.locales() if loc != i18n.SOURCE_LOCALE])
+def test_catalogs_cover_every_builder_string(locale):
+    for family, theme_key, screen_key in registry.select(None, [next(iter(f.themes)) for f in registry.families().values()]):
+        layout.measure(family, theme_key, screen_key, locale)
+    assert i18n.missing(locale) == []
+
+
+def test_copy_changes_with_the_locale():
+    family = registry.families()["mirat"]
+    texts = {}
+    for locale in ("es", "en"):
+        recorder, _ = layout.measure(family, "light", "caja", locale)
+        texts[locale] = [el.text for el in recorder.elements if el.kind == "text"]
+    assert texts["es"][0] == "Caja"
+    assert texts["es"] != texts["en"]
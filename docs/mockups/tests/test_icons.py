@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from mockupkit import icons
+
+
+@pytest.fixture
+def source(tmp_path):
+    # A mark, a transparent gap and a wordmark, like the brand logo.
+    logo = Image.new("RGBA", (120, 90), (0, 0, 0, 0))
+    logo.paste((40, 40, 40, 255), (40, 0, 80, 40))
+    logo.paste((40, 40, 40, 255), (0, 60, 120, 90))
+    path = tmp_path / "logo.png"
+    logo.save(path)
+    return path
+
+
+@pytest.fixture
+def outputs(source, tmp_path):
+    return list(icons.plan(source, tmp_path / "res"))
+
+
+def test_plan_covers_every_asset_and_density(outputs, tmp_path):
+    assert len(outputs) == len(icons.ASSETS) * len(icons.DENSITIES)
+    assert tmp_path / "res" / "mipmap-xxxhdpi" / "ic_launcher_round.png" in [o.path for o in outputs]
+    # One key per asset, shared by its densities.
+    assert len({o.key for o in outputs}) == len(icons.ASSETS)
+
+
+def test_manifest_marks_written_outputs_fresh(source, outputs, tmp_path):
+    assert icons.stale(outputs, {}) == outputs
+    with ThreadPoolExecutor(2) as executor:
+        written = [f.result() for f in icons.submit(outputs, executor, source)]
+    manifest = {str(o.path): o.key for o in written}
+    assert icons.stale(outputs, manifest) == []
+
+    path = tmp_path / "manifest.json"
+    icons.save_manifest(manifest, path)
+    assert icons.load_manifest(path) == manifest
+    assert Image.open(tmp_path / "res" / "mipmap-mdpi" / "ic_launcher.png").size == (48, 48)
+    assert Image.open(tmp_path / "res" / "mipmap-xxxhdpi" / "ic_launcher.png").size == (192, 192)
+    # The splash keeps the logo's aspect ratio.
+    assert Image.open(tmp_path / "res" / "drawable-mdpi" / "splash_screen.png").size == (200, 150)
+
+
+def test_drifted_reports_without_writing(source, outputs):
+    with ThreadPoolExecutor(2) as executor:
+        assert icons.drifted(outputs, executor, source) == outputs
+        assert not any(o.path.exists() for o in outputs)
+        for f in icons.submit(outputs, executor, source):
+            f.result()
+        assert icons.drifted(outputs, executor, source) == []
+        first = outputs[0].path
+        Image.new("RGBA", Image.open(first).size).save(first)
+        assert icons.drifted(outputs, executor, source) == [outputs[0]]
+
+
+def test_round_icon_is_transparent_in_the_corners(source, outputs):
+    round_ = next(o for o in outputs if o.asset.shape == "round")
+    im = icons.compose(round_.asset, source)
+    assert im.getpixel((0, 0))[3] == 0
+    assert im.getpixel((im.width // 2, im.height // 2))[3] == 255
@@ -0,0 +1,83 @@
+import pytest
+
+from mockupkit import cache, devices, layout, registry
+
+TEXT = "Claudia siempre cede un poco para no perder a nadie. Se vuelve flexible hasta desaparecer."
+
+
+@pytest.fixture
+def font():
+    return registry.fonts_for("mirat", 2.0)["body_28"]
+
+
+def _greedy(font, text, max_w):
+    # One trial per word, as the generators wrapped before ``cache.wrap``.
+    lines, current = [], []
+    for w in text.split():
+        b = cache.text_bbox(font, " ".join([*current, w]))
+        if b[2] - b[0] <= max_w:
+            current.append(w)
+            continue
+        if current:
+            lines.append(" ".join(current))
+        current = [w]
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+@pytest.mark.parametrize("max_w", [40, 120, 300, 520, 2000])
+def test_wrap_matches_greedy(font, max_w):
+    assert list(cache.wrap(font, TEXT, max_w)) == _greedy(font, TEXT, max_w)
+
+
+def test_wrap_puts_an_overlong_word_on_its_own_line(font):
+    assert cache.wrap(font, "a desaparecer b", 30) == ("a", "desaparecer", "b")
+    assert cache.wrap(font, "", 100) == ()
+
+
+def test_measure_records_boxes_and_containers():
+    family = registry.families()["mirat"]
+    recorder, issues = layout.measure(family, "light", "caja")
+    texts = [el for el in recorder.elements if el.kind == "text" and not el.in_paragraph]
+    assert any(el.text == "Caja" for el in texts)
+    assert all(el.container is not None for el in texts)
+    assert not [i for i in issues if i["kind"] == "overlap"]
+    frame = layout.frame_json(recorder, issues, screen="caja")
+    assert frame["size"] == list(devices.DEFAULT.pixels)
+
+
+def test_stacked_paragraphs_that_wrap_overlap():
+    # At 360 dp the first two evidence bullets wrap onto a second line, but
+    # the list still steps one line height per bullet.
+    family = registry.families()["mirat"]
+    _, issues = layout.measure(family, "light", "caja", "es", devices.DEVICES["android_360_mdpi"])
+    overlaps = [i for i in issues if i["kind"] == "overlap"]
+    assert [i["above"].split(" · ")[0] for i in overlaps] == ["• Lun 05", "• Mié 07"]
+    assert all(i["rows"] > 0 for i in overlaps)
+
+
+def test_text_side_by_side_does_not_overlap():
+    recorder = layout.Recorder((200, 100))
+    draw = layout.LayoutDraw(recorder)
+    font = registry.fonts_for("mirat", 1.0)["body_28"]
+    draw.text((10, 10), "Left", font=font)
+    draw.text((120, 12), "Right", font=font)
+    draw.text((10, 60), "Below", font=font)
+    assert layout.analyze(recorder) == []
+
+
+def test_boxes_persist_across_runs(tmp_path, monkeypatch, font):
+    path = tmp_path / "text_bbox.json"
+    monkeypatch.setattr(cache, "_boxes", None)
+    cache.load_boxes(path)
+    cache.text_bbox.cache_clear()
+    box = cache.text_bbox(font, "persisted")
+    cache.save_boxes(path)
+    assert path.exists()
+
+    cache.load_boxes(path)
+    cache.text_bbox.cache_clear()
+    monkeypatch.setattr(cache.MEASURE, "textbbox", lambda *a, **k: pytest.fail("measured again"))
+    assert cache.text_bbox(font, "persisted") == box
+    cache.text_bbox.cache_clear()
@@ -0,0 +1,57 @@
+import gc
+import json
+
+import pytest
+from PIL import Image
+
+from mockupkit import memory, trace
+
+
+@pytest.mark.parametrize(
+    ("requested", "free", "expected"),
+    [(8, 10 * memory.MB, 2), (8, memory.MB, 1), (2, 100 * memory.MB, 2), (4, None, 4)],
+)
+def test_workers_fit_the_budget(monkeypatch, requested, free, expected):
+    monkeypatch.setattr(memory, "available", lambda: free)
+    assert memory.workers(requested, 4 * memory.MB) == expected
+
+
+def test_no_budget_keeps_the_requested_workers(monkeypatch):
+    monkeypatch.setattr(memory, "available", lambda: 0)
+    assert memory.workers(6, None) == 6
+
+
+def test_budget_parses_megabytes_and_auto(tmp_path, monkeypatch):
+    assert memory.budget(None) is None
+    assert memory.budget("1.5") == int(1.5 * memory.MB)
+    report = tmp_path / "report.json"
+    monkeypatch.setattr(memory, "REPORT", report)
+    with pytest.raises(ValueError, match="needs a report"):
+        memory.budget("auto")
+    report.write_text(json.dumps({"budget_hint_mb": 300.0}), encoding="utf-8")
+    assert memory.budget("auto") == 300 * memory.MB
+
+
+def test_accountant_tracks_live_buffers_per_stage():
+    new = Image.Image._new
+    with memory.accounting(top=2) as accountant:
+        accountant.begin("screen")
+        with trace.region("_glass", "x"):
+            a = Image.new("RGBA", (100, 100))
+            b = Image.new("L", (10, 10))
+        with trace.region("_nav", "x"):
+            c = a.copy()
+        peak = accountant.live
+        del a, b, c
+        gc.collect()
+        s = accountant.end(None, None)
+    assert Image.Image._new is new and trace.active() is None
+    assert s.screen == "screen" and s.image_peak >= peak >= 80_100
+    assert s.stages["_glass"] >= 40_100 and s.stages["_nav"] >= 40_000
+    assert [(a.size, a.mode) for a in s.largest] == [((100, 100), "RGBA"), ((100, 100), "RGBA")]
+    # Collected images are no longer live.
+    assert accountant.live_by_stage["_glass"] == 0
+
+    report = memory.to_json([s], [])
+    assert report["budget_hint_mb"] == round(s.rss_growth / memory.MB, 1)
+    assert report["screens"][0]["largest"][0]["stage"] in ("_glass", "_nav")
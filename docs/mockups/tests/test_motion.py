@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+from PIL import Image
+
+from mockupkit import devices, motion, registry
+
+N = 5
+
+
+@pytest.fixture(scope="module", params=sorted(motion.TRANSITIONS))
+def transition_scene(request):
+    transition = motion.TRANSITIONS[request.param]
+    family = registry.families()[transition.family]
+    scene = motion._scene(
+        family, next(iter(family.themes)), transition.screens[0], transition.element, "es", devices.DEFAULT
+    )
+    if transition.prepare is not None:
+        scene = motion.replace(scene, extra={**scene.extra, **transition.prepare(scene)})
+    return transition, scene
+
+
+def _repainted(transition, scene, i):
+    # The frame painted from the base over the whole canvas.
+    t = i / N if transition.loop else i / (N - 1)
+    full = (0, 0, *scene.base.size)
+    return np.asarray(transition.paint(scene.base.crop(full), full, scene, t))
+
+
+def test_dirty_boxes_reproduce_full_repaints(transition_scene):
+    transition, scene = transition_scene
+    for i, (frame, box, _) in enumerate(motion.frames(transition, scene, N)):
+        assert np.array_equal(np.asarray(frame), _repainted(transition, scene, i)), i
+        if i and transition.region is not motion._drawer_region:
+            # Only the scrim repaints the whole frame.
+            assert (box[2] - box[0]) * (box[3] - box[1]) < scene.base.width * scene.base.height
+
+
+def test_one_shot_transitions_end_on_the_rendered_screen(transition_scene):
+    transition, scene = transition_scene
+    if transition.loop:
+        pytest.skip("loops never settle")
+    *_, (frame, _, _) = motion.frames(transition, scene, N)
+    assert np.array_equal(np.asarray(frame), np.asarray(scene.final))
+
+
+def test_apng_decodes_to_the_same_frames(tmp_path):
+    transition = motion.TRANSITIONS["drawer"]
+    path = tmp_path / "drawer.png"
+    stats, _ = motion.export(transition, "menu", path, n=N)
+    assert [s.index for s in stats] == list(range(N))
+    with Image.open(path) as im:
+        assert im.n_frames == N
+        im.seek(N - 1)
+        last = np.asarray(im.convert("RGB"))
+    family = registry.families()["mirat"]
+    scene = motion._scene(family, "light", "menu", "drawer", "es", devices.DEFAULT)
+    scene = motion.replace(scene, extra={**scene.extra, **motion._dim(scene)})
+    assert np.array_equal(last, _repainted(transition, scene, N - 1))
+
+
+def test_screens_outside_the_transition_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="runs on"):
+        motion.export(motion.TRANSITIONS["pulse"], "menu", tmp_path / "x.png")
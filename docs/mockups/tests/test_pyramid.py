@@ -0,0 +1,46 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from mockupkit import devices, pyramid
+
+
+def test_variants_cover_densities_and_thumbnails():
+    out = pyramid.variants(devices.DEFAULT, (1, 2.5), (240,))
+    assert out == [
+        pyramid.Variant("@1x", (390, 844)),
+        pyramid.Variant("@2.5x", (975, 2110)),
+        pyramid.Variant("_thumb240", (240, 519)),
+    ]
+
+
+def test_downsampling_averages_in_linear_light():
+    # A one-pixel checkerboard is half the light of white, which is sRGB 188, not 128.
+    checker = (np.indices((64, 64)).sum(axis=0) % 2 * 255).astype(np.uint8)
+    im = Image.fromarray(np.dstack([checker] * 3), "RGB")
+    out = np.asarray(pyramid.Master(im).resize((16, 16)))
+    assert abs(int(np.median(out)) - 188) <= 1
+
+
+def test_transparent_pixels_do_not_bleed():
+    arr = np.zeros((32, 32, 4), np.uint8)
+    arr[:, :16] = (255, 0, 0, 255)
+    arr[:, 16:] = (0, 255, 0, 0)
+    out = np.asarray(pyramid.Master(Image.fromarray(arr, "RGBA")).resize((8, 8)))
+    visible = out[out[..., 3] > 0]
+    assert visible[:, 1].max() == 0
+
+
+def test_same_size_returns_the_master_image():
+    im = Image.new("RGB", (10, 20), (1, 2, 3))
+    assert pyramid.Master(im).resize((10, 20)) is im
+
+
+def test_submit_writes_every_variant(tmp_path):
+    master = pyramid.Master(Image.new("RGB", (90, 60), (200, 100, 50)))
+    todo = [pyramid.Variant("@1x", (30, 20)), pyramid.Variant("_thumb12", (12, 8))]
+    with ThreadPoolExecutor(2) as executor:
+        paths = [f.result() for f in pyramid.submit(master, todo, tmp_path, "screen", executor, optimize=False)]
+    assert [p.name for p in paths] == ["screen@1x.png", "screen_thumb12.png"]
+    assert [Image.open(p).size for p in paths] == [(30, 20), (12, 8)]
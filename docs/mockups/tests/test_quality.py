@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageFilter
+
+from mockupkit import context, devices, layout, quality, registry, render
+
+
+@pytest.fixture(scope="module")
+def soft():
+    rng = np.random.default_rng(5)
+    arr = np.zeros((160, 120, 4), np.uint8)
+    arr[40:120, 30:90] = rng.integers(0, 256, 4, dtype=np.uint8)
+    arr[..., 3] = np.maximum(arr[..., 3], 80)
+    return Image.fromarray(arr, "RGBA")
+
+
+def test_draft_devices_keep_the_points():
+    device = quality.draft_device(devices.DEFAULT)
+    assert device.points == devices.DEFAULT.points
+    assert device.pixels == (390, 844) and device.key == "iphone_14_draft"
+    for fraction in (0, 1.5):
+        with pytest.raises(ValueError, match="draft scale"):
+            quality.draft_device(devices.DEFAULT, fraction)
+
+
+def test_final_blur_is_a_plain_gaussian(soft):
+    assert not quality.draft()
+    assert np.array_equal(np.asarray(quality.blur(soft, 12)), np.asarray(soft.filter(ImageFilter.GaussianBlur(12))))
+
+
+def test_draft_blur_approximates_large_radii(soft):
+    exact = np.asarray(soft.filter(ImageFilter.GaussianBlur(28))).astype(int)
+    with context.use(draft=True):
+        assert quality.draft()
+        approx = quality.blur(soft, 28)
+        assert np.array_equal(np.asarray(quality.blur(soft, 0.5)), np.asarray(soft))
+        small = quality.blur(soft, 2)
+    assert approx.size == soft.size
+    # Close, not exact: a few levels on average, a little more along the edges.
+    error = np.abs(np.asarray(approx).astype(int) - exact)
+    assert error.mean() < 4 and error.max() < 32
+    assert np.array_equal(np.asarray(small), np.asarray(soft.filter(ImageFilter.GaussianBlur(2))))
+
+
+def test_drafts_render_at_the_fraction():
+    family = registry.families()["native_v3"]
+    im = render.render(family, "default", "login", draft=0.25)
+    assert im.size == (195, 422)
+
+
+@pytest.mark.parametrize("family_key", sorted(registry.families()))
+def test_drafts_keep_the_layout(family_key):
+    family = registry.families()[family_key]
+    draft = quality.draft_device(devices.DEFAULT)
+    theme_key = next(iter(family.themes))
+    for screen_key in family.screens:
+        final, _ = layout.measure(family, theme_key, screen_key)
+        preview, _ = layout.measure(family, theme_key, screen_key, device=draft)
+        assert [e.kind for e in preview.elements] == [e.kind for e in final.elements], screen_key
+        if family_key != "mirat":
+            # Half-size metrics can wrap differently; the native copy has the slack not to.
+            assert [e.lines for e in preview.elements] == [e.lines for e in final.elements], screen_key
@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from mockupkit import regress
+
+
+@pytest.fixture
+def golden(tmp_path):
+    rng = np.random.default_rng(7)
+    arr = rng.integers(0, 256, (150, 200, 3), dtype=np.uint8)
+    path = tmp_path / "golden.png"
+    Image.fromarray(arr, "RGB").save(path)
+    return path, arr
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    return regress.Manifest(tmp_path / "golden.json")
+
+
+def _compare(arr, golden, manifest, **kwargs):
+    return regress.compare(Image.fromarray(arr, "RGB"), golden, manifest, **kwargs)
+
+
+def test_identical_frames_stop_at_the_hashes(golden, manifest):
+    path, arr = golden
+    r = _compare(arr, path, manifest)
+    assert (r.status, r.tiles, r.changed_tiles) == ("same", 12, 0)
+
+
+def test_changes_below_the_delta_pass(golden, manifest):
+    path, arr = golden
+    arr = arr.copy()
+    arr[10, 10] ^= 1
+    r = _compare(arr, path, manifest)
+    assert r.status == "pass" and r.changed_tiles == 1 and r.changed_pixels == 0
+    assert 0 < r.max_delta < regress.DELTA
+
+
+def test_visible_changes_fail_with_a_heatmap(golden, manifest, tmp_path):
+    path, arr = golden
+    arr = arr.copy()
+    arr[70:72, 130:140] = 255 - arr[70:72, 130:140]
+    r = _compare(arr, path, manifest, out_dir=tmp_path / "diff")
+    assert r.status == "fail" and not r.ok
+    assert r.changed_tiles == 1 and r.changed_pixels > 0
+    assert Image.open(r.heatmap).size == (200, 150)
+    # Within tolerance the same change is accepted.
+    assert _compare(arr, path, manifest, tolerance=0.01).status == "pass"
+
+
+def test_missing_and_resized_goldens(golden, manifest, tmp_path):
+    path, arr = golden
+    assert _compare(arr, tmp_path / "nope.png", manifest).status == "missing"
+    assert _compare(arr[:, :100], path, manifest).status == "size"
+
+
+def test_manifest_reuses_hashes_until_the_file_changes(golden, manifest, tmp_path):
+    path, arr = golden
+    manifest.hashes(path)
+    manifest.save()
+    again = regress.Manifest(manifest.path)
+    assert again.hashes(path)[1] == regress.tile_hashes(arr) and not again.dirty
+    st = path.stat()
+    Image.fromarray(arr[::-1].copy(), "RGB").save(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert again.hashes(path)[1] == regress.tile_hashes(arr[::-1]) and again.dirty
+
+
+def test_delta_e():
+    white = np.full((1, 3), 255, np.uint8)
+    black = np.zeros((1, 3), np.uint8)
+    assert regress.delta_e(white, white)[0] == 0
+    assert regress.delta_e(white, black)[0] == pytest.approx(100, abs=0.1)
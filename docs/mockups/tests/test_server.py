@@ -0,0 +1,155 @@
+import asyncio
+import io
+import json
+import threading
+import time
+import wave
+
+import pytest
+from PIL import Image
+
+from mockupkit import server
+
+JOB = {"family": "native", "screen": "login"}
+
+
+class _Slow:
+    """A renderer that takes a while and counts its calls."""
+
+    def __init__(self, delay=0.05, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, job):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return f"{job.screen}:{job.values}".encode()
+
+
+def _service(renderer, keep=64):
+    service = server.Service(workers=4, keep=keep)
+    service.render = renderer
+    return service
+
+
+def _post(service, payload):
+    return service.route("POST", "/render", json.dumps(payload).encode())
+
+
+def test_identical_jobs_in_flight_share_one_render():
+    renderer = _Slow()
+    service = _service(renderer, keep=0)
+
+    async def run():
+        other = {**JOB, "screen": "dashboard"}
+        return await asyncio.gather(*(_post(service, JOB) for _ in range(5)), _post(service, other))
+
+    results = asyncio.run(run())
+    assert renderer.calls == 2
+    assert [r[0] for r in results] == [200] * 6
+    assert sorted(r[3]["X-Served"] for r in results) == ["coalesced"] * 4 + ["render"] * 2
+    assert results[0][2] == results[1][2] == b"login:{}"
+    assert service.metrics.coalesced == 4 and service.metrics.renders == 2
+
+
+def test_finished_jobs_are_served_from_the_result_cache():
+    renderer = _Slow(delay=0)
+    service = _service(renderer, keep=1)
+
+    async def run():
+        await _post(service, JOB)
+        again = await _post(service, {**JOB, "theme": "default", "values": {}})
+        await _post(service, {**JOB, "values": {"b": 1, "a": 2}})
+        # Key order does not matter; the first job was evicted by the second.
+        same = await _post(service, {**JOB, "values": {"a": 2, "b": 1}})
+        evicted = await _post(service, JOB)
+        return again, same, evicted
+
+    again, same, evicted = asyncio.run(run())
+    assert again[3]["X-Served"] == same[3]["X-Served"] == "cache"
+    assert evicted[3]["X-Served"] == "render" and renderer.calls == 3
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        (b"not json", "Expecting value"),
+        (b"[1]", "expected a JSON object"),
+        (json.dumps({"family": "nope"}).encode(), "unknown family"),
+        (json.dumps({"family": "native", "screen": "caja"}).encode(), "unknown screen"),
+        (json.dumps({**JOB, "theme": "dark"}).encode(), "unknown theme"),
+        (json.dumps({**JOB, "locale": "fr"}).encode(), "unknown locale"),
+        (json.dumps({**JOB, "device": "nokia"}).encode(), "unknown device"),
+        (json.dumps({**JOB, "format": "gif"}).encode(), "format must be"),
+        (json.dumps({**JOB, "values": [1]}).encode(), "values must be an object"),
+    ],
+)
+def test_bad_requests_are_400(body, message):
+    renderer = _Slow(delay=0)
+    status, ctype, data, _ = asyncio.run(_service(renderer).route("POST", "/render", body))
+    assert (status, ctype) == (400, "application/json")
+    assert message in json.loads(data)["error"]
+    assert renderer.calls == 0
+
+
+@pytest.mark.parametrize("error", [ValueError("bad value"), wave.Error("file does not start with RIFF id")])
+def test_override_errors_reach_every_waiter_as_400(error):
+    renderer = _Slow(error=error)
+    service = _service(renderer)
+
+    async def run():
+        return await asyncio.gather(_post(service, JOB), _post(service, JOB))
+
+    results = asyncio.run(run())
+    assert [r[0] for r in results] == [400, 400] and renderer.calls == 1
+    assert json.loads(results[1][2])["error"] == str(error)
+    assert service._pending == {} and service._results == {}
+
+
+def test_routes():
+    service = _service(_Slow(delay=0))
+    assert asyncio.run(service.route("GET", "/render", b""))[0] == 405
+    assert asyncio.run(service.route("GET", "/nope", b""))[0] == 404
+    status, _, data, _ = asyncio.run(service.route("GET", "/screens", b""))
+    matrix = json.loads(data)
+    assert status == 200 and len(matrix) == len(set(map(json.dumps, matrix)))
+    assert {"family": "native", "theme": "default", "screen": "login", "file": "mirat_login_native.png"} in matrix
+    asyncio.run(_post(service, JOB))
+    metrics = json.loads(asyncio.run(service.route("GET", "/metrics", b""))[2])
+    assert metrics["renders"] == 1 and metrics["latency_ms"]["p50"] is not None
+
+
+def test_http_keeps_the_connection_alive():
+    service = _service(_Slow(delay=0))
+
+    async def run():
+        srv = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = srv.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps(JOB).encode()
+        answers = []
+        for _ in range(2):
+            writer.write(b"POST /render HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+            await writer.drain()
+            head = (await reader.readuntil(b"\r\n\r\n")).decode()
+            length = int(head.split("Content-Length: ")[1].split("\r\n")[0])
+            answers.append((head.split("\r\n")[0], await reader.readexactly(length)))
+        writer.close()
+        srv.close()
+        await srv.wait_closed()
+        return answers
+
+    assert asyncio.run(run()) == [("HTTP/1.1 200 OK", b"login:{}")] * 2
+    assert service.metrics.requests == 2
+
+
+def test_renderer_encodes_the_requested_format():
+    job = server.Job.parse({**JOB, "device": "android_360_mdpi", "format": "jpeg"})
+    data = server.Renderer()(job)
+    with Image.open(io.BytesIO(data)) as im:
+        assert im.format == "JPEG" and im.size == (360, 800)
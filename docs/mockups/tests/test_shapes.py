@@ -0,0 +1,93 @@
+import math
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from mockupkit import context, layout, shapes
+
+INK = (30, 160, 90)
+
+
+def _canvas(mode="RGB"):
+    im = Image.new(mode, (80, 60), (0, 0, 0, 0) if mode == "RGBA" else (255, 255, 255))
+    return im, ImageDraw.Draw(im)
+
+
+def _coverage(im):
+    # Fraction of ink per pixel, from the green channel over white.
+    return (255 - np.asarray(im)[..., 0].astype(float)) / (255 - INK[0])
+
+
+def test_ellipse_edges_are_antialiased_and_cover_the_area():
+    im, draw = _canvas()
+    shapes.ellipse(draw, (10, 10, 49, 39), fill=INK)
+    cov = _coverage(im)
+    partial = (cov > 0.02) & (cov < 0.98)
+    assert partial.sum() > 40
+    assert cov[25, 30] == pytest.approx(1)
+    # Pillow boxes are inclusive: a 40x30 ellipse.
+    assert cov.sum() == pytest.approx(math.pi * 20 * 15, rel=0.02)
+    assert not cov[:9].any() and not cov[41:].any() and not cov[:, :9].any() and not cov[:, 51:].any()
+
+
+def test_polygon_area_is_exact_within_a_percent():
+    im, draw = _canvas()
+    shapes.polygon(draw, [(5, 5), (65, 5), (5, 45)], fill=INK)
+    assert _coverage(im).sum() == pytest.approx(60 * 40 / 2, rel=0.05)
+
+
+def test_rounded_rectangles_only_redo_their_corners():
+    im, draw = _canvas()
+    shapes.rounded_rectangle(draw, (10, 10, 69, 49), radius=8, fill=INK, outline=(0, 0, 0), width=2)
+    plain, plain_draw = _canvas()
+    plain_draw.rounded_rectangle((10, 10, 69, 49), radius=8, fill=INK, outline=(0, 0, 0), width=2)
+    a, b = np.asarray(im), np.asarray(plain)
+    c = math.ceil(8) + 1
+    inner = np.ones(a.shape[:2], bool)
+    for ys, xs in ((slice(10, 10 + c), slice(10, 10 + c)), (slice(10, 10 + c), slice(70 - c, 70))):
+        inner[ys, xs] = False
+    for ys, xs in ((slice(50 - c, 50), slice(10, 10 + c)), (slice(50 - c, 50), slice(70 - c, 70))):
+        inner[ys, xs] = False
+    assert np.array_equal(a[inner], b[inner])
+    assert not np.array_equal(a[10 : 10 + c, 10 : 10 + c], b[10 : 10 + c, 10 : 10 + c])
+
+
+def test_ink_over_transparency_keeps_its_color():
+    im, draw = _canvas("RGBA")
+    shapes.ellipse(draw, (10, 10, 49, 39), fill=(*INK, 200))
+    arr = np.asarray(im)
+    edge = (arr[..., 3] > 0) & (arr[..., 3] < 200)
+    assert edge.any()
+    # Exact up to 8-bit premultiplied rounding, which grows as alpha shrinks.
+    error = np.abs(arr[edge][:, :3].astype(int) - INK).max(axis=1)
+    assert np.all(error <= 255 / arr[edge][:, 3] + 1)
+    assert arr[25, 30].tolist() == [*INK, 200]
+
+
+def test_repeated_shapes_reuse_the_mask():
+    im, draw = _canvas()
+    shapes.ellipse(draw, (2, 2, 13, 13), fill=INK)
+    before = shapes.coverage.cache_info().hits
+    shapes.ellipse(draw, (40, 30, 51, 41), fill=INK)
+    assert shapes.coverage.cache_info().hits == before + 1
+    a = np.asarray(im)
+    assert np.array_equal(a[2:14, 2:14], a[30:42, 40:52])
+
+
+def test_drafts_and_factor_one_fall_back_to_pillow():
+    plain, plain_draw = _canvas()
+    plain_draw.ellipse((10, 10, 49, 39), fill=INK)
+    im, draw = _canvas()
+    with context.use(draft=True):
+        shapes.ellipse(draw, (10, 10, 49, 39), fill=INK)
+    assert np.array_equal(np.asarray(im), np.asarray(plain))
+    im, draw = _canvas()
+    shapes.ellipse(draw, (10, 10, 49, 39), fill=INK, factor=1)
+    assert np.array_equal(np.asarray(im), np.asarray(plain))
+
+
+def test_layout_passes_record_the_plain_call():
+    recorder = layout.Recorder((80, 60))
+    shapes.arc(layout.LayoutDraw(recorder), (10, 10, 49, 39), 0, 180, fill=INK, width=3)
+    assert [e.kind for e in recorder.elements] == ["arc"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from mockupkit import context, registry, render, stamp
+
+RECORDS = [
+    {"id": "u0", "name": "Carlos Alberto", "prompt": "“¿Qué evitaste decir hoy?”", "density": [7.8, 7.2, 3.5, 3.3, 2.5, 4.4, 1.0]},
+    {
+        "id": "u1",
+        "name": "Sofía",
+        "prompt": "“¿A quién le dijiste que sí cuando querías decir que no, y qué te costó exactamente ese sí?”",
+        "density": [3.3, 5.8, 7.2, 8.8, 0.0, 0.7, 4.7],
+    },
+    {},
+    {"name": "Ana"},
+]
+
+
+def _full(family, theme_key, screen_key, record, slots):
+    values = {k: record[k] for k in slots if record.get(k) not in (None, "")}
+    with context.use(values=values):
+        return render.render(family, theme_key, screen_key)
+
+
+@pytest.mark.parametrize("family_key,screen_key", [("mirat", "sesion"), ("native", "dashboard"), ("native_v3", "dashboard")])
+def test_stamped_frames_match_full_renders(family_key, screen_key):
+    family = registry.families()[family_key]
+    theme_key = next(iter(family.themes))
+    stamper = stamp.Stamper(family, theme_key, screen_key)
+    # The first record comes back last, after frames that dirtied other regions.
+    for record in [*RECORDS, RECORDS[0]]:
+        stamped = np.asarray(stamper.stamp(record).convert("RGB"))
+        full = np.asarray(_full(family, theme_key, screen_key, record, stamper.slots).convert("RGB"))
+        assert np.array_equal(stamped, full), record
+
+
+def test_screens_without_slots_are_rejected():
+    family = registry.families()["mirat"]
+    with pytest.raises(ValueError, match="no stampable slots"):
+        stamp.Stamper(family, "light", "contrato")
+
+
+def test_csv_records_coerce_series(tmp_path):
+    path = tmp_path / "records.csv"
+    path.write_text("id,name,density\na/1,Ana,1;2.5;3\n,Luis,\n", encoding="utf-8")
+    records = list(stamp.read_records(str(path)))
+    assert records[0] == {"id": "a/1", "name": "Ana", "density": [1.0, 2.5, 3.0]}
+    assert stamp.record_name(records[0], 0) == "a_1"
+    assert stamp.record_name(records[1], 7) == "000007"
@@ -0,0 +1,64 @@
+import xml.etree.ElementTree as ET
+from collections import Counter
+
+import pytest
+
+from mockupkit import devices, registry, svg
+
+NS = {"svg": "http://www.w3.org/2000/svg"}
+XLINK = "{http://www.w3.org/1999/xlink}href"
+
+
+def _parse(markup):
+    return ET.fromstring(markup.encode("utf-8"))
+
+
+@pytest.mark.parametrize(
+    ("family_key", "theme_key", "screen_key"),
+    [(f.key, t, s) for f, t, s in registry.select(["mirat", "native"])],
+)
+def test_screens_are_well_formed_svg(family_key, theme_key, screen_key):
+    family = registry.families()[family_key]
+    root = _parse(svg.render(family, theme_key, screen_key))
+    assert root.get("viewBox") == "0 0 780 1688"
+    assert (root.get("width"), root.get("height")) == ("390", "844")
+    texts = [t.text for t in root.iter("{http://www.w3.org/2000/svg}text")]
+    assert texts and all(texts)
+    # Every reference points at a definition.
+    ids = {el.get("id") for el in root.find("svg:defs", NS)}
+    refs = {el.get(XLINK)[1:] for el in root.iter() if el.get(XLINK, "").startswith("#")}
+    assert refs <= ids
+
+
+def test_rasters_are_embedded_once():
+    family = registry.families()["native_v3"]
+    root = _parse(svg.render(family, "default", "dashboard"))
+    images = [el.get(XLINK) for el in root.find("svg:defs", NS).iter("{http://www.w3.org/2000/svg}image")]
+    assert images and all(uri.startswith("data:image/png;base64,") for uri in images)
+    assert max(Counter(images).values()) == 1
+    uses = Counter(el.get(XLINK) for el in root.iter("{http://www.w3.org/2000/svg}use"))
+    # The photo background is reused under the blurred sheets.
+    assert max(uses.values()) > 1
+
+
+def test_other_densities_only_change_the_viewbox():
+    family = registry.families()["mirat"]
+    root = _parse(svg.render(family, "light", "acceso", device=devices.DEVICES["iphone_15_pro_max"]))
+    assert root.get("viewBox") == "0 0 1290 2796"
+    assert (root.get("width"), root.get("height")) == ("430", "932")
+
+
+def test_ink_alpha_follows_pillow():
+    assert svg._paint("fill", (1, 2, 3, 128), opaque=True) == 'fill="#010203"'
+    assert svg._paint("fill", (1, 2, 3, 128), opaque=False) == 'fill="#010203" fill-opacity="0.5"'
+    assert svg._paint("stroke", None, opaque=True) == 'stroke="none"'
+    assert svg._paint("fill", 255, opaque=True) == 'fill="#ffffff"'
+
+
+def test_text_is_escaped():
+    doc = svg.Document()
+    layer = svg.SvgImage(doc, "RGB", (100, 40))
+    font = registry.fonts_for("mirat", 2.0)
+    svg.SvgDraw(layer).text((0, 0), "Tú & yo <3", fill=(0, 0, 0), font=next(iter(font.values())))
+    root = _parse(doc.markup(layer, devices.DEFAULT))
+    assert root.find("svg:text", NS).text == "Tú & yo <3"
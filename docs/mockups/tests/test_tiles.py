@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageEnhance, ImageFilter
+
+from mockupkit import tiles
+
+
+@pytest.fixture(autouse=True)
+def workers(monkeypatch):
+    # Tile even on a single-core runner.
+    monkeypatch.setattr(tiles, "WORKERS", 4)
+
+
+@pytest.fixture(scope="module")
+def noisy():
+    rng = np.random.default_rng(11)
+    return Image.fromarray(rng.integers(0, 256, (1600, 120, 4), dtype=np.uint8), "RGBA")
+
+
+def test_spans_cover_every_row_once():
+    for h, halo in ((1688, 0), (1688, 90), (1000, 300), (100, 0)):
+        parts = tiles.spans(h, halo)
+        assert parts[0][0] == 0 and parts[-1][1] == h
+        assert all(a[1] == b[0] for a, b in zip(parts, parts[1:]))
+    assert len(tiles.spans(1688)) == 4 and tiles.spans(100) == [(0, 100)]
+
+
+@pytest.mark.parametrize("radius", [0.6, 2, 7.3, 28, 60])
+@pytest.mark.parametrize("mode", ["RGBA", "RGB", "L"])
+def test_tiled_blur_is_bit_exact(noisy, radius, mode):
+    im = noisy.convert(mode)
+    assert len(tiles.spans(im.height, tiles.blur_halo(radius))) > 1
+    tiled = tiles.gaussian_blur(im, radius)
+    assert tiled.mode == mode
+    assert np.array_equal(np.asarray(tiled), np.asarray(im.filter(ImageFilter.GaussianBlur(radius))))
+
+
+def test_tiled_point_is_bit_exact(noisy):
+    table = [255 - v for v in range(256)] * 2 + [v // 2 for v in range(256)] + list(range(256))
+    assert np.array_equal(np.asarray(tiles.point(noisy, table)), np.asarray(noisy.point(table)))
+
+
+@pytest.mark.parametrize("factor", [0, 0.37, 0.8, 1, 1.6, 3])
+@pytest.mark.parametrize("mode", ["RGBA", "RGB", "L"])
+def test_brightness_matches_image_enhance(noisy, factor, mode):
+    im = noisy.convert(mode)
+    expected = ImageEnhance.Brightness(im).enhance(factor)
+    assert np.array_equal(np.asarray(tiles.brightness(im, factor)), np.asarray(expected))
+
+
+def test_non_images_get_the_plain_call():
+    calls = []
+    assert tiles.map_rows(lambda x: calls.append(x) or "done", "layer", halo=10) == "done"
+    assert calls == ["layer"]
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from PIL import Image, ImageDraw, ImageFilter
+
+from mockupkit import devices, registry, render, trace
+
+
+@trace.span
+def _helper(im):
+    return im.filter(ImageFilter.GaussianBlur(2))
+
+
+def test_disabled_tracing_leaves_pillow_alone():
+    assert trace.active() is None
+    original = Image.Image.filter
+    with trace.enabled() as tracer:
+        assert trace.active() is tracer and Image.Image.filter is not original
+        with pytest.raises(RuntimeError):
+            with trace.enabled():
+                pass
+    assert trace.active() is None and Image.Image.filter is original
+    # Decorated helpers run untraced.
+    assert _helper(Image.new("RGB", (8, 8))).size == (8, 8)
+
+
+def test_spans_nest_and_counters_accumulate(tmp_path):
+    with trace.enabled() as tracer:
+        with trace.region("outer", "render"):
+            im = _helper(Image.new("RGBA", (40, 30)))
+            Image.alpha_composite(im, Image.new("RGBA", (40, 30)))
+            ImageDraw.Draw(im).textbbox((0, 0), "hola")
+    assert [e.name for e in tracer.events] == ["filter GaussianBlur", "_helper", "alpha_composite", "outer"]
+    assert tracer.counters["pixels_composited"] == 1200 and tracer.counters["textbbox"] == 1
+    assert tracer.counters["image_bytes"] > 0
+
+    path = tmp_path / "trace.json"
+    tracer.write(path)
+    doc = json.loads(path.read_text(encoding="utf-8"))
+    spans = [e for e in doc["traceEvents"] if e["ph"] == "X"]
+    assert {e["name"] for e in spans} == {"filter GaussianBlur", "_helper", "alpha_composite", "outer"}
+    assert all(e["dur"] >= 0 for e in spans)
+    # The render span samples the counters.
+    assert [e["args"]["textbbox"] for e in doc["traceEvents"] if e["ph"] == "C"] == [1]
+
+    summary = tracer.summary(top=2)
+    rows = summary.splitlines()
+    assert rows[0].split()[0] == "span" and len(rows) == 1 + 2 + 1 + len(trace.COUNTERS)
+    assert "pixels_composited" in summary
+
+
+def test_self_time_excludes_nested_spans():
+    tracer = trace.Tracer()
+    ms = 1_000_000
+    tracer.events = [
+        trace.Event("child", "x", 10 * ms, 40 * ms, 1),
+        trace.Event("parent", "x", 0, 100 * ms, 1),
+        # Another thread overlapping in time is not nested.
+        trace.Event("other", "x", 0, 50 * ms, 2),
+    ]
+    rows = {line.split()[0]: line.split()[1:] for line in tracer.summary().splitlines()[1:4]}
+    assert rows == {
+        "parent": ["1", "70.00", "100.00"],
+        "other": ["1", "50.00", "50.00"],
+        "child": ["1", "30.00", "30.00"],
+    }
+
+
+def test_render_is_traced_through_the_generator_helpers():
+    family = registry.families()["native"]
+    with trace.enabled() as tracer:
+        render.render(family, "default", "login", device=devices.DEVICES["android_360_mdpi"])
+    cats = {e.cat for e in tracer.events}
+    assert "render" in cats and "pillow" in cats and len(cats) > 2
+    assert tracer.counters["textbbox"] > 0
@@ -0,0 +1,144 @@
+import ast
+import json
+import shutil
+import sys
+from pathlib import Path
+
+import pytest
+from PIL import Image
+
+from mockupkit import cache, i18n, registry, watch
+
+SOURCE = '''
+import os
+
+LIMIT = 3
+SIZES = [LIMIT * 2]
+
+
+def _helper():
+    return tr("Hola")
+
+
+def build():
+    return _helper() + str(SIZES)
+'''
+
+
+def test_parse_follows_references_and_tr_strings():
+    src = watch.parse(SOURCE)
+    assert src.reach("build") == {"build", "_helper", "SIZES", "LIMIT"}
+    assert src.tr_strings("build") == {"Hola"}
+    assert src.tr_strings("SIZES") == set()
+
+
+def test_patch_reruns_changed_statements_and_what_captured_them(tmp_path):
+    module = type(sys)("fake")
+    exec(SOURCE, module.__dict__)
+    helper = module._helper
+    old = watch.parse(SOURCE)
+    new = watch.parse(SOURCE.replace("LIMIT = 3", "LIMIT = 5"))
+    changed = watch._patch(module, tmp_path / "fake.py", old, new)
+    # SIZES holds a value computed from LIMIT; functions look it up when called.
+    assert changed == {"LIMIT", "SIZES"}
+    assert module.SIZES == [10] and module._helper is helper
+
+
+@pytest.fixture
+def mirat(tmp_path, monkeypatch):
+    """The mirat generator watched from a copy; the live module is restored afterwards."""
+    family = registry.families()["mirat"]
+    module = sys.modules[next(iter(family.screens.values())).__module__]
+    copy = tmp_path / Path(module.__file__).name
+    shutil.copy(module.__file__, copy)
+    saved = dict(module.__dict__)
+    monkeypatch.setattr(module, "__file__", str(copy))
+    yield family, copy
+    for key in set(module.__dict__) - set(saved):
+        del module.__dict__[key]
+    module.__dict__.update(saved)
+    registry.families.cache_clear()
+    registry.fonts_for.cache_clear()
+
+
+def _insert(path, function, line):
+    """Add ``line`` at the top of ``function``'s body."""
+    text = path.read_text(encoding="utf-8")
+    node = next(n for n in ast.parse(text).body if isinstance(n, ast.FunctionDef) and n.name == function)
+    lines = text.splitlines(keepends=True)
+    first = node.body[0]
+    lines.insert(first.lineno - 1, " " * first.col_offset + line + "\n")
+    path.write_text("".join(lines), encoding="utf-8")
+
+
+def _poll(watcher):
+    return {what: sorted((t.theme, t.screen) for t in affected) for what, affected in watcher.poll()}
+
+
+def test_only_builders_reaching_an_edit_are_rerendered(mirat):
+    family, path = mirat
+    watcher = watch.Watcher(watch.targets(["mirat"]))
+    assert path in watcher.paths()
+    assert _poll(watcher) == {}
+
+    _insert(path, family.screens["caja"].__name__, "_watched = None")
+    assert _poll(watcher) == {path.name: [("dark", "caja"), ("light", "caja")]}
+
+    # A helper shared by some builders but not all.
+    src = watcher.sources["mirat"]
+    reached = {key: src.reach(fn.__name__) for key, fn in family.screens.items()}
+    helper, users = next(
+        (name, sorted(k for k, names in reached.items() if name in names))
+        for name, node in src.statements.items()
+        if isinstance(node, ast.FunctionDef)
+        and 1 < sum(name in names for names in reached.values()) < len(reached)
+    )
+    _insert(path, helper, "_watched = None")
+    assert _poll(watcher) == {path.name: [(t, s) for t in ("dark", "light") for s in users]}
+
+    # Blank lines move code without changing it.
+    path.write_text("\n\n" + path.read_text(encoding="utf-8"), encoding="utf-8")
+    assert _poll(watcher) == {path.name: []}
+
+
+def test_broken_edits_keep_the_previous_version(mirat, capsys):
+    family, path = mirat
+    watcher = watch.Watcher(watch.targets(["mirat"], screens=["caja"]))
+    path.write_text(path.read_text(encoding="utf-8") + "\ndef broken(:\n", encoding="utf-8")
+    assert _poll(watcher) == {path.name: []}
+    assert "keeping the previous version" in capsys.readouterr().err
+    assert registry.families()["mirat"].screens["caja"] is family.screens["caja"]
+
+
+def test_catalog_edits_target_the_screens_using_the_string(tmp_path, monkeypatch):
+    shutil.copytree(i18n.LOCALE_DIR, tmp_path / "locales")
+    monkeypatch.setattr(i18n, "LOCALE_DIR", tmp_path / "locales")
+    i18n.catalog.cache_clear()
+    try:
+        watcher = watch.Watcher(watch.targets(["mirat"], ["light"]), "en")
+        catalog = tmp_path / "locales" / "en.json"
+        assert catalog in watcher.paths()
+        strings = json.loads(catalog.read_text(encoding="utf-8"))
+        strings["Espejo Negro"] = "Black Mirror (edited)"
+        catalog.write_text(json.dumps(strings, ensure_ascii=False), encoding="utf-8")
+        affected = _poll(watcher)["en.json"]
+        assert ("light", "espejo_negro") in affected and ("light", "acceso") not in affected
+    finally:
+        i18n.catalog.cache_clear()
+
+
+def test_redefined_image_helpers_replace_their_store():
+    def define(color):
+        @cache.images("test_watch_swatch", copy=False)
+        def swatch():
+            return Image.new("RGB", (2, 2), color)
+
+        return swatch
+
+    first = define("red")
+    assert first().getpixel((0, 0)) == (255, 0, 0)
+    second = define("blue")
+    # The old store is emptied and the name keeps one store, not two.
+    assert len(cache._stores["test_watch_swatch"]) == 1
+    assert second().getpixel((0, 0)) == (0, 0, 255)
+    assert first().getpixel((0, 0)) == (255, 0, 0)
@@ -0,0 +1,77 @@
+import wave
+
+import numpy as np
+import pytest
+
+from mockupkit import layout, waveform
+
+RATE = 8000
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(waveform, "CACHE_DIR", tmp_path / "cache")
+    waveform._summary.cache_clear()
+    waveform._peaks.cache_clear()
+    yield tmp_path / "cache"
+    waveform._summary.cache_clear()
+    waveform._peaks.cache_clear()
+
+
+@pytest.fixture
+def recording(tmp_path):
+    # Three seconds of stereo: a quiet tone with one loud click on the left channel.
+    t = np.arange(3 * RATE)
+    left = (np.sin(t / 20) * 8000).astype(np.int16)
+    right = (np.sin(t / 20) * 8000).astype(np.int16)
+    left[RATE] = 32000
+    path = tmp_path / "clip.wav"
+    with wave.open(str(path), "wb") as w:
+        w.setnchannels(2)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(np.column_stack([left, right]).tobytes())
+    mono = (left.astype(np.float32) + right) / 2 / 32768
+    return path, mono
+
+
+def test_scan_bins_the_mono_mix(recording, cache_dir):
+    path, mono = recording
+    s = waveform.summary(path)
+    assert s.frames == mono.size and s.duration == 3.0
+    assert s.lo.size == -(-mono.size // waveform.BLOCK)
+    assert s.hi.max() == pytest.approx(mono.max())
+    assert s.lo.min() == pytest.approx(mono.min())
+    assert s.sumsq.sum() == pytest.approx(float(np.dot(mono, mono)), rel=1e-5)
+    assert list(cache_dir.glob("*.npz"))
+
+
+@pytest.mark.parametrize("columns", [7, 300, 1000])
+def test_peaks_fold_to_any_width(recording, columns):
+    path, mono = recording
+    p = waveform.peaks(path, columns)
+    assert p.lo.size == p.hi.size == p.rms.size == columns
+    assert p.hi.max() == pytest.approx(mono.max())
+    assert np.all(p.lo <= p.hi)
+    assert np.all((0 <= p.rms) & (p.rms <= 1))
+
+
+def test_decode_widths():
+    raw24 = np.array([[[0x00, 0x00, 0x80]], [[0xFF, 0xFF, 0x7F]]], dtype=np.uint8)
+    assert waveform._decode(raw24, 3, False)[:, 0].tolist() == pytest.approx([-1.0, 1.0], abs=1e-6)
+    raw8 = np.array([[[0]], [[128]]], dtype=np.uint8)
+    assert waveform._decode(raw8, 1, False)[:, 0].tolist() == [-1.0, 0.0]
+    rawf = np.frombuffer(np.array([0.5, -0.25], "<f4").tobytes(), np.uint8).reshape(2, 1, 4)
+    assert waveform._decode(rawf, 4, True)[:, 0].tolist() == [0.5, -0.25]
+
+
+def test_drawn_waveform_has_an_exclusive_box(recording):
+    path, _ = recording
+    recorder = layout.Recorder((200, 100))
+    waveform.draw(layout.LayoutDraw(recorder), (10, 20, 120, 40), path, (255, 255, 255), rms_color=(0, 0, 0))
+    assert [el.box for el in recorder.elements] == [(10, 20, 130, 60), (10, 20, 130, 60)]
+
+
+def test_duration_label():
+    assert waveform.duration_label(0) == "00:00"
+    assert waveform.duration_label(125.4) == "02:05"